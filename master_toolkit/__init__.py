@@ -29,30 +29,30 @@ Usage:
 __version__ = "1.0.0"
 __author__ = "WordPress Toolkit"
 
-# Core imports for easy access
-from .core import create_client, WordPressClient, WordPressAPIError, config, auth
-from .content import ContentPublisher, ContentWorkflow
-from .validation import ComprehensiveValidator, LinkValidator, SEOValidator, ImageValidator
-from .utils import print_header, print_success, print_error, print_warning
+from ._lazy import lazy_exports
 
-__all__ = [
+# Public names and the submodule that provides them. Submodules are imported
+# on first attribute access (PEP 562) so commands only pay for what they use.
+_LAZY_IMPORTS = {
     # Core
-    'create_client',
-    'WordPressClient', 
-    'WordPressAPIError',
-    'config',
-    'auth',
+    'create_client': '.core',
+    'WordPressClient': '.core',
+    'WordPressAPIError': '.core',
+    'config': '.core',
+    'auth': '.core',
     # Content
-    'ContentPublisher',
-    'ContentWorkflow',
+    'ContentPublisher': '.content',
+    'ContentWorkflow': '.content',
     # Validation
-    'ComprehensiveValidator',
-    'LinkValidator',
-    'SEOValidator', 
-    'ImageValidator',
+    'ComprehensiveValidator': '.validation',
+    'LinkValidator': '.validation',
+    'SEOValidator': '.validation',
+    'ImageValidator': '.validation',
     # Utils
-    'print_header',
-    'print_success',
-    'print_error',
-    'print_warning'
-]
\ No newline at end of file
+    'print_header': '.utils',
+    'print_success': '.utils',
+    'print_error': '.utils',
+    'print_warning': '.utils'
+}
+
+lazy_exports(globals(), _LAZY_IMPORTS)
@@ -0,0 +1,39 @@
+"""
+Lazy Exports
+============
+PEP 562 module attributes for the package __init__ modules.
+
+A package lists its public names and the submodule providing each; the
+submodule is imported on first attribute access, so callers only load the
+dependencies of what they use. Kept outside core because importing core
+loads the client and its dependencies.
+"""
+
+import importlib
+from typing import Any, Dict
+
+
+def lazy_exports(module_globals: Dict[str, Any], imports: Dict[str, str]):
+    """
+    Install __all__, __getattr__ and __dir__ in a package namespace.
+
+    Args:
+        module_globals: The package's globals()
+        imports: Public name -> relative submodule that provides it
+    """
+    package = module_globals['__name__']
+
+    def __getattr__(name):
+        """Import the providing submodule on first access."""
+        module_name = imports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | set(imports))
+
+    module_globals.update(__all__=list(imports), __getattr__=__getattr__, __dir__=__dir__)
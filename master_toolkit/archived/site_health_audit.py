@@ -1,45 +1,120 @@
 import argparse
 import csv
+import heapq
 import re
 import sys
 import time
-from collections import defaultdict, Counter, deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import Dict, List, Set, Tuple, Optional
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Set, Tuple, Optional, Iterable, Iterator
 from urllib.parse import urljoin, urlparse, urldefrag
 
 import requests
 from bs4 import BeautifulSoup
 
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core import AuditStore
+
 # ---- Config defaults ----
 DEFAULT_TIMEOUT = 12
 HEADERS = {"User-Agent": "SphereVista360-SiteAuditor/1.0 (+https://example.com)"}
 
 # ---- Data models ----
-@dataclass
+# Every URL seen in a crawl is stored once in a UrlTable and referred to by a
+# dense integer ID. Pages keep their links and images as array('I') of those
+# IDs and PageInfo uses __slots__, so a 100k-page crawl grows with the number
+# of distinct URLs rather than with the number of links between them.
+
+class UrlTable:
+    """Interned URL strings addressed by dense uint32 IDs."""
+    __slots__ = ("_ids", "_urls")
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._urls: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._ids
+
+    def intern(self, url: str) -> int:
+        url_id = self._ids.get(url)
+        if url_id is None:
+            url_id = self._ids[url] = len(self._urls)
+            self._urls.append(url)
+        return url_id
+
+    def get(self, url: str) -> Optional[int]:
+        return self._ids.get(url)
+
+    def url(self, url_id: int) -> str:
+        return self._urls[url_id]
+
+    def urls(self, url_ids: Iterable[int]) -> Iterator[str]:
+        return (self._urls[url_id] for url_id in url_ids)
+
+# PageInfo.flags bits
+MIXED_CONTENT, FEATURED_IMAGE, SCHEMA_MARKUP, OG_IMAGE, OG_TITLE, OG_DESCRIPTION = (1 << i for i in range(6))
+OG_FLAGS = {"og:image": OG_IMAGE, "og:title": OG_TITLE, "og:description": OG_DESCRIPTION}
+
 class PageInfo:
-    url: str
-    status: int = 0
-    title: str = ""
-    meta_desc: str = ""
-    canonical: str = ""
-    h1: str = ""
-    internal_links: Set[str] = field(default_factory=set)
-    external_links: Set[str] = field(default_factory=set)
-    images: List[Tuple[str, str]] = field(default_factory=list)  # (src, alt)
-    mixed_content: bool = False
-    # Enhanced post validation fields
-    word_count: int = 0
-    headings: List[str] = field(default_factory=list)  # H2, H3, etc.
-    has_featured_image: bool = False
-    publish_date: Optional[str] = None
-    categories: List[str] = field(default_factory=list)
-    content_quality_score: float = 0.0
-    readability_score: str = ""
-    social_meta: Dict[str, str] = field(default_factory=dict)
-    schema_markup: bool = False
+    """One crawled page; links and images are URL IDs into the crawl's UrlTable."""
+    __slots__ = ("url_id", "status", "title", "meta_desc", "canonical", "h1",
+                 "internal_links", "external_links", "images", "image_alts", "flags",
+                 "word_count", "headings_count", "publish_date", "categories",
+                 "content_quality_score", "readability_score")
+
+    def __init__(self, url_id: int, status: int = 0):
+        self.url_id = url_id
+        self.status = status
+        self.title = ""
+        self.meta_desc = ""
+        self.canonical = ""
+        self.h1 = ""
+        self.internal_links = array("I")
+        self.external_links = array("I")
+        self.images = array("I")          # image src IDs, parallel to image_alts
+        self.image_alts: Tuple[str, ...] = ()
+        self.flags = 0
+        self.word_count = 0
+        self.headings_count = 0
+        self.publish_date: Optional[str] = None
+        self.categories = ""
+        self.content_quality_score = 0.0
+        self.readability_score = ""
+
+    def has(self, flag: int) -> bool:
+        return bool(self.flags & flag)
+
+    def set(self, flag: int, value: bool):
+        if value:
+            self.flags |= flag
+        else:
+            self.flags &= ~flag
+
+class CrawlData:
+    """Crawl result: the URL table plus one PageInfo per crawled page, in crawl order."""
+    __slots__ = ("urls", "pages")
+
+    def __init__(self):
+        self.urls = UrlTable()
+        self.pages: Dict[int, PageInfo] = {}
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def items(self) -> Iterator[Tuple[str, PageInfo]]:
+        """(url, page) pairs, without materializing a list."""
+        for url_id, pi in self.pages.items():
+            yield self.urls.url(url_id), pi
 
 # ---- Helpers ----
 def same_host(u1: str, u2: str) -> bool:
@@ -327,20 +402,22 @@ def extract_content_analysis(soup: BeautifulSoup) -> Tuple[int, List[str], bool]
     return word_count, headings, has_featured_image
 
 # ---- Crawler ----
-def crawl(start_url: str, max_pages: int, same_domain_only: bool) -> Dict[str, PageInfo]:
+def crawl(start_url: str, max_pages: int, same_domain_only: bool) -> CrawlData:
     session = requests.Session()
-    visited: Dict[str, PageInfo] = {}
-    queue = deque([start_url])
+    data = CrawlData()
+    urls, visited = data.urls, data.pages
+    queue = deque([urls.intern(start_url)])
     root = start_url
 
     while queue and len(visited) < max_pages:
-        url = queue.popleft()
-        if url in visited:
+        url_id = queue.popleft()
+        if url_id in visited:
             continue
+        url = urls.url(url_id)
 
         r = get(session, url)
         status = r.status_code if r is not None else 0
-        pi = PageInfo(url=url, status=status)
+        pi = PageInfo(url_id, status=status)
 
         if r and r.headers.get("content-type", "").lower().startswith("text/html"):
             soup = BeautifulSoup(r.text, "html.parser")
@@ -348,15 +425,23 @@ def crawl(start_url: str, max_pages: int, same_domain_only: bool) -> Dict[str, P
             pi.title, pi.meta_desc, pi.canonical, pi.h1 = title, meta_desc, canonical, h1
 
             internal, external, images, mixed = find_links_and_images(url, soup)
-            pi.internal_links, pi.external_links, pi.images, pi.mixed_content = internal, external, images, mixed
+            pi.internal_links = array("I", map(urls.intern, internal))
+            pi.external_links = array("I", map(urls.intern, external))
+            pi.images = array("I", (urls.intern(src) for src, _ in images))
+            pi.image_alts = tuple(alt for _, alt in images)
+            pi.set(MIXED_CONTENT, mixed)
 
             # Enhanced content analysis
             word_count, headings, has_featured_image = extract_content_analysis(soup)
-            pi.word_count, pi.headings, pi.has_featured_image = word_count, headings, has_featured_image
+            pi.word_count, pi.headings_count = word_count, len(headings)
+            pi.set(FEATURED_IMAGE, has_featured_image)
             
             # Extract post metadata
             publish_date, categories, social_meta, schema_markup = extract_post_metadata(soup)
-            pi.publish_date, pi.categories, pi.social_meta, pi.schema_markup = publish_date, categories, social_meta, schema_markup
+            pi.publish_date, pi.categories = publish_date, ", ".join(categories)
+            pi.set(SCHEMA_MARKUP, schema_markup)
+            for key, flag in OG_FLAGS.items():
+                pi.set(flag, bool(social_meta.get(key)))
             
             # Calculate content quality score
             pi.content_quality_score = calculate_content_quality_score(soup, word_count, images, headings)
@@ -366,59 +451,86 @@ def crawl(start_url: str, max_pages: int, same_domain_only: bool) -> Dict[str, P
             pi.readability_score = calculate_readability_score(content_text)
 
             # queue internal links
-            for link in internal:
+            for link, link_id in zip(internal, pi.internal_links):
                 if same_domain_only and not same_host(root, link):
                     continue
-                if link not in visited and len(visited) + len(queue) < max_pages:
-                    queue.append(link)
+                if link_id not in visited and len(visited) + len(queue) < max_pages:
+                    queue.append(link_id)
 
-        visited[url] = pi
+        visited[url_id] = pi
 
-    return visited
+    return data
 
 # ---- Link & image status checks ----
-def check_urls_status(urls: Set[str], max_workers: int = 16) -> Dict[str, Tuple[int, str]]:
-    results: Dict[str, Tuple[int, str]] = {}
+def iter_url_statuses(urls: Iterable[str], max_workers: int = 16) -> Iterator[Tuple[str, int, str]]:
+    """Yield (url, status, final_url) as checks complete, keeping at most max_workers * 4 in flight."""
     session = requests.Session()
+    urls = iter(urls)
     with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        future_to_url = {ex.submit(head_or_get_status, session, u): u for u in urls}
-        for fut in as_completed(future_to_url):
-            u = future_to_url[fut]
-            try:
-                code, final_url = fut.result()
-            except Exception:
-                code, final_url = 0, u
-            results[u] = (code, final_url)
-    return results
+        pending = {ex.submit(head_or_get_status, session, u): u for u in islice(urls, max_workers * 4)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                u = pending.pop(fut)
+                try:
+                    code, final_url = fut.result()
+                except Exception:
+                    code, final_url = 0, u
+                for nxt in islice(urls, 1):
+                    pending[ex.submit(head_or_get_status, session, nxt)] = nxt
+                yield u, code, final_url
+
+def check_urls_status(urls: Iterable[str], max_workers: int = 16) -> Dict[str, Tuple[int, str]]:
+    return {u: (code, final_url) for u, code, final_url in iter_url_statuses(urls, max_workers)}
 
 # ---- Reporting ----
-def write_csv(path: str, rows: List[Dict], fieldnames: List[str]):
+# Reports are streamed: each CSV is written row by row from its own pass over
+# the crawl, and the issues CSV is read back lazily for the audit store, so no
+# report is ever held in memory as a list of row dicts.
+
+PAGE_FIELDS = ["url", "status", "title", "title_length", "meta_desc", "meta_desc_len", "canonical", "h1",
+               "word_count", "headings_count", "has_featured_image", "internal_links", "external_links",
+               "images", "images_with_alt", "mixed_content", "publish_date", "categories",
+               "content_quality_score", "readability_score", "has_og_image", "has_schema_markup"]
+LINK_FIELDS = ["from", "to", "type"]
+IMAGE_FIELDS = ["page", "src", "alt", "has_alt", "alt_length"]
+ISSUE_FIELDS = ["url", "type", "severity", "detail"]
+
+def write_csv(path: str, rows: Iterable[Dict], fieldnames: List[str]) -> int:
+    count = 0
     with open(path, "w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=fieldnames)
         w.writeheader()
         for r in rows:
             w.writerow(r)
-
-def generate_reports(data: Dict[str, PageInfo], start_url: str):
-    pages = []
-    links = []
-    images = []
-    issues = []
-
-    # Collect global sets for status checks & inbound links map
-    all_links: Set[str] = set()
-    all_images: Set[str] = set()
-    inbound: Dict[str, Set[str]] = defaultdict(set)
-
-    # Track recent posts (last 30 days) and posts without images
-    recent_cutoff = datetime.now() - timedelta(days=30)
-    recent_posts_without_images = []
-    low_quality_posts = []
-    posts_without_featured_images = []
-
+            count += 1
+    return count
+
+def read_csv(path: str) -> Iterator[Dict[str, str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+def issue_check(issue: Dict) -> str:
+    """Stable check key of an issue: its type plus the detail without counts or parentheticals."""
+    detail = re.sub(r"\s*\([^)]*\)|(?<!HTTP )\b\d+(\.\d+)?\b", "", issue["detail"])
+    return f"{issue['type']}:{' '.join(detail.split())}"
+
+def record_audit(data: CrawlData, issues: Iterable[Dict], start_url: str,
+                 audit_store: Optional[AuditStore] = None) -> Dict:
+    """Store this run keyed by (url, check) and diff it against each URL's previous audit."""
+    store = audit_store or AuditStore()
+    run_id = store.record_run(
+        "site_health",
+        {url: round(pi.content_quality_score, 1) for url, pi in data.items()},
+        ({"subject": i["url"], "check": issue_check(i), "severity": i["severity"], "detail": i["detail"]}
+         for i in issues),
+        meta={"start_url": start_url},
+    )
+    return store.diff("site_health", run_id, min_score_delta=5)
+
+def page_rows(data: CrawlData) -> Iterator[Dict]:
     for url, pi in data.items():
-        # Enhanced pages data
-        pages.append({
+        yield {
             "url": url,
             "status": pi.status,
             "title": pi.title,
@@ -428,171 +540,215 @@ def generate_reports(data: Dict[str, PageInfo], start_url: str):
             "canonical": pi.canonical,
             "h1": pi.h1,
             "word_count": pi.word_count,
-            "headings_count": len(pi.headings),
-            "has_featured_image": "yes" if pi.has_featured_image else "no",
+            "headings_count": pi.headings_count,
+            "has_featured_image": "yes" if pi.has(FEATURED_IMAGE) else "no",
             "internal_links": len(pi.internal_links),
             "external_links": len(pi.external_links),
             "images": len(pi.images),
-            "images_with_alt": sum(1 for _, alt in pi.images if alt.strip()),
-            "mixed_content": "yes" if pi.mixed_content else "no",
+            "images_with_alt": sum(1 for alt in pi.image_alts if alt.strip()),
+            "mixed_content": "yes" if pi.has(MIXED_CONTENT) else "no",
             "publish_date": pi.publish_date or "",
-            "categories": ", ".join(pi.categories),
+            "categories": pi.categories,
             "content_quality_score": round(pi.content_quality_score, 1),
             "readability_score": pi.readability_score,
-            "has_og_image": "yes" if pi.social_meta.get('og:image') else "no",
-            "has_schema_markup": "yes" if pi.schema_markup else "no",
-        })
-        
-        # Check for recent posts without images
-        if pi.publish_date:
-            try:
-                # Try to parse the date
-                pub_date = None
-                for fmt in ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S%z"]:
-                    try:
-                        pub_date = datetime.strptime(pi.publish_date[:19], fmt[:len(pi.publish_date[:19])])
-                        break
-                    except ValueError:
-                        continue
-                
-                if pub_date and pub_date > recent_cutoff:
-                    if len(pi.images) == 0:
-                        recent_posts_without_images.append(url)
-                    if not pi.has_featured_image:
-                        posts_without_featured_images.append(url)
-            except:
-                pass
-        
-        # Check for low quality content
-        if pi.content_quality_score < 60:
-            low_quality_posts.append((url, pi.content_quality_score))
-        
-        for l in pi.internal_links:
-            all_links.add(l)
-            inbound[l].add(url)
-            links.append({"from": url, "to": l, "type": "internal"})
-        for l in pi.external_links:
-            all_links.add(l)
-            links.append({"from": url, "to": l, "type": "external"})
-        for src, alt in pi.images:
-            all_images.add(src)
-            images.append({
+            "has_og_image": "yes" if pi.has(OG_IMAGE) else "no",
+            "has_schema_markup": "yes" if pi.has(SCHEMA_MARKUP) else "no",
+        }
+
+def link_rows(data: CrawlData) -> Iterator[Dict]:
+    urls = data.urls
+    for url, pi in data.items():
+        for l in urls.urls(pi.internal_links):
+            yield {"from": url, "to": l, "type": "internal"}
+        for l in urls.urls(pi.external_links):
+            yield {"from": url, "to": l, "type": "external"}
+
+def image_rows(data: CrawlData) -> Iterator[Dict]:
+    urls = data.urls
+    for url, pi in data.items():
+        for src, alt in zip(urls.urls(pi.images), pi.image_alts):
+            yield {
                 "page": url, 
                 "src": src, 
                 "alt": alt,
                 "has_alt": "yes" if alt.strip() else "no",
                 "alt_length": len(alt)
-            })
+            }
 
-    # Check statuses
-    print("🔍 Checking link and image statuses...")
-    link_statuses = check_urls_status(all_links)
-    img_statuses = check_urls_status(all_images)
-
-    # Duplicate titles / duplicate canonicals
-    title_index = defaultdict(list)
-    canon_index = defaultdict(list)
+def is_recent(publish_date: Optional[str], cutoff: datetime) -> bool:
+    if not publish_date:
+        return False
+    for fmt in ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S%z"]:
+        try:
+            return datetime.strptime(publish_date[:19], fmt[:len(publish_date[:19])]) > cutoff
+        except (ValueError, TypeError):
+            continue
+    return False
 
-    for url, pi in data.items():
+def page_issues(url: str, pi: PageInfo, orphan: bool) -> Iterator[Dict]:
+    # Page status issues
+    if pi.status != 200:
+        yield {"url": url, "type": "page_status", "severity": "high", "detail": f"HTTP {pi.status}"}
+    
+    # SEO issues
+    if not pi.title:
+        yield {"url": url, "type": "seo", "severity": "high", "detail": "Missing <title>"}
+    elif len(pi.title) > 60:
+        yield {"url": url, "type": "seo", "severity": "medium", "detail": f"Long <title> ({len(pi.title)} chars)"}
+    elif len(pi.title) < 30:
+        yield {"url": url, "type": "seo", "severity": "medium", "detail": f"Short <title> ({len(pi.title)} chars)"}
+    
+    if not pi.meta_desc:
+        yield {"url": url, "type": "seo", "severity": "high", "detail": "Missing meta description"}
+    elif len(pi.meta_desc) > 160:
+        yield {"url": url, "type": "seo", "severity": "medium", "detail": f"Long meta description ({len(pi.meta_desc)} chars)"}
+    elif len(pi.meta_desc) < 120:
+        yield {"url": url, "type": "seo", "severity": "low", "detail": f"Short meta description ({len(pi.meta_desc)} chars)"}
+    
+    # Content quality issues
+    if pi.word_count < 300:
+        yield {"url": url, "type": "content_quality", "severity": "high", "detail": f"Very short content ({pi.word_count} words)"}
+    elif pi.word_count < 500:
+        yield {"url": url, "type": "content_quality", "severity": "medium", "detail": f"Short content ({pi.word_count} words)"}
+    
+    if pi.headings_count == 0:
+        yield {"url": url, "type": "content_structure", "severity": "medium", "detail": "No subheadings (H2-H6)"}
+    elif pi.headings_count < 2:
+        yield {"url": url, "type": "content_structure", "severity": "low", "detail": "Few subheadings (less than 2)"}
+    
+    # Image issues
+    if len(pi.images) == 0:
+        yield {"url": url, "type": "images", "severity": "high", "detail": "No images found"}
+    else:
+        images_without_alt = sum(1 for alt in pi.image_alts if not alt.strip())
+        if images_without_alt > 0:
+            yield {"url": url, "type": "accessibility", "severity": "medium", "detail": f"{images_without_alt} images missing alt text"}
+    
+    if not pi.has(FEATURED_IMAGE):
+        yield {"url": url, "type": "images", "severity": "medium", "detail": "No featured image detected"}
+    
+    # Social media optimization
+    if not pi.has(OG_IMAGE):
+        yield {"url": url, "type": "social_media", "severity": "medium", "detail": "Missing Open Graph image"}
+    if not pi.has(OG_TITLE):
+        yield {"url": url, "type": "social_media", "severity": "low", "detail": "Missing Open Graph title"}
+    if not pi.has(OG_DESCRIPTION):
+        yield {"url": url, "type": "social_media", "severity": "low", "detail": "Missing Open Graph description"}
+    
+    # Technical issues
+    if pi.has(MIXED_CONTENT):
+        yield {"url": url, "type": "security", "severity": "high", "detail": "Mixed content (HTTP assets on HTTPS page)"}
+    
+    if not pi.has(SCHEMA_MARKUP):
+        yield {"url": url, "type": "seo", "severity": "low", "detail": "No structured data (schema markup)"}
+    
+    # Content quality score
+    if pi.content_quality_score < 50:
+        yield {"url": url, "type": "content_quality", "severity": "high", "detail": f"Low content quality score ({pi.content_quality_score:.1f}/100)"}
+    elif pi.content_quality_score < 70:
+        yield {"url": url, "type": "content_quality", "severity": "medium", "detail": f"Medium content quality score ({pi.content_quality_score:.1f}/100)"}
+    
+    # Orphan risk (no internal inbound links)
+    if orphan:
+        yield {"url": url, "type": "internal_linking", "severity": "medium", "detail": "No internal inbound links (orphan risk)"}
+
+def iter_issues(data: CrawlData, start_url: str) -> Iterator[Dict]:
+    urls = data.urls
+    # Inbound link counts and "is a link / is an image" marks, indexed by URL ID
+    inbound = array("I", bytes(4 * len(urls)))
+    is_link, is_image = bytearray(len(urls)), bytearray(len(urls))
+    title_index: Dict[str, array] = {}
+    canon_index: Dict[str, array] = {}
+
+    for url_id, pi in data.pages.items():
+        for l in pi.internal_links:
+            inbound[l] += 1
+            is_link[l] = 1
+        for l in pi.external_links:
+            is_link[l] = 1
+        for src in pi.images:
+            is_image[src] = 1
         if pi.title:
-            title_index[pi.title.strip()].append(url)
+            title_index.setdefault(pi.title.strip(), array("I")).append(url_id)
         if pi.canonical:
-            canon_index[pi.canonical.strip()].append(url)
+            canon_index.setdefault(pi.canonical.strip(), array("I")).append(url_id)
 
-    # Build comprehensive issues list
-    print("📋 Analyzing content quality issues...")
-    
+    # Per-page issues; orphan risk excepts the start page
     for url, pi in data.items():
-        # Page status issues
-        if pi.status != 200:
-            issues.append({"url": url, "type": "page_status", "severity": "high", "detail": f"HTTP {pi.status}"})
-        
-        # SEO issues
-        if not pi.title:
-            issues.append({"url": url, "type": "seo", "severity": "high", "detail": "Missing <title>"})
-        elif len(pi.title) > 60:
-            issues.append({"url": url, "type": "seo", "severity": "medium", "detail": f"Long <title> ({len(pi.title)} chars)"})
-        elif len(pi.title) < 30:
-            issues.append({"url": url, "type": "seo", "severity": "medium", "detail": f"Short <title> ({len(pi.title)} chars)"})
-        
-        if not pi.meta_desc:
-            issues.append({"url": url, "type": "seo", "severity": "high", "detail": "Missing meta description"})
-        elif len(pi.meta_desc) > 160:
-            issues.append({"url": url, "type": "seo", "severity": "medium", "detail": f"Long meta description ({len(pi.meta_desc)} chars)"})
-        elif len(pi.meta_desc) < 120:
-            issues.append({"url": url, "type": "seo", "severity": "low", "detail": f"Short meta description ({len(pi.meta_desc)} chars)"})
-        
-        # Content quality issues
-        if pi.word_count < 300:
-            issues.append({"url": url, "type": "content_quality", "severity": "high", "detail": f"Very short content ({pi.word_count} words)"})
-        elif pi.word_count < 500:
-            issues.append({"url": url, "type": "content_quality", "severity": "medium", "detail": f"Short content ({pi.word_count} words)"})
-        
-        if len(pi.headings) == 0:
-            issues.append({"url": url, "type": "content_structure", "severity": "medium", "detail": "No subheadings (H2-H6)"})
-        elif len(pi.headings) < 2:
-            issues.append({"url": url, "type": "content_structure", "severity": "low", "detail": "Few subheadings (less than 2)"})
-        
-        # Image issues
-        if len(pi.images) == 0:
-            issues.append({"url": url, "type": "images", "severity": "high", "detail": "No images found"})
-        else:
-            images_without_alt = sum(1 for _, alt in pi.images if not alt.strip())
-            if images_without_alt > 0:
-                issues.append({"url": url, "type": "accessibility", "severity": "medium", "detail": f"{images_without_alt} images missing alt text"})
-        
-        if not pi.has_featured_image:
-            issues.append({"url": url, "type": "images", "severity": "medium", "detail": "No featured image detected"})
-        
-        # Social media optimization
-        if not pi.social_meta.get('og:image'):
-            issues.append({"url": url, "type": "social_media", "severity": "medium", "detail": "Missing Open Graph image"})
-        if not pi.social_meta.get('og:title'):
-            issues.append({"url": url, "type": "social_media", "severity": "low", "detail": "Missing Open Graph title"})
-        if not pi.social_meta.get('og:description'):
-            issues.append({"url": url, "type": "social_media", "severity": "low", "detail": "Missing Open Graph description"})
-        
-        # Technical issues
-        if pi.mixed_content:
-            issues.append({"url": url, "type": "security", "severity": "high", "detail": "Mixed content (HTTP assets on HTTPS page)"})
-        
-        if not pi.schema_markup:
-            issues.append({"url": url, "type": "seo", "severity": "low", "detail": "No structured data (schema markup)"})
-        
-        # Content quality score
-        if pi.content_quality_score < 50:
-            issues.append({"url": url, "type": "content_quality", "severity": "high", "detail": f"Low content quality score ({pi.content_quality_score:.1f}/100)"})
-        elif pi.content_quality_score < 70:
-            issues.append({"url": url, "type": "content_quality", "severity": "medium", "detail": f"Medium content quality score ({pi.content_quality_score:.1f}/100)"})
-        
-        # Orphan risk (no internal inbound links) → except start page
-        if url != start_url and url.startswith("http") and len(inbound.get(url, set())) == 0:
-            issues.append({"url": url, "type": "internal_linking", "severity": "medium", "detail": "No internal inbound links (orphan risk)"})
+        orphan = url != start_url and url.startswith("http") and inbound[pi.url_id] == 0
+        yield from page_issues(url, pi, orphan)
 
     # Broken links/images
-    for link, (code, final_u) in link_statuses.items():
+    print("🔍 Checking link and image statuses...")
+    link_urls = urls.urls(i for i, marked in enumerate(is_link) if marked)
+    for link, code, final_u in iter_url_statuses(link_urls):
         if code >= 400 or code == 0:
-            issues.append({"url": link, "type": "broken_link", "severity": "high", "detail": f"HTTP {code} (final: {final_u})"})
-    for img, (code, final_u) in img_statuses.items():
+            yield {"url": link, "type": "broken_link", "severity": "high", "detail": f"HTTP {code} (final: {final_u})"}
+    image_urls = urls.urls(i for i, marked in enumerate(is_image) if marked)
+    for img, code, final_u in iter_url_statuses(image_urls):
         if code >= 400 or code == 0:
-            issues.append({"url": img, "type": "broken_image", "severity": "high", "detail": f"HTTP {code} (final: {final_u})"})
+            yield {"url": img, "type": "broken_image", "severity": "high", "detail": f"HTTP {code} (final: {final_u})"}
 
     # Duplicate titles (ignore empty)
-    for title, urls in title_index.items():
-        if title and len(urls) > 1:
-            issues.append({"url": ", ".join(urls), "type": "duplicate_title", "severity": "medium", "detail": f'"{title}" appears on {len(urls)} pages'})
+    for title, ids in title_index.items():
+        if title and len(ids) > 1:
+            yield {"url": ", ".join(urls.urls(ids)), "type": "duplicate_title", "severity": "medium", "detail": f'"{title}" appears on {len(ids)} pages'}
 
     # Duplicate canonicals (conflict)
-    for can, urls in canon_index.items():
-        if can and len(urls) > 1:
-            issues.append({"url": ", ".join(urls), "type": "duplicate_canonical", "severity": "high", "detail": f'Canonical {can} used by {len(urls)} pages'})
+    for can, ids in canon_index.items():
+        if can and len(ids) > 1:
+            yield {"url": ", ".join(urls.urls(ids)), "type": "duplicate_canonical", "severity": "high", "detail": f'Canonical {can} used by {len(ids)} pages'}
+
+def tally(issues: Iterable[Dict], counts: Counter) -> Iterator[Dict]:
+    """Pass issues through while counting them for the summary."""
+    for issue in issues:
+        counts[issue["type"]] += 1
+        counts[f"severity:{issue['severity']}"] += 1
+        if issue["type"] == "images":
+            if "No images found" in issue["detail"]:
+                counts["images:none"] += 1
+            if "featured image" in issue["detail"]:
+                counts["images:no_featured"] += 1
+        if issue["type"] == "content_quality" and issue["severity"] == "high":
+            counts["content_quality:high"] += 1
+        yield issue
+
+def generate_reports(data: CrawlData, start_url: str, audit_store: Optional[AuditStore] = None):
+    # Track recent posts (last 30 days) and posts without images
+    recent_cutoff = datetime.now() - timedelta(days=30)
+    recent_posts_without_images = []
+    recent_without_images_count = 0
+
+    # Content statistics
+    total_pages = len(data)
+    pages_with_images = pages_with_featured_images = 0
+    total_words, total_quality = 0, 0.0
+    for url, pi in data.items():
+        pages_with_images += len(pi.images) > 0
+        pages_with_featured_images += pi.has(FEATURED_IMAGE)
+        total_words += pi.word_count
+        total_quality += pi.content_quality_score
+        if is_recent(pi.publish_date, recent_cutoff) and len(pi.images) == 0:
+            recent_without_images_count += 1
+            if len(recent_posts_without_images) < 10:
+                recent_posts_without_images.append(url)
+    avg_word_count = total_words / total_pages if total_pages > 0 else 0
+    avg_quality_score = total_quality / total_pages if total_pages > 0 else 0
+
+    # Check for low quality content
+    sorted_low_quality = heapq.nsmallest(
+        10, ((pi.content_quality_score, url) for url, pi in data.items() if pi.content_quality_score < 60))
 
     # Write enhanced CSVs
     print("📊 Generating comprehensive reports...")
-    write_csv("pages_detailed.csv", pages, list(pages[0].keys()) if pages else [])
-    write_csv("links.csv", links, list(links[0].keys()) if links else [])
-    write_csv("images_detailed.csv", images, list(images[0].keys()) if images else [])
-    write_csv("issues_prioritized.csv", issues, list(issues[0].keys()) if issues else [])
+    write_csv("pages_detailed.csv", page_rows(data), PAGE_FIELDS)
+    write_csv("links.csv", link_rows(data), LINK_FIELDS)
+    write_csv("images_detailed.csv", image_rows(data), IMAGE_FIELDS)
+
+    # Build comprehensive issues list
+    print("📋 Analyzing content quality issues...")
+    counts: Counter = Counter()
+    total_issues = write_csv("issues_prioritized.csv", tally(iter_issues(data, start_url), counts), ISSUE_FIELDS)
 
     # robots.txt & sitemap
     print("🔍 Checking robots.txt and sitemap...")
@@ -619,28 +775,21 @@ def generate_reports(data: Dict[str, PageInfo], start_url: str):
             continue
 
     # Enhanced analysis and summary
-    broken_links = [i for i in issues if i["type"] == "broken_link"]
-    broken_imgs = [i for i in issues if i["type"] == "broken_image"]
-    orphan_pages = [i for i in issues if i["type"] == "internal_linking"]
-    dup_titles = [i for i in issues if i["type"] == "duplicate_title"]
-    dup_canons = [i for i in issues if i["type"] == "duplicate_canonical"]
+    broken_links = counts["broken_link"]
+    broken_imgs = counts["broken_image"]
+    orphan_pages = counts["internal_linking"]
+    dup_titles = counts["duplicate_title"]
+    dup_canons = counts["duplicate_canonical"]
     
     # Content quality analysis
-    posts_without_images = [i for i in issues if i["type"] == "images" and "No images found" in i["detail"]]
-    posts_without_featured = [i for i in issues if i["type"] == "images" and "featured image" in i["detail"]]
-    low_quality_content = [i for i in issues if i["type"] == "content_quality" and i["severity"] == "high"]
-    missing_alt_text = [i for i in issues if i["type"] == "accessibility"]
+    posts_without_images = counts["images:none"]
+    posts_without_featured = counts["images:no_featured"]
+    low_quality_content = counts["content_quality:high"]
+    missing_alt_text = counts["accessibility"]
     
     # SEO issues
-    seo_issues = [i for i in issues if i["type"] == "seo"]
-    social_media_issues = [i for i in issues if i["type"] == "social_media"]
-    
-    # Content statistics
-    total_pages = len(data)
-    pages_with_images = sum(1 for _, pi in data.items() if len(pi.images) > 0)
-    pages_with_featured_images = sum(1 for _, pi in data.items() if pi.has_featured_image)
-    avg_word_count = sum(pi.word_count for _, pi in data.items()) / total_pages if total_pages > 0 else 0
-    avg_quality_score = sum(pi.content_quality_score for _, pi in data.items()) / total_pages if total_pages > 0 else 0
+    seo_issues = counts["seo"]
+    social_media_issues = counts["social_media"]
 
     # Enhanced markdown summary
     summary = []
@@ -660,9 +809,9 @@ def generate_reports(data: Dict[str, PageInfo], start_url: str):
 
     summary.append("## 🚨 Critical Issues Summary")
     
-    def line(label, seq, severity=""):
+    def line(label, count, severity=""):
         severity_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(severity, "")
-        return f"- **{label}:** {len(seq)} {severity_emoji}"
+        return f"- **{label}:** {count} {severity_emoji}"
 
     summary.append(line("Broken Links", broken_links, "high"))
     summary.append(line("Broken Images", broken_imgs, "high"))
@@ -682,23 +831,41 @@ def generate_reports(data: Dict[str, PageInfo], start_url: str):
 
     if recent_posts_without_images:
         summary.append("## 🕒 Recent Posts Without Images (Last 30 Days)")
-        for url in recent_posts_without_images[:10]:  # Show first 10
+        for url in recent_posts_without_images:  # First 10 only
             summary.append(f"- {url}")
-        if len(recent_posts_without_images) > 10:
-            summary.append(f"- ... and {len(recent_posts_without_images) - 10} more")
+        if recent_without_images_count > 10:
+            summary.append(f"- ... and {recent_without_images_count - 10} more")
         summary.append("")
 
-    if low_quality_posts:
+    if sorted_low_quality:
         summary.append("## 📉 Lowest Quality Posts")
-        sorted_low_quality = sorted(low_quality_posts, key=lambda x: x[1])[:10]
-        for url, score in sorted_low_quality:
+        for score, url in sorted_low_quality:
             summary.append(f"- {url} (Score: {score:.1f}/100)")
         summary.append("")
 
+    changes = record_audit(data, read_csv("issues_prioritized.csv"), start_url, audit_store)
+    write_csv("issues_new.csv", changes["new_issues"], ["subject", "check", "severity", "detail"])
+    summary.append("## 🔄 Changes Since Last Audit")
+    if changes["subjects_compared"]:
+        summary.append(f"- **New Issues:** {len(changes['new_issues'])}")
+        summary.append(f"- **Resolved Issues:** {len(changes['resolved_issues'])}")
+        summary.append(f"- **Unchanged Issues:** {changes['persisting']}")
+        summary.append(f"- **Newly Crawled URLs:** {len(changes['new_subjects'])}")
+        new_by_severity = sorted(changes["new_issues"], key=lambda i: {"high": 0, "medium": 1}.get(i["severity"], 2))
+        for issue in new_by_severity[:15]:
+            summary.append(f"- 🆕 {issue['subject']} — {issue['detail']} ({issue['severity']})")
+        drops = [c for c in changes["score_changes"] if c["delta"] < 0]
+        for change in drops[:10]:
+            summary.append(f"- 📉 {change['subject']} quality {change['before']:.1f} → {change['after']:.1f}")
+    else:
+        summary.append("- First recorded audit; later runs report only what changed")
+    summary.append("")
+
     summary.append("## 📁 Generated Files")
     summary.append("- `pages_detailed.csv` — Complete page analysis with quality metrics")
     summary.append("- `images_detailed.csv` — Image analysis with alt text status")
     summary.append("- `issues_prioritized.csv` — All issues with severity levels")
+    summary.append("- `issues_new.csv` — Issues that were not present in the previous audit")
     summary.append("- `links.csv` — Internal/external link mapping")
     summary.append("")
 
@@ -718,17 +885,20 @@ def generate_reports(data: Dict[str, PageInfo], start_url: str):
     print("   📊 pages_detailed.csv")
     print("   🖼️ images_detailed.csv") 
     print("   🚨 issues_prioritized.csv")
+    print("   🆕 issues_new.csv")
     print("   🔗 links.csv")
-    print(f"\n📈 Summary: {total_pages} pages analyzed, {len(issues)} issues found")
-    print(f"🎯 Priority: {len([i for i in issues if i.get('severity') == 'high'])} high-severity issues")
+    print(f"\n📈 Summary: {total_pages} pages analyzed, {total_issues} issues found")
+    if changes["subjects_compared"]:
+        print(f"🔄 Since last audit: {len(changes['new_issues'])} new, {len(changes['resolved_issues'])} resolved")
+    print(f"🎯 Priority: {counts['severity:high']} high-severity issues")
     
     # Quick stats
     if posts_without_images:
-        print(f"🖼️ Image Alert: {len(posts_without_images)} pages have no images!")
+        print(f"🖼️ Image Alert: {posts_without_images} pages have no images!")
     if posts_without_featured:
-        print(f"🎭 Featured Image Alert: {len(posts_without_featured)} pages missing featured images!")
+        print(f"🎭 Featured Image Alert: {posts_without_featured} pages missing featured images!")
     if low_quality_content:
-        print(f"📝 Content Alert: {len(low_quality_content)} pages have low content quality!")
+        print(f"📝 Content Alert: {low_quality_content} pages have low content quality!")
 
 # ---- CLI ----
 def main():
@@ -0,0 +1,89 @@
+"""
+Archived Scripts Test Suite
+===========================
+Tests for the site health audit crawler.
+"""
+
+import unittest
+import tempfile
+import os
+from unittest.mock import Mock, patch
+
+# Test imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core.audit_store import AuditStore
+
+
+class TestSiteHealthAudit(unittest.TestCase):
+    """Test cases for the compact crawl model of the site health audit."""
+    
+    PAGES = {
+        'https://example.com': '<title>Home</title><a href="/a/">a</a><a href="/b/">b</a>'
+                               '<a href="https://other.net/x">x</a><img src="/img/1.png" alt="one">',
+        'https://example.com/a/': '<title>Same</title><a href="/b/">b</a><a href="https://example.com">h</a>'
+                                  '<img src="/img/1.png" alt="">',
+        'https://example.com/b/': '<title>Same</title><a href="/a/">a</a><a href="/missing/">m</a>',
+        'https://example.com/missing/': None,
+    }
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+    
+    def tearDown(self):
+        import shutil
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _get(self, session, url):
+        html = self.PAGES.get(url)
+        if html is None:
+            return Mock(status_code=404, headers={'content-type': 'text/html'}, text='', __bool__=lambda _: False)
+        return Mock(status_code=200, headers={'content-type': 'text/html'}, text=html)
+    
+    def _status(self, session, url):
+        return (404, url) if 'missing' in url else (200, url)
+    
+    def test_crawl_interns_urls_and_reports_stream(self):
+        """Test that links are stored as interned IDs and the streamed reports match them."""
+        from master_toolkit.archived import site_health_audit as audit
+        import csv
+        
+        with patch.object(audit, 'get', side_effect=self._get):
+            data = audit.crawl('https://example.com', max_pages=10, same_domain_only=True)
+        
+        self.assertEqual(len(data), 4)
+        home = data.pages[data.urls.get('https://example.com')]
+        self.assertEqual(home.internal_links.typecode, 'I')
+        self.assertFalse(hasattr(home, '__dict__'))
+        self.assertEqual(sorted(data.urls.urls(home.internal_links)),
+                         ['https://example.com/a/', 'https://example.com/b/'])
+        page_a = data.pages[data.urls.get('https://example.com/a/')]
+        self.assertEqual(page_a.images[0], home.images[0])
+        
+        store = AuditStore(db_path=Path(self.temp_dir) / 'audits.db')
+        with patch.object(audit, 'head_or_get_status', side_effect=self._status), \
+                patch.object(audit.requests, 'get', side_effect=audit.requests.RequestException), \
+                patch('builtins.print'):
+            audit.generate_reports(data, 'https://example.com', audit_store=store)
+        
+        with open('links.csv', newline='') as f:
+            links = list(csv.DictReader(f))
+        with open('issues_prioritized.csv', newline='') as f:
+            issues = list(csv.DictReader(f))
+        self.assertEqual(len(links), 7)
+        self.assertIn({'from': 'https://example.com', 'to': 'https://other.net/x', 'type': 'external'}, links)
+        kinds = {(issue['type'], issue['url']) for issue in issues}
+        self.assertIn(('broken_link', 'https://example.com/missing/'), kinds)
+        duplicates = [set(issue['url'].split(', ')) for issue in issues if issue['type'] == 'duplicate_title']
+        self.assertEqual(duplicates, [{'https://example.com/a/', 'https://example.com/b/'}])
+        self.assertNotIn(('internal_linking', 'https://example.com/a/'), kinds)
+        self.assertIn('**Broken Links:** 1', open('comprehensive_audit_report.md').read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Audit Runs CLI
+==============
+Inspect the audit run store: recorded runs of each audit and what changed
+between them.
+
+Usage:
+    python master_toolkit/cli/audits.py runs [--audit auto_fixer] [--limit 20]
+    python master_toolkit/cli/audits.py diff auto_fixer [--run 12] [--base 9] [-o changes.json]
+    python master_toolkit/cli/audits.py prune site_health [--keep 20]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core import AuditStore
+from master_toolkit.utils import print_header, print_error, print_success
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description='Recorded audit runs and run-to-run diffs')
+    parser.add_argument('--db', help='Audit store database path')
+
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+
+    runs_parser = subparsers.add_parser('runs', help='List recorded runs, newest first')
+    runs_parser.add_argument('--audit', help='Only runs of this audit (auto_fixer, quality_audit, site_health)')
+    runs_parser.add_argument('--limit', type=int, default=20, help='Maximum runs to list')
+
+    diff_parser = subparsers.add_parser('diff', help='New/resolved issues and score changes of a run')
+    diff_parser.add_argument('audit', help='Audit name')
+    diff_parser.add_argument('--run', type=int, help='Run to inspect (default: latest)')
+    diff_parser.add_argument('--base', type=int,
+                             help="Compare with this run (default: each subject's previous evaluation)")
+    diff_parser.add_argument('--min-delta', type=float, default=0.0, help='Ignore smaller score changes')
+    diff_parser.add_argument('--output', '-o', help='Write the diff as JSON')
+
+    prune_parser = subparsers.add_parser('prune', help='Drop old runs of an audit')
+    prune_parser.add_argument('audit', help='Audit name')
+    prune_parser.add_argument('--keep', type=int, default=20, help='Newest runs to keep')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    store = AuditStore(db_path=args.db)
+
+    if args.command == 'runs':
+        print_header("Audit Runs")
+        for run in store.runs(args.audit, limit=args.limit):
+            print(f"   #{run['id']:<5} {run['audit']:<14} {run['finished_at']}  "
+                  f"{run['subject_count']} subjects, {run['issue_count']} issues")
+        return 0
+
+    if args.command == 'prune':
+        print_success(f"Removed {store.prune(args.audit, keep=args.keep)} run(s) of {args.audit}")
+        return 0
+
+    try:
+        changes = store.diff(args.audit, run_id=args.run, base_run_id=args.base,
+                             min_score_delta=args.min_delta)
+    except ValueError as e:
+        print_error(str(e))
+        return 1
+
+    print_header(f"Audit Diff: {args.audit} #{changes['run_id']}")
+    print(f"📊 {changes['subjects_compared']} subject(s) compared, "
+          f"{len(changes['new_subjects'])} evaluated for the first time")
+    print(f"🆕 New issues: {len(changes['new_issues'])}")
+    for issue in changes['new_issues'][:30]:
+        print(f"   {issue['subject']}  {issue['check']}" + (f"  ({issue['detail']})" if issue['detail'] else ''))
+    print(f"✅ Resolved issues: {len(changes['resolved_issues'])}")
+    for issue in changes['resolved_issues'][:30]:
+        print(f"   {issue['subject']}  {issue['check']}")
+    print(f"⏸️ Unchanged issues: {changes['persisting']}")
+    print(f"📈 Score changes: {len(changes['score_changes'])}")
+    for change in changes['score_changes'][:30]:
+        print(f"   {change['subject']}  {change['before']:g} → {change['after']:g} ({change['delta']:+g})")
+    print(f"⚠️ Regressed: {len(changes['regressed_subjects'])}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(changes, f, indent=2)
+        print_success(f"Diff saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Homepage Fragment CLI
+=====================
+Render the homepage category carousel and latest-posts grid from batched
+post/media data and publish them only when the composed HTML changed.
+Cheap enough to run from cron every few minutes.
+
+Usage:
+    python master_toolkit/cli/homepage.py [--page-id 2412] [--grid-size 12]
+    python master_toolkit/cli/homepage.py --dry-run [--output homepage.html]
+    python master_toolkit/cli/homepage.py --force
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core import create_client, WordPressAPIError
+from master_toolkit.content.homepage import HomepageBuilder, HOME_PAGE_ID
+from master_toolkit.utils import print_header, print_error, print_success, print_info
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description='Publish homepage carousel/grid fragments on change')
+    parser.add_argument('--username', '-u', help='WordPress username')
+    parser.add_argument('--password', '-p', help='WordPress application password')
+    parser.add_argument('--page-id', type=int, default=HOME_PAGE_ID, help='Homepage page ID')
+    parser.add_argument('--grid-size', type=int, default=12, help='Latest posts in the grid')
+    parser.add_argument('--state-file', default='.homepage_state.json',
+                        help='Fragment hashes of the last publish')
+    parser.add_argument('--force', action='store_true',
+                        help='Compare against the live page even if the state file matches')
+    parser.add_argument('--dry-run', action='store_true', help='Compose but do not write')
+    parser.add_argument('--output', '-o', help='Also save the composed page content here')
+
+    args = parser.parse_args()
+
+    try:
+        client = create_client(args.username, args.password)
+    except WordPressAPIError as e:
+        print_error(f"WordPress API error: {e}")
+        return 1
+
+    print_header("Homepage Fragments")
+    builder = HomepageBuilder(client, page_id=args.page_id, grid_size=args.grid_size,
+                              state_file=args.state_file)
+    try:
+        result = builder.publish(force=args.force or bool(args.output), dry_run=args.dry_run)
+    except WordPressAPIError as e:
+        print_error(f"WordPress API error: {e}")
+        return 1
+
+    for name, digest in result['hashes'].items():
+        marker = '✏️ ' if name in result['changed'] else '  '
+        print(f"   {marker} {name}: {digest[:12]}")
+
+    if args.output and result['content'] is not None:
+        with open(args.output, 'w') as f:
+            f.write(result['content'])
+        print_success(f"Composed content saved to {args.output}")
+
+    if result['status'] == 'updated':
+        print_success(f"Homepage {args.page_id} updated ({', '.join(result['changed']) or 'layout'})")
+    elif result['status'] == 'dry_run':
+        print_info(f"Dry run: homepage {args.page_id} would change ({', '.join(result['changed'])})")
+    else:
+        print_info("Homepage unchanged, nothing published")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
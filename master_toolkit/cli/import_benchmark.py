@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark
+======================
+Measures fresh-interpreter startup plus the imports each CLI command needs,
+against the old behaviour of eagerly importing every toolkit subpackage.
+
+Usage:
+    python master_toolkit/cli/import_benchmark.py [--runs 7]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+
+# Statement executed in a fresh interpreter for each scenario
+SCENARIOS = {
+    'interpreter': 'pass',
+    'package': 'import master_toolkit',
+    'validate': 'from master_toolkit.validation import ComprehensiveValidator',
+    'publish': 'from master_toolkit.content import ContentPublisher',
+    'optimize': 'from master_toolkit.optimization import SEOOptimizer',
+    'eager (all subpackages)': (
+        'import master_toolkit as m\n'
+        'for name in m.__all__: getattr(m, name)\n'
+        'import master_toolkit.validation as v\n'
+        'for name in v.__all__: getattr(v, name)\n'
+        'import master_toolkit.optimization as o\n'
+        'for name in o.__all__: getattr(o, name)'
+    )
+}
+
+
+def time_statement(statement: str, runs: int) -> float:
+    """Median wall time in milliseconds of running a statement in a new interpreter."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', statement],
+            cwd=str(project_root),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode(errors='replace').strip().splitlines()[-1])
+        samples.append(elapsed)
+    return statistics.median(samples)
+
+
+def main():
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description='Measure CLI startup/import time')
+    parser.add_argument('--runs', type=int, default=7, help='Runs per scenario (median is reported)')
+    args = parser.parse_args()
+
+    print("⏱️  Startup time (median of {} runs)".format(args.runs))
+    print("=" * 50)
+
+    timings = {}
+    for name, statement in SCENARIOS.items():
+        try:
+            timings[name] = time_statement(statement, args.runs)
+            print(f"  {name:<25} {timings[name]:8.1f} ms")
+        except RuntimeError as e:
+            print(f"  {name:<25} ❌ {e}")
+
+    eager = timings.get('eager (all subpackages)')
+    if eager:
+        print("-" * 50)
+        for name in ('validate', 'publish', 'optimize'):
+            if name in timings:
+                print(f"  {name:<25} {timings[name] / eager * 100:7.1f}% of eager import")
+
+
+if __name__ == '__main__':
+    main()
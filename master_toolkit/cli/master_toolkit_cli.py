@@ -13,6 +13,13 @@ Commands:
     seo-enhance    - Run SEO and content quality enhancements
     validate       - Run comprehensive site validation
     publish        - Publish content using master toolkit
+    media-index    - Sync the media hash index / report duplicate media
+    mirror         - Sync / inspect the local SQLite site mirror
+    rewrite-urls   - Rewrite old URLs across all posts and pages (dry run by default)
+    sitemap        - Build sharded gzip sitemaps, rewriting only changed shards
+    homepage       - Rebuild the homepage carousel/grid, publishing only on change
+    audits         - List recorded audit runs / diff a run against earlier ones
+    bench-startup  - Measure interpreter + import startup time per command
     
     help           - Show this help message
     list           - List all available tools
@@ -22,20 +29,28 @@ Examples:
     python master_toolkit_cli.py set-images
     python master_toolkit_cli.py seo-enhance
     python master_toolkit_cli.py validate --comprehensive
+    python master_toolkit_cli.py media-index duplicates -o duplicates.json
+    python master_toolkit_cli.py mirror sync
+    python master_toolkit_cli.py rewrite-urls --map redirects.csv --apply
+    python master_toolkit_cli.py sitemap --output-dir public/sitemaps
+    python master_toolkit_cli.py homepage --dry-run
+    python master_toolkit_cli.py audits diff auto_fixer
+    python master_toolkit_cli.py --isolated publish batch published_content/
 """
 
 import sys
 import os
+import runpy
 import subprocess
 from pathlib import Path
 
-# Add master_toolkit to Python path
-toolkit_path = Path(__file__).parent / 'master_toolkit'
-sys.path.insert(0, str(toolkit_path))
+# Add the project root to Python path so command modules import in-process
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
 
 class MasterToolkitCLI:
     def __init__(self):
-        self.toolkit_dir = Path(__file__).parent / 'master_toolkit'
+        self.toolkit_dir = project_root / 'master_toolkit'
         self.commands = {
             'verify': {
                 'script': 'cli/verify_fixes.py',
@@ -56,6 +71,34 @@ class MasterToolkitCLI:
             'publish': {
                 'script': 'cli/publish.py',
                 'description': 'Publish content using master toolkit'
+            },
+            'media-index': {
+                'script': 'cli/media_index.py',
+                'description': 'Sync the media hash index / report duplicate media'
+            },
+            'mirror': {
+                'script': 'cli/mirror.py',
+                'description': 'Sync / inspect the local SQLite site mirror'
+            },
+            'rewrite-urls': {
+                'script': 'cli/rewrite_urls.py',
+                'description': 'Rewrite old URLs across all posts and pages (dry run by default)'
+            },
+            'sitemap': {
+                'script': 'cli/sitemap.py',
+                'description': 'Build sharded gzip sitemaps, rewriting only changed shards'
+            },
+            'homepage': {
+                'script': 'cli/homepage.py',
+                'description': 'Rebuild the homepage carousel/grid, publishing only on change'
+            },
+            'audits': {
+                'script': 'cli/audits.py',
+                'description': 'List recorded audit runs / diff a run against earlier ones'
+            },
+            'bench-startup': {
+                'script': 'cli/import_benchmark.py',
+                'description': 'Measure interpreter + import startup time per command'
             }
         }
     
@@ -79,8 +122,16 @@ class MasterToolkitCLI:
         print(f"  master_toolkit/examples/   - Example scripts")
         print(f"  master_toolkit/archived/   - One-time use scripts")
         
-    def run_command(self, command, args=None):
-        """Execute a master toolkit command"""
+    def _module_name(self, script: str) -> str:
+        """Convert a toolkit-relative script path to its module name."""
+        return 'master_toolkit.' + script[:-len('.py')].replace('/', '.')
+    
+    def run_command(self, command, args=None, isolated=False):
+        """
+        Execute a master toolkit command.
+        Runs in-process by default so only the command's own imports are
+        loaded; isolated=True spawns a fresh interpreter instead.
+        """
         if command not in self.commands:
             print(f"❌ Unknown command: {command}")
             print(f"💡 Use 'list' to see available commands")
@@ -96,13 +147,32 @@ class MasterToolkitCLI:
         print(f"📝 Script: {script_path}")
         print("-" * 50)
         
+        if isolated:
+            return self._run_subprocess(script_path, args)
+        
+        module_name = self._module_name(self.commands[command]['script'])
+        saved_argv = sys.argv
+        sys.argv = [str(script_path)] + list(args or [])
+        
+        try:
+            runpy.run_module(module_name, run_name='__main__', alter_sys=True)
+            return True
+        except SystemExit as e:
+            return e.code in (None, 0)
+        except Exception as e:
+            print(f"❌ Error running command: {e}")
+            return False
+        finally:
+            sys.argv = saved_argv
+    
+    def _run_subprocess(self, script_path, args=None):
+        """Run a command script in a fresh interpreter."""
         try:
-            # Run the script
             cmd = [sys.executable, str(script_path)]
             if args:
                 cmd.extend(args)
                 
-            result = subprocess.run(cmd, cwd=str(self.toolkit_dir.parent))
+            result = subprocess.run(cmd, cwd=str(project_root))
             return result.returncode == 0
             
         except Exception as e:
@@ -115,15 +185,24 @@ class MasterToolkitCLI:
             self.show_help()
             return
         
-        command = sys.argv[1].lower()
-        args = sys.argv[2:] if len(sys.argv) > 2 else None
+        argv = sys.argv[1:]
+        isolated = '--isolated' in argv[:1]
+        if isolated:
+            argv = argv[1:]
+        if not argv:
+            self.show_help()
+            return
+        
+        command = argv[0].lower()
+        args = argv[1:] or None
         
         if command in ['help', '-h', '--help']:
             self.show_help()
         elif command in ['list', 'ls']:
             self.list_commands()
         elif command in self.commands:
-            self.run_command(command, args)
+            if not self.run_command(command, args, isolated=isolated):
+                sys.exit(1)
         else:
             print(f"❌ Unknown command: {command}")
             print(f"💡 Use 'help' for usage information")
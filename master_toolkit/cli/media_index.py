@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Media Index CLI
+===============
+Build/sync the content-addressed media index and report byte-identical
+and visually near-identical duplicates in the media library.
+
+Usage:
+    python master_toolkit/cli/media_index.py sync [--full]
+    python master_toolkit/cli/media_index.py duplicates [--output report.json]
+    python master_toolkit/cli/media_index.py near-duplicates [--distance 10] [--output report.json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core import create_client, WordPressAPIError, MediaIndex
+from master_toolkit.utils import print_header, print_error, print_success, print_warning
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description='Content-addressed media library index')
+    parser.add_argument('--username', '-u', help='WordPress username')
+    parser.add_argument('--password', '-p', help='WordPress application password')
+    parser.add_argument('--db', help='Index database path')
+
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+
+    sync_parser = subparsers.add_parser('sync', help='Hash new/changed media into the index')
+    sync_parser.add_argument('--full', action='store_true',
+                             help='Re-list the whole library and prune deleted media')
+
+    dup_parser = subparsers.add_parser('duplicates', help='Report byte-identical media')
+    dup_parser.add_argument('--output', '-o', help='Write the full report as JSON')
+
+    near_parser = subparsers.add_parser('near-duplicates',
+                                        help='Report visually identical media (perceptual hashes)')
+    near_parser.add_argument('--distance', type=int, default=10,
+                             help='Max Hamming distance (of 64 bits) to count as the same image')
+    near_parser.add_argument('--output', '-o', help='Write the full report as JSON')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    if args.command == 'near-duplicates':
+        return report_near_duplicates(args)
+
+    index = MediaIndex(db_path=args.db)
+
+    if args.command == 'sync':
+        try:
+            index.wp = create_client(args.username, args.password)
+            result = index.sync(full=args.full)
+        except WordPressAPIError as e:
+            print_error(f"WordPress API error: {e}")
+            return 1
+
+        print_header("Media Index Sync")
+        print(f"📚 Media listed: {result['listed']}")
+        print(f"🔑 Files hashed: {result['hashed']}")
+        print(f"🗑️ Pruned: {result['pruned']}")
+        print(f"📊 Indexed total: {result['indexed_total']}")
+        for error in result['errors']:
+            print_warning(f"Media {error['media_id']}: {error['error']}")
+        return 0 if not result['errors'] else 1
+
+    report = index.duplicates_report()
+    print_header("Duplicate Media Report")
+    print(f"📊 Indexed media: {report['indexed_media']}")
+    print(f"🔁 Duplicate groups: {report['duplicate_groups']}")
+    print(f"🗂️ Redundant copies: {report['redundant_media']}")
+    print(f"💾 Reclaimable: {report['reclaimable_bytes'] / 1024 / 1024:.1f} MB")
+    for group in report['groups'][:20]:
+        print(f"   keep {group['keep_media_id']} ← duplicates {group['duplicate_media_ids']} "
+              f"({group['reclaimable_bytes'] / 1024:.0f} KB)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print_success(f"Report saved to {args.output}")
+
+    return 0
+
+
+def report_near_duplicates(args):
+    """Cluster perceptually similar media and print the report."""
+    from master_toolkit.validation.image_similarity import NearDuplicateImageFinder
+
+    try:
+        finder = NearDuplicateImageFinder(create_client(args.username, args.password))
+        report = finder.find_near_duplicates(max_distance=args.distance)
+    except WordPressAPIError as e:
+        print_error(f"WordPress API error: {e}")
+        return 1
+
+    print_header("Near-Duplicate Media Report")
+    print(f"📊 Media scanned: {report['media_scanned']} "
+          f"({report['hashed']} hashed, {report['cache_hits']} cached)")
+    print(f"🔁 Clusters: {len(report['clusters'])}")
+    print(f"🗂️ Media in clusters: {report['near_duplicate_media']}")
+    for cluster in report['clusters'][:20]:
+        posts = sorted({pid for m in cluster['media'] for pid in m['featured_in_posts']})
+        print(f"   media {cluster['media_ids']} (distance ≤ {cluster['max_distance']})"
+              + (f" featured in posts {posts}" if posts else ""))
+    for error in report['errors']:
+        print_warning(f"Media {error['key']}: {error['error']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print_success(f"Report saved to {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
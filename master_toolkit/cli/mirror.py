@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Site Mirror CLI
+===============
+Sync the local SQLite mirror of the WordPress site, inspect its state and
+run full-text audit queries against it.
+
+Usage:
+    python master_toolkit/cli/mirror.py sync [--full] [--only posts pages]
+    python master_toolkit/cli/mirror.py status
+    python master_toolkit/cli/mirror.py search "cloud AND security" [--type post]
+    python master_toolkit/cli/mirror.py search --mentions "coming soon"
+    python master_toolkit/cli/mirror.py search --links-to https://example.com/old-slug/
+    python master_toolkit/cli/mirror.py search --placeholders | --inline-scripts
+    python master_toolkit/cli/mirror.py links [--top 20] [--htaccess redirect_rules.htaccess] [-o graph.json]
+    python master_toolkit/cli/mirror.py resolve https://example.com/old-slug/ [...] [--candidates 3]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core import create_client, WordPressAPIError
+from master_toolkit.mirror import SiteMirror, ContentSearch, LinkGraph, UrlResolver
+from master_toolkit.mirror.store import COLLECTIONS
+from master_toolkit.utils import print_header, print_error, print_success, print_warning
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description='Local SQLite mirror of the WordPress site')
+    parser.add_argument('--username', '-u', help='WordPress username')
+    parser.add_argument('--password', '-p', help='WordPress application password')
+    parser.add_argument('--db', help='Mirror database path')
+
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+
+    sync_parser = subparsers.add_parser('sync', help='Fetch changes since the last sync')
+    sync_parser.add_argument('--full', action='store_true',
+                             help='Refetch every item instead of only modified ones')
+    sync_parser.add_argument('--only', nargs='+', choices=list(COLLECTIONS),
+                             help='Sync only these collections')
+
+    subparsers.add_parser('status', help='Show per-collection sync state')
+
+    search_parser = subparsers.add_parser('search', help='Full-text search over mirrored posts and pages')
+    search_parser.add_argument('query', nargs='?',
+                               help='FTS5 query (phrases, AND/OR/NOT, prefix*, title:term)')
+    mode = search_parser.add_mutually_exclusive_group()
+    mode.add_argument('--mentions', metavar='TEXT', help='Posts containing a literal phrase')
+    mode.add_argument('--links-to', metavar='URL', help='Posts linking to a URL')
+    mode.add_argument('--placeholders', action='store_true',
+                      help='Posts with placeholder/redirect text')
+    mode.add_argument('--inline-scripts', action='store_true',
+                      help='Posts embedding inline <script> code')
+    search_parser.add_argument('--type', choices=['post', 'page'], help='Restrict to one post type')
+    search_parser.add_argument('--limit', type=int, default=50, help='Maximum hits to return')
+    search_parser.add_argument('--rebuild', action='store_true', help='Re-index the mirror first')
+    search_parser.add_argument('--output', '-o', help='Write hits as JSON')
+
+    links_parser = subparsers.add_parser('links', help='Internal link graph report')
+    links_parser.add_argument('--top', type=int, default=20, help='How many central pages to list')
+    links_parser.add_argument('--htaccess', help='Include "Redirect 301" rules from an .htaccess file')
+    links_parser.add_argument('--output', '-o', help='Write the full report as JSON')
+
+    resolve_parser = subparsers.add_parser('resolve', help='Map broken URLs to the most likely live post')
+    resolve_parser.add_argument('urls', nargs='*', help='Broken URLs (default: every unresolved internal link)')
+    resolve_parser.add_argument('--candidates', type=int, default=1, help='Candidates to show per URL')
+    resolve_parser.add_argument('--min-confidence', type=float, default=0.45,
+                                help='Below this the best candidate is reported as unresolved')
+    resolve_parser.add_argument('--output', '-o', help='Write the mapping as JSON')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    mirror = SiteMirror(db_path=args.db)
+
+    if args.command == 'search':
+        return run_search(mirror, args)
+
+    if args.command == 'links':
+        return report_links(mirror, args)
+
+    if args.command == 'resolve':
+        return resolve_urls(mirror, args)
+
+    if args.command == 'sync':
+        try:
+            client = create_client(args.username, args.password)
+        except WordPressAPIError as e:
+            print_error(f"WordPress API error: {e}")
+            return 1
+
+        print_header("Site Mirror Sync")
+        result = mirror.sync(client, full=args.full, collections=args.only)
+        failed = False
+        for name in args.only or COLLECTIONS:
+            outcome = result[name]
+            if 'error' in outcome:
+                print_error(f"{name}: {outcome['error']}")
+                failed = True
+            elif 'skipped' in outcome:
+                print_warning(f"{name}: {outcome['skipped']}")
+            else:
+                pruned = f", {outcome['pruned']} pruned" if 'pruned' in outcome else ''
+                print(f"   {name:<12} {outcome['fetched']} fetched{pruned}, {outcome['total']} total")
+        print(f"⏱️ {result['duration_seconds']}s")
+        if not failed:
+            print_success(f"Mirror up to date: {mirror.db_path}")
+        return 1 if failed else 0
+
+    print_header("Site Mirror Status")
+    print(f"📁 {mirror.db_path}")
+    for name, state in mirror.status().items():
+        if state is None:
+            print(f"   {name:<12} never synced")
+        elif not state['available']:
+            print(f"   {name:<12} not available on this site")
+        else:
+            print(f"   {name:<12} {state['item_count']} items, synced {state['synced_at']}"
+                  + (f", cursor {state['cursor']}" if state['cursor'] else ''))
+    return 0
+
+
+def run_search(mirror, args):
+    """Run one search subcommand query and print the hits."""
+    search = ContentSearch(mirror)
+    if args.rebuild:
+        print_success(f"Re-indexed {search.rebuild()} posts")
+
+    options = {'post_type': args.type, 'limit': args.limit}
+    try:
+        if args.mentions:
+            label, hits = f'mentioning "{args.mentions}"', search.mentions(args.mentions, **options)
+        elif args.links_to:
+            label, hits = f'linking to {args.links_to}', search.linking_to(args.links_to, **options)
+        elif args.placeholders:
+            label, hits = 'with placeholder text', search.find_placeholders(**options)
+        elif args.inline_scripts:
+            label, hits = 'with inline scripts', search.with_inline_scripts(post_type=args.type)
+        elif args.query:
+            label, hits = f'matching {args.query}', search.search(args.query, **options)
+        else:
+            print_error("Give a query or one of --mentions/--links-to/--placeholders/--inline-scripts")
+            return 1
+    except ValueError as e:
+        print_error(str(e))
+        return 1
+
+    print_header("Site Mirror Search")
+    print(f"🔎 {len(hits)} item(s) {label}")
+    for hit in hits:
+        print(f"   [{hit['type']} {hit['id']}] {hit['title']}")
+        if hit.get('snippet'):
+            print(f"      {hit['snippet']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(hits, f, indent=2)
+        print_success(f"Hits saved to {args.output}")
+    return 0
+
+
+def report_links(mirror, args):
+    """Build the link graph and print orphans, dead ends, redirect chains and top pages."""
+    redirects = {}
+    if args.htaccess:
+        with open(args.htaccess) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 4 and parts[0] == 'Redirect':
+                    redirects[parts[2]] = parts[3]
+
+    report = LinkGraph(mirror, redirects=redirects).report(top=args.top)
+
+    print_header("Internal Link Graph")
+    print(f"🕸️ {report['content_nodes']} posts/pages, {report['links']} internal links, "
+          f"{report['redirects']} redirects")
+
+    print(f"\n🏝️ Orphans (no inbound content or menu links): {len(report['orphans'])}")
+    for node in report['orphans'][:20]:
+        print(f"   [{node['post_id']}] {node['title']}")
+
+    print(f"\n🚧 Dead ends (no internal outbound links): {len(report['dead_ends'])}")
+    for node in report['dead_ends'][:20]:
+        print(f"   [{node['post_id']}] {node['title']}")
+
+    print(f"\n↪️ Linked redirects: {len(report['redirect_chains'])}")
+    for chain in report['redirect_chains'][:20]:
+        end = 'LOOP' if chain['loop'] else chain['final_url']
+        print(f"   {chain['url']} → {end} ({chain['hops']} hop(s)), linked from {chain['linked_from']}")
+
+    print(f"\n❓ Unresolved internal links: {len(report['unresolved_links'])}")
+    for node in report['unresolved_links'][:20]:
+        print(f"   {node['url']} linked from {node['linked_from']}")
+
+    print(f"\n⭐ Most central pages:")
+    for node in report['top_pages']:
+        print(f"   {node['score']:.4f}  [{node['post_id']}] {node['title']} "
+              f"(in {node['inbound']}, out {node['outbound']})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print_success(f"Report saved to {args.output}")
+    return 0
+
+
+def resolve_urls(mirror, args):
+    """Print the best live target for each broken URL."""
+    resolver = UrlResolver.from_mirror(mirror)
+    urls = args.urls or [f"https://{node['url']}" for node in LinkGraph(mirror).unresolved_links()]
+
+    print_header("Broken URL Resolution")
+    print(f"🔗 {len(urls)} URL(s) against {len(resolver)} live posts/pages")
+    mapping = {}
+    for url in urls:
+        match = resolver.resolve(url, min_confidence=args.min_confidence)
+        mapping[url] = match
+        if match:
+            print(f"   ✅ {url} → {match['url']} ({match['confidence']:.2f})")
+        else:
+            print_warning(f"{url}: no confident match")
+        if args.candidates > 1:
+            for candidate in resolver.candidates(url, limit=args.candidates):
+                print(f"        {candidate['confidence']:.2f}  {candidate['url']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(mapping, f, indent=2)
+        print_success(f"Mapping saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
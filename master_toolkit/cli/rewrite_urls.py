@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Bulk URL Rewrite CLI
+====================
+Rewrite old -> new URLs in the href/src attributes of every post and page.
+Runs as a dry run (summary plus unified diff) unless --apply is given.
+
+Usage:
+    python master_toolkit/cli/rewrite_urls.py --map redirects.csv [--map more.json]
+    python master_toolkit/cli/rewrite_urls.py --htaccess redirect_rules.htaccess --diff-file rewrite.diff
+    python master_toolkit/cli/rewrite_urls.py --prefix /2019/=/archive/2019/ --domain old.example.com=example.com
+    python master_toolkit/cli/rewrite_urls.py --map redirects.csv --types posts --apply [--workers 4]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core import create_client, WordPressAPIError
+from master_toolkit.utils import print_header, print_error, print_success, print_warning
+from master_toolkit.utils.url_rewriter import UrlRewriter, BulkUrlRewrite
+
+
+def _pair(value: str):
+    """OLD=NEW argument."""
+    old, sep, new = value.partition('=')
+    if not sep or not old or not new:
+        raise argparse.ArgumentTypeError(f"expected OLD=NEW, got {value!r}")
+    return old, new
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description='Rewrite old URLs across all posts and pages')
+    parser.add_argument('--username', '-u', help='WordPress username')
+    parser.add_argument('--password', '-p', help='WordPress application password')
+    parser.add_argument('--map', action='append', default=[], metavar='FILE',
+                        help='Exact old -> new mappings (JSON object or old,new CSV); repeatable')
+    parser.add_argument('--htaccess', action='append', default=[], metavar='FILE',
+                        help='Load "Redirect 301" lines as prefix rules; repeatable')
+    parser.add_argument('--prefix', action='append', default=[], type=_pair, metavar='OLD=NEW',
+                        help='Rewrite every URL under a path prefix; repeatable')
+    parser.add_argument('--domain', action='append', default=[], type=_pair, metavar='OLD=NEW',
+                        help='Move every URL on one host to another; repeatable')
+    parser.add_argument('--types', nargs='+', choices=list(BulkUrlRewrite.COLLECTIONS),
+                        default=list(BulkUrlRewrite.COLLECTIONS), help='Collections to rewrite')
+    parser.add_argument('--apply', action='store_true', help='Write the changes (default: dry run)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent writes with --apply')
+    parser.add_argument('--diff-file', help='Write the full unified diff here instead of printing it')
+
+    args = parser.parse_args()
+
+    rewriter = UrlRewriter()
+    try:
+        for path in args.map:
+            print(f"📄 {path}: {rewriter.load(path)} exact rule(s)")
+        for path in args.htaccess:
+            print(f"📄 {path}: {rewriter.load_htaccess(path)} prefix rule(s)")
+        for old, new in args.prefix:
+            rewriter.add_prefix(old, new)
+        for old, new in args.domain:
+            rewriter.add_domain(old, new)
+    except (OSError, ValueError) as e:
+        print_error(f"Could not load rules: {e}")
+        return 1
+
+    if not len(rewriter):
+        print_error("No rules given; use --map, --htaccess, --prefix or --domain")
+        return 1
+
+    try:
+        client = create_client(args.username, args.password)
+    except WordPressAPIError as e:
+        print_error(f"WordPress API error: {e}")
+        return 1
+
+    print_header("Bulk URL Rewrite" + ("" if args.apply else " (dry run)"))
+    print(f"🔀 {len(rewriter.exact)} exact, {len(rewriter.prefixes)} prefix, "
+          f"{len(rewriter.domains)} domain rule(s)")
+
+    bulk = BulkUrlRewrite(client, rewriter)
+    try:
+        plan = bulk.plan(args.types)
+    except WordPressAPIError as e:
+        print_error(f"WordPress API error: {e}")
+        return 1
+
+    scanned = ', '.join(f"{count} {name}" for name, count in plan['scanned'].items())
+    print(f"🔎 Scanned {scanned}: {len(plan['items'])} item(s) to change, {plan['url_changes']} URL(s)")
+    for item in plan['items']:
+        print(f"   [{item['type']} {item['id']}] {item['title']} ({len(item['changes'])} URL(s))")
+
+    diff = ''.join(item['diff'] for item in plan['items'])
+    if args.diff_file:
+        with open(args.diff_file, 'w') as f:
+            f.write(diff)
+        print_success(f"Diff saved to {args.diff_file}")
+    elif diff:
+        print()
+        print(diff)
+
+    if not args.apply or not plan['items']:
+        return 0
+
+    results = bulk.apply(plan, max_workers=args.workers)
+    for item in results['conflicts']:
+        print_warning(f"[{item['type']} {item['id']}] edited since the scan, skipped: {item['error']}")
+    for item in results['failed']:
+        print_error(f"[{item['type']} {item['id']}] {item['error']}")
+    print_success(f"Updated {len(results['updated'])} item(s)")
+    return 1 if results['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
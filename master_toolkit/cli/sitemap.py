@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Sitemap Build CLI
+=================
+Generate sharded, gzip-compressed XML sitemaps of all published posts,
+pages and category archives, plus a sitemap index. Later runs rewrite only
+the shards whose URLs or lastmod values changed.
+
+Usage:
+    python master_toolkit/cli/sitemap.py [--output-dir sitemaps] [--public-url https://example.com/sitemaps]
+    python master_toolkit/cli/sitemap.py --types post page
+    python master_toolkit/cli/sitemap.py --force
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core import create_client, WordPressAPIError
+from master_toolkit.content.sitemap import SitemapBuilder, TYPES, MAX_URLS
+from master_toolkit.utils import print_header, print_error, print_success
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description='Build sharded gzip sitemaps incrementally')
+    parser.add_argument('--username', '-u', help='WordPress username')
+    parser.add_argument('--password', '-p', help='WordPress application password')
+    parser.add_argument('--output-dir', '-o', default='sitemaps', help='Directory for shards and index')
+    parser.add_argument('--public-url', help='URL the output directory is served under (default: site URL)')
+    parser.add_argument('--types', nargs='+', choices=list(TYPES), default=list(TYPES),
+                        help='Sitemap types to build')
+    parser.add_argument('--max-urls', type=int, default=MAX_URLS, help='URLs per shard')
+    parser.add_argument('--force', action='store_true', help='Rewrite every shard and the index')
+
+    args = parser.parse_args()
+
+    try:
+        client = create_client(args.username, args.password)
+    except WordPressAPIError as e:
+        print_error(f"WordPress API error: {e}")
+        return 1
+
+    print_header("Sitemap Build")
+    builder = SitemapBuilder(client, args.output_dir, public_url=args.public_url,
+                             types=args.types, max_urls=args.max_urls)
+    try:
+        results = builder.build(force=args.force)
+    except WordPressAPIError as e:
+        print_error(f"WordPress API error: {e}")
+        return 1
+
+    print(f"🗺️  {results['urls']} URL(s) in {results['shards']} shard(s)")
+    for name in results['written']:
+        print(f"   ✏️  {name}")
+    print(f"   {len(results['unchanged'])} shard(s) unchanged")
+    for name in results['removed']:
+        print(f"   🗑️  {name}")
+    print_success(f"Index {'written' if results['index_written'] else 'unchanged'}: {results['index']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,10 +4,16 @@ Content Module
 WordPress content publishing, validation, and management.
 """
 
-from .publisher import ContentPublisher
-from .workflow import ContentWorkflow
+from .._lazy import lazy_exports
 
-__all__ = [
-    'ContentPublisher',
-    'ContentWorkflow'
-]
\ No newline at end of file
+# Imported on first access: the workflow pulls in the validators, which a
+# plain publish does not need.
+_LAZY_IMPORTS = {
+    'ContentPublisher': '.publisher',
+    'ContentWorkflow': '.workflow',
+    'SitemapBuilder': '.sitemap',
+    'HomepageBuilder': '.homepage',
+    'MarkdownRenderer': '.renderer'
+}
+
+lazy_exports(globals(), _LAZY_IMPORTS)
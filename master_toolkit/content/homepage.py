@@ -0,0 +1,260 @@
+"""
+Homepage Fragment Builder
+=========================
+Renders the homepage category carousel and latest-posts grid from batched
+REST data and publishes them only when they changed.
+
+One run costs three listings: the categories, the latest posts, and every
+cover and featured image in a single include= request. Each fragment is
+rendered deterministically and hashed. The hashes of the last publish are
+kept in a small state file, so an unchanged homepage costs no page request
+at all. Otherwise the page is loaded once, the fragments are spliced into
+their marked regions and the page is written in one request, and only if
+the composed HTML actually differs.
+
+Fragments live in Custom HTML blocks delimited by markers:
+
+    <!-- mt-fragment:carousel 3f2a9c... -->
+    ...
+    <!-- /mt-fragment:carousel -->
+
+Content outside the markers is left alone. A fragment that has no region
+on the page yet is inserted at the top, in FRAGMENTS order.
+"""
+
+import hashlib
+import json
+import re
+from html import escape, unescape
+from pathlib import Path
+from typing import Dict, Any
+
+from ..core import WordPressClient, EditSession, metrics
+
+
+HOME_PAGE_ID = 2412
+
+# Category ID -> cover image media ID (the carousel set used by the ui/ scripts)
+CATEGORY_MEDIA = {
+    3: 2744, 190: 2746, 188: 2741, 167: 2743, 5: 2745,
+    6: 2748, 7: 2749, 213: 2750, 165: 2742, 177: 2747
+}
+
+FRAGMENTS = ('carousel', 'grid')
+
+REGION_RE = re.compile(r'<!-- mt-fragment:(\w+) [0-9a-f]* -->.*?<!-- /mt-fragment:\1 -->', re.DOTALL)
+
+CAROUSEL_STYLE = """<style>
+.category-carousel-container{width:100%;max-width:1200px;margin:40px auto;padding:20px;overflow:hidden}
+.category-carousel{display:flex;gap:20px;width:fit-content;animation:mt-scroll 30s linear infinite}
+.category-carousel:hover{animation-play-state:paused}
+.category-card{position:relative;min-width:280px;height:200px;border-radius:12px;overflow:hidden;box-shadow:0 4px 12px rgba(0,0,0,.15)}
+.category-card img{width:100%;height:100%;object-fit:cover}
+.category-overlay{position:absolute;bottom:0;left:0;right:0;padding:20px;color:#fff;background:linear-gradient(to top,rgba(0,0,0,.8),transparent)}
+.category-name{font-size:20px;font-weight:bold;margin:0}
+@keyframes mt-scroll{0%{transform:translateX(0)}100%{transform:translateX(-50%)}}
+@media (max-width:768px){.category-card{min-width:220px;height:160px}}
+</style>"""
+
+GRID_STYLE = """<style>
+.home-post-grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(280px,1fr));gap:24px;max-width:1200px;margin:40px auto;padding:0 20px}
+.home-post-card{border-radius:12px;overflow:hidden;box-shadow:0 2px 10px rgba(0,0,0,.08);background:#fff}
+.home-post-card img{width:100%;height:180px;object-fit:cover;display:block}
+.home-post-card h3{font-size:18px;margin:16px 16px 8px}
+.home-post-card p{font-size:14px;color:#555;margin:0 16px 16px}
+</style>"""
+
+
+def _text(html: str) -> str:
+    """Plain text of a rendered REST field, re-escaped for HTML."""
+    return escape(unescape(re.sub(r'<[^>]+>', '', html or '')).strip())
+
+
+def _rendered(field: Any) -> str:
+    return field.get('rendered', '') if isinstance(field, dict) else (field or '')
+
+
+def _image_url(media: Dict[str, Any], size: str) -> str:
+    """URL of an intermediate size when WordPress generated one, else the original."""
+    sizes = (media.get('media_details') or {}).get('sizes') or {}
+    return (sizes.get(size) or {}).get('source_url') or media.get('source_url', '')
+
+
+def fragment_hash(html: str) -> str:
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class HomepageBuilder:
+    """Carousel and grid fragments of one homepage, published on change."""
+
+    def __init__(self, wp_client: WordPressClient = None, page_id: int = HOME_PAGE_ID,
+                 category_media: Dict[int, int] = None, grid_size: int = 12,
+                 state_file='.homepage_state.json'):
+        """
+        Args:
+            wp_client: WordPress client
+            page_id: Homepage page ID
+            category_media: Carousel categories, category ID -> cover media ID
+            grid_size: Latest posts shown in the grid
+            state_file: Where the fragment hashes of the last publish are kept
+        """
+        self.wp = wp_client or WordPressClient()
+        self.page_id = page_id
+        self.category_media = dict(category_media or CATEGORY_MEDIA)
+        self.grid_size = grid_size
+        self.state_file = Path(state_file)
+
+    # Data
+
+    def load_data(self) -> Dict[str, Any]:
+        """Carousel categories, latest posts and every image they use, in three requests."""
+        categories = {category['id']: category for category in self.wp.get_categories()
+                      if category['id'] in self.category_media}
+        posts = self.wp.get_posts(per_page=self.grid_size,
+                                  _fields='id,link,title,excerpt,featured_media')
+        media_ids = [self.category_media[category_id] for category_id in categories]
+        media_ids += [post['featured_media'] for post in posts if post.get('featured_media')]
+        media = {item['id']: item for item in self.wp.get_media_by_ids(
+            media_ids, _fields='id,source_url,alt_text,media_details')} if media_ids else {}
+        return {'categories': categories, 'posts': posts, 'media': media}
+
+    # Rendering
+
+    def render_carousel(self, data: Dict[str, Any]) -> str:
+        """Category cards, repeated once so the scroll animation loops seamlessly."""
+        cards = []
+        for category_id, media_id in self.category_media.items():
+            category = data['categories'].get(category_id)
+            media = data['media'].get(media_id)
+            if not category or not media:
+                continue
+            name = _text(category.get('name', ''))
+            cards.append(
+                f'<a href="{escape(category["link"])}" class="category-card">'
+                f'<img src="{escape(_image_url(media, "medium_large"))}" alt="{name}" loading="lazy">'
+                f'<div class="category-overlay"><h3 class="category-name">{name}</h3></div></a>'
+            )
+        if not cards:
+            return ''
+        return (f'{CAROUSEL_STYLE}\n<div class="category-carousel-container">'
+                f'<h2 class="category-carousel-title">Explore Our Categories</h2>'
+                f'<div class="category-carousel">\n' + '\n'.join(cards * 2) + '\n</div></div>')
+
+    def render_grid(self, data: Dict[str, Any]) -> str:
+        """Latest posts with their featured images."""
+        cards = []
+        for post in data['posts']:
+            title = _text(_rendered(post.get('title')))
+            excerpt = ' '.join(_text(_rendered(post.get('excerpt'))).split()[:25])
+            media = data['media'].get(post.get('featured_media'))
+            image = ''
+            if media:
+                alt = escape(media.get('alt_text') or '') or title
+                image = f'<img src="{escape(_image_url(media, "medium"))}" alt="{alt}" loading="lazy">'
+            cards.append(
+                f'<article class="home-post-card"><a href="{escape(post.get("link", ""))}">{image}'
+                f'<h3>{title}</h3></a><p>{excerpt}</p></article>'
+            )
+        if not cards:
+            return ''
+        return f'{GRID_STYLE}\n<div class="home-post-grid">\n' + '\n'.join(cards) + '\n</div>'
+
+    def build(self, data: Dict[str, Any] = None) -> Dict[str, Dict[str, str]]:
+        """Every fragment as {'html', 'hash'}, by name."""
+        data = data or self.load_data()
+        fragments = {}
+        for name in FRAGMENTS:
+            html = getattr(self, f'render_{name}')(data)
+            fragments[name] = {'html': html, 'hash': fragment_hash(html)}
+        return fragments
+
+    # Composition
+
+    @staticmethod
+    def region(name: str, fragment: Dict[str, str]) -> str:
+        """The marked region of one fragment."""
+        return f'<!-- mt-fragment:{name} {fragment["hash"]} -->\n{fragment["html"]}\n<!-- /mt-fragment:{name} -->'
+
+    def compose(self, content: str, fragments: Dict[str, Dict[str, str]]) -> str:
+        """The page content with every fragment region replaced (or inserted at the top)."""
+        placed = set()
+
+        def replace(match):
+            name = match.group(1)
+            if name not in fragments:
+                return match.group(0)
+            placed.add(name)
+            return self.region(name, fragments[name])
+
+        content = REGION_RE.sub(replace, content or '')
+        missing = [f'<!-- wp:html -->\n{self.region(name, fragments[name])}\n<!-- /wp:html -->'
+                   for name in FRAGMENTS if name in fragments and name not in placed]
+        if missing:
+            content = '\n\n'.join(missing + ([content] if content.strip() else []))
+        return content
+
+    # State
+
+    def load_state(self) -> Dict[str, str]:
+        """Fragment hashes of the last publish of this page ({} if unknown)."""
+        try:
+            with open(self.state_file) as f:
+                return json.load(f).get(str(self.page_id), {})
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, hashes: Dict[str, str]):
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state[str(self.page_id)] = hashes
+        with open(self.state_file, 'w') as f:
+            json.dump(state, f, indent=2)
+
+    # Publishing
+
+    def publish(self, force: bool = False, dry_run: bool = False,
+                fragments: Dict[str, Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Push the fragments to the homepage if they changed.
+
+        Args:
+            force: Load and compare the live page even if the state file
+                says the fragments are already published
+            dry_run: Compose but do not write
+            fragments: Prebuilt fragments (default: build them now)
+
+        Returns:
+            status ('unchanged', 'updated' or 'dry_run'), changed fragment
+            names, fragment hashes and the composed content when loaded
+        """
+        with metrics.span('homepage.publish') as span:
+            fragments = fragments or self.build()
+            hashes = {name: fragment['hash'] for name, fragment in fragments.items()}
+            result = {'status': 'unchanged', 'changed': [], 'hashes': hashes, 'content': None}
+
+            if not force and self.load_state() == hashes:
+                metrics.record_cache('homepage_fragments', True)
+                span.set(status='unchanged')
+                return result
+            metrics.record_cache('homepage_fragments', False)
+
+            session = EditSession(self.wp, self.page_id, post_type='pages')
+            current = session.content
+            live = dict(re.findall(r'<!-- mt-fragment:(\w+) ([0-9a-f]*) -->', current))
+            result['changed'] = [name for name in FRAGMENTS if live.get(name) != hashes.get(name)]
+            result['content'] = content = self.compose(current, fragments)
+
+            if content != current:
+                if dry_run:
+                    result['status'] = 'dry_run'
+                    span.set(status='dry_run')
+                    return result
+                session.content = content
+                session.commit()
+                result['status'] = 'updated'
+            self.save_state(hashes)
+            span.set(status=result['status'], changed=len(result['changed']))
+        return result
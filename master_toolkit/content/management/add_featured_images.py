@@ -5,11 +5,18 @@ Uses Unsplash API for relevant stock photos
 """
 
 import os
+import sys
 import requests
-import time
+from pathlib import Path
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
 
+# Add the project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from master_toolkit.core import WordPressClient, MediaIndex, MediaIngestPipeline, config
+
 load_dotenv()
 
 WORDPRESS_URL = os.getenv('WORDPRESS_BASE_URL')
@@ -28,58 +35,6 @@ CATEGORY_IMAGES = {
     'World News': 'news journalism media'
 }
 
-def download_image(url, filename):
-    """Download image from URL"""
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            with open(filename, 'wb') as f:
-                f.write(response.content)
-            return True
-    except Exception as e:
-        print(f"   ❌ Download error: {e}")
-    return False
-
-def upload_image_to_wordpress(image_path, title):
-    """Upload image to WordPress media library"""
-    url = f"{WORDPRESS_URL}/wp-json/wp/v2/media"
-    
-    with open(image_path, 'rb') as f:
-        files = {
-            'file': (os.path.basename(image_path), f, 'image/jpeg')
-        }
-        headers = {
-            'Content-Disposition': f'attachment; filename="{os.path.basename(image_path)}"'
-        }
-        
-        response = requests.post(
-            url,
-            files=files,
-            headers=headers,
-            auth=HTTPBasicAuth(USERNAME, PASSWORD)
-        )
-        
-        if response.status_code == 201:
-            return response.json()['id']
-    
-    return None
-
-def set_featured_image(post_id, media_id):
-    """Set featured image for a post"""
-    url = f"{WORDPRESS_URL}/wp-json/wp/v2/posts/{post_id}"
-    
-    data = {
-        'featured_media': media_id
-    }
-    
-    response = requests.post(
-        url,
-        json=data,
-        auth=HTTPBasicAuth(USERNAME, PASSWORD)
-    )
-    
-    return response.status_code == 200
-
 def get_placeholder_image_url(category, index):
     """Get placeholder image URL from Unsplash Source"""
     query = CATEGORY_IMAGES.get(category, 'business technology')
@@ -107,56 +62,50 @@ def add_featured_images():
     print(f"\nFound {len(posts_without_images)} posts without featured images")
     print("=" * 60)
     
-    success_count = 0
-    temp_dir = '/tmp/wp_images'
-    os.makedirs(temp_dir, exist_ok=True)
+    # Category names for image queries, fetched once instead of per post
+    cat_response = requests.get(f"{WORDPRESS_URL}/wp-json/wp/v2/categories?per_page=100")
+    category_names = {}
+    if cat_response.status_code == 200:
+        category_names = {cat['id']: cat['name'] for cat in cat_response.json()}
+    
+    config.set('base_url', WORDPRESS_URL)
+    wp = WordPressClient()
+    if not wp.authenticate(USERNAME, PASSWORD):
+        print("❌ Authentication failed")
+        return
+    
+    # Byte-identical images already in the media library are reused, not re-uploaded
+    media_index = MediaIndex(wp_client=wp)
+    media_index.sync()
     
+    items = []
     for index, post in enumerate(posts_without_images[:20], 1):  # Limit to 20 for now
-        print(f"\n[{index}/{len(posts_without_images)}] {post['title']['rendered'][:50]}...")
-        
         # Get category for relevant image
         categories = post.get('categories', [])
-        category_name = 'Business'  # Default
-        
-        if categories:
-            cat_url = f"{WORDPRESS_URL}/wp-json/wp/v2/categories/{categories[0]}"
-            cat_response = requests.get(cat_url)
-            if cat_response.status_code == 200:
-                category_name = cat_response.json()['name']
+        category_name = category_names.get(categories[0], 'Business') if categories else 'Business'
         
-        # Get image
-        image_url = get_placeholder_image_url(category_name, index)
-        image_path = os.path.join(temp_dir, f"featured_{post['id']}.jpg")
-        
-        print(f"   📥 Downloading image... ", end='')
-        if download_image(image_url, image_path):
-            print("✅")
-            
-            print(f"   📤 Uploading to WordPress... ", end='')
-            media_id = upload_image_to_wordpress(image_path, post['title']['rendered'])
-            
-            if media_id:
-                print(f"✅ (ID: {media_id})")
-                
-                print(f"   🖼️  Setting as featured image... ", end='')
-                if set_featured_image(post['id'], media_id):
-                    print("✅")
-                    success_count += 1
-                else:
-                    print("❌")
-            else:
-                print("❌")
-            
-            # Clean up
-            try:
-                os.remove(image_path)
-            except:
-                pass
+        items.append({
+            'post_id': post['id'],
+            'image_url': get_placeholder_image_url(category_name, index),
+            'filename': f"featured_{post['id']}.jpg",
+            'title': post['title']['rendered']
+        })
+    
+    titles = {item['post_id']: item['title'] for item in items}
+    
+    def report(result):
+        """Print each post as it finishes the pipeline."""
+        print(f"\n{titles[result['post_id']][:50]}...")
+        if result['success']:
+            reused = ", reused" if result['reused'] else ""
+            print(f"   ✅ Featured image set (Media ID: {result['media_id']}{reused})")
         else:
-            print("❌")
-        
-        # Be nice to Unsplash
-        time.sleep(1)
+            print(f"   ❌ {result['failed_stage'].capitalize()} failed: {result['error']}")
+    
+    # A small download pool keeps the load on Unsplash modest without fixed sleeps
+    summary = MediaIngestPipeline(wp, download_workers=4, on_result=report,
+                                  media_index=media_index).run(items)
+    success_count = summary['succeeded']
     
     print("\n" + "=" * 60)
     print(f"✅ Added featured images to {success_count} posts")
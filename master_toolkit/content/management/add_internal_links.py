@@ -4,9 +4,16 @@ Add Relevant Internal Links to Posts
 Intelligently adds contextual internal links to posts that don't have any
 """
 
+import sys
 import requests
 from bs4 import BeautifulSoup
-import re
+from pathlib import Path
+
+# Add the project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from master_toolkit.mirror import open_site_mirror, LinkGraph
 
 WORDPRESS_URL = 'https://spherevista360.com'
 USERNAME = 'JK'
@@ -27,39 +34,17 @@ LINK_MAPPING = {
 }
 
 def get_all_posts():
-    """Get all posts with their content"""
-    all_posts = []
-    page = 1
-    
-    while True:
-        response = requests.get(
-            f'{WORDPRESS_URL}/wp-json/wp/v2/posts',
-            params={'per_page': 100, 'page': page},
-            auth=(USERNAME, PASSWORD)
-        )
-        
-        if not response.ok or not response.json():
-            break
-        
-        all_posts.extend(response.json())
-        page += 1
-    
-    return all_posts
+    """Get all posts with their content (from the incrementally synced local mirror)"""
+    return open_site_mirror(WORDPRESS_URL, USERNAME, PASSWORD).get_posts()
 
 def get_posts_without_internal_links(posts):
-    """Identify posts without internal links"""
-    posts_without_links = []
-    
-    for post in posts:
-        content = post['content']['rendered']
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Check for internal links
-        internal_links = soup.find_all('a', href=re.compile(r'spherevista360\.com'))
-        
-        if len(internal_links) == 0:
-            posts_without_links.append(post)
+    """Identify posts without internal links, most central (PageRank) first"""
+    graph = LinkGraph(open_site_mirror(sync=False))
+    rank = graph.pagerank()
+    dead_ends = {node['post_id']: rank[graph.index[node['url']]] for node in graph.dead_ends()}
     
+    posts_without_links = [post for post in posts if post['id'] in dead_ends]
+    posts_without_links.sort(key=lambda post: dead_ends[post['id']], reverse=True)
     return posts_without_links
 
 def find_related_posts(post, all_posts):
@@ -4,67 +4,28 @@ Add Featured Images to WordPress Posts using Lorem Picsum
 """
 
 import os
+import sys
 import requests
-import time
+from pathlib import Path
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
 
+# Add the project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.append(str(project_root))
+
+from master_toolkit.core import WordPressClient, MediaIndex, MediaIngestPipeline, config
+
 load_dotenv()
 
 WORDPRESS_URL = os.getenv('WORDPRESS_BASE_URL')
 USERNAME = os.getenv('WORDPRESS_USERNAME')
 PASSWORD = os.getenv('WORDPRESS_PASSWORD')
 
-def download_placeholder_image(post_id):
-    """Download placeholder image from Lorem Picsum"""
-    # Use Lorem Picsum for placeholder images
+def placeholder_image_url(post_id):
+    """Placeholder image URL from Lorem Picsum"""
     # Size: 1200x630 (optimal for social sharing)
-    url = f"https://picsum.photos/1200/630?random={post_id}"
-    
-    try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            filename = f"/tmp/featured_{post_id}.jpg"
-            with open(filename, 'wb') as f:
-                f.write(response.content)
-            return filename
-    except Exception as e:
-        print(f"Error: {e}")
-    return None
-
-def upload_to_wordpress(image_path, post_title):
-    """Upload image to WordPress"""
-    url = f"{WORDPRESS_URL}/wp-json/wp/v2/media"
-    
-    try:
-        with open(image_path, 'rb') as f:
-            files = {
-                'file': (f'featured-{os.path.basename(image_path)}', f, 'image/jpeg')
-            }
-            response = requests.post(
-                url,
-                files=files,
-                auth=HTTPBasicAuth(USERNAME, PASSWORD),
-                headers={'Content-Disposition': f'attachment; filename="featured.jpg"'}
-            )
-            
-            if response.status_code == 201:
-                return response.json()['id']
-    except Exception as e:
-        print(f"Upload error: {e}")
-    return None
-
-def set_featured_image(post_id, media_id):
-    """Set featured image for post"""
-    url = f"{WORDPRESS_URL}/wp-json/wp/v2/posts/{post_id}"
-    
-    response = requests.post(
-        url,
-        json={'featured_media': media_id},
-        auth=HTTPBasicAuth(USERNAME, PASSWORD)
-    )
-    
-    return response.status_code == 200
+    return f"https://picsum.photos/1200/630?random={post_id}"
 
 def main():
     print("=" * 60)
@@ -84,39 +45,40 @@ def main():
     print(f"\nProcessing {min(len(posts), 30)} posts...")
     print("=" * 60)
     
-    success = 0
+    config.set('base_url', WORDPRESS_URL)
+    wp = WordPressClient()
+    if not wp.authenticate(USERNAME, PASSWORD):
+        print("❌ Authentication failed")
+        return
+    
+    # Byte-identical images already in the media library are reused, not re-uploaded
+    media_index = MediaIndex(wp_client=wp)
+    media_index.sync()
     
-    for i, post in enumerate(posts[:30], 1):
-        title = post['title']['rendered'][:40]
-        print(f"\n[{i}/30] {title}...")
-        
-        # Download placeholder
-        image_path = download_placeholder_image(post['id'])
-        if not image_path:
-            print("   ❌ Download failed")
-            continue
-        
-        # Upload to WordPress
-        media_id = upload_to_wordpress(image_path, title)
-        if not media_id:
-            print("   ❌ Upload failed")
-            os.remove(image_path)
-            continue
-        
-        # Set as featured image
-        if set_featured_image(post['id'], media_id):
-            print(f"   ✅ Featured image set (Media ID: {media_id})")
-            success += 1
+    batch = posts[:30]
+    titles = {post['id']: post['title']['rendered'][:40] for post in batch}
+    completed = 0
+    
+    def report(result):
+        """Print each post as it finishes the pipeline."""
+        nonlocal completed
+        completed += 1
+        print(f"\n[{completed}/{len(batch)}] {titles[result['post_id']]}...")
+        if result['success']:
+            reused = ", reused" if result['reused'] else ""
+            print(f"   ✅ Featured image set (Media ID: {result['media_id']}{reused})")
         else:
-            print("   ❌ Failed to set featured image")
-        
-        # Cleanup
-        try:
-            os.remove(image_path)
-        except:
-            pass
-        
-        time.sleep(0.5)
+            print(f"   ❌ {result['failed_stage'].capitalize()} failed: {result['error']}")
+    
+    summary = MediaIngestPipeline(wp, on_result=report, media_index=media_index).run(
+        {
+            'post_id': post['id'],
+            'image_url': placeholder_image_url(post['id']),
+            'filename': f"featured-{post['id']}.jpg"
+        }
+        for post in batch
+    )
+    success = summary['succeeded']
     
     print("\n" + "=" * 60)
     print(f"✅ Successfully added {success} featured images!")
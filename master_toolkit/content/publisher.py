@@ -5,18 +5,11 @@ WordPress content publishing with markdown support and optimization.
 """
 
 import os
-import yaml
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
-try:
-    import markdown
-    HAS_MARKDOWN = True
-except ImportError:
-    HAS_MARKDOWN = False
-
 try:
     from slugify import slugify
 except ImportError:
@@ -30,14 +23,16 @@ except ImportError:
 
 from ..core import WordPressClient, WordPressAPIError
 from ..utils import print_header, print_section, print_success, print_error, safe_get
+from .renderer import MarkdownRenderer, simple_markdown_to_html
 
 
 class ContentPublisher:
     """Content publishing system with markdown support."""
     
-    def __init__(self, wp_client: WordPressClient = None):
-        """Initialize publisher."""
+    def __init__(self, wp_client: WordPressClient = None, renderer: MarkdownRenderer = None):
+        """Initialize publisher; markdown renders are cached by the (shared) renderer."""
         self.wp = wp_client or WordPressClient()
+        self.renderer = renderer or MarkdownRenderer()
         
         # Default image templates by category
         self.image_templates = {
@@ -54,39 +49,7 @@ class ContentPublisher:
     def parse_markdown_file(self, file_path: str) -> Dict[str, Any]:
         """Parse markdown file with YAML front matter."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            front_matter = {}
-            markdown_content = content
-            
-            # Check for YAML front matter
-            if content.startswith('---'):
-                parts = content.split('---', 2)
-                if len(parts) >= 3:
-                    try:
-                        front_matter = yaml.safe_load(parts[1]) or {}
-                        markdown_content = parts[2].strip()
-                    except yaml.YAMLError:
-                        print_error(f"Invalid YAML front matter in {file_path}")
-            
-            # Convert markdown to HTML
-            if HAS_MARKDOWN:
-                html_content = markdown.markdown(
-                    markdown_content,
-                    extensions=['extra', 'codehilite', 'toc']
-                )
-            else:
-                # Simple markdown conversion fallback
-                html_content = self._simple_markdown_to_html(markdown_content)
-            
-            return {
-                'front_matter': front_matter,
-                'raw_content': markdown_content,
-                'html_content': html_content,
-                'file_path': file_path
-            }
-            
+            return self.renderer.render_file(file_path)
         except Exception as e:
             raise ValueError(f"Error parsing {file_path}: {e}")
     
@@ -139,13 +102,15 @@ class ContentPublisher:
         return post_data
     
     def publish_from_file(self, file_path: str, category: str = None, 
-                         status: str = 'publish', dry_run: bool = False) -> Dict[str, Any]:
-        """Publish content from markdown file."""
+                         status: str = 'publish', dry_run: bool = False,
+                         parsed_content: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Publish content from markdown file (already parsed when parsed_content is given)."""
         print_header(f"Publishing: {os.path.basename(file_path)}")
         
         try:
             # Parse file
-            parsed_content = self.parse_markdown_file(file_path)
+            if parsed_content is None:
+                parsed_content = self.parse_markdown_file(file_path)
             print_success("File parsed successfully")
             
             # Prepare post data
@@ -209,11 +174,15 @@ class ContentPublisher:
             'results': []
         }
         
-        for file_path in markdown_files:
+        # Rendered in chunks on the renderer's worker pool; unchanged files come from cache
+        for file_path, parsed_content in zip(markdown_files, self.renderer.render_files(markdown_files)):
             print_section(f"Processing {file_path.name}")
             
             try:
-                result = self.publish_from_file(str(file_path), category, status, dry_run)
+                if 'error' in parsed_content:
+                    raise ValueError(f"Error parsing {file_path}: {parsed_content['error']}")
+                result = self.publish_from_file(str(file_path), category, status, dry_run,
+                                                parsed_content=parsed_content)
                 
                 if result['success']:
                     results['published'] += 1
@@ -296,22 +265,4 @@ class ContentPublisher:
     
     def _simple_markdown_to_html(self, markdown_text: str) -> str:
         """Simple markdown to HTML conversion fallback."""
-        html = markdown_text
-        
-        # Headers
-        html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-        html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-        
-        # Bold and italic
-        html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-        html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
-        
-        # Links
-        html = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', html)
-        
-        # Paragraphs (simple approach)
-        paragraphs = html.split('\n\n')
-        html = ''.join(f'<p>{p.strip()}</p>\n' for p in paragraphs if p.strip())
-        
-        return html
\ No newline at end of file
+        return simple_markdown_to_html(markdown_text)
\ No newline at end of file
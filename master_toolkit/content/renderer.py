@@ -0,0 +1,285 @@
+"""
+Markdown Renderer
+=================
+Markdown -> HTML conversion for the publisher with converter reuse, a
+render cache and a worker pool for whole content trees.
+
+Building a markdown.Markdown instance loads and configures every
+extension, which costs more than converting a typical post. Each thread
+(and each pool worker process) therefore keeps one converter and resets it
+between documents. Rendered HTML is cached by (body hash, extension
+configuration) in memory and in an SQLite disk tier, so dry runs and
+re-publishes of unchanged files skip conversion entirely. Front matter is
+not part of the key: editing a title or tags does not re-render the body.
+
+Trees are rendered in chunks. The cache misses of a chunk are converted
+on a process pool (conversion is pure Python and CPU-bound); a handful of
+misses is converted in-process instead.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+
+import yaml
+
+try:
+    import markdown
+    HAS_MARKDOWN = True
+except ImportError:
+    HAS_MARKDOWN = False
+
+from ..core import metrics
+from ..core.storage import SQLiteStore, LRUCache, chunked, placeholders
+from ..utils import print_error
+
+
+DEFAULT_EXTENSIONS = ('extra', 'codehilite', 'toc')
+
+# Files read, looked up and converted together by render_files()
+CHUNK_SIZE = 64
+
+# Below this many cache misses, starting worker processes costs more than it saves
+PROCESS_POOL_MIN_ITEMS = 16
+
+RENDER_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS renders (
+        body_hash TEXT NOT NULL,
+        config TEXT NOT NULL,
+        html TEXT NOT NULL,
+        rendered_at REAL,
+        PRIMARY KEY (body_hash, config)
+    );
+'''
+
+
+def split_front_matter(content: str, file_path: str = '') -> Tuple[Dict[str, Any], str]:
+    """(front matter, markdown body) of a document with optional YAML front matter."""
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            try:
+                return yaml.safe_load(parts[1]) or {}, parts[2].strip()
+            except yaml.YAMLError:
+                print_error(f"Invalid YAML front matter in {file_path}")
+    return {}, content
+
+
+def simple_markdown_to_html(markdown_text: str) -> str:
+    """Simple markdown to HTML conversion fallback."""
+    html = markdown_text
+
+    # Headers
+    html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
+    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
+    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
+
+    # Bold and italic
+    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+    html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
+
+    # Links
+    html = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', html)
+
+    # Paragraphs (simple approach)
+    paragraphs = html.split('\n\n')
+    return ''.join(f'<p>{p.strip()}</p>\n' for p in paragraphs if p.strip())
+
+
+_local = threading.local()
+
+
+def convert(text: str, extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS,
+            extension_configs: Dict[str, Dict] = None) -> str:
+    """
+    Convert one document with this thread's converter (built on first use).
+
+    Module-level so pool workers can run it; each worker process keeps its
+    own converter between tasks.
+    """
+    if not HAS_MARKDOWN:
+        return simple_markdown_to_html(text)
+    key = (tuple(extensions), json.dumps(extension_configs or {}, sort_keys=True, default=str))
+    if getattr(_local, 'key', None) != key:
+        _local.converter = markdown.Markdown(extensions=list(extensions),
+                                             extension_configs=extension_configs or {})
+        _local.key = key
+    return _local.converter.reset().convert(text)
+
+
+def _convert_many(texts: List[str], extensions: Tuple[str, ...], extension_configs: Dict) -> List[str]:
+    return [convert(text, extensions, extension_configs) for text in texts]
+
+
+def _process_context():
+    """Start method for render workers."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
+
+
+class MarkdownRenderer(SQLiteStore):
+    """Cached markdown rendering of single documents and whole content trees."""
+
+    def __init__(self, extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+                 extension_configs: Dict[str, Dict] = None, db_path: Optional[Path] = None,
+                 disk: bool = True, max_entries: int = 1024, workers: int = None):
+        """
+        Args:
+            extensions: Markdown extensions
+            extension_configs: Per-extension settings
+            db_path: Disk tier location (default: content/render_cache.db, created on first store)
+            disk: Keep the disk tier at all
+            max_entries: Rendered documents kept in the memory tier
+            workers: Render processes for trees (default: CPU count)
+        """
+        self.extensions = tuple(extensions)
+        self.extension_configs = extension_configs or {}
+        self.config_key = hashlib.sha256(json.dumps(
+            [list(self.extensions), self.extension_configs, markdown.__version__ if HAS_MARKDOWN else 'fallback'],
+            sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+        super().__init__(db_path or Path(__file__).parent / 'render_cache.db', RENDER_SCHEMA)
+        self.disk = disk
+        self.max_entries = max_entries
+        self.workers = workers
+
+        self._memory = LRUCache(max_entries)
+
+    # Cache
+
+    def _get_many(self, body_hashes: Iterable[str]) -> Dict[str, str]:
+        """Cached HTML for the given body hashes (memory first, then disk)."""
+        body_hashes = list(body_hashes)
+        found = self._memory.get_many(body_hashes)
+        missing = [body_hash for body_hash in body_hashes if body_hash not in found]
+
+        if missing and self.disk and self.db_path.exists():
+            conn = self._connect()
+            loaded = {}
+            for chunk in chunked(missing):
+                rows = conn.execute(
+                    f'SELECT body_hash, html FROM renders WHERE config = ? '
+                    f'AND body_hash IN ({placeholders(chunk)})', [self.config_key, *chunk])
+                loaded.update((row['body_hash'], row['html']) for row in rows)
+            self._memory.update(loaded)
+            found.update(loaded)
+        return found
+
+    def _put_many(self, rendered: Dict[str, str]):
+        self._memory.update(rendered)
+        if self.disk and rendered:
+            now = time.time()
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('INSERT OR REPLACE INTO renders VALUES (?, ?, ?, ?)',
+                             [(body_hash, self.config_key, html, now) for body_hash, html in rendered.items()])
+            conn.execute('COMMIT')
+
+    @staticmethod
+    def body_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def clear(self):
+        """Drop every cached render of this configuration."""
+        self._memory.clear()
+        if self.disk and self.db_path.exists():
+            self._connect().execute('DELETE FROM renders WHERE config = ?', (self.config_key,))
+
+    # Rendering
+
+    def render(self, text: str) -> str:
+        """HTML of one markdown document, from cache when possible."""
+        body_hash = self.body_hash(text)
+        html = self._get_many([body_hash]).get(body_hash)
+        metrics.record_cache('markdown_render', html is not None)
+        if html is None:
+            with metrics.span('markdown.convert'):
+                html = convert(text, self.extensions, self.extension_configs)
+            self._put_many({body_hash: html})
+        return html
+
+    def parse(self, content: str, file_path: str = '') -> Dict[str, Any]:
+        """Front matter, markdown body and rendered HTML of a document."""
+        front_matter, body = split_front_matter(content, file_path)
+        return {
+            'front_matter': front_matter,
+            'raw_content': body,
+            'html_content': self.render(body),
+            'file_path': file_path
+        }
+
+    def render_file(self, file_path) -> Dict[str, Any]:
+        """parse() of a file."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return self.parse(f.read(), str(file_path))
+
+    def render_files(self, file_paths: Iterable, max_workers: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        parse() every file, in order, CHUNK_SIZE files at a time.
+
+        Unreadable files yield {'file_path', 'error'} instead of stopping the run.
+        """
+        workers = max_workers or self.workers or os.cpu_count() or 1
+        pool = None
+        paths = iter(file_paths)
+        try:
+            while True:
+                chunk = list(islice(paths, CHUNK_SIZE))
+                if not chunk:
+                    return
+
+                documents, errors = [], {}
+                for path in chunk:
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            front_matter, body = split_front_matter(f.read(), str(path))
+                        documents.append((str(path), front_matter, body, self.body_hash(body)))
+                    except (OSError, UnicodeDecodeError) as e:
+                        documents.append((str(path), None, None, None))
+                        errors[str(path)] = str(e)
+
+                hashes = [doc[3] for doc in documents if doc[3] is not None]
+                cached = self._get_many(hashes)
+                misses = {body_hash: body for _, _, body, body_hash in documents
+                          if body_hash is not None and body_hash not in cached}
+                for body_hash in hashes:
+                    metrics.record_cache('markdown_render', body_hash not in misses)
+
+                if misses:
+                    texts = list(misses.values())
+                    with metrics.span('markdown.convert_batch', documents=len(texts)):
+                        if len(texts) < PROCESS_POOL_MIN_ITEMS or workers < 2:
+                            rendered = _convert_many(texts, self.extensions, self.extension_configs)
+                        else:
+                            if pool is None:
+                                pool = ProcessPoolExecutor(max_workers=workers, mp_context=_process_context())
+                            # One contiguous batch per worker keeps pickling overhead low
+                            size = -(-len(texts) // workers)
+                            futures = [pool.submit(_convert_many, batch, self.extensions, self.extension_configs)
+                                       for batch in chunked(texts, size)]
+                            rendered = [html for future in futures for html in future.result()]
+                    rendered = dict(zip(misses, rendered))
+                    self._put_many(rendered)
+                    cached.update(rendered)
+
+                for path, front_matter, body, body_hash in documents:
+                    if body_hash is None:
+                        yield {'file_path': path, 'error': errors[path]}
+                    else:
+                        yield {'front_matter': front_matter, 'raw_content': body,
+                               'html_content': cached[body_hash], 'file_path': path}
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def render_tree(self, root, pattern: str = '**/*.md', max_workers: int = None) -> Iterator[Dict[str, Any]]:
+        """render_files() over every matching file under a directory, in path order."""
+        return self.render_files(sorted(Path(root).glob(pattern)), max_workers)
@@ -0,0 +1,238 @@
+"""
+Sitemap Builder
+===============
+Streams every published post, page and category archive into sharded,
+gzip-compressed XML sitemaps plus a sitemap index.
+
+Each content type is read in ascending ID order and cut into shards of at
+most 50,000 URLs (and 50 MB uncompressed), the sitemaps.org limits. Shard
+boundaries are remembered in a manifest next to the files and reused on the
+next run, so a shard always covers the same ID range: new posts land in the
+last shard and an edited post only changes the shard that holds it. Only
+shards whose URLs or lastmod values changed are rewritten; the others are
+left untouched on disk. Gzip output is written with a fixed mtime, so an
+unchanged shard is also byte-for-byte identical.
+
+lastmod comes from modified_gmt. A category archive takes the newest
+lastmod of the published posts filed under it.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from ..core import WordPressClient, config, metrics
+
+
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024 - 1024  # room for the urlset wrapper
+
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+INDEX_FILE = 'sitemap_index.xml'
+MANIFEST_FILE = '.sitemap-manifest.json'
+
+# Sitemap type -> REST collection
+TYPES = {'post': 'posts', 'page': 'pages', 'category': 'categories'}
+
+# (id, loc, lastmod or None)
+Entry = Tuple[int, str, Optional[str]]
+
+
+def w3c_datetime(modified_gmt: Optional[str]) -> Optional[str]:
+    """A REST *_gmt timestamp as a W3C datetime in UTC."""
+    if not modified_gmt:
+        return None
+    return modified_gmt[:19] + '+00:00'
+
+
+def _url_element(loc: str, lastmod: Optional[str]) -> str:
+    if lastmod:
+        return f'<url><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></url>\n'
+    return f'<url><loc>{escape(loc)}</loc></url>\n'
+
+
+def _atomic_write(path: Path, data: bytes):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SitemapBuilder:
+    """Incremental sharded sitemap generator for one output directory."""
+
+    def __init__(self, wp_client: WordPressClient = None, output_dir='sitemaps', public_url: str = None,
+                 types: Iterable[str] = tuple(TYPES), max_urls: int = MAX_URLS):
+        """
+        Args:
+            wp_client: WordPress client
+            output_dir: Directory receiving the shards, index and manifest
+            public_url: URL the directory is served under, used for the shard
+                locations in the index (default: configured base_url)
+            types: Sitemap types to build ('post', 'page', 'category')
+            max_urls: URLs per shard
+        """
+        self.wp = wp_client or WordPressClient()
+        self.output_dir = Path(output_dir)
+        self.public_url = (public_url or config.get('base_url')).rstrip('/')
+        self.types = [name for name in TYPES if name in set(types)]
+        self.max_urls = max_urls
+        self._category_lastmod: Dict[int, str] = {}
+
+    # Manifest
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.output_dir / MANIFEST_FILE
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Shards of the previous run ({} on the first run or an unreadable manifest)."""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    # Sources
+
+    def iter_entries(self, sitemap_type: str) -> Iterator[Entry]:
+        """Published items of one type in ascending ID order."""
+        collection = TYPES[sitemap_type]
+        if sitemap_type == 'category':
+            for term in self.wp.iter_collection(collection, orderby='id', order='asc', hide_empty=True,
+                                                _fields='id,link,count'):
+                if term.get('link'):
+                    yield term['id'], term['link'], self._category_lastmod.get(term['id'])
+            return
+
+        fields = 'id,link,modified_gmt' + (',categories' if sitemap_type == 'post' else '')
+        for item in self.wp.iter_collection(collection, status='publish', orderby='id', order='asc',
+                                            _fields=fields):
+            if not item.get('link'):
+                continue
+            lastmod = w3c_datetime(item.get('modified_gmt'))
+            if lastmod and sitemap_type == 'post':
+                for category_id in item.get('categories', ()):
+                    if lastmod > self._category_lastmod.get(category_id, ''):
+                        self._category_lastmod[category_id] = lastmod
+            yield item['id'], item['link'], lastmod
+
+    # Sharding
+
+    def shard(self, entries: Iterable[Entry], boundaries: List[int] = ()) -> Iterator[List[Entry]]:
+        """
+        Cut ID-ordered entries into shards, one list at a time.
+
+        A new shard starts at every previous boundary (first ID of an earlier
+        shard) and whenever the current one reaches the URL or size limit.
+        """
+        boundaries = sorted(boundaries)
+        current: List[Entry] = []
+        size = 0
+        next_boundary = 0
+        for entry in entries:
+            element_size = len(_url_element(entry[1], entry[2]).encode('utf-8'))
+            if current and ((next_boundary < len(boundaries) and entry[0] >= boundaries[next_boundary])
+                            or len(current) >= self.max_urls or size + element_size > MAX_BYTES):
+                yield current
+                current, size = [], 0
+            if not current:
+                next_boundary = bisect_right(boundaries, entry[0])
+            current.append(entry)
+            size += element_size
+        if current:
+            yield current
+
+    @staticmethod
+    def render_shard(entries: List[Entry]) -> bytes:
+        """A <urlset> document, gzip-compressed with a fixed mtime."""
+        body = ''.join(_url_element(loc, lastmod) for _, loc, lastmod in entries)
+        xml = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{XMLNS}">\n{body}</urlset>\n'
+        return gzip.compress(xml.encode('utf-8'), compresslevel=9, mtime=0)
+
+    @staticmethod
+    def digest(entries: List[Entry]) -> str:
+        hasher = hashlib.sha256()
+        for _, loc, lastmod in entries:
+            hasher.update(f'{loc}\t{lastmod or ""}\n'.encode('utf-8'))
+        return hasher.hexdigest()
+
+    # Build
+
+    def build(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Regenerate the sitemaps, writing only shards whose content changed.
+
+        Args:
+            force: Rewrite every shard and the index
+
+        Returns:
+            urls, shards, written / unchanged / removed shard files and
+            whether the index was rewritten
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        previous = self.load_manifest().get('shards', {})
+        self._category_lastmod = {}
+        shards: Dict[str, Dict[str, Any]] = {}
+        results = {'urls': 0, 'shards': 0, 'written': [], 'unchanged': [], 'removed': []}
+
+        with metrics.span('sitemap.build') as span:
+            # Posts first: category lastmod is collected while they stream
+            for sitemap_type in sorted(self.types, key=lambda name: name == 'category'):
+                boundaries = [shard['first_id'] for shard in previous.values() if shard['type'] == sitemap_type]
+                for number, entries in enumerate(self.shard(self.iter_entries(sitemap_type), boundaries), start=1):
+                    name = f'sitemap-{sitemap_type}-{number}.xml.gz'
+                    digest = self.digest(entries)
+                    shards[name] = {
+                        'type': sitemap_type,
+                        'first_id': entries[0][0],
+                        'urls': len(entries),
+                        'lastmod': max((lastmod for _, _, lastmod in entries if lastmod), default=None),
+                        'digest': digest
+                    }
+                    results['urls'] += len(entries)
+                    path = self.output_dir / name
+                    if not force and previous.get(name, {}).get('digest') == digest and path.exists():
+                        results['unchanged'].append(name)
+                        continue
+                    _atomic_write(path, self.render_shard(entries))
+                    results['written'].append(name)
+
+            for name, shard in previous.items():
+                if shard['type'] not in self.types:
+                    shards[name] = shard  # type not rebuilt this run
+                elif name not in shards:
+                    (self.output_dir / name).unlink(missing_ok=True)
+                    results['removed'].append(name)
+
+            results['index_written'] = self._write_index(shards, force)
+            _atomic_write(self.manifest_path, json.dumps(
+                {'public_url': self.public_url, 'shards': shards}, indent=2).encode('utf-8'))
+            results['shards'] = len(shards)
+            results['index'] = str(self.output_dir / INDEX_FILE)
+            span.set(urls=results['urls'], written=len(results['written']))
+
+        metrics.inc('sitemap_shards_written', len(results['written']))
+        return results
+
+    def _write_index(self, shards: Dict[str, Dict[str, Any]], force: bool) -> bool:
+        """Write the <sitemapindex> unless it is unchanged; True if written."""
+        lines = [f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{XMLNS}">\n']
+        order = list(TYPES)
+        for name, shard in sorted(shards.items(), key=lambda item: (order.index(item[1]['type']),
+                                                                     item[1]['first_id'])):
+            lastmod = f'<lastmod>{shard["lastmod"]}</lastmod>' if shard['lastmod'] else ''
+            lines.append(f'<sitemap><loc>{escape(self.public_url)}/{name}</loc>{lastmod}</sitemap>\n')
+        lines.append('</sitemapindex>\n')
+        data = ''.join(lines).encode('utf-8')
+
+        path = self.output_dir / INDEX_FILE
+        if not force and path.exists() and path.read_bytes() == data:
+            return False
+        _atomic_write(path, data)
+        return True
@@ -0,0 +1,222 @@
+"""
+Content Module Test Suite
+=========================
+Tests for the sitemap builder, homepage fragments and markdown renderer.
+"""
+
+import unittest
+import json
+import tempfile
+import threading
+from unittest.mock import Mock, patch
+
+# Test imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.content.sitemap import SitemapBuilder
+from master_toolkit.content.homepage import HomepageBuilder
+from master_toolkit.content import renderer as markdown_renderer
+from master_toolkit.content.renderer import MarkdownRenderer
+
+
+class TestSitemapBuilder(unittest.TestCase):
+    """Test cases for the incremental sharded sitemap builder."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.items = {
+            'posts': [{'id': i, 'link': f'https://example.com/p{i}/', 'categories': [7 if i == 4 else 3],
+                       'modified_gmt': f'2024-01-0{i}T10:00:00'} for i in range(1, 6)],
+            'pages': [{'id': 50, 'link': 'https://example.com/about/', 'modified_gmt': '2023-05-01T08:00:00'}],
+            'categories': [{'id': 3, 'link': 'https://example.com/category/news/', 'count': 4},
+                           {'id': 7, 'link': 'https://example.com/category/cloud/', 'count': 1}]
+        }
+        self.wp = Mock()
+        self.wp.iter_collection.side_effect = lambda endpoint, **params: iter(
+            sorted(self.items[endpoint], key=lambda item: item['id']))
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _build(self, **kwargs):
+        builder = SitemapBuilder(self.wp, self.temp_dir, public_url='https://example.com/sitemaps', max_urls=2)
+        return builder.build(**kwargs)
+    
+    def test_shards_index_and_lastmod(self):
+        """Test shard limits, gzip output and category lastmod from posts."""
+        import gzip
+        results = self._build()
+        
+        self.assertEqual(results['urls'], 8)
+        self.assertEqual(sorted(results['written']), [
+            'sitemap-category-1.xml.gz', 'sitemap-page-1.xml.gz',
+            'sitemap-post-1.xml.gz', 'sitemap-post-2.xml.gz', 'sitemap-post-3.xml.gz'])
+        shard = gzip.decompress((Path(self.temp_dir) / 'sitemap-post-3.xml.gz').read_bytes()).decode()
+        self.assertIn('<url><loc>https://example.com/p5/</loc><lastmod>2024-01-05T10:00:00+00:00</lastmod></url>',
+                      shard)
+        categories = gzip.decompress((Path(self.temp_dir) / 'sitemap-category-1.xml.gz').read_bytes()).decode()
+        self.assertIn('news/</loc><lastmod>2024-01-05T10:00:00+00:00', categories)
+        self.assertIn('cloud/</loc><lastmod>2024-01-04T10:00:00+00:00', categories)
+        index = (Path(self.temp_dir) / 'sitemap_index.xml').read_text()
+        self.assertIn('<loc>https://example.com/sitemaps/sitemap-post-1.xml.gz</loc>'
+                      '<lastmod>2024-01-02T10:00:00+00:00</lastmod>', index)
+    
+    def test_rebuild_rewrites_only_changed_shards(self):
+        """Test that regeneration is a delta over stable ID-range shards."""
+        self._build()
+        
+        unchanged = self._build()
+        self.assertEqual(unchanged['written'], [])
+        self.assertFalse(unchanged['index_written'])
+        
+        # Post 1 unpublished, post 2 edited, post 6 published
+        del self.items['posts'][0]
+        self.items['posts'][0]['modified_gmt'] = '2024-01-09T10:00:00'
+        self.items['posts'].append({'id': 6, 'link': 'https://example.com/p6/', 'categories': [],
+                                    'modified_gmt': '2024-01-06T10:00:00'})
+        delta = self._build()
+        
+        self.assertEqual(sorted(delta['written']), [
+            'sitemap-category-1.xml.gz', 'sitemap-post-1.xml.gz', 'sitemap-post-3.xml.gz'])
+        self.assertIn('sitemap-post-2.xml.gz', delta['unchanged'])
+        self.assertTrue(delta['index_written'])
+        
+        delta = self._build()
+        self.assertEqual(delta['written'], [])
+
+
+class TestHomepageBuilder(unittest.TestCase):
+    """Test cases for the skip-if-unchanged homepage fragment builder."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.page = {'id': 2412, 'modified_gmt': '2024-01-01T00:00:00',
+                     'content': {'raw': '<p>Intro</p>', 'rendered': '<p>Intro</p>'}}
+        self.posts = [{'id': 11, 'link': 'https://example.com/p11/', 'title': {'rendered': 'Rates &amp; Bonds'},
+                       'excerpt': {'rendered': '<p>Short excerpt</p>'}, 'featured_media': 101}]
+        self.wp = Mock()
+        self.wp.get_categories.return_value = [{'id': 3, 'name': 'Finance', 'link': 'https://example.com/category/finance/'},
+                                               {'id': 9, 'name': 'Other', 'link': 'https://example.com/category/other/'}]
+        self.wp.get_posts.side_effect = lambda **kwargs: self.posts
+        self.wp.get_media_by_ids.side_effect = lambda ids, **kwargs: [
+            {'id': media_id, 'source_url': f'https://example.com/m{media_id}.jpg', 'alt_text': ''} for media_id in ids]
+        
+        def request(method, endpoint, **kwargs):
+            if method == 'POST':
+                self.page['content'] = {'raw': kwargs['data']['content']}
+                self.page['modified_gmt'] = '2024-01-02T00:00:00'
+            return Mock(status_code=200, json=Mock(return_value=dict(self.page)))
+        self.wp._make_request.side_effect = request
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _builder(self):
+        return HomepageBuilder(self.wp, category_media={3: 201},
+                               state_file=Path(self.temp_dir) / 'state.json')
+    
+    def _writes(self):
+        return [c for c in self.wp._make_request.call_args_list if c.args[0] == 'POST']
+    
+    def test_fragments_batch_media_and_render(self):
+        """Test that every image is fetched in one batch and rendered escaped."""
+        fragments = self._builder().build()
+        
+        self.wp.get_media_by_ids.assert_called_once()
+        self.assertEqual(self.wp.get_media_by_ids.call_args.args[0], [201, 101])
+        self.assertEqual(fragments['carousel']['html'].count('category/finance/'), 2)
+        self.assertNotIn('category/other/', fragments['carousel']['html'])
+        self.assertIn('<h3>Rates &amp; Bonds</h3>', fragments['grid']['html'])
+        self.assertIn('alt="Rates &amp; Bonds"', fragments['grid']['html'])
+    
+    def test_publish_only_when_changed(self):
+        """Test that fragments are spliced in place and unchanged runs skip the page."""
+        result = self._builder().publish()
+        self.assertEqual(result['status'], 'updated')
+        self.assertEqual(result['changed'], ['carousel', 'grid'])
+        content = self.page['content']['raw']
+        self.assertTrue(content.startswith('<!-- wp:html -->\n<!-- mt-fragment:carousel '))
+        self.assertTrue(content.endswith('<p>Intro</p>'))
+        
+        self.wp._make_request.reset_mock()
+        result = self._builder().publish()
+        self.assertEqual(result['status'], 'unchanged')
+        self.wp._make_request.assert_not_called()
+        
+        # A new post changes only the grid region; the page is written once more
+        self.posts.insert(0, dict(self.posts[0], id=12, title={'rendered': 'New post'}))
+        result = self._builder().publish()
+        self.assertEqual(result['status'], 'updated')
+        self.assertEqual(result['changed'], ['grid'])
+        self.assertEqual(len(self._writes()), 1)
+        content = self.page['content']['raw']
+        self.assertEqual(content.count('<!-- mt-fragment:grid '), 1)
+        self.assertIn('<h3>New post</h3>', content)
+        
+        self.wp._make_request.reset_mock()
+        result = self._builder().publish(force=True)
+        self.assertEqual(result['status'], 'unchanged')
+        self.assertEqual(self._writes(), [])
+
+
+class TestMarkdownRenderer(unittest.TestCase):
+    """Test cases for the cached markdown renderer."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir) / 'content'
+        self.root.mkdir()
+        for i in range(3):
+            (self.root / f'post{i}.md').write_text(f'---\ntitle: Post {i}\n---\n# Heading {i}\n\nBody *{i}*\n')
+        self.db_path = Path(self.temp_dir) / 'renders.db'
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_converter_reused_and_output_unchanged(self):
+        """Test that one converter per thread renders like a fresh markdown pipeline."""
+        import markdown
+        markdown_renderer._local = threading.local()
+        renderer = MarkdownRenderer(disk=False)
+        texts = ['# Title\n\n[TOC]\n\n## Part', '```python\nx = 1\n```', '| a | b |\n|---|---|\n| 1 | 2 |']
+        with patch.object(markdown_renderer.markdown, 'Markdown', wraps=markdown.Markdown) as factory:
+            rendered = [renderer.render(text) for text in texts]
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual(rendered, [markdown.markdown(text, extensions=['extra', 'codehilite', 'toc'])
+                                    for text in texts])
+    
+    def test_tree_render_cached_by_body_hash(self):
+        """Test that a re-render of an unchanged tree converts nothing."""
+        first = list(MarkdownRenderer(db_path=self.db_path).render_tree(self.root))
+        self.assertEqual([doc['front_matter']['title'] for doc in first], ['Post 0', 'Post 1', 'Post 2'])
+        self.assertIn('<em>1</em>', first[1]['html_content'])
+        
+        # Front matter edits do not change the body; a body edit re-renders that file only
+        (self.root / 'post0.md').write_text('---\ntitle: Renamed\n---\n# Heading 0\n\nBody *0*\n')
+        (self.root / 'post2.md').write_text('# Heading 2\n\nNew body\n')
+        converted = []
+        with patch.object(markdown_renderer, '_convert_many',
+                          side_effect=lambda texts, *args: converted.extend(texts) or ['<p>new</p>'] * len(texts)):
+            second = list(MarkdownRenderer(db_path=self.db_path).render_tree(self.root))
+        self.assertEqual(converted, ['# Heading 2\n\nNew body\n'])
+        self.assertEqual(second[0]['front_matter']['title'], 'Renamed')
+        self.assertEqual(second[0]['html_content'], first[0]['html_content'])
+        self.assertEqual(second[2]['html_content'], '<p>new</p>')
+    
+    def test_pool_render_and_unreadable_file(self):
+        """Test that misses render on the worker pool and bad files are reported in place."""
+        (self.root / 'broken.md').write_bytes(b'\xff\xfe not utf-8')
+        with patch.object(markdown_renderer, 'PROCESS_POOL_MIN_ITEMS', 2):
+            docs = list(MarkdownRenderer(disk=False, workers=2).render_tree(self.root))
+        self.assertIn('error', docs[0])
+        self.assertEqual([doc['html_content'] for doc in docs[1:]],
+                         [MarkdownRenderer(disk=False).render(f'# Heading {i}\n\nBody *{i}*') for i in range(3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,7 @@ Complete content publishing and management workflows.
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, AuditStore
 from ..utils import print_header, print_section, print_success, print_error, ResultFormatter
 from ..validation import ComprehensiveValidator
 from .publisher import ContentPublisher
@@ -16,11 +16,15 @@ from .publisher import ContentPublisher
 class ContentWorkflow:
     """Complete content management workflow."""
     
-    def __init__(self, wp_client: WordPressClient = None):
+    # Below this a validation area counts as an issue in the audit store
+    AUDIT_THRESHOLD = 70
+    
+    def __init__(self, wp_client: WordPressClient = None, audit_store: AuditStore = None):
         """Initialize workflow."""
         self.wp = wp_client or WordPressClient()
         self.publisher = ContentPublisher(self.wp)
         self.validator = ComprehensiveValidator(self.wp)
+        self.audit_store = audit_store or AuditStore()
     
     def publish_with_validation(self, file_path: str, category: str = None,
                               status: str = 'publish', validate_after: bool = True,
@@ -147,8 +151,15 @@ class ContentWorkflow:
         
         return results
     
-    def quality_audit_workflow(self, post_ids: List[int] = None) -> Dict[str, Any]:
-        """Complete quality audit and fixing workflow."""
+    def quality_audit_workflow(self, post_ids: List[int] = None,
+                               regressions_only: bool = False) -> Dict[str, Any]:
+        """
+        Complete quality audit and fixing workflow.
+        
+        The assessment is recorded as a 'quality_audit' run; with
+        regressions_only, only posts that gained an issue or lost score since
+        their previous audit are fixed.
+        """
         print_header("Quality Audit Workflow")
         
         # Step 1: Comprehensive validation
@@ -158,22 +169,33 @@ class ContentWorkflow:
         if 'error' in validation_results:
             return {'success': False, 'error': validation_results['error']}
         
+        run_id = self._record_audit(validation_results)
+        changes = self.audit_store.diff('quality_audit', run_id)
+        
         # Step 2: Identify issues
         posts_needing_attention = [
             result for result in validation_results.get('validation_results', [])
             if result['summary']['needs_attention']
         ]
+        if regressions_only:
+            regressed = set(changes['regressed_subjects'])
+            posts_needing_attention = [r for r in posts_needing_attention if r['post_id'] in regressed]
         
         print_section("Step 2: Issue Analysis")
         print(f"📊 Posts analyzed: {validation_results['validated_posts']}")
         print(f"📈 Average quality: {validation_results['average_score']}%")
-        print(f"⚠️ Posts needing attention: {len(posts_needing_attention)}")
+        print(f"🆕 New issues: {len(changes['new_issues'])}, "
+              f"resolved: {len(changes['resolved_issues'])}, unchanged: {changes['persisting']}")
+        print(f"⚠️ Posts needing attention: {len(posts_needing_attention)}"
+              + (" (regressions only)" if regressions_only else ""))
         
         if not posts_needing_attention:
             print_success("🎉 All posts meet quality standards!")
             return {
                 'success': True,
                 'validation_results': validation_results,
+                'run_id': run_id,
+                'changes': changes,
                 'posts_fixed': 0,
                 'message': 'No fixes needed'
             }
@@ -190,6 +212,8 @@ class ContentWorkflow:
         return {
             'success': True,
             'initial_validation': validation_results,
+            'run_id': run_id,
+            'changes': changes,
             'fix_results': fix_results,
             'final_validation': final_validation,
             'improvement': {
@@ -200,6 +224,20 @@ class ContentWorkflow:
             }
         }
     
+    def _record_audit(self, validation_results: Dict[str, Any]) -> int:
+        """Store a validation run keyed by (post ID, area scoring below the threshold)."""
+        subjects, issues = {}, []
+        for result in validation_results.get('validation_results', []):
+            subjects[result['post_id']] = result['overall_score']
+            for area in ('seo', 'link', 'image'):
+                score = result['summary'][f'{area}_score']
+                if score < self.AUDIT_THRESHOLD:
+                    issues.append({'subject': result['post_id'], 'check': f'low_{area}_score',
+                                   'severity': 'high' if score < 40 else 'medium',
+                                   'detail': f'{area} score {score}%'})
+        return self.audit_store.record_run('quality_audit', subjects, issues,
+                                           meta={'average_score': validation_results.get('average_score')})
+    
     def _print_batch_summary(self, results: Dict[str, Any], dry_run: bool):
         """Print batch workflow summary."""
         mode = " (DRY RUN)" if dry_run else ""
@@ -7,6 +7,13 @@ Core WordPress functionality - client, authentication, and configuration.
 from .config import config, Config
 from .auth import auth, WordPressAuth
 from .client import WordPressClient, WordPressAPIError, create_client
+from .metrics import metrics, MetricsRegistry
+from .media_index import MediaIndex
+from .media_pipeline import MediaIngestPipeline
+from .audit_store import AuditStore
+from .edit_session import EditSession
+from .page_cache import PageCache, page_cache
+from .result_sink import ResultSink, iter_results
 
 __all__ = [
     'config',
@@ -15,5 +22,15 @@ __all__ = [
     'WordPressAuth',
     'WordPressClient',
     'WordPressAPIError',
-    'create_client'
+    'create_client',
+    'metrics',
+    'MetricsRegistry',
+    'MediaIndex',
+    'MediaIngestPipeline',
+    'AuditStore',
+    'EditSession',
+    'PageCache',
+    'page_cache',
+    'ResultSink',
+    'iter_results'
 ]
\ No newline at end of file
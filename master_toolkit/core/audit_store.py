@@ -0,0 +1,286 @@
+"""
+Audit Run Store
+===============
+Per-run persistence of audit results keyed by (subject, check).
+
+Every validation or audit run records the subjects it evaluated (post IDs
+or URLs, each with an optional score) and the issues it found. Diffing a
+run against each subject's previous evaluation is a handful of indexed
+queries, so fixers can act only on regressions and reports can list what
+changed instead of repeating the whole site every time.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+
+from .metrics import metrics
+from .storage import SQLiteStore, chunked, placeholders
+
+
+# Subjects are untyped columns so post IDs stay integers and URLs stay text
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS audit_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        audit TEXT NOT NULL,
+        started_at TEXT,
+        finished_at TEXT,
+        subject_count INTEGER,
+        issue_count INTEGER,
+        meta TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_audit_runs_audit ON audit_runs (audit, id);
+
+    CREATE TABLE IF NOT EXISTS audit_subjects (
+        run_id INTEGER NOT NULL,
+        subject NOT NULL,
+        score REAL,
+        PRIMARY KEY (run_id, subject)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_audit_subjects_subject ON audit_subjects (subject, run_id);
+
+    CREATE TABLE IF NOT EXISTS audit_issues (
+        run_id INTEGER NOT NULL,
+        subject NOT NULL,
+        check_name TEXT NOT NULL,
+        severity TEXT,
+        detail TEXT,
+        PRIMARY KEY (run_id, subject, check_name)
+    ) WITHOUT ROWID;
+'''
+
+
+class AuditStore(SQLiteStore):
+    """SQLite store of audit runs with run-to-run diffing."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize the store."""
+        super().__init__(db_path or Path(__file__).parent / 'audit_runs.db', SCHEMA)
+        self._connect()
+
+    # Recording
+
+    def record_run(self, audit: str, subjects: Dict[Any, Optional[float]],
+                   issues: Iterable[Dict[str, Any]] = (), meta: Dict[str, Any] = None,
+                   started_at: str = None) -> int:
+        """
+        Persist one audit run.
+
+        Args:
+            audit: Audit name (runs are only diffed against the same audit)
+            subjects: Every evaluated subject mapped to its score (or None)
+            issues: Dicts with subject, check and optional severity/detail;
+                a subject with issues counts as evaluated even if absent
+                from subjects
+            meta: Free-form run metadata (stored as JSON)
+
+        Returns:
+            The new run ID
+        """
+        issue_rows = {}
+        for issue in issues:
+            key = (issue['subject'], issue['check'])
+            issue_rows[key] = (issue.get('severity'), issue.get('detail'))
+        subjects = dict(subjects)
+        for subject, _ in issue_rows:
+            subjects.setdefault(subject, None)
+
+        conn = self._connect()
+        with metrics.span('audit_store.record_run'):
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                run_id = conn.execute('''
+                    INSERT INTO audit_runs (audit, started_at, finished_at, subject_count, issue_count, meta)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (audit, started_at or datetime.now().isoformat(), datetime.now().isoformat(),
+                      len(subjects), len(issue_rows), json.dumps(meta or {}))).lastrowid
+                conn.executemany('INSERT INTO audit_subjects (run_id, subject, score) VALUES (?, ?, ?)',
+                                 [(run_id, subject, score) for subject, score in subjects.items()])
+                conn.executemany('''
+                    INSERT INTO audit_issues (run_id, subject, check_name, severity, detail)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(run_id, subject, check, severity, detail)
+                      for (subject, check), (severity, detail) in issue_rows.items()])
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return run_id
+
+    # Reading
+
+    def runs(self, audit: str = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent runs first."""
+        sql = 'SELECT * FROM audit_runs'
+        params: List[Any] = []
+        if audit:
+            sql += ' WHERE audit = ?'
+            params.append(audit)
+        rows = self._connect().execute(sql + ' ORDER BY id DESC LIMIT ?', params + [limit])
+        return [self._run_dict(row) for row in rows]
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """One run's metadata."""
+        row = self._connect().execute('SELECT * FROM audit_runs WHERE id = ?', (run_id,)).fetchone()
+        return self._run_dict(row) if row else None
+
+    def latest_run(self, audit: str) -> Optional[int]:
+        """ID of the most recent run of an audit."""
+        row = self._connect().execute('SELECT MAX(id) FROM audit_runs WHERE audit = ?', (audit,)).fetchone()
+        return row[0]
+
+    def scores(self, run_id: int) -> Dict[Any, Optional[float]]:
+        """Subject -> score for one run."""
+        rows = self._connect().execute('SELECT subject, score FROM audit_subjects WHERE run_id = ?', (run_id,))
+        return {row['subject']: row['score'] for row in rows}
+
+    def issues(self, run_id: int, subject: Any = None) -> List[Dict[str, Any]]:
+        """Issues recorded in one run (optionally for one subject)."""
+        sql = 'SELECT subject, check_name, severity, detail FROM audit_issues WHERE run_id = ?'
+        params: List[Any] = [run_id]
+        if subject is not None:
+            sql += ' AND subject = ?'
+            params.append(subject)
+        return [_issue_dict(row) for row in self._connect().execute(sql, params)]
+
+    @staticmethod
+    def _run_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        run = dict(row)
+        run['meta'] = json.loads(run['meta'] or '{}')
+        return run
+
+    # Diffing
+
+    def diff(self, audit: str, run_id: int = None, base_run_id: int = None,
+             min_score_delta: float = 0.0) -> Dict[str, Any]:
+        """
+        Compare a run (default: the latest) with earlier results.
+
+        Each subject is compared with its most recent earlier evaluation by
+        the same audit, so partial runs (a few post IDs) diff correctly
+        against a full run. Pass base_run_id to compare with one run only.
+
+        Returns:
+            new_issues, resolved_issues, persisting (count), score_changes
+            (subject, before, after, delta), new_subjects and
+            regressed_subjects (new issues or a lower score)
+        """
+        conn = self._connect()
+        run_id = run_id or self.latest_run(audit)
+        if run_id is None:
+            raise ValueError(f"No recorded runs for audit {audit!r}")
+
+        if base_run_id is None:
+            base_sql = '''
+                SELECT s.subject, MAX(s.run_id) AS run_id
+                FROM audit_subjects s JOIN audit_runs r ON r.id = s.run_id
+                WHERE r.audit = :audit AND s.run_id < :run
+                  AND s.subject IN (SELECT subject FROM audit_subjects WHERE run_id = :run)
+                GROUP BY s.subject
+            '''
+        else:
+            base_sql = '''
+                SELECT subject, :base AS run_id FROM audit_subjects
+                WHERE run_id = :base
+                  AND subject IN (SELECT subject FROM audit_subjects WHERE run_id = :run)
+            '''
+        params = {'audit': audit, 'run': run_id, 'base': base_run_id}
+
+        with metrics.span('audit_store.diff'):
+            conn.execute('BEGIN')
+            try:
+                conn.execute('DROP TABLE IF EXISTS temp.audit_base')
+                conn.execute(f'CREATE TEMP TABLE audit_base AS {base_sql}', params)
+                conn.execute('CREATE UNIQUE INDEX temp.idx_audit_base ON audit_base (subject)')
+
+                new_issues = conn.execute('''
+                    SELECT c.subject, c.check_name, c.severity, c.detail FROM audit_issues c
+                    LEFT JOIN audit_base b ON b.subject = c.subject
+                    WHERE c.run_id = :run AND NOT EXISTS (
+                        SELECT 1 FROM audit_issues p
+                        WHERE p.run_id = b.run_id AND p.subject = c.subject AND p.check_name = c.check_name)
+                    ORDER BY c.subject, c.check_name
+                ''', params).fetchall()
+
+                resolved_issues = conn.execute('''
+                    SELECT p.subject, p.check_name, p.severity, p.detail
+                    FROM audit_base b JOIN audit_issues p ON p.run_id = b.run_id AND p.subject = b.subject
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM audit_issues c
+                        WHERE c.run_id = :run AND c.subject = p.subject AND c.check_name = p.check_name)
+                    ORDER BY p.subject, p.check_name
+                ''', params).fetchall()
+
+                persisting = conn.execute('''
+                    SELECT COUNT(*) FROM audit_base b
+                    JOIN audit_issues p ON p.run_id = b.run_id AND p.subject = b.subject
+                    JOIN audit_issues c ON c.run_id = :run AND c.subject = p.subject
+                                       AND c.check_name = p.check_name
+                ''', params).fetchone()[0]
+
+                score_changes = conn.execute('''
+                    SELECT c.subject, p.score AS before, c.score AS after, c.score - p.score AS delta
+                    FROM audit_base b
+                    JOIN audit_subjects p ON p.run_id = b.run_id AND p.subject = b.subject
+                    JOIN audit_subjects c ON c.run_id = :run AND c.subject = b.subject
+                    WHERE c.score IS NOT NULL AND p.score IS NOT NULL
+                      AND c.score != p.score AND ABS(c.score - p.score) >= :min_delta
+                    ORDER BY c.score - p.score
+                ''', dict(params, min_delta=min_score_delta)).fetchall()
+
+                new_subjects = [row[0] for row in conn.execute('''
+                    SELECT subject FROM audit_subjects
+                    WHERE run_id = :run AND subject NOT IN (SELECT subject FROM audit_base)
+                    ORDER BY subject
+                ''', params)]
+                compared = conn.execute('SELECT COUNT(*) FROM audit_base').fetchone()[0]
+
+                conn.execute('DROP TABLE temp.audit_base')
+            finally:
+                conn.execute('COMMIT')
+
+        new_issues = [_issue_dict(row) for row in new_issues]
+        score_changes = [dict(row) for row in score_changes]
+        regressed = {issue['subject'] for issue in new_issues}
+        regressed.update(change['subject'] for change in score_changes if change['delta'] < 0)
+
+        return {
+            'audit': audit,
+            'run_id': run_id,
+            'base_run_id': base_run_id,
+            'subjects_compared': compared,
+            'new_issues': new_issues,
+            'resolved_issues': [_issue_dict(row) for row in resolved_issues],
+            'persisting': persisting,
+            'score_changes': score_changes,
+            'new_subjects': new_subjects,
+            'regressed_subjects': sorted(regressed, key=lambda s: (isinstance(s, str), s)),
+        }
+
+    # Maintenance
+
+    def prune(self, audit: str, keep: int = 20) -> int:
+        """Drop all but the newest runs of an audit; returns the number removed."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            old = [row[0] for row in conn.execute(
+                'SELECT id FROM audit_runs WHERE audit = ? ORDER BY id DESC LIMIT -1 OFFSET ?', (audit, keep))]
+            for chunk in chunked(old):
+                marks = placeholders(chunk)
+                for table in ('audit_issues', 'audit_subjects'):
+                    conn.execute(f'DELETE FROM {table} WHERE run_id IN ({marks})', chunk)
+                conn.execute(f'DELETE FROM audit_runs WHERE id IN ({marks})', chunk)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(old)
+
+
+def _issue_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """Issue row as {subject, check, severity, detail}."""
+    return {'subject': row['subject'], 'check': row['check_name'],
+            'severity': row['severity'], 'detail': row['detail']}
@@ -2,20 +2,33 @@
 WordPress API Client
 ===================
 Unified WordPress REST API client with comprehensive functionality.
+
+Identical GET requests issued concurrently (e.g. several optimization
+engines loading the same post) are coalesced: the first caller performs
+the request and the others wait for and share its response.
 """
 
+import json
+import mimetypes
+import os
 import requests
+import threading
 import time
-from typing import Dict, List, Optional, Any, Union
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Any, Union, Iterator, Iterable
 from urllib.parse import urljoin
 
 from .config import config
 from .auth import auth
+from .metrics import metrics
 
 
 class WordPressAPIError(Exception):
     """Custom exception for WordPress API errors."""
-    pass
+
+    def __init__(self, message: str = '', status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class WordPressClient:
@@ -32,6 +45,10 @@ class WordPressClient:
             'Accept': 'application/json'
         })
         
+        # In-flight GETs by request key, for single-flight coalescing
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
         # Authenticate if credentials provided
         if username and password:
             self.authenticate(username, password)
@@ -47,10 +64,15 @@ class WordPressClient:
     
     def _make_request(self, method: str, endpoint: str, 
                      data: Dict = None, params: Dict = None, 
-                     context: str = None) -> requests.Response:
-        """Make authenticated API request with error handling."""
+                     context: str = None, body: Any = None,
+                     headers: Dict = None) -> requests.Response:
+        """
+        Make authenticated API request with error handling.
+        A raw body (bytes or file object) is sent as-is instead of JSON data.
+        A GET identical to one already in flight shares that request's response.
+        """
         if not auth.is_authenticated():
-            raise WordPressAPIError("Not authenticated. Call authenticate() first.")
+            raise WordPressAPIError("Not authenticated. Call authenticate() first.", 401)
         
         url = config.get_api_url(endpoint)
         
@@ -60,17 +82,55 @@ class WordPressClient:
         if context:
             params['context'] = context
         
+        if method != 'GET' or body is not None:
+            return self._send(method, endpoint, url, data, params, body, headers)
+        
+        key = (url, json.dumps(params, sort_keys=True, default=str),
+               json.dumps(headers, sort_keys=True, default=str))
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+        metrics.record_cache('wp_api_coalesce', not leader)
+        if not leader:
+            return flight.result()
+        
+        try:
+            response = self._send(method, endpoint, url, data, params, body, headers)
+        except BaseException as e:
+            self._land(key)
+            flight.set_exception(e)
+            raise
+        self._land(key)
+        flight.set_result(response)
+        return response
+    
+    def _land(self, key: tuple):
+        """Stop sharing a finished request so later identical GETs go to the server."""
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+    
+    def _send(self, method: str, endpoint: str, url: str, data: Dict, params: Dict,
+              body: Any, headers: Dict) -> requests.Response:
+        """Perform one request and record its metrics."""
+        start_time = time.perf_counter()
         try:
             response = self.session.request(
                 method=method,
                 url=url,
-                json=data,
+                json=data if body is None else None,
+                data=body,
                 params=params,
+                headers=headers,
                 timeout=config.get('timeout')
             )
+            metrics.record_request(method, endpoint, response.status_code,
+                                   time.perf_counter() - start_time)
             return response
             
         except requests.RequestException as e:
+            metrics.record_request(method, endpoint, 'error', time.perf_counter() - start_time)
             raise WordPressAPIError(f"Request failed: {e}")
     
     def test_connection(self) -> bool:
@@ -107,6 +167,75 @@ class WordPressClient:
         else:
             raise WordPressAPIError(f"Failed to get posts: {response.status_code}")
     
+    def get_media(self, per_page: int = 10, page: int = 1, context: str = None,
+                  **kwargs) -> List[Dict]:
+        """Get media library items."""
+        params = {
+            'per_page': min(per_page, config.get('per_page_limit')),
+            'page': page,
+            **kwargs
+        }
+        
+        response = self._make_request('GET', 'media', params=params, context=context)
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise WordPressAPIError(f"Failed to get media: {response.status_code}", response.status_code)
+    
+    def iter_collection(self, endpoint: str, per_page: int = 100, context: str = None,
+                        **params) -> Iterator[Dict]:
+        """Yield every item of a collection endpoint, following X-WP-TotalPages."""
+        page = 1
+        while True:
+            response = self._make_request(
+                'GET', endpoint,
+                params={'per_page': min(per_page, config.get('per_page_limit')), 'page': page, **params},
+                context=context
+            )
+            
+            if response.status_code != 200:
+                raise WordPressAPIError(f"Failed to list {endpoint}: {response.status_code}",
+                                        response.status_code)
+            
+            items = response.json()
+            yield from items
+            
+            total_pages = int(response.headers.get('X-WP-TotalPages') or page)
+            if not items or page >= total_pages:
+                return
+            page += 1
+    
+    def _get_by_ids(self, endpoint: str, ids: Iterable[int], context: str = None,
+                    **params) -> List[Dict]:
+        """Items of a collection by ID via include=, one request per 100 IDs, in the order given."""
+        ids = list(dict.fromkeys(int(item_id) for item_id in ids))
+        chunk_size = min(100, config.get('per_page_limit'))
+        found = {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            response = self._make_request(
+                'GET', endpoint,
+                params={'include': ','.join(map(str, chunk)), 'per_page': len(chunk), **params},
+                context=context
+            )
+            if response.status_code != 200:
+                raise WordPressAPIError(f"Failed to get {endpoint} by ID: {response.status_code}",
+                                        response.status_code)
+            found.update((item['id'], item) for item in response.json())
+        return [found[item_id] for item_id in ids if item_id in found]
+    
+    def get_posts_by_ids(self, post_ids: Iterable[int], context: str = None, **kwargs) -> List[Dict]:
+        """
+        Get many posts in as few requests as possible.
+        IDs the listing does not return (e.g. other statuses than requested) are left out.
+        """
+        return self._get_by_ids('posts', post_ids, context=context, **kwargs)
+    
+    def get_media_by_ids(self, media_ids: Iterable[int], context: str = None, **kwargs) -> List[Dict]:
+        """Get many media items in as few requests as possible (missing IDs are left out)."""
+        return self._get_by_ids('media', media_ids, context=context, **kwargs)
+    
     def get_post(self, post_id: int, context: str = None) -> Dict:
         """Get a single post by ID."""
         response = self._make_request('GET', f'posts/{post_id}', context=context)
@@ -137,6 +266,8 @@ class WordPressClient:
             update_data['status'] = data['status']
         if 'categories' in data:
             update_data['categories'] = data['categories']
+        if 'featured_media' in data:
+            update_data['featured_media'] = data['featured_media']
         
         response = self._make_request('POST', f'posts/{post_id}', data=update_data)
         
@@ -144,7 +275,48 @@ class WordPressClient:
             return response.json()
         else:
             error_text = response.text
-            raise WordPressAPIError(f"Failed to update post {post_id}: {response.status_code} - {error_text}")
+            raise WordPressAPIError(f"Failed to update post {post_id}: {response.status_code} - {error_text}",
+                                    response.status_code)
+    
+    def set_featured_media(self, post_id: int, media_id: int) -> Dict:
+        """Set a post's featured image without re-reading the post first."""
+        response = self._make_request('POST', f'posts/{post_id}', data={'featured_media': media_id})
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise WordPressAPIError(f"Failed to set featured media on post {post_id}: {response.status_code}",
+                                    response.status_code)
+    
+    def upload_media(self, file_content: bytes = None, filename: str = None,
+                     alt_text: str = '', caption: str = '', file_path: str = None,
+                     mime_type: str = None) -> Dict:
+        """
+        Upload a file to the media library.
+        Pass file_path to stream the upload from disk instead of holding it in memory.
+        """
+        if file_path is None and file_content is None:
+            raise WordPressAPIError("upload_media needs file_content or file_path")
+        
+        filename = filename or os.path.basename(file_path)
+        mime_type = mime_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        headers = {
+            'Content-Type': mime_type,
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        }
+        params = {key: value for key, value in (('alt_text', alt_text), ('caption', caption)) if value}
+        
+        if file_path is not None:
+            with open(file_path, 'rb') as f:
+                response = self._make_request('POST', 'media', params=params, body=f, headers=headers)
+        else:
+            response = self._make_request('POST', 'media', params=params, body=file_content, headers=headers)
+        
+        if response.status_code == 201:
+            return response.json()
+        else:
+            raise WordPressAPIError(f"Failed to upload media {filename}: {response.status_code}",
+                                    response.status_code)
     
     def create_post(self, title: str, content: str, status: str = None,
                    categories: List[str] = None, **kwargs) -> Dict:
@@ -0,0 +1,162 @@
+"""
+Post Edit Session
+=================
+Single read-modify-write cycle shared by every fixer touching a post.
+
+The post is loaded once in edit context. Fixers read and replace fields
+on the in-memory copy (raw content, title, slug, ...). Commit then sends
+only the fields that actually changed, in one request. Before writing,
+commit checks the post's ``modified_gmt`` so that an edit made elsewhere
+in the meantime raises a conflict instead of being silently overwritten.
+"""
+
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from .client import WordPressClient, WordPressAPIError
+from .metrics import metrics
+
+
+# Fields whose edit-context value is {'raw': ..., 'rendered': ...}
+RAW_FIELDS = ('content', 'title', 'excerpt')
+
+
+class EditSession:
+    """One post loaded for editing, written back once."""
+
+    def __init__(self, wp_client: WordPressClient, post_id: int, post_type: str = 'posts',
+                 post: Dict[str, Any] = None):
+        """
+        Initialize the session; the post is fetched on first use unless an
+        edit-context copy (e.g. from a collection listing) is passed in.
+        """
+        self.wp = wp_client
+        self.post_id = post_id
+        self.post_type = post_type
+        self._post: Optional[Dict[str, Any]] = post
+        self._original: Dict[str, Any] = {}
+        self._values: Dict[str, Any] = {}
+        self.fixes: Dict[str, List[str]] = {}
+
+    # Loading
+
+    @property
+    def post(self) -> Dict[str, Any]:
+        """The post as loaded (edit context), fetched once."""
+        if self._post is None:
+            response = self.wp._make_request('GET', f'{self.post_type}/{self.post_id}', context='edit')
+            if response.status_code != 200:
+                raise WordPressAPIError(f"Failed to get post {self.post_id}: {response.status_code}",
+                                        response.status_code)
+            self._reset(response.json())
+        return self._post
+
+    def _reset(self, post: Dict[str, Any]):
+        self._post = post
+        self._original = {}
+        self._values = {}
+
+    @property
+    def modified_gmt(self) -> Optional[str]:
+        """Last-modified timestamp of the loaded copy."""
+        return self.post.get('modified_gmt')
+
+    # Fields
+
+    def get(self, field: str) -> Any:
+        """Current value of a field (raw where available, else rendered)."""
+        if field in self._values:
+            return self._values[field]
+        value = self.post.get(field)
+        if field in RAW_FIELDS and isinstance(value, dict):
+            value = value['raw'] if 'raw' in value else value.get('rendered', '')
+        return value
+
+    def set(self, field: str, value: Any):
+        """Replace a field on the in-memory copy."""
+        if field not in self._original:
+            self._original[field] = self.get(field)
+        self._values[field] = value
+
+    @property
+    def content(self) -> str:
+        return self.get('content') or ''
+
+    @content.setter
+    def content(self, value: str):
+        self.set('content', value)
+
+    @property
+    def content_source(self) -> str:
+        """'raw' if the site returned raw content, else 'rendered'."""
+        return 'raw' if 'raw' in self.post.get('content', {}) else 'rendered'
+
+    def rendered(self, field: str) -> str:
+        """Rendered value of a field as loaded (not affected by pending edits)."""
+        value = self.post.get(field)
+        return value.get('rendered', '') if isinstance(value, dict) else (value or '')
+
+    def apply(self, fixer: str, field: str,
+              transform: Callable[[Any], Tuple[Any, List[str]]]) -> List[str]:
+        """
+        Run a (new_value, fixes) transform over a field and record its fixes.
+
+        The field is only marked changed when the transform altered it.
+        """
+        new_value, fixes = transform(self.get(field))
+        if fixes and new_value != self.get(field):
+            self.set(field, new_value)
+        self.fixes.setdefault(fixer, []).extend(fixes)
+        return fixes
+
+    @property
+    def changes(self) -> Dict[str, Any]:
+        """Fields that differ from the loaded post."""
+        return {field: value for field, value in self._values.items()
+                if value != self._original.get(field)}
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.changes)
+
+    # Writing
+
+    def commit(self, check_conflict: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Write all changed fields in one request.
+
+        Args:
+            check_conflict: Re-read only modified_gmt first and refuse to
+                write if the post changed since it was loaded
+
+        Returns:
+            The updated post, or None if nothing changed
+
+        Raises:
+            WordPressAPIError: status 409 on a conflicting edit
+        """
+        changes = self.changes
+        if not changes:
+            return None
+
+        endpoint = f'{self.post_type}/{self.post_id}'
+        with metrics.span('edit_session.commit'):
+            if check_conflict and self.modified_gmt:
+                response = self.wp._make_request('GET', endpoint, context='edit',
+                                                 params={'_fields': 'modified_gmt'})
+                if response.status_code != 200:
+                    raise WordPressAPIError(f"Failed to check post {self.post_id}: {response.status_code}",
+                                            response.status_code)
+                current = response.json().get('modified_gmt')
+                if current != self.modified_gmt:
+                    raise WordPressAPIError(
+                        f"Post {self.post_id} was modified at {current} after it was loaded "
+                        f"({self.modified_gmt}); not overwriting", 409)
+
+            response = self.wp._make_request('POST', endpoint, data=changes)
+            if response.status_code != 200:
+                raise WordPressAPIError(f"Failed to update post {self.post_id}: "
+                                        f"{response.status_code} - {response.text}", response.status_code)
+
+        updated = response.json()
+        self._reset(updated)
+        return updated
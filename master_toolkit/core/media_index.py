@@ -0,0 +1,246 @@
+"""
+Content-Addressed Media Index
+=============================
+Local sha256 -> media_id index of the WordPress media library.
+
+The index is built by streaming every attachment's source file through
+sha256 once, then kept current with incremental syncs (modified_after).
+The media ingest pipeline consults it before uploading so byte-identical
+images are reused instead of re-uploaded, and duplicates already in the
+library are reported with the storage they waste.
+"""
+
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import config
+from .client import WordPressClient
+from .metrics import metrics
+from .storage import SQLiteStore
+
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS media_hashes (
+        media_id INTEGER PRIMARY KEY,
+        sha256 TEXT NOT NULL,
+        size INTEGER,
+        source_url TEXT,
+        modified_gmt TEXT,
+        indexed_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_media_hashes_sha256 ON media_hashes (sha256);
+
+    CREATE TABLE IF NOT EXISTS media_index_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+'''
+
+
+class MediaIndex(SQLiteStore):
+    """SQLite-backed content hash index of media library attachments."""
+
+    def __init__(self, db_path: Optional[Path] = None, wp_client: WordPressClient = None,
+                 max_workers: int = 8):
+        """Initialize media index."""
+        super().__init__(db_path or Path(__file__).parent / 'media_index.db', SCHEMA)
+        self.wp = wp_client
+        self.max_workers = max_workers
+        self._connect()
+
+    # Lookups
+
+    def lookup(self, sha256: str) -> Optional[int]:
+        """Oldest media ID with the given content hash, if any."""
+        row = self._connect().execute(
+            'SELECT MIN(media_id) AS media_id FROM media_hashes WHERE sha256 = ?', (sha256,)
+        ).fetchone()
+        hit = row['media_id'] is not None
+        metrics.record_cache('media_index', hit)
+        return row['media_id'] if hit else None
+
+    def add(self, sha256: str, media_id: int, size: int = None, source_url: str = None,
+            modified_gmt: str = None):
+        """Record a media item's content hash (e.g. right after uploading it)."""
+        self._connect().execute('''
+            INSERT OR REPLACE INTO media_hashes
+                (media_id, sha256, size, source_url, modified_gmt, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (media_id, sha256, size, source_url, modified_gmt, datetime.now().isoformat()))
+
+    def remove(self, media_id: int):
+        """Drop a media item from the index."""
+        self._connect().execute('DELETE FROM media_hashes WHERE media_id = ?', (media_id,))
+
+    def __len__(self) -> int:
+        """Number of indexed media items."""
+        return self._connect().execute('SELECT COUNT(*) FROM media_hashes').fetchone()[0]
+
+    # Syncing
+
+    def sync(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the index up to date with the media library.
+
+        Incremental syncs only fetch attachments modified since the last sync
+        and catch deletions with an IDs-only listing. A full sync re-lists the
+        whole library; files are only re-hashed when their modified date
+        changed. Deleted attachments are pruned either way, so lookup() never
+        offers them for reuse.
+        """
+        if self.wp is None:
+            self.wp = WordPressClient()
+
+        conn = self._connect()
+        since = None if full else self._get_state('last_modified')
+        known = {row['media_id']: row['modified_gmt']
+                 for row in conn.execute('SELECT media_id, modified_gmt FROM media_hashes')}
+
+        params = {'orderby': 'modified', 'order': 'asc'}
+        if since:
+            params['modified_after'] = since
+
+        seen_ids = set()
+        to_hash = []
+        newest = since
+        for item in self.wp.iter_collection('media', **params):
+            seen_ids.add(item['id'])
+            # modified_after is matched against the site-local modified date
+            if item.get('modified') and (newest is None or item['modified'] > newest):
+                newest = item['modified']
+            if item['id'] not in known or known[item['id']] != item.get('modified_gmt'):
+                to_hash.append(item)
+
+        if full:
+            remote_ids = seen_ids
+        else:
+            remote_ids = {item['id'] for item in self.wp.iter_collection('media', _fields='id')}
+
+        hashed, errors = self._hash_items(to_hash)
+        for item, (digest, size) in hashed:
+            self.add(digest, item['id'], size, item.get('source_url'), item.get('modified_gmt'))
+
+        deleted = set(known) - remote_ids
+        for media_id in deleted:
+            self.remove(media_id)
+
+        # Keep the cursor where it was if anything failed so the next sync retries it
+        if newest and not errors:
+            self._set_state('last_modified', newest)
+
+        return {
+            'listed': len(seen_ids),
+            'hashed': len(hashed),
+            'pruned': len(deleted),
+            'errors': errors,
+            'indexed_total': len(self)
+        }
+
+    def _hash_items(self, items: List[Dict]) -> Tuple[List[Tuple[Dict, Tuple[str, int]]], List[Dict]]:
+        """Stream-hash attachment files concurrently."""
+        if not items:
+            return [], []
+
+        session = requests.Session()
+        session.headers.update({'User-Agent': config.get('user_agent')})
+        adapter = HTTPAdapter(pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        def work(item):
+            try:
+                return item, hash_url(session, item['source_url']), None
+            except Exception as e:
+                return item, None, str(e)
+
+        hashed, errors = [], []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item, result, error in executor.map(work, items):
+                if error:
+                    errors.append({'media_id': item['id'], 'error': error})
+                else:
+                    hashed.append((item, result))
+        return hashed, errors
+
+    def _get_state(self, key: str) -> Optional[str]:
+        """Read a sync state value."""
+        row = self._connect().execute(
+            'SELECT value FROM media_index_state WHERE key = ?', (key,)
+        ).fetchone()
+        return row['value'] if row else None
+
+    def _set_state(self, key: str, value: str):
+        """Store a sync state value."""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO media_index_state (key, value) VALUES (?, ?)', (key, value)
+        )
+
+    # Reporting
+
+    def find_duplicates(self) -> List[Dict[str, Any]]:
+        """Groups of byte-identical attachments, largest waste first."""
+        rows = self._connect().execute('''
+            SELECT sha256, media_id, size, source_url FROM media_hashes
+            WHERE sha256 IN (SELECT sha256 FROM media_hashes GROUP BY sha256 HAVING COUNT(*) > 1)
+            ORDER BY sha256, media_id
+        ''').fetchall()
+
+        groups: Dict[str, List[sqlite3.Row]] = {}
+        for row in rows:
+            groups.setdefault(row['sha256'], []).append(row)
+
+        duplicates = []
+        for digest, members in groups.items():
+            keep, redundant = members[0], members[1:]
+            duplicates.append({
+                'sha256': digest,
+                'keep_media_id': keep['media_id'],
+                'keep_url': keep['source_url'],
+                'duplicate_media_ids': [m['media_id'] for m in redundant],
+                'reclaimable_bytes': sum(m['size'] or 0 for m in redundant)
+            })
+        duplicates.sort(key=lambda d: d['reclaimable_bytes'], reverse=True)
+        return duplicates
+
+    def duplicates_report(self) -> Dict[str, Any]:
+        """Summary of duplicate groups and reclaimable storage."""
+        duplicates = self.find_duplicates()
+        return {
+            'indexed_media': len(self),
+            'duplicate_groups': len(duplicates),
+            'redundant_media': sum(len(d['duplicate_media_ids']) for d in duplicates),
+            'reclaimable_bytes': sum(d['reclaimable_bytes'] for d in duplicates),
+            'groups': duplicates
+        }
+
+
+def hash_file(path: str) -> Tuple[str, int]:
+    """sha256 hex digest and size of a local file."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def hash_url(session: requests.Session, url: str) -> Tuple[str, int]:
+    """sha256 hex digest and size of a remote file, streamed without buffering it."""
+    digest = hashlib.sha256()
+    size = 0
+    with session.get(url, stream=True, timeout=config.get('timeout')) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
@@ -0,0 +1,338 @@
+"""
+Media Ingest Pipeline
+=====================
+Concurrent download -> upload -> attach pipeline for featured images.
+
+Each stage runs its own worker threads and hands items to the next stage
+through a bounded queue, so downloads overlap uploads and attachments while
+at most a fixed number of images sit on disk at once. Images are streamed to
+temporary files and uploaded from disk; each stage retries transient failures
+(connection errors, timeouts, 429 and 5xx responses) on its own.
+
+With a MediaIndex attached, downloads are hashed as they stream and an
+image whose bytes are already in the media library is attached by its
+existing media ID instead of being uploaded again.
+"""
+
+import hashlib
+import os
+import queue
+import random
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Any, Optional, Callable, Iterable
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import config
+from .client import WordPressClient, WordPressAPIError
+from .media_index import MediaIndex
+from .metrics import metrics
+
+
+# HTTP statuses worth retrying; anything else in the 4xx range is permanent
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Locks serializing uploads by content hash; a fixed set keeps memory bounded
+HASH_LOCK_STRIPES = 64
+
+_STOP = object()
+
+
+class MediaIngestPipeline:
+    """Bounded-queue pipeline that downloads, uploads and attaches images."""
+
+    STAGES = ('download', 'upload', 'attach')
+
+    def __init__(self, wp_client: WordPressClient = None, download_workers: int = 8,
+                 upload_workers: int = 6, attach_workers: int = 4, queue_size: int = 16,
+                 max_attempts: int = 3, retry_delay: float = 1.0, temp_dir: str = None,
+                 on_result: Callable[[Dict[str, Any]], None] = None,
+                 media_index: MediaIndex = None):
+        """
+        Initialize media ingest pipeline.
+
+        Args:
+            wp_client: Authenticated client used for uploads and attachments
+            download_workers / upload_workers / attach_workers: Threads per stage
+            queue_size: Capacity of each inter-stage queue (bounds temp files on disk)
+            max_attempts: Attempts per stage before an item is marked failed
+            retry_delay: Base delay for exponential backoff between attempts
+            temp_dir: Directory for downloaded images (a private one is created if omitted)
+            on_result: Callback invoked once per item with its final result
+            media_index: Content hash index consulted before uploading
+        """
+        self.wp = wp_client or WordPressClient()
+        self.workers = {
+            'download': max(1, download_workers),
+            'upload': max(1, upload_workers),
+            'attach': max(1, attach_workers)
+        }
+        self.queue_size = max(1, queue_size)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.temp_dir = temp_dir
+        self.on_result = on_result
+        self.media_index = media_index
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.get('user_agent')})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers['download'])
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._results_lock = threading.Lock()
+        # Serializes lookup+upload per content hash so identical images in one
+        # batch are uploaded once and reused by the rest
+        self._hash_locks = [threading.Lock() for _ in range(HASH_LOCK_STRIPES)]
+
+    def run(self, items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Ingest a batch of images.
+
+        Each item is a dict with post_id and image_url, plus optional filename,
+        alt_text, caption and attach (False to upload without setting featured_media).
+
+        Returns:
+            Summary with per-item results and success/failure counts
+        """
+        results: List[Dict[str, Any]] = []
+        owns_temp_dir = self.temp_dir is None
+        work_dir = tempfile.mkdtemp(prefix='wp_media_') if owns_temp_dir else self.temp_dir
+        os.makedirs(work_dir, exist_ok=True)
+
+        queues = {stage: queue.Queue(maxsize=self.queue_size) for stage in self.STAGES}
+        handlers = {
+            'download': lambda item: self._download(item, work_dir),
+            'upload': self._upload,
+            'attach': self._attach
+        }
+        next_stage = {'download': 'upload', 'upload': 'attach', 'attach': None}
+
+        start_time = time.perf_counter()
+        threads = {}
+        for stage in self.STAGES:
+            threads[stage] = [
+                threading.Thread(
+                    target=self._stage_worker,
+                    args=(stage, handlers[stage], queues[stage],
+                          queues[next_stage[stage]] if next_stage[stage] else None, results),
+                    name=f'media-{stage}-{i}',
+                    daemon=True
+                )
+                for i in range(self.workers[stage])
+            ]
+            for thread in threads[stage]:
+                thread.start()
+
+        try:
+            # Feeding blocks once the download queue is full, which is what keeps
+            # the number of in-flight images bounded for arbitrarily large batches
+            for index, item in enumerate(items):
+                item = dict(item, index=index, timings={})
+                queues['download'].put(item)
+
+            # Drain stages in order: a stage is closed only after every worker
+            # of the previous stage has exited and can no longer hand it work
+            for stage in self.STAGES:
+                for _ in threads[stage]:
+                    queues[stage].put(_STOP)
+                for thread in threads[stage]:
+                    thread.join()
+        finally:
+            if owns_temp_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        results.sort(key=lambda r: r['index'])
+        succeeded = sum(1 for r in results if r['success'])
+        return {
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'duration_seconds': round(time.perf_counter() - start_time, 2),
+            'results': results
+        }
+
+    def ingest_one(self, post_id: int, image_url: str, **options) -> Dict[str, Any]:
+        """Run a single image through all stages in the calling thread."""
+        item = dict(options, post_id=post_id, image_url=image_url, index=0, timings={})
+        work_dir = tempfile.mkdtemp(prefix='wp_media_') if self.temp_dir is None else self.temp_dir
+        try:
+            stages = [('download', lambda i: self._download(i, work_dir)), ('upload', self._upload)]
+            if item.get('attach', True):
+                stages.append(('attach', self._attach))
+            for stage, handler in stages:
+                if not self._run_stage(stage, handler, item):
+                    break
+            else:
+                item['success'] = True
+        finally:
+            if self.temp_dir is None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        return self._make_result(item)
+
+    # Stage plumbing
+
+    def _stage_worker(self, stage: str, handler: Callable, inbox: queue.Queue,
+                      outbox: Optional[queue.Queue], results: List[Dict[str, Any]]):
+        """Worker loop for one stage: process items and forward them downstream."""
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                return
+
+            if not self._run_stage(stage, handler, item):
+                self._finish(item, results)
+            elif outbox is None or (stage == 'upload' and not item.get('attach', True)):
+                item['success'] = True
+                self._finish(item, results)
+            else:
+                outbox.put(item)
+
+    def _run_stage(self, stage: str, handler: Callable, item: Dict[str, Any]) -> bool:
+        """Run a stage handler with retries; record the error and return False on failure."""
+        started = time.perf_counter()
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    handler(item)
+                    metrics.inc('media_pipeline_items', stage=stage, result='ok')
+                    return True
+                except Exception as e:
+                    if attempt == self.max_attempts or not _is_retryable(e):
+                        item['success'] = False
+                        item['failed_stage'] = stage
+                        item['error'] = str(e)
+                        item['attempts'] = attempt
+                        metrics.inc('media_pipeline_items', stage=stage, result='failed')
+                        return False
+                    metrics.inc('media_pipeline_retries', stage=stage)
+                    # Full jitter keeps retrying workers from hammering the server in lockstep
+                    time.sleep(random.uniform(0, self.retry_delay * (2 ** (attempt - 1))))
+        finally:
+            elapsed = time.perf_counter() - started
+            item['timings'][stage] = round(elapsed, 3)
+            metrics.observe('media_pipeline_stage_seconds', elapsed, stage=stage)
+
+    def _finish(self, item: Dict[str, Any], results: List[Dict[str, Any]]):
+        """Record an item's final result."""
+        result = self._make_result(item)
+        with self._results_lock:
+            results.append(result)
+            if self.on_result:
+                self.on_result(result)
+
+    @staticmethod
+    def _make_result(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Strip internal fields from a finished item."""
+        _discard_file(item)
+        result = {
+            'index': item['index'],
+            'post_id': item.get('post_id'),
+            'image_url': item['image_url'],
+            'success': item.get('success', False),
+            'media_id': item.get('media_id'),
+            'reused': item.get('reused', False),
+            'timings': item['timings']
+        }
+        if not result['success']:
+            result['failed_stage'] = item.get('failed_stage')
+            result['error'] = item.get('error')
+        return result
+
+    # Stage handlers
+
+    def _download(self, item: Dict[str, Any], work_dir: str):
+        """Stream the image to a temporary file."""
+        _discard_file(item)
+        with self.session.get(item['image_url'], stream=True, timeout=config.get('timeout')) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+            if content_type and not content_type.startswith('image/'):
+                raise ValueError(f"Not an image: {content_type}")
+
+            fd, path = tempfile.mkstemp(dir=work_dir, suffix=os.path.splitext(_filename_for(item))[1])
+            item['path'] = path
+            item['mime_type'] = content_type or None
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            item['sha256'] = digest.hexdigest()
+            item['size'] = size
+
+    def _upload(self, item: Dict[str, Any]):
+        """Upload the downloaded file to the media library, reusing identical media."""
+        if self.media_index is None:
+            self._upload_file(item)
+            return
+
+        with self._hash_locks[int(item['sha256'][:8], 16) % HASH_LOCK_STRIPES]:
+            existing = self.media_index.lookup(item['sha256'])
+            if existing is not None:
+                item['media_id'] = existing
+                item['reused'] = True
+                _discard_file(item)
+                return
+            media = self._upload_file(item)
+            self.media_index.add(item['sha256'], media['id'], item['size'],
+                                 media.get('source_url'), media.get('modified_gmt'))
+
+    def _upload_file(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Stream the downloaded file from disk into the media library."""
+        media = self.wp.upload_media(
+            file_path=item['path'],
+            filename=_filename_for(item),
+            alt_text=item.get('alt_text', ''),
+            caption=item.get('caption', ''),
+            mime_type=item.get('mime_type')
+        )
+        item['media_id'] = media['id']
+        _discard_file(item)
+        return media
+
+    def _attach(self, item: Dict[str, Any]):
+        """Set the uploaded media as the post's featured image."""
+        self.wp.set_featured_media(item['post_id'], item['media_id'])
+
+
+def _filename_for(item: Dict[str, Any]) -> str:
+    """Upload filename for an item, derived from its URL when not given."""
+    if item.get('filename'):
+        return item['filename']
+    name = os.path.basename(urlparse(item['image_url']).path)
+    if not os.path.splitext(name)[1]:
+        name = f"featured_image_{item.get('post_id', item['index'])}.jpg"
+    return name
+
+
+def _discard_file(item: Dict[str, Any]):
+    """Delete an item's temporary file if it still exists."""
+    path = item.pop('path', None)
+    if path:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a stage failure is transient and worth another attempt."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRYABLE_STATUSES
+    if isinstance(error, WordPressAPIError):
+        # No status means the request never completed (transport failure)
+        return error.status_code is None or error.status_code in RETRYABLE_STATUSES
+    return False
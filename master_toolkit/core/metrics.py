@@ -0,0 +1,317 @@
+"""
+Metrics and Tracing Module
+==========================
+Lightweight instrumentation for the toolkit: request counters and latency
+histograms per REST endpoint, timing spans for engines and validators, and
+cache hit rates. Exports OpenMetrics text and JSON trace files.
+
+Disabled by default; enable with WP_METRICS=1 or metrics.enable().
+"""
+
+import functools
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Any, Tuple
+
+
+# Latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Numeric path segments are collapsed so posts/123 and posts/456 share a series
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+class _NullSpan:
+    """Shared no-op span used when metrics are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'total')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        """Record an observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Cumulative bucket counts keyed by upper bound, including +Inf."""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((repr(bound), running))
+        result.append(('+Inf', self.count))
+        return result
+
+
+class Span:
+    """Timing span recorded into the registry trace."""
+
+    __slots__ = ('registry', 'name', 'attrs', 'start')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, attrs: Dict[str, Any]):
+        self.registry = registry
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.registry._finish_span(self, duration)
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes to the span."""
+        self.attrs.update(attrs)
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, histograms, cache stats and spans."""
+
+    def __init__(self, enabled: bool = False, max_spans: int = 100000):
+        """Initialize metrics registry."""
+        self.enabled = enabled
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self._epoch = time.perf_counter()
+        self.reset()
+
+    def enable(self):
+        """Start collecting metrics."""
+        self.enabled = True
+
+    def disable(self):
+        """Stop collecting metrics."""
+        self.enabled = False
+
+    def reset(self):
+        """Clear all collected data."""
+        with self._lock:
+            self.counters: Dict[Tuple[str, Tuple], float] = {}
+            self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+            self.cache_stats: Dict[str, List[int]] = {}
+            self.spans: List[Dict[str, Any]] = []
+            self.dropped_spans = 0
+
+    # Recording
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a histogram observation."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_request(self, method: str, endpoint: str, status: Any, duration: float):
+        """Record a REST API request."""
+        if not self.enabled:
+            return
+        endpoint = normalize_endpoint(endpoint)
+        self.inc('wp_api_requests', method=method, endpoint=endpoint, status=str(status))
+        self.observe('wp_api_request_duration_seconds', duration, method=method, endpoint=endpoint)
+
+    def record_cache(self, cache: str, hit: bool):
+        """Record a cache lookup."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.cache_stats.setdefault(cache, [0, 0])
+            stats[0 if hit else 1] += 1
+
+    def span(self, name: str, **attrs):
+        """Context manager timing a block of work."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs)
+
+    def timed(self, name: str):
+        """Decorator wrapping a function call in a span."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _finish_span(self, span: Span, duration: float):
+        """Store a completed span and its duration histogram."""
+        self.observe('span_duration_seconds', duration, span=span.name)
+        record = {
+            'name': span.name,
+            'ts': (span.start - self._epoch) * 1e6,
+            'dur': duration * 1e6,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': span.attrs
+        }
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(record)
+            else:
+                self.dropped_spans += 1
+
+    # Reporting
+
+    def get_cache_hit_rates(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counts and hit rate per cache."""
+        with self._lock:
+            return {
+                cache: {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / (hits + misses) if hits + misses else 0.0
+                }
+                for cache, (hits, misses) in self.cache_stats.items()
+            }
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact summary of collected metrics."""
+        with self._lock:
+            requests_by_endpoint = {}
+            for (name, labels), histogram in self.histograms.items():
+                label_map = dict(labels)
+                if name == 'wp_api_request_duration_seconds':
+                    key = f"{label_map['method']} {label_map['endpoint']}"
+                elif name == 'span_duration_seconds':
+                    key = f"span {label_map['span']}"
+                else:
+                    continue
+                requests_by_endpoint[key] = {
+                    'count': histogram.count,
+                    'total_seconds': round(histogram.total, 4),
+                    'avg_seconds': round(histogram.total / histogram.count, 4) if histogram.count else 0
+                }
+
+        return {
+            'timings': requests_by_endpoint,
+            'caches': self.get_cache_hit_rates(),
+            'spans_recorded': len(self.spans),
+            'spans_dropped': self.dropped_spans
+        }
+
+    def to_openmetrics(self) -> str:
+        """Render all metrics in OpenMetrics text format."""
+        lines = []
+
+        with self._lock:
+            counter_names = sorted({name for name, _ in self.counters})
+            for name in counter_names:
+                lines.append(f"# TYPE {name} counter")
+                for (metric, labels), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}_total{_format_labels(labels)} {_format_value(value)}")
+
+            histogram_names = sorted({name for name, _ in self.histograms})
+            for name in histogram_names:
+                lines.append(f"# TYPE {name} histogram")
+                lines.append(f"# UNIT {name} seconds")
+                for (metric, labels), histogram in sorted(self.histograms.items(), key=lambda i: i[0]):
+                    if metric != name:
+                        continue
+                    for bound, count in histogram.cumulative():
+                        bucket_labels = labels + (('le', bound),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+
+            if self.cache_stats:
+                lines.append("# TYPE cache_requests counter")
+                for cache, (hits, misses) in sorted(self.cache_stats.items()):
+                    lines.append(f'cache_requests_total{{cache="{cache}",result="hit"}} {hits}')
+                    lines.append(f'cache_requests_total{{cache="{cache}",result="miss"}} {misses}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def to_trace(self) -> Dict[str, Any]:
+        """Spans as a Chrome/Perfetto compatible trace document."""
+        with self._lock:
+            events = [dict(span, ph='X', cat='toolkit') for span in self.spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': self.summary()}
+
+    def export_openmetrics(self, output_file: str) -> str:
+        """Write OpenMetrics text to a file."""
+        data = self.to_openmetrics()
+        with open(output_file, 'w') as f:
+            f.write(data)
+        return output_file
+
+    def export_trace(self, output_file: str) -> str:
+        """Write the JSON trace file."""
+        with open(output_file, 'w') as f:
+            json.dump(self.to_trace(), f, default=str)
+        return output_file
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Collapse numeric IDs in an endpoint path: posts/123 -> posts/{id}."""
+    endpoint = '/' + endpoint.split('?', 1)[0].strip('/')
+    return _ID_SEGMENT.sub('/{id}', endpoint).lstrip('/')
+
+
+def _format_labels(labels: Tuple) -> str:
+    """Format a label tuple as {k="v",...}."""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Global metrics instance
+metrics = MetricsRegistry(enabled=os.getenv('WP_METRICS', '').lower() in ('1', 'true', 'yes'))
@@ -0,0 +1,229 @@
+"""
+Rendered Page Cache
+===================
+Shared HTTP cache for front-end page fetches (post permalinks, the home
+page, category archives) used by validators and optimizers.
+
+Requests go through one pooled session. Responses are kept in memory and
+in an SQLite disk tier. Each cached page stores the request headers its
+``Vary`` header names, so a mobile and a desktop User-Agent get separate
+variants. By default every use revalidates the page with
+If-None-Match/If-Modified-Since, so an unchanged page costs a 304 without a
+body and an edited one is re-downloaded. A positive ``ttl`` serves pages
+for that many seconds without contacting the server. ``Cache-Control: no-store``,
+``Vary: *`` and non-200 responses are never stored.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .config import config
+from .metrics import metrics
+from .storage import SQLiteStore, LRUCache
+
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS pages (
+        url TEXT NOT NULL,
+        variant TEXT NOT NULL,
+        vary TEXT NOT NULL,
+        status INTEGER,
+        headers TEXT,
+        body BLOB,
+        encoding TEXT,
+        final_url TEXT,
+        elapsed REAL,
+        fetched_at REAL,
+        PRIMARY KEY (url, variant)
+    );
+'''
+
+
+class CachedPage:
+    """A fetched page; exposes the parts of requests.Response validators use."""
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes, encoding: Optional[str],
+                 elapsed: float, fetched_at: float, source: str = 'network'):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding
+        self.elapsed = elapsed        # seconds the original download took
+        self.fetched_at = fetched_at
+        self.source = source          # network | memory | disk | revalidated
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    @property
+    def from_cache(self) -> bool:
+        return self.source != 'network'
+
+
+class PageCache(SQLiteStore):
+    """Vary-aware, revalidating page cache with memory and disk tiers."""
+
+    def __init__(self, db_path: Optional[Path] = None, ttl: float = 0, max_entries: int = 256,
+                 disk: bool = True, pool_size: int = 10):
+        """
+        Args:
+            db_path: Disk tier location (default: core/page_cache.db, created on first store)
+            ttl: Seconds a page is served without revalidation (0: always revalidate)
+            max_entries: URLs kept in the memory tier
+            disk: Keep the disk tier at all
+            pool_size: Pooled connections per host
+        """
+        super().__init__(db_path or Path(__file__).parent / 'page_cache.db', SCHEMA)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk = disk
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.get('user_agent')})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._memory = LRUCache(max_entries)
+
+    # Fetching
+
+    def get(self, url: str, headers: Dict[str, str] = None, timeout: float = 15,
+            max_age: float = None, refresh: bool = False) -> CachedPage:
+        """
+        GET a page, from cache when possible.
+
+        Args:
+            headers: Extra request headers (e.g. a mobile User-Agent)
+            max_age: Override ttl for this lookup (0 forces revalidation)
+            refresh: Download the page unconditionally, e.g. to time the load
+
+        Raises:
+            requests.RequestException on network failure with nothing cached
+        """
+        request_headers = CaseInsensitiveDict(self.session.headers)
+        request_headers.update(headers or {})
+        max_age = self.ttl if max_age is None else max_age
+
+        entry = None if refresh else self._lookup(url, request_headers)
+        fresh = entry is not None and time.time() - entry['fetched_at'] < max_age
+        metrics.record_cache('page_cache', fresh)
+        if fresh:
+            return self._page(entry)
+
+        conditional = dict(headers or {})
+        if entry is not None:
+            stored = CaseInsensitiveDict(entry['headers'])
+            if stored.get('ETag'):
+                conditional['If-None-Match'] = stored['ETag']
+            if stored.get('Last-Modified'):
+                conditional['If-Modified-Since'] = stored['Last-Modified']
+
+        with metrics.span('page_cache.fetch', url=url):
+            start = time.perf_counter()
+            response = self.session.get(url, headers=conditional, timeout=timeout)
+            elapsed = time.perf_counter() - start
+
+        if response.status_code == 304 and entry is not None:
+            refreshed = CaseInsensitiveDict(entry['headers'])
+            refreshed.update({name: value for name, value in response.headers.items()
+                              if name.lower() in ('cache-control', 'expires', 'date', 'etag')})
+            entry = dict(entry, fetched_at=time.time(), headers=dict(refreshed))
+            self._store(url, entry)
+            return self._page(entry, 'revalidated')
+
+        entry = {
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'body': response.content,
+            'encoding': response.encoding or response.apparent_encoding,
+            'final_url': response.url,
+            'elapsed': elapsed,
+            'fetched_at': time.time(),
+        }
+        vary = _vary_names(response.headers)
+        if self._storable(response, vary):
+            entry['vary'] = vary
+            entry['request'] = {name: request_headers.get(name) for name in vary}
+            self._store(url, entry)
+        return self._page(entry, 'network')
+
+    def invalidate(self, url: str):
+        """Drop every cached variant of a URL (e.g. after updating the post)."""
+        self._memory.pop(url)
+        if self.disk and self.db_path.exists():
+            self._connect().execute('DELETE FROM pages WHERE url = ?', (url,))
+
+    # Tiers
+
+    def _lookup(self, url: str, request_headers: CaseInsensitiveDict) -> Optional[Dict[str, Any]]:
+        for entry in self._memory.get(url, ()):
+            if _matches(entry, request_headers):
+                return entry
+
+        if not self.disk or not self.db_path.exists():
+            return None
+        for row in self._connect().execute('SELECT * FROM pages WHERE url = ?', (url,)):
+            vary = json.loads(row['vary'])
+            entry = {
+                'status': row['status'], 'headers': json.loads(row['headers']), 'body': row['body'],
+                'encoding': row['encoding'], 'final_url': row['final_url'], 'elapsed': row['elapsed'],
+                'fetched_at': row['fetched_at'], 'vary': vary['names'], 'request': vary['request'],
+                'source': 'disk'
+            }
+            if _matches(entry, request_headers):
+                self._remember(url, entry)
+                return entry
+        return None
+
+    def _store(self, url: str, entry: Dict[str, Any]):
+        self._remember(url, entry)
+        if not self.disk:
+            return
+        self._connect().execute('''
+            INSERT OR REPLACE INTO pages
+                (url, variant, vary, status, headers, body, encoding, final_url, elapsed, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (url, json.dumps(entry['request'], sort_keys=True),
+              json.dumps({'names': entry['vary'], 'request': entry['request']}),
+              entry['status'], json.dumps(entry['headers']), entry['body'], entry['encoding'],
+              entry['final_url'], entry['elapsed'], entry['fetched_at']))
+
+    def _remember(self, url: str, entry: Dict[str, Any]):
+        with self._memory.lock:
+            variants = [other for other in self._memory.get(url, [])
+                        if other['request'] != entry['request']]
+            self._memory.put(url, variants + [dict(entry, source='memory')])
+
+    @staticmethod
+    def _storable(response, vary: List[str]) -> bool:
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        return response.status_code == 200 and 'no-store' not in cache_control and '*' not in vary
+
+    @staticmethod
+    def _page(entry: Dict[str, Any], source: str = None) -> CachedPage:
+        return CachedPage(entry['final_url'], entry['status'], entry['headers'], entry['body'],
+                          entry['encoding'], entry['elapsed'], entry['fetched_at'],
+                          source or entry.get('source', 'memory'))
+
+
+def _vary_names(headers) -> List[str]:
+    """Lower-cased header names listed in Vary."""
+    return sorted({name.strip().lower() for name in headers.get('Vary', '').split(',') if name.strip()})
+
+
+def _matches(entry: Dict[str, Any], request_headers: CaseInsensitiveDict) -> bool:
+    """Whether a stored variant was fetched with the same Vary-listed request headers."""
+    return all(request_headers.get(name) == value for name, value in entry['request'].items())
+
+
+# Shared so every validator and optimizer in a process reuses connections and pages
+page_cache = PageCache()
@@ -0,0 +1,121 @@
+"""
+Streaming Result Sink
+=====================
+Bounded-memory storage for the per-item results of long batch runs.
+
+Each result is appended to a gzip-compressed NDJSON file as soon as it
+completes, so full records (optimized HTML, per-image tags, ...) never
+accumulate in memory. The sink itself keeps only compact aggregates:
+record and failure counts, statistics of selected numeric fields and
+named counters. Reports read the file back lazily with iter_results().
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator
+
+
+class ResultSink:
+    """Append-only NDJSON(.gz) result stream with in-memory aggregates."""
+
+    def __init__(self, path=None, numeric_fields: Iterable[str] = (), compresslevel: int = 6):
+        """
+        Args:
+            path: Output file; gzip-compressed when it ends in .gz
+                (default: a new results_*.ndjson.gz in the temp directory)
+            numeric_fields: Top-level record fields to keep count/total/min/max of
+            compresslevel: gzip level (6 trades little size for much less CPU than 9)
+        """
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='results_', suffix='.ndjson.gz')
+            os.close(fd)
+        self.path = Path(path)
+        self.numeric_fields = tuple(numeric_fields)
+        self.records = 0
+        self.failures = 0
+        self.counters: Dict[str, float] = {}
+        self._stats: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        if self.path.suffix == '.gz':
+            self._file = gzip.open(self.path, 'wt', encoding='utf-8', compresslevel=compresslevel)
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write(self, record: Dict[str, Any]):
+        """Append one result and fold it into the aggregates (thread-safe)."""
+        line = json.dumps(record, default=str, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self.records += 1
+            if record.get('success') is False or 'error' in record:
+                self.failures += 1
+            for name in self.numeric_fields:
+                value = record.get(name)
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                stats = self._stats.get(name)
+                if stats is None:
+                    self._stats[name] = [1, value, value, value]
+                else:
+                    stats[0] += 1
+                    stats[1] += value
+                    stats[2] = min(stats[2], value)
+                    stats[3] = max(stats[3], value)
+
+    def count(self, name: str, value: float = 1):
+        """Increment a named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def close(self):
+        """Finish the file (writes the gzip trailer); the sink can then only be read."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def read(self) -> Iterator[Dict[str, Any]]:
+        """Close the sink and lazily iterate over every record written."""
+        self.close()
+        return iter_results(self.path)
+
+    def field_stats(self, name: str) -> Dict[str, float]:
+        """count/total/mean/min/max of a numeric field (empty if never seen)."""
+        stats = self._stats.get(name)
+        if stats is None:
+            return {}
+        count, total, low, high = stats
+        return {'count': count, 'total': total, 'mean': total / count, 'min': low, 'max': high}
+
+    def summary(self) -> Dict[str, Any]:
+        """The aggregates plus the results file location."""
+        return {
+            'results_file': str(self.path),
+            'records': self.records,
+            'failures': self.failures,
+            'counters': dict(self.counters),
+            'fields': {name: self.field_stats(name) for name in self.numeric_fields if name in self._stats}
+        }
+
+
+def iter_results(path) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the records of a closed NDJSON(.gz) results file."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,115 @@
+"""
+Storage Helpers
+===============
+Building blocks shared by the SQLite-backed stores and caches.
+
+Every store opens its database the same way: autocommit (transactions
+are explicit BEGIN IMMEDIATE ... COMMIT), WAL so readers never block the
+writer, synchronous=NORMAL, and the schema applied on connect. Stores used
+from several threads keep one connection per thread. IN (...) lists are
+bound in chunks because SQLite caps the number of parameters per
+statement. The memory tiers of the caches are bounded LRU mappings.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Iterator, List
+
+
+# Bound parameters per IN (...) chunk, well below SQLite's limit
+MAX_BOUND_PARAMS = 500
+
+
+def connect(db_path: Path, schema: str = '') -> sqlite3.Connection:
+    """Open an autocommit WAL connection with Row results, creating the schema."""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    if schema:
+        conn.executescript(schema)
+    return conn
+
+
+def chunked(items: Iterable, size: int = MAX_BOUND_PARAMS) -> Iterator[List]:
+    """Consecutive lists of at most size items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def placeholders(values: List) -> str:
+    """'?,?,...' for an IN (...) list of values."""
+    return ','.join('?' * len(values))
+
+
+class SQLiteStore:
+    """Base for SQLite-backed stores: one connection per thread, schema created on first use."""
+
+    def __init__(self, db_path: Path, schema: str = ''):
+        self.db_path = Path(db_path)
+        self.schema = schema
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = connect(self.db_path, self.schema)
+            self._local.conn = conn
+        return conn
+
+
+class LRUCache:
+    """Thread-safe mapping that keeps the max_entries most recently used keys."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # Reentrant so callers can hold it around a read-modify-write
+        self.lock = threading.RLock()
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """The cached subset of keys."""
+        with self.lock:
+            found = {}
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+            return found
+
+    def put(self, key: Hashable, value: Any):
+        self.update({key: value})
+
+    def update(self, entries: Dict[Hashable, Any]):
+        with self.lock:
+            for key, value in entries.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self.lock:
+            return self._entries.pop(key, default)
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
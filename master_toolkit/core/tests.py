@@ -0,0 +1,578 @@
+"""
+Core Module Test Suite
+======================
+Tests for the client, metrics, media, audit, edit-session, page-cache, result-sink and storage
+modules and the lazy package exports.
+"""
+
+import unittest
+import json
+import subprocess
+import tempfile
+import time
+import threading
+from unittest.mock import Mock, patch, MagicMock
+
+# Test imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core.metrics import MetricsRegistry
+from master_toolkit.core.client import WordPressClient, WordPressAPIError
+from master_toolkit.core.media_pipeline import MediaIngestPipeline
+from master_toolkit.core.media_index import MediaIndex
+from master_toolkit.core.audit_store import AuditStore
+from master_toolkit.core.page_cache import PageCache
+from master_toolkit.core.result_sink import ResultSink, iter_results
+from master_toolkit.core.storage import SQLiteStore, LRUCache, chunked, placeholders
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for engine timing and metrics export."""
+    
+    def setUp(self):
+        """Set up an isolated metrics registry."""
+        self.registry = MetricsRegistry(enabled=True)
+    
+    def test_disabled_registry_records_nothing(self):
+        """Test that a disabled registry is a no-op."""
+        registry = MetricsRegistry(enabled=False)
+        with registry.span('engine.seo'):
+            pass
+        registry.record_request('GET', 'posts/1', 200, 0.1)
+        
+        self.assertEqual(registry.spans, [])
+        self.assertEqual(registry.counters, {})
+    
+    def test_request_endpoints_are_normalized(self):
+        """Test that post IDs collapse into one endpoint series."""
+        self.registry.record_request('GET', 'posts/123', 200, 0.02)
+        self.registry.record_request('GET', 'posts/456', 200, 0.3)
+        
+        output = self.registry.to_openmetrics()
+        self.assertIn('wp_api_requests_total{endpoint="posts/{id}",method="GET",status="200"} 2', output)
+        self.assertIn('wp_api_request_duration_seconds_count{endpoint="posts/{id}",method="GET"} 2', output)
+        self.assertTrue(output.endswith('# EOF\n'))
+    
+    def test_spans_and_cache_rates_in_trace(self):
+        """Test that spans and cache hit rates are exported in the trace."""
+        with self.registry.span('engine.performance', post_id=1):
+            pass
+        self.registry.record_cache('pages', True)
+        self.registry.record_cache('pages', False)
+        
+        trace = self.registry.to_trace()
+        self.assertEqual(trace['traceEvents'][0]['name'], 'engine.performance')
+        self.assertEqual(trace['otherData']['caches']['pages']['hit_rate'], 0.5)
+
+
+class TestMediaIngestPipeline(unittest.TestCase):
+    """Test cases for the concurrent media ingest pipeline."""
+    
+    def setUp(self):
+        """Set up a pipeline with a mock client and stubbed downloads."""
+        self.mock_wp = Mock()
+        self.uploaded = []
+        
+        def upload_media(file_path=None, **kwargs):
+            with open(file_path, 'rb') as f:
+                self.uploaded.append(f.read())
+            return {'id': 100 + len(self.uploaded)}
+        
+        self.mock_wp.upload_media.side_effect = upload_media
+        self.pipeline = MediaIngestPipeline(self.mock_wp, download_workers=3, upload_workers=2,
+                                            attach_workers=2, queue_size=2, retry_delay=0)
+        
+        def fake_get(url, **kwargs):
+            response = MagicMock()
+            response.__enter__.return_value = response
+            response.headers = {'Content-Type': 'image/jpeg'}
+            response.iter_content.return_value = [b'img-', url.encode()]
+            return response
+        
+        self.pipeline.session.get = fake_get
+    
+    def test_all_stages_run_and_stream_from_disk(self):
+        """Test that every item is downloaded, uploaded from a file and attached."""
+        items = [{'post_id': i, 'image_url': f'https://img.test/{i}.jpg'} for i in range(6)]
+        
+        summary = self.pipeline.run(items)
+        
+        self.assertEqual(summary['succeeded'], 6)
+        self.assertEqual([r['post_id'] for r in summary['results']], list(range(6)))
+        self.assertIn(b'img-https://img.test/3.jpg', self.uploaded)
+        self.assertEqual(self.mock_wp.set_featured_media.call_count, 6)
+    
+    def test_transient_failures_retry_within_stage(self):
+        """Test that a 503 on attach is retried but a 400 on upload is not."""
+        self.mock_wp.set_featured_media.side_effect = [WordPressAPIError('busy', 503), {}]
+        
+        result = self.pipeline.ingest_one(1, 'https://img.test/1.jpg')
+        self.assertTrue(result['success'])
+        self.assertEqual(self.mock_wp.set_featured_media.call_count, 2)
+        
+        self.mock_wp.upload_media.side_effect = WordPressAPIError('bad file', 400)
+        result = self.pipeline.ingest_one(2, 'https://img.test/2.jpg')
+        self.assertFalse(result['success'])
+        self.assertEqual(result['failed_stage'], 'upload')
+        self.assertEqual(self.mock_wp.upload_media.call_count, 2)
+    
+    def test_identical_images_upload_once_with_media_index(self):
+        """Test that byte-identical downloads reuse one indexed media item."""
+        with tempfile.TemporaryDirectory() as tmp:
+            index = MediaIndex(db_path=Path(tmp) / 'media.db')
+            self.pipeline.media_index = index
+            items = [{'post_id': i, 'image_url': 'https://img.test/same.jpg'} for i in range(4)]
+            
+            summary = self.pipeline.run(items)
+            
+            self.assertEqual(summary['succeeded'], 4)
+            self.assertEqual(self.mock_wp.upload_media.call_count, 1)
+            self.assertEqual(sum(r['reused'] for r in summary['results']), 3)
+            self.assertEqual({r['media_id'] for r in summary['results']}, {101})
+    
+    def test_media_index_duplicates_report(self):
+        """Test that duplicate groups keep the oldest media and count reclaimable bytes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            index = MediaIndex(db_path=Path(tmp) / 'media.db')
+            index.add('aaa', 12, size=500)
+            index.add('aaa', 7, size=500)
+            index.add('aaa', 30, size=500)
+            index.add('bbb', 8, size=900)
+            
+            report = index.duplicates_report()
+            
+            self.assertEqual(index.lookup('aaa'), 7)
+            self.assertEqual(report['duplicate_groups'], 1)
+            self.assertEqual(report['groups'][0]['duplicate_media_ids'], [12, 30])
+            self.assertEqual(report['reclaimable_bytes'], 1000)
+
+    
+    def test_media_index_sync_pages_to_the_end_and_prunes_deletions(self):
+        """Test that syncs list the library through iter_collection and drop deleted media."""
+        library = [{'id': i, 'source_url': f'https://img.test/{i}.jpg', 'modified': f'2025-01-{i:02d}T10:00:00',
+                    'modified_gmt': f'2025-01-{i:02d}T10:00:00'} for i in range(1, 4)]
+        
+        def iter_collection(endpoint, **params):
+            if params.get('_fields') == 'id':
+                return iter([{'id': item['id']} for item in library])
+            return iter([item for item in library if item['modified'] > params.get('modified_after', '')])
+        
+        self.mock_wp.iter_collection.side_effect = iter_collection
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('master_toolkit.core.media_index.hash_url', side_effect=lambda _, url: (url[-5:], 10)):
+            index = MediaIndex(db_path=Path(tmp) / 'media.db', wp_client=self.mock_wp)
+            self.assertEqual(index.sync()['hashed'], 3)
+            
+            del library[0]
+            result = index.sync()
+            
+            self.assertEqual((result['listed'], result['pruned'], result['indexed_total']), (0, 1, 2))
+            self.assertIsNone(index.lookup('1.jpg'))
+            self.assertEqual(index.lookup('2.jpg'), 2)
+            self.mock_wp.get_media.assert_not_called()
+
+
+class TestAuditStore(unittest.TestCase):
+    """Test cases for the audit run store and run-to-run diffs."""
+    
+    def setUp(self):
+        """Set up a store in a temp dir."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = AuditStore(db_path=Path(self.temp_dir.name) / 'audits.db')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_diff_reports_only_changes(self):
+        """Test new/resolved issues and score deltas against each subject's last evaluation."""
+        self.store.record_run('audit', {1: 90, 2: 50, 3: 70},
+                              [{'subject': 2, 'check': 'missing_alt_text'},
+                               {'subject': 3, 'check': 'no_schema_markup'}])
+        # A partial run only re-evaluates post 2
+        self.store.record_run('audit', {2: 80}, [])
+        run_id = self.store.record_run('audit', {1: 75, 2: 80, 3: 70, 4: 60},
+                                       [{'subject': 1, 'check': 'missing_alt_text', 'severity': 'high'},
+                                        {'subject': 3, 'check': 'no_schema_markup'},
+                                        {'subject': 4, 'check': 'poor_structure'}])
+        
+        changes = self.store.diff('audit')
+        
+        self.assertEqual(changes['run_id'], run_id)
+        self.assertEqual([(i['subject'], i['check']) for i in changes['new_issues']],
+                         [(1, 'missing_alt_text'), (4, 'poor_structure')])
+        self.assertEqual(changes['resolved_issues'], [])
+        self.assertEqual(changes['persisting'], 1)
+        self.assertEqual([(c['subject'], c['delta']) for c in changes['score_changes']], [(1, -15.0)])
+        self.assertEqual(changes['new_subjects'], [4])
+        self.assertEqual(changes['regressed_subjects'], [1, 4])
+        
+        # Against the first run only, post 2's alt-text issue is resolved and its score went up
+        changes = self.store.diff('audit', base_run_id=1)
+        self.assertEqual([(i['subject'], i['check']) for i in changes['resolved_issues']],
+                         [(2, 'missing_alt_text')])
+        self.assertIn((2, 30.0), [(c['subject'], c['delta']) for c in changes['score_changes']])
+    
+    def test_runs_are_isolated_per_audit_and_prunable(self):
+        """Test that audits do not diff against each other and old runs can be pruned."""
+        self.store.record_run('site_health', {'https://site.test/a/': None},
+                              [{'subject': 'https://site.test/a/', 'check': 'seo:Missing <title>'}])
+        for _ in range(3):
+            self.store.record_run('auto_fixer', {1: 100}, [])
+        
+        changes = self.store.diff('site_health')
+        self.assertEqual(changes['subjects_compared'], 0)
+        self.assertEqual(changes['new_issues'][0]['check'], 'seo:Missing <title>')
+        
+        self.assertEqual(self.store.prune('auto_fixer', keep=1), 2)
+        self.assertEqual([r['audit'] for r in self.store.runs()], ['auto_fixer', 'site_health'])
+        with self.assertRaises(ValueError):
+            self.store.diff('quality_audit')
+
+
+class TestEditSession(unittest.TestCase):
+    """Test cases for the shared single-write post edit session."""
+    
+    def setUp(self):
+        """Set up a post served in edit context."""
+        self.post = {
+            'id': 7,
+            'modified_gmt': '2024-01-01T00:00:00',
+            'slug': 'edit-session-test',
+            'title': {'raw': 'A ' + 'very long title ' * 5, 'rendered': 'A ' + 'very long title ' * 5},
+            'content': {'raw': '<p><a href="http://old.example/x">x</a></p>',
+                        'rendered': '<p><a href="http://old.example/x">x</a></p>'},
+            'excerpt': {'raw': '', 'rendered': ''}
+        }
+        self.remote_modified = self.post['modified_gmt']
+        self.requests = []
+        self.wp = Mock()
+        self.wp._make_request.side_effect = self._respond
+    
+    def _respond(self, method, endpoint, data=None, params=None, context=None, **kwargs):
+        self.requests.append((method, params, data))
+        response = Mock(status_code=200)
+        if method == 'POST':
+            response.json.return_value = dict(self.post, **{k: {'raw': v} if k in ('title', 'content') else v
+                                                           for k, v in data.items()})
+        elif params and '_fields' in params:
+            response.json.return_value = {'modified_gmt': self.remote_modified}
+        else:
+            response.json.return_value = self.post
+        return response
+    
+    def test_all_fixers_share_one_read_and_one_write(self):
+        """Test that SEO and link fixes land in a single POST after one full GET."""
+        from master_toolkit.validation.comprehensive import ComprehensiveValidator
+        
+        validator = ComprehensiveValidator(self.wp)
+        validator.link_validator.fix_broken_links_in_content = lambda content: (
+            content.replace('http://old.example/x', '/x/'), ['Fixed /x/'])
+        
+        with patch('master_toolkit.validation.comprehensive.print_header'), \
+                patch('master_toolkit.validation.comprehensive.print_section'), \
+                patch('master_toolkit.validation.comprehensive.print_success'), \
+                patch.object(validator, '_print_fixing_summary'):
+            results = validator.fix_all_issues([7])
+        
+        self.assertEqual(results['posts_fixed'], 1)
+        self.assertEqual([method for method, _, _ in self.requests], ['GET', 'GET', 'POST'])
+        posted = self.requests[-1][2]
+        self.assertEqual(set(posted), {'title', 'content'})
+        self.assertIn('href="/x/"', posted['content'])
+        self.wp.get_post.assert_not_called()
+        self.wp.update_post.assert_not_called()
+    
+    def test_conflicting_edit_is_not_overwritten(self):
+        """Test that a post modified since loading raises a 409 and is not written."""
+        from master_toolkit.core.edit_session import EditSession
+        
+        session = EditSession(self.wp, 7)
+        session.content = session.content + '<p>more</p>'
+        self.remote_modified = '2024-01-02T00:00:00'
+        
+        with self.assertRaises(WordPressAPIError) as raised:
+            session.commit()
+        self.assertEqual(raised.exception.status_code, 409)
+        self.assertNotIn('POST', [method for method, _, _ in self.requests])
+        
+        # Unchanged sessions never touch the API
+        untouched = EditSession(self.wp, 7)
+        untouched.content = untouched.content
+        self.assertIsNone(untouched.commit())
+
+
+class TestPageCache(unittest.TestCase):
+    """Test cases for the shared rendered-page cache."""
+    
+    def setUp(self):
+        """Create a cache whose session answers from a canned response list."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / 'pages.db'
+        self.cache = PageCache(db_path=self.db_path, ttl=60)
+        self.cache.session.get = Mock(side_effect=self._respond)
+        self.sent = []
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _respond(self, url, headers=None, timeout=None):
+        self.sent.append(dict(headers or {}))
+        response = Mock(url=url, encoding='utf-8')
+        if 'If-None-Match' in (headers or {}):
+            response.status_code, response.content, response.headers = 304, b'', {}
+        else:
+            ua = (headers or {}).get('User-Agent', 'desktop')
+            response.status_code = 200
+            response.content = f'<html>{ua}</html>'.encode('utf-8')
+            response.headers = {'Vary': 'User-Agent, Accept-Encoding', 'ETag': '"v1"'}
+        return response
+    
+    def test_vary_variants_are_cached_separately(self):
+        """Test that each User-Agent variant is fetched once and served from memory after."""
+        mobile = {'User-Agent': 'iPhone'}
+        
+        self.assertEqual(self.cache.get('https://example.com/a/').text, '<html>desktop</html>')
+        self.assertEqual(self.cache.get('https://example.com/a/').source, 'memory')
+        self.assertEqual(self.cache.get('https://example.com/a/', headers=mobile).text, '<html>iPhone</html>')
+        self.assertEqual(self.cache.get('https://example.com/a/', headers=mobile).source, 'memory')
+        self.assertEqual(len(self.sent), 2)
+    
+    def test_stale_pages_revalidate_and_disk_tier_survives(self):
+        """Test that a stale page is revalidated with its ETag and reloaded from disk by a new cache."""
+        first = self.cache.get('https://example.com/b/')
+        
+        reopened = PageCache(db_path=self.db_path, ttl=60)
+        reopened.session.get = Mock(side_effect=self._respond)
+        self.assertEqual(reopened.get('https://example.com/b/').source, 'disk')
+        
+        revalidated = reopened.get('https://example.com/b/', max_age=0)
+        self.assertEqual(revalidated.source, 'revalidated')
+        self.assertEqual(revalidated.content, first.content)
+        self.assertEqual(self.sent[-1]['If-None-Match'], '"v1"')
+        self.assertEqual(len(self.sent), 2)
+    
+    def test_default_cache_revalidates_every_use(self):
+        """Test that the default cache never serves a page unchecked and refresh skips validators."""
+        cache = PageCache(db_path=self.db_path)
+        cache.session.get = Mock(side_effect=self._respond)
+        
+        cache.get('https://example.com/c/')
+        self.assertEqual(cache.get('https://example.com/c/').source, 'revalidated')
+        self.assertEqual(self.sent[-1]['If-None-Match'], '"v1"')
+        
+        refreshed = cache.get('https://example.com/c/', refresh=True)
+        self.assertEqual(refreshed.source, 'network')
+        self.assertNotIn('If-None-Match', self.sent[-1])
+        self.assertEqual(len(self.sent), 3)
+
+
+class TestClientBatching(unittest.TestCase):
+    """Test cases for multi-get by IDs and in-flight GET coalescing."""
+    
+    def setUp(self):
+        auth_patcher = patch('master_toolkit.core.client.auth')
+        auth_patcher.start().is_authenticated.return_value = True
+        self.addCleanup(auth_patcher.stop)
+        self.client = WordPressClient()
+        self.client.session.request = Mock(side_effect=self._respond)
+        self.gate = threading.Event()
+    
+    def _respond(self, method, url, params=None, **kwargs):
+        if url.endswith('/posts/9'):
+            self.gate.wait(5)
+            return Mock(status_code=200, json=Mock(return_value={'id': 9}))
+        ids = [int(item_id) for item_id in params['include'].split(',')]
+        # The server returns its own order and skips IDs it does not have
+        return Mock(status_code=200, json=Mock(return_value=[{'id': i} for i in sorted(ids) if i != 4]))
+    
+    def test_get_by_ids_chunks_include_and_keeps_order(self):
+        """Test that 150 IDs take two include= requests and come back in the order asked."""
+        ids = list(range(150, 0, -1)) + [150]
+        
+        posts = self.client.get_posts_by_ids(ids, status='any')
+        
+        self.assertEqual(self.client.session.request.call_count, 2)
+        sizes = [len(c.kwargs['params']['include'].split(',')) for c in self.client.session.request.call_args_list]
+        self.assertEqual(sizes, [100, 50])
+        self.assertEqual([post['id'] for post in posts], [i for i in range(150, 0, -1) if i != 4])
+    
+    def test_identical_concurrent_gets_share_one_request(self):
+        """Test that concurrent identical GETs coalesce while a later GET goes to the server."""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.client.get_post(9)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        self.gate.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(results, [{'id': 9}] * 4)
+        self.assertEqual(self.client.session.request.call_count, 1)
+        self.client.get_post(9)
+        self.assertEqual(self.client.session.request.call_count, 2)
+
+
+class TestResultSink(unittest.TestCase):
+    """Test cases for the streaming NDJSON result sink."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / 'results.ndjson.gz'
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_concurrent_writes_stream_and_aggregate(self):
+        """Test that records from many threads all land in the file and only aggregates are kept."""
+        sink = ResultSink(self.path, numeric_fields=('score',))
+        
+        def write(start):
+            for post_id in range(start, start + 50):
+                sink.write({'post_id': post_id, 'success': post_id % 10 != 0, 'score': post_id,
+                            'optimized_content': '<p>' + 'x' * 1000 + '</p>'})
+        
+        threads = [threading.Thread(target=write, args=(start,)) for start in (0, 50, 100, 150)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sink.count('images_checked', 3)
+        sink.close()
+        
+        summary = sink.summary()
+        self.assertEqual(summary['records'], 200)
+        self.assertEqual(summary['failures'], 20)
+        self.assertEqual(summary['counters'], {'images_checked': 3})
+        self.assertEqual(summary['fields']['score'], {'count': 200, 'total': 19900, 'mean': 99.5,
+                                                      'min': 0, 'max': 199})
+        self.assertLess(self.path.stat().st_size, 200 * 1000 // 10)
+        self.assertEqual(sorted(record['post_id'] for record in iter_results(self.path)), list(range(200)))
+    
+    def test_batch_processor_keeps_only_summaries_in_memory(self):
+        """Test that full engine results go to the stream while individual_results stays compact."""
+        from master_toolkit.optimization.advanced import BatchOptimizationProcessor
+        
+        def optimize(post_id, engines, auto_apply, executor=None):
+            return {'post_id': post_id, 'success': post_id != 3, 'engines_run': ['content'],
+                    'engine_results': {'content': {'optimized_content': '<p>big</p>' * 100}},
+                    'overall_score': 80, 'score_improvement': 20, 'total_improvements': 2}
+        
+        processor = BatchOptimizationProcessor(Mock())
+        processor._optimize_single_post = optimize
+        sink = ResultSink(self.path)
+        with patch('master_toolkit.optimization.advanced.print_info'), \
+                patch('master_toolkit.optimization.advanced.print_success'), \
+                patch('master_toolkit.optimization.advanced.print_warning'):
+            results = processor.process_posts_batch([1, 2, 3], ['content'], sink=sink)
+        
+        self.assertEqual(results['results_file'], str(self.path))
+        self.assertNotIn('engine_results', results['individual_results'][1])
+        self.assertEqual(results['individual_results'][3]['success'], False)
+        self.assertEqual(results['average_score_improvement'], 20)
+        
+        records = {record['post_id']: record for record in sink.read()}
+        self.assertEqual(sorted(records), [1, 2, 3])
+        self.assertIn('optimized_content', records[2]['engine_results']['content'])
+    
+    def test_batch_processor_closes_and_removes_its_sink_on_error(self):
+        """Test that an interrupted batch does not leave its own temporary results file behind."""
+        from master_toolkit.optimization.advanced import BatchOptimizationProcessor
+        
+        processor = BatchOptimizationProcessor(Mock())
+        processor._optimize_single_post = Mock(return_value={'post_id': 1, 'success': True})
+        created = []
+        
+        def sink(*args, **kwargs):
+            created.append(ResultSink(Path(self.temp_dir) / 'owned.ndjson.gz', *args, **kwargs))
+            return created[-1]
+        
+        with patch('master_toolkit.optimization.advanced.ResultSink', side_effect=sink), \
+                patch('master_toolkit.optimization.advanced.print_info'), \
+                patch('master_toolkit.optimization.advanced.print_success'), \
+                self.assertRaises(KeyboardInterrupt):
+            processor.process_posts_batch([1], ['content'], progress_callback=Mock(side_effect=KeyboardInterrupt))
+        
+        self.assertTrue(created[0].closed)
+        self.assertFalse(created[0].path.exists())
+
+
+
+class TestStorage(unittest.TestCase):
+    """Test cases for the shared SQLite store, chunking and LRU helpers."""
+    
+    def test_store_keeps_one_connection_per_thread(self):
+        """Test that each thread gets its own WAL connection with the schema applied."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteStore(Path(tmp) / 'store.db', 'CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY);')
+            conn = store._connect()
+            connections = []
+            
+            def other_thread():
+                connections.append(store._connect())
+                connections[0].close()
+            
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+            
+            self.assertIs(store._connect(), conn)
+            self.assertIsNot(connections[0], conn)
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            conn.executemany('INSERT INTO t VALUES (?)', [(i,) for i in range(1200)])
+            counts = [conn.execute(f'SELECT COUNT(*) FROM t WHERE id IN ({placeholders(chunk)})',
+                                   chunk).fetchone()[0] for chunk in chunked(range(1200))]
+            self.assertEqual(counts, [500, 500, 200])
+    
+    def test_lru_cache_evicts_least_recently_used(self):
+        """Test that reads refresh recency and the oldest key is evicted first."""
+        cache = LRUCache(2)
+        cache.update({'a': 1, 'b': 2})
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'a': 1, 'c': 3})
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertEqual(len(cache), 1)
+
+
+class TestLazyExports(unittest.TestCase):
+    """Test cases for the lazily imported package namespaces."""
+    
+    HEAVY_MODULES = ('bs4', 'PIL', 'yaml', 'markdown')
+    
+    def _loaded_after(self, statement):
+        """Heavy modules present in a fresh interpreter after running statement."""
+        code = (f'import sys; {statement}; '
+                f'print(",".join(m for m in {self.HEAVY_MODULES!r} if m in sys.modules))')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=str(Path(__file__).parent.parent.parent))
+        return [name for name in result.stdout.strip().split(',') if name]
+    
+    def test_package_imports_load_no_optional_dependencies(self):
+        """Test that importing the packages loads none of bs4, PIL, yaml or markdown."""
+        self.assertEqual(self._loaded_after('import master_toolkit'), [])
+        self.assertEqual(self._loaded_after(
+            'import master_toolkit.content, master_toolkit.optimization, '
+            'master_toolkit.validation, master_toolkit.mirror'), [])
+    
+    def test_names_resolve_on_first_access(self):
+        """Test that exported names import their submodule on access and unknown names raise."""
+        import master_toolkit
+        from master_toolkit import validation
+        
+        self.assertIs(master_toolkit.WordPressClient, WordPressClient)
+        self.assertIn('SecurityValidator', dir(validation))
+        self.assertIn('SecurityValidator', validation.__all__)
+        self.assertEqual(validation.SecurityValidator.__name__, 'SecurityValidator')
+        with self.assertRaises(AttributeError):
+            validation.NoSuchValidator
+
+
+if __name__ == '__main__':
+    unittest.main()
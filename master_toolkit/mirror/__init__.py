@@ -0,0 +1,19 @@
+"""
+Mirror Module
+=============
+Local SQLite mirror of the WordPress site with incremental sync.
+"""
+
+from .._lazy import lazy_exports
+
+# Imported on first access, like the other feature packages.
+_LAZY_IMPORTS = {
+    'SiteMirror': '.store',
+    'open_site_mirror': '.store',
+    'MirrorClient': '.client',
+    'ContentSearch': '.search',
+    'LinkGraph': '.link_graph',
+    'UrlResolver': '.url_resolver'
+}
+
+lazy_exports(globals(), _LAZY_IMPORTS)
@@ -0,0 +1,132 @@
+"""
+Mirror Client
+=============
+Read-only stand-in for WordPressClient backed by the local site mirror.
+
+Validators and audits take a wp_client; passing a MirrorClient makes them
+read posts, pages, terms and media from local disk instead of the REST API.
+Anything that would write to the site, or read an endpoint that is not
+mirrored, raises WordPressAPIError.
+"""
+
+from typing import Dict, List, Any, Iterable, Iterator
+
+from ..core import WordPressClient, WordPressAPIError
+from .store import SiteMirror
+
+
+class MirrorClient(WordPressClient):
+    """WordPressClient interface served from a SiteMirror."""
+
+    def __init__(self, mirror: SiteMirror = None):
+        """Initialize mirror client (requests are never sent)."""
+        super().__init__()
+        self.mirror = mirror or SiteMirror()
+
+    def authenticate(self, username: str = None, password: str = None) -> bool:
+        """No authentication needed for local reads."""
+        return True
+
+    def test_connection(self) -> bool:
+        """The mirror is always reachable."""
+        return True
+
+    def _make_request(self, method: str, endpoint: str, **kwargs):
+        """Every request not served from the mirror is refused."""
+        raise WordPressAPIError(f"{method} {endpoint} is not available from the read-only site mirror", 405)
+
+    def get_posts(self, per_page: int = 10, page: int = 1, status: str = 'publish',
+                  category: str = None, context: str = None, **kwargs) -> List[Dict]:
+        """Get posts with optional filtering."""
+        categories = _id_list(kwargs.get('categories'))
+        if category:
+            cat_id = self._get_category_id(category)
+            categories = [cat_id] if cat_id else []
+
+        return self.mirror.get_posts(
+            status=status if status != 'any' else None,
+            categories=categories,
+            include=_id_list(kwargs.get('include')),
+            order_by=_order_by(kwargs.get('orderby', 'date'), kwargs.get('order', 'desc')),
+            **_page(per_page, page)
+        )
+
+    def get_post(self, post_id: int, context: str = None) -> Dict:
+        """Get a single post or page by ID."""
+        post = self.mirror.get_post(post_id)
+        if post is None:
+            raise WordPressAPIError(f"Failed to get post {post_id}: 404", 404)
+        return post
+
+    def _get_by_ids(self, endpoint: str, ids: Iterable[int], context: str = None,
+                    **params) -> List[Dict]:
+        """Mirrored posts or media by ID, in the order given."""
+        ids = list(dict.fromkeys(int(item_id) for item_id in ids))
+        if endpoint == 'posts':
+            status = params.get('status', 'publish')
+            items = self.mirror.get_posts(status=status if status != 'any' else None, include=ids)
+        elif endpoint == 'media':
+            wanted = set(ids)
+            items = [item for item in self.mirror.get_media() if item['id'] in wanted]
+        else:
+            raise WordPressAPIError(f"{endpoint} is not mirrored", 404)
+        found = {item['id']: item for item in items}
+        return [found[item_id] for item_id in ids if item_id in found]
+
+    def get_pages(self, per_page: int = 10, **kwargs) -> List[Dict]:
+        """Get pages."""
+        return self.mirror.get_pages(include=_id_list(kwargs.get('include')),
+                                     **_page(per_page, kwargs.get('page', 1)))
+
+    def get_categories(self) -> List[Dict]:
+        """Get all categories."""
+        return self.mirror.get_categories()
+
+    def get_media(self, per_page: int = 10, page: int = 1, context: str = None,
+                  **kwargs) -> List[Dict]:
+        """Get media library items."""
+        return self.mirror.get_media(kwargs.get('media_type'), **_page(per_page, page))
+
+    def iter_collection(self, endpoint: str, per_page: int = 100, context: str = None,
+                        **params) -> Iterator[Dict]:
+        """Yield every mirrored item of a collection endpoint."""
+        readers = {
+            'posts': lambda: self.mirror.get_posts(),
+            'pages': lambda: self.mirror.get_pages(),
+            'media': lambda: self.mirror.get_media(params.get('media_type')),
+            'categories': self.mirror.get_categories,
+            'tags': self.mirror.get_tags,
+            'menus': lambda: self.mirror.get_menus() or [],
+            'menu-items': lambda: self.mirror.get_menu_items(params.get('menus'))
+        }
+        reader = readers.get(endpoint.strip('/'))
+        if reader is None:
+            raise WordPressAPIError(f"{endpoint} is not mirrored", 404)
+        yield from reader()
+
+    def get_user_info(self) -> Dict:
+        """No user context offline."""
+        return {}
+
+
+def _id_list(value: Any) -> Any:
+    """Normalize a REST id filter (list or comma string) to a list, or None."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [int(v) for v in value.split(',') if v.strip()]
+    if isinstance(value, int):
+        return [value]
+    return list(value)
+
+
+def _order_by(orderby: str, order: str) -> str:
+    """Map REST orderby/order to a mirror ordering."""
+    direction = 'ASC' if str(order).lower() == 'asc' else 'DESC'
+    column = {'title': 'title', 'id': 'id', 'modified': 'modified_gmt'}.get(orderby, 'date_gmt')
+    return f'{column} {direction}'
+
+
+def _page(per_page: int, page: int) -> Dict[str, int]:
+    """LIMIT/OFFSET of one REST-style page."""
+    return {'limit': per_page, 'offset': (max(1, page) - 1) * per_page}
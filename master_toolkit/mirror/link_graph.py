@@ -0,0 +1,401 @@
+"""
+Link Graph
+==========
+Internal link graph of the mirrored site.
+
+The mirror extracts every post's hrefs (and redirect target, for redirect
+stub posts) into post_links as part of the same sync transaction that
+upserts the post, so only changed posts are re-parsed. LinkGraph turns
+those rows into compact sparse adjacency arrays (CSR: indptr/indices
+int32) over posts, pages, term archives and any other internal URL that
+is linked to, and answers orphan, dead-end, redirect-chain and PageRank
+questions without crawling the site.
+"""
+
+import json
+import re
+import sqlite3
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, parse_qs
+
+import numpy as np
+
+from ..core.metrics import metrics
+from ..core.storage import chunked, placeholders
+
+
+LINK_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS post_links (
+        source_id INTEGER NOT NULL,
+        target_url TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        PRIMARY KEY (source_id, target_url, kind)
+    );
+    CREATE TABLE IF NOT EXISTS link_sources (
+        post_id INTEGER PRIMARY KEY,
+        link_count INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS link_rank (
+        url TEXT PRIMARY KEY,
+        score REAL NOT NULL
+    );
+'''
+
+HREF_PATTERN = re.compile(r'''<a\s[^>]*?href\s*=\s*["']([^"'#][^"']*)["']''', re.IGNORECASE)
+
+# How this site's redirect stub posts send visitors on
+REDIRECT_PATTERNS = [
+    re.compile(r'''location(?:\.href)?\s*=\s*["']([^"']+)["']'''),
+    re.compile(r'''location\.replace\(\s*["']([^"']+)["']'''),
+    re.compile(r'''http-equiv\s*=\s*["']?refresh["']?[^>]*content\s*=\s*["'][^"']*url=([^"'>\s]+)''',
+               re.IGNORECASE)
+]
+
+# Internal URLs that are files or endpoints rather than pages
+NON_PAGE_PREFIXES = ('/wp-content/', '/wp-json/', '/wp-admin/', '/wp-includes/', '/feed/')
+
+
+class LinkGraph:
+    """Sparse internal link graph built from a SiteMirror."""
+
+    def __init__(self, mirror=None, redirects: Dict[str, str] = None):
+        """
+        Build the graph from the mirror's link rows.
+
+        Args:
+            mirror: SiteMirror to read (default: the default mirror)
+            redirects: Extra server-side redirects (old URL or path -> new URL),
+                e.g. from .htaccess rules
+        """
+        from .store import SiteMirror
+        self.mirror = mirror or SiteMirror()
+        with metrics.span('mirror.link_graph.build'):
+            self._backfill()
+            self._build(redirects or {})
+
+    def _backfill(self):
+        """Extract links for posts mirrored before link indexing existed."""
+        missing = self.mirror.query(
+            'SELECT data FROM posts WHERE id NOT IN (SELECT post_id FROM link_sources)'
+        )
+        if not missing:
+            return
+        conn = self.mirror._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            index_links(conn, [json.loads(row['data']) for row in missing])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _build(self, redirects: Dict[str, str]):
+        """Assign node IDs and build CSR link arrays plus the redirect vector."""
+        self.urls: List[str] = []
+        self.kinds: List[str] = []
+        self.post_ids: List[Optional[int]] = []
+        self.titles: List[str] = []
+        self.index: Dict[str, int] = {}
+
+        posts = self.mirror.query('SELECT id, type, link, title FROM posts')
+        self.hosts = {urlsplit(row['link']).netloc.lower().removeprefix('www.')
+                      for row in posts if row['link']}
+        for row in posts:
+            if row['link']:
+                self._node(normalize_url(row['link']), row['type'], row['id'], row['title'])
+                self.index.setdefault(f"?p={row['id']}", self.index[normalize_url(row['link'])])
+        for row in self.mirror.query('SELECT taxonomy, name, data FROM terms'):
+            link = json.loads(row['data']).get('link')
+            if link:
+                self._node(normalize_url(link), row['taxonomy'], None, row['name'])
+
+        by_post = {pid: node for node, pid in enumerate(self.post_ids) if pid is not None}
+        sources, targets, redirect_pairs = [], [], []
+        for row in self.mirror.query('SELECT source_id, target_url, kind FROM post_links'):
+            source = by_post.get(row['source_id'])
+            target = self._resolve(row['target_url'])
+            if source is None or target is None or source == target:
+                continue
+            if row['kind'] == 'redirect':
+                redirect_pairs.append((source, target))
+            else:
+                sources.append(source)
+                targets.append(target)
+
+        base = f'https://{min(self.hosts)}/' if self.hosts else ''
+        for old, new in redirects.items():
+            old_node, new_node = self._resolve(urljoin(base, old)), self._resolve(urljoin(base, new))
+            if old_node is not None and new_node is not None and old_node != new_node:
+                redirect_pairs.append((old_node, new_node))
+
+        n = len(self.urls)
+        self.size = n
+        # One edge per (source, target) pair, sorted by source for CSR
+        pairs = np.unique(np.asarray(sources, dtype=np.int64) * n + np.asarray(targets, dtype=np.int64))
+        src = (pairs // max(n, 1)).astype(np.int32)
+        dst = (pairs % max(n, 1)).astype(np.int32)
+        self.indices = dst
+        self.indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.sources = src
+
+        self.redirect_to = np.full(n, -1, dtype=np.int32)
+        for old, new in redirect_pairs:
+            self.redirect_to[old] = new
+
+        self.in_degree = np.bincount(dst, minlength=n).astype(np.int32)
+        self.out_degree = np.diff(self.indptr)
+
+    def _node(self, url: str, kind: str, post_id: Optional[int], title: str) -> int:
+        """Node ID for a normalized URL, creating the node if needed."""
+        node = self.index.get(url)
+        if node is None:
+            node = len(self.urls)
+            self.index[url] = node
+            self.urls.append(url)
+            self.kinds.append(kind)
+            self.post_ids.append(post_id)
+            self.titles.append(title or '')
+        return node
+
+    def _resolve(self, url: str, create: bool = True) -> Optional[int]:
+        """Node ID for an internal link target (None for external/non-page URLs)."""
+        parts = urlsplit(url)
+        if parts.netloc.lower().removeprefix('www.') not in self.hosts:
+            return None
+        if parts.path.startswith(NON_PAGE_PREFIXES):
+            return None
+        query = parse_qs(parts.query)
+        post_id = (query.get('p') or query.get('page_id') or [None])[0]
+        if post_id and f'?p={post_id}' in self.index:
+            return self.index[f'?p={post_id}']
+        if not create:
+            return self.index.get(normalize_url(url))
+        return self._node(normalize_url(url), 'url', None, '')
+
+    # Node helpers
+
+    def _content_nodes(self) -> np.ndarray:
+        """Mask of posts and pages that are not redirect stubs."""
+        is_post = np.array([pid is not None for pid in self.post_ids], dtype=bool)
+        return is_post & (self.redirect_to < 0)
+
+    def _describe(self, node: int, **extra) -> Dict[str, Any]:
+        """Report entry for a node."""
+        entry = {'url': self.urls[node], 'kind': self.kinds[node], 'post_id': self.post_ids[node],
+                 'title': self.titles[node]}
+        entry.update(extra)
+        return entry
+
+    def linked_from(self, node: int) -> List[int]:
+        """Nodes that link to a node."""
+        return self.sources[self.indices == node].tolist()
+
+    def links_of(self, node: int) -> List[int]:
+        """Nodes a node links to."""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]].tolist()
+
+    # Analyses
+
+    def orphans(self) -> List[Dict[str, Any]]:
+        """Posts/pages no other content links to (menu-linked items excluded)."""
+        in_menu = np.zeros(self.size, dtype=bool)
+        by_post = {pid: node for node, pid in enumerate(self.post_ids) if pid is not None}
+        for item in self.mirror.get_menu_items():
+            node = by_post.get(item.get('object_id')) if item.get('object_id') else None
+            if node is None and item.get('url'):
+                node = self._resolve(item['url'], create=False)
+            if node is not None:
+                in_menu[node] = True
+
+        # Links from redirect stubs do not make a page discoverable
+        real_sources = self.redirect_to[self.sources] < 0
+        linked = np.bincount(self.indices[real_sources], minlength=self.size) > 0
+        # ...but a linked redirect does make its final target discoverable
+        for chain in self.redirect_chains():
+            if chain['final_url'] and chain['linked_from']:
+                linked[self.index[chain['final_url']]] = True
+        mask = self._content_nodes() & ~linked & ~in_menu
+        return [self._describe(int(node)) for node in np.flatnonzero(mask)]
+
+    def dead_ends(self) -> List[Dict[str, Any]]:
+        """Posts/pages without any internal outgoing links."""
+        mask = self._content_nodes() & (self.out_degree == 0)
+        return [self._describe(int(node)) for node in np.flatnonzero(mask)]
+
+    def unresolved_links(self) -> List[Dict[str, Any]]:
+        """Internal URLs that are linked to but are not a known post, page or archive."""
+        mask = np.array([kind == 'url' for kind in self.kinds], dtype=bool)
+        mask &= (self.in_degree > 0) & (self.redirect_to < 0)
+        return [self._describe(int(node), linked_from=self._post_ids(self.linked_from(int(node))))
+                for node in np.flatnonzero(mask)]
+
+    def redirect_chains(self) -> List[Dict[str, Any]]:
+        """
+        Linked-to redirects and where they end up.
+
+        Every content link that hits a redirect costs a hop; chains of two or
+        more hops and loops are the worst offenders. Each entry lists the
+        posts whose links should point straight at the final URL.
+        """
+        chains = []
+        for node in np.flatnonzero((self.redirect_to >= 0) & (self.in_degree > 0)):
+            path, seen = [int(node)], {int(node)}
+            loop = False
+            while self.redirect_to[path[-1]] >= 0:
+                nxt = int(self.redirect_to[path[-1]])
+                if nxt in seen:
+                    loop = True
+                    break
+                path.append(nxt)
+                seen.add(nxt)
+            chains.append(self._describe(
+                int(node),
+                chain=[self.urls[p] for p in path],
+                hops=len(path) - 1,
+                final_url=None if loop else self.urls[path[-1]],
+                loop=loop,
+                linked_from=self._post_ids(self.linked_from(int(node)))
+            ))
+        chains.sort(key=lambda c: (not c['loop'], -c['hops'], -len(c['linked_from'])))
+        return chains
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-8, max_iter: int = 100,
+                 warm_start: bool = True) -> np.ndarray:
+        """
+        PageRank-style centrality over the link graph (vectorized power iteration).
+
+        Redirects forward all of their score to their target; dangling nodes
+        spread theirs evenly. Scores are persisted so the next run starts from
+        the previous solution and converges in a few iterations after small edits.
+        """
+        n = self.size
+        if n == 0:
+            return np.zeros(0)
+
+        # Redirect nodes get a single edge to their target instead of their links
+        is_redirect = self.redirect_to >= 0
+        keep = ~is_redirect[self.sources]
+        src = np.concatenate([self.sources[keep], np.flatnonzero(is_redirect)]).astype(np.int64)
+        dst = np.concatenate([self.indices[keep], self.redirect_to[is_redirect]]).astype(np.int64)
+        out = np.bincount(src, minlength=n).astype(np.float64)
+        dangling = out == 0
+        weight = 1.0 / out[src]
+
+        rank = self._load_rank() if warm_start else None
+        if rank is None:
+            rank = np.full(n, 1.0 / n)
+
+        with metrics.span('mirror.link_graph.pagerank', nodes=n, edges=len(src)):
+            for iteration in range(max_iter):
+                spread = np.bincount(dst, weights=rank[src] * weight, minlength=n)
+                new = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+                delta = np.abs(new - rank).sum()
+                rank = new
+                if delta < tol:
+                    break
+            metrics.observe('mirror.link_graph.pagerank_iterations', iteration + 1)
+
+        self._store_rank(rank)
+        return rank
+
+    def top_pages(self, limit: int = 20, **pagerank_options) -> List[Dict[str, Any]]:
+        """Most central posts/pages with their score and link counts."""
+        rank = self.pagerank(**pagerank_options)
+        content = np.flatnonzero(self._content_nodes())
+        ordered = content[np.argsort(-rank[content], kind='stable')][:limit]
+        return [self._describe(int(node), score=round(float(rank[node]), 6),
+                               inbound=int(self.in_degree[node]), outbound=int(self.out_degree[node]))
+                for node in ordered]
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        """Summary of every analysis."""
+        content = self._content_nodes()
+        return {
+            'nodes': self.size,
+            'content_nodes': int(content.sum()),
+            'links': int(len(self.indices)),
+            'redirects': int((self.redirect_to >= 0).sum()),
+            'orphans': self.orphans(),
+            'dead_ends': self.dead_ends(),
+            'redirect_chains': self.redirect_chains(),
+            'unresolved_links': self.unresolved_links(),
+            'top_pages': self.top_pages(top)
+        }
+
+    def _post_ids(self, nodes: Iterable[int]) -> List[int]:
+        """Post IDs of the given nodes (non-post nodes skipped)."""
+        return sorted({self.post_ids[n] for n in nodes if self.post_ids[n] is not None})
+
+    def _load_rank(self) -> Optional[np.ndarray]:
+        """Previous scores aligned to the current nodes, or None."""
+        stored = {row['url']: row['score'] for row in self.mirror.query('SELECT url, score FROM link_rank')}
+        if not stored:
+            return None
+        rank = np.array([stored.get(url, 0.0) for url in self.urls])
+        missing = rank == 0
+        rank[missing] = 1.0 / self.size
+        return rank / rank.sum()
+
+    def _store_rank(self, rank: np.ndarray):
+        """Persist scores for the next warm start."""
+        conn = self.mirror._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM link_rank')
+            conn.executemany('INSERT INTO link_rank VALUES (?, ?)', zip(self.urls, rank.tolist()))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+def extract_links(post: Dict) -> List[Tuple[str, str]]:
+    """(absolute URL, kind) pairs for a post's links and redirect target."""
+    base = post.get('link') or ''
+    content = post.get('content')
+    html = (content.get('rendered') if isinstance(content, dict) else content) or ''
+
+    links = [(urljoin(base, href.strip()), 'link') for href in HREF_PATTERN.findall(html)
+             if not href.startswith(('mailto:', 'tel:', 'javascript:'))]
+
+    target = (post.get('meta') or {}).get('_redirect_url') if isinstance(post.get('meta'), dict) else None
+    if not target:
+        for pattern in REDIRECT_PATTERNS:
+            match = pattern.search(html)
+            if match:
+                target = match.group(1)
+                break
+    if target:
+        links.append((urljoin(base, target), 'redirect'))
+    return links
+
+
+def index_links(conn: sqlite3.Connection, posts: List[Dict]):
+    """(Re)extract posts' links inside the caller's transaction."""
+    unindex_links(conn, [p['id'] for p in posts])
+    rows, sources = [], []
+    for post in posts:
+        links = set(extract_links(post))
+        rows.extend((post['id'], url, kind) for url, kind in links)
+        sources.append((post['id'], len(links)))
+    conn.executemany('INSERT OR IGNORE INTO post_links VALUES (?, ?, ?)', rows)
+    conn.executemany('INSERT OR REPLACE INTO link_sources VALUES (?, ?)', sources)
+
+
+def unindex_links(conn: sqlite3.Connection, post_ids: List[int]):
+    """Drop posts' links inside the caller's transaction."""
+    for chunk in chunked(post_ids):
+        marks = placeholders(chunk)
+        conn.execute(f'DELETE FROM post_links WHERE source_id IN ({marks})', chunk)
+        conn.execute(f'DELETE FROM link_sources WHERE post_id IN ({marks})', chunk)
+
+
+def normalize_url(url: str) -> str:
+    """Scheme-, www- and trailing-slash-insensitive key for an internal URL."""
+    parts = urlsplit(url)
+    host = parts.netloc.lower().removeprefix('www.')
+    path = parts.path or '/'
+    if not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+        path += '/'
+    return f'{host}{path}'
@@ -0,0 +1,178 @@
+"""
+Content Search
+==============
+FTS5 full-text index over the mirrored posts and pages.
+
+Each post is indexed as five columns: title, excerpt, body (tags and
+scripts stripped), links (every href in the body) and scripts (inline
+script source). The mirror keeps the index current inside the same
+transaction that upserts or prunes posts, so audit questions like "which
+posts mention X", "which contain placeholder text" or "which link to Y"
+are a single indexed query instead of a loop over every post.
+"""
+
+import json
+import sqlite3
+from typing import Dict, List, Any, Iterable, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+from ..core.metrics import metrics
+from ..core.storage import chunked, placeholders
+
+
+SEARCH_SCHEMA = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS content_search USING fts5(
+        title, excerpt, body, links, scripts,
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+'''
+
+SEARCH_COLUMNS = ('title', 'excerpt', 'body', 'links', 'scripts')
+
+# Columns holding reader-visible text
+TEXT_COLUMNS = ('title', 'excerpt', 'body')
+
+# Title matches outrank body matches; links/scripts barely count towards relevance
+COLUMN_WEIGHTS = (10.0, 4.0, 1.0, 0.5, 0.5)
+
+PLACEHOLDER_PHRASES = ('coming soon', 'placeholder', 'lorem ipsum', 'redirect')
+
+
+class ContentSearch:
+    """Full-text queries against a SiteMirror's content index."""
+
+    def __init__(self, mirror=None):
+        """Initialize search, backfilling the index if it lags the mirror."""
+        from .store import SiteMirror
+        self.mirror = mirror or SiteMirror()
+        if self._indexed_count() != self._post_count():
+            self.rebuild()
+
+    def _post_count(self) -> int:
+        return self.mirror.query('SELECT COUNT(*) FROM posts')[0][0]
+
+    def _indexed_count(self) -> int:
+        return self.mirror.query('SELECT COUNT(*) FROM content_search')[0][0]
+
+    def rebuild(self) -> int:
+        """Re-index every mirrored post from scratch."""
+        conn = self.mirror._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM content_search')
+            posts = [json.loads(row[0]) for row in conn.execute('SELECT data FROM posts')]
+            index_posts(conn, posts)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(posts)
+
+    # Queries
+
+    def search(self, query: str, post_type: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Run an FTS5 query (phrases, AND/OR/NOT, prefix*, column:term).
+
+        Returns:
+            Hits ordered by relevance with id, type, title, link and a
+            highlighted snippet
+        """
+        sql = f'''
+            SELECT p.id, p.type, p.title, p.link,
+                   snippet(content_search, -1, '[', ']', '…', 12) AS snippet,
+                   bm25(content_search, {', '.join(map(str, COLUMN_WEIGHTS))}) AS rank
+            FROM content_search JOIN posts p ON p.id = content_search.rowid
+            WHERE content_search MATCH ?
+        '''
+        params: List[Any] = [query]
+        if post_type:
+            sql += ' AND p.type = ?'
+            params.append(post_type)
+        sql += ' ORDER BY rank LIMIT ?'
+        params.append(limit)
+
+        with metrics.span('mirror.search'):
+            try:
+                rows = self.mirror.query(sql, params)
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query {query!r}: {e}") from e
+        return [dict(row) for row in rows]
+
+    def mentions(self, text: str, column: str = None, post_type: str = None,
+                 limit: int = 1000) -> List[Dict[str, Any]]:
+        """Posts whose visible text (or one given column) contains a literal phrase."""
+        return self.search(_phrase(text, column or TEXT_COLUMNS), post_type=post_type, limit=limit)
+
+    def linking_to(self, url: str, post_type: str = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Posts whose body links to a URL (or any URL containing it)."""
+        return self.mentions(url, column='links', post_type=post_type, limit=limit)
+
+    def find_placeholders(self, phrases: Iterable[str] = PLACEHOLDER_PHRASES,
+                          post_type: str = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Posts whose title or body contains any placeholder phrase."""
+        query = ' OR '.join(_phrase(p, ('title', 'body')) for p in phrases)
+        return self.search(query, post_type=post_type, limit=limit)
+
+    def with_inline_scripts(self, post_type: str = None) -> List[Dict[str, Any]]:
+        """Posts whose content embeds inline <script> code."""
+        sql = '''
+            SELECT p.id, p.type, p.title, p.link, substr(s.scripts, 1, 120) AS snippet
+            FROM content_search s JOIN posts p ON p.id = s.rowid
+            WHERE s.scripts != ''
+        '''
+        params = []
+        if post_type:
+            sql += ' AND p.type = ?'
+            params.append(post_type)
+        return [dict(row) for row in self.mirror.query(sql + ' ORDER BY p.id', params)]
+
+
+def extract_document(post: Dict) -> Tuple[str, str, str, str, str]:
+    """Split a REST post into the indexed (title, excerpt, body, links, scripts) text."""
+    title = BeautifulSoup(_rendered(post.get('title')), 'html.parser').get_text()
+    excerpt = BeautifulSoup(_rendered(post.get('excerpt')), 'html.parser').get_text(' ', strip=True)
+
+    soup = BeautifulSoup(_rendered(post.get('content')), 'html.parser')
+    links = ' '.join(a['href'] for a in soup.find_all('a', href=True))
+    scripts = '\n'.join(s.string.strip() for s in soup.find_all('script') if s.string and s.string.strip())
+    for tag in soup.find_all(['script', 'style']):
+        tag.decompose()
+    body = soup.get_text(' ', strip=True)
+
+    return title, excerpt, body, links, scripts
+
+
+def index_posts(conn: sqlite3.Connection, posts: List[Dict]):
+    """(Re)index posts inside the caller's transaction."""
+    unindex_posts(conn, [p['id'] for p in posts])
+    conn.executemany(
+        'INSERT INTO content_search (rowid, title, excerpt, body, links, scripts) VALUES (?, ?, ?, ?, ?, ?)',
+        [(p['id'],) + extract_document(p) for p in posts]
+    )
+
+
+def unindex_posts(conn: sqlite3.Connection, post_ids: List[int]):
+    """Drop posts from the index inside the caller's transaction."""
+    for chunk in chunked(post_ids):
+        conn.execute(f'DELETE FROM content_search WHERE rowid IN ({placeholders(chunk)})', chunk)
+
+
+def _phrase(text: str, columns: Union[str, Iterable[str], None] = None) -> str:
+    """Quote text as an FTS5 phrase, optionally scoped to one or more columns."""
+    phrase = '"' + text.replace('"', '""') + '"'
+    if columns is None:
+        return phrase
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    unknown = set(columns) - set(SEARCH_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown search column(s): {', '.join(sorted(unknown))}")
+    return f"{{{' '.join(columns)}}} : {phrase}"
+
+
+def _rendered(field: Any) -> str:
+    """Rendered HTML of a REST field, or an empty string."""
+    if isinstance(field, dict):
+        field = field.get('rendered')
+    return field or ''
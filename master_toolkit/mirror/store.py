@@ -0,0 +1,453 @@
+"""
+Site Mirror Store
+=================
+Normalized local SQLite copy of a WordPress site: posts, pages, terms,
+media and menus.
+
+Posts, pages and media sync incrementally: only items modified since the
+last sync are fetched (modified_after, compared by WordPress against the
+site-local modified date), and an IDs-only listing prunes items that were
+deleted or unpublished. Terms and menus are small and refreshed in full.
+Each row keeps the REST representation alongside its normalized columns,
+so reads return the same dicts the REST API would. Post and page text is
+also kept in a full-text index (see search.py) and its links in the
+link graph tables (see link_graph.py).
+"""
+
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+from ..core import WordPressClient, WordPressAPIError, metrics
+from ..core.storage import SQLiteStore, chunked, placeholders
+from .search import SEARCH_SCHEMA, index_posts, unindex_posts
+from .link_graph import LINK_SCHEMA, index_links, unindex_links
+
+
+# Collection name -> REST endpoint and sync mode
+COLLECTIONS = {
+    'posts': {'endpoint': 'posts', 'incremental': True},
+    'pages': {'endpoint': 'pages', 'incremental': True},
+    'media': {'endpoint': 'media', 'incremental': True},
+    'categories': {'endpoint': 'categories', 'incremental': False},
+    'tags': {'endpoint': 'tags', 'incremental': False},
+    'menus': {'endpoint': 'menus', 'incremental': False},
+    'menu_items': {'endpoint': 'menu-items', 'incremental': False}
+}
+
+# Menus need WordPress 5.9+ and an authenticated user; missing access is not an error
+OPTIONAL_COLLECTIONS = {'menus', 'menu_items'}
+
+POST_TYPES = {'posts': 'post', 'pages': 'page'}
+TAXONOMIES = {'categories': 'category', 'tags': 'post_tag'}
+
+# Columns get_posts() can order by
+ORDER_COLUMNS = ('date_gmt', 'modified_gmt', 'id', 'title', 'menu_order')
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY,
+        type TEXT NOT NULL,
+        slug TEXT,
+        status TEXT,
+        link TEXT,
+        title TEXT,
+        excerpt TEXT,
+        content TEXT,
+        author INTEGER,
+        featured_media INTEGER,
+        parent INTEGER,
+        menu_order INTEGER,
+        date_gmt TEXT,
+        modified TEXT,
+        modified_gmt TEXT,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_posts_type_date ON posts (type, date_gmt);
+    CREATE INDEX IF NOT EXISTS idx_posts_slug ON posts (slug);
+
+    CREATE TABLE IF NOT EXISTS terms (
+        id INTEGER PRIMARY KEY,
+        taxonomy TEXT NOT NULL,
+        name TEXT,
+        slug TEXT,
+        description TEXT,
+        parent INTEGER,
+        count INTEGER,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_terms_taxonomy ON terms (taxonomy, slug);
+
+    CREATE TABLE IF NOT EXISTS post_terms (
+        post_id INTEGER NOT NULL,
+        term_id INTEGER NOT NULL,
+        taxonomy TEXT NOT NULL,
+        PRIMARY KEY (post_id, term_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_post_terms_term ON post_terms (term_id);
+
+    CREATE TABLE IF NOT EXISTS media (
+        id INTEGER PRIMARY KEY,
+        slug TEXT,
+        title TEXT,
+        source_url TEXT,
+        mime_type TEXT,
+        media_type TEXT,
+        alt_text TEXT,
+        post INTEGER,
+        modified TEXT,
+        modified_gmt TEXT,
+        data TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS menus (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        slug TEXT,
+        data TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS menu_items (
+        id INTEGER PRIMARY KEY,
+        menu_id INTEGER,
+        parent INTEGER,
+        menu_order INTEGER,
+        title TEXT,
+        url TEXT,
+        object TEXT,
+        object_id INTEGER,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_menu_items_menu ON menu_items (menu_id, menu_order);
+
+    CREATE TABLE IF NOT EXISTS sync_state (
+        collection TEXT PRIMARY KEY,
+        cursor TEXT,
+        available INTEGER NOT NULL DEFAULT 1,
+        item_count INTEGER,
+        synced_at TEXT
+    );
+'''
+
+
+class SiteMirror(SQLiteStore):
+    """Local SQLite mirror of a WordPress site."""
+
+    def __init__(self, db_path: Optional[Path] = None, statuses: Tuple[str, ...] = ('publish',)):
+        """
+        Initialize site mirror.
+
+        Args:
+            db_path: Mirror database (defaults to site_mirror.db next to this module)
+            statuses: Post/page statuses to mirror; anything beyond 'publish' needs auth
+        """
+        super().__init__(db_path or Path(__file__).parent / 'site_mirror.db',
+                         SCHEMA + SEARCH_SCHEMA + LINK_SCHEMA)
+        self.statuses = tuple(statuses)
+        self._connect()
+
+    # Syncing
+
+    def sync(self, wp_client: WordPressClient, full: bool = False,
+             collections: Iterable[str] = None) -> Dict[str, Any]:
+        """
+        Bring the mirror up to date.
+
+        Args:
+            wp_client: Authenticated client to sync from
+            full: Refetch everything instead of only items modified since the last sync
+            collections: Subset of COLLECTIONS to sync (default: all)
+
+        Returns:
+            Per-collection counts of fetched and pruned items
+        """
+        results = {}
+        started = time.perf_counter()
+        for name in collections or COLLECTIONS:
+            with metrics.span('mirror.sync', collection=name):
+                try:
+                    if COLLECTIONS[name]['incremental']:
+                        results[name] = self._sync_incremental(wp_client, name, full)
+                    else:
+                        results[name] = self._sync_full(wp_client, name)
+                except WordPressAPIError as e:
+                    if name in OPTIONAL_COLLECTIONS and e.status_code in (401, 403, 404):
+                        self._set_state(name, available=False)
+                        results[name] = {'skipped': f'not available ({e.status_code})'}
+                    else:
+                        results[name] = {'error': str(e)}
+
+        results['duration_seconds'] = round(time.perf_counter() - started, 2)
+        return results
+
+    def _sync_incremental(self, wp: WordPressClient, name: str, full: bool) -> Dict[str, int]:
+        """Fetch items modified since the cursor, then prune deleted ones."""
+        spec = COLLECTIONS[name]
+        state = self.get_state(name)
+        cursor = None if full or not state else state['cursor']
+
+        filters = {}
+        if name in POST_TYPES:
+            filters['status'] = ','.join(self.statuses)
+
+        params = dict(filters, orderby='modified', order='asc')
+        if cursor:
+            params['modified_after'] = cursor
+
+        fetched = list(wp.iter_collection(spec['endpoint'], **params))
+        newest = max([item.get('modified') or '' for item in fetched] + [cursor or '']) or None
+
+        # IDs-only listing is a few bytes per item and catches deletions/unpublishing
+        remote_ids = {item['id'] for item in wp.iter_collection(spec['endpoint'], _fields='id', **filters)}
+
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if name in POST_TYPES:
+                self._upsert_posts(conn, POST_TYPES[name], fetched)
+                local_ids = {row[0] for row in conn.execute(
+                    'SELECT id FROM posts WHERE type = ?', (POST_TYPES[name],))}
+            else:
+                self._upsert_media(conn, fetched)
+                local_ids = {row[0] for row in conn.execute('SELECT id FROM media')}
+
+            stale = sorted(local_ids - remote_ids)
+            for chunk in chunked(stale):
+                marks = placeholders(chunk)
+                if name in POST_TYPES:
+                    conn.execute(f'DELETE FROM posts WHERE id IN ({marks})', chunk)
+                    conn.execute(f'DELETE FROM post_terms WHERE post_id IN ({marks})', chunk)
+                    unindex_posts(conn, chunk)
+                    unindex_links(conn, chunk)
+                else:
+                    conn.execute(f'DELETE FROM media WHERE id IN ({marks})', chunk)
+
+            self._set_state(name, cursor=newest, item_count=len(remote_ids), conn=conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return {'fetched': len(fetched), 'pruned': len(stale), 'total': len(remote_ids)}
+
+    def _sync_full(self, wp: WordPressClient, name: str) -> Dict[str, int]:
+        """Replace a small collection wholesale."""
+        spec = COLLECTIONS[name]
+        items = list(wp.iter_collection(spec['endpoint']))
+
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if name in TAXONOMIES:
+                taxonomy = TAXONOMIES[name]
+                conn.execute('DELETE FROM terms WHERE taxonomy = ?', (taxonomy,))
+                conn.executemany(
+                    'INSERT OR REPLACE INTO terms VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(t['id'], taxonomy, t.get('name'), t.get('slug'), t.get('description'),
+                      t.get('parent', 0), t.get('count'), json.dumps(t)) for t in items]
+                )
+            elif name == 'menus':
+                conn.execute('DELETE FROM menus')
+                conn.executemany(
+                    'INSERT INTO menus VALUES (?, ?, ?, ?)',
+                    [(m['id'], m.get('name'), m.get('slug'), json.dumps(m)) for m in items]
+                )
+            else:
+                conn.execute('DELETE FROM menu_items')
+                conn.executemany(
+                    'INSERT INTO menu_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(i['id'], i.get('menus'), i.get('parent', 0), i.get('menu_order'),
+                      _rendered(i.get('title')), i.get('url'), i.get('object'), i.get('object_id'),
+                      json.dumps(i)) for i in items]
+                )
+            self._set_state(name, item_count=len(items), conn=conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return {'fetched': len(items), 'total': len(items)}
+
+    def _upsert_posts(self, conn: sqlite3.Connection, post_type: str, items: List[Dict]):
+        """Insert or replace posts/pages, their term assignments, search and link rows."""
+        conn.executemany(
+            'INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(p['id'], post_type, p.get('slug'), p.get('status'), p.get('link'),
+              _rendered(p.get('title')), _rendered(p.get('excerpt')), _rendered(p.get('content')),
+              p.get('author'), p.get('featured_media', 0), p.get('parent', 0), p.get('menu_order', 0),
+              p.get('date_gmt'), p.get('modified'), p.get('modified_gmt'), json.dumps(p))
+             for p in items]
+        )
+
+        ids = [p['id'] for p in items]
+        for chunk in chunked(ids):
+            conn.execute(f'DELETE FROM post_terms WHERE post_id IN ({placeholders(chunk)})', chunk)
+        conn.executemany(
+            'INSERT OR IGNORE INTO post_terms VALUES (?, ?, ?)',
+            [(p['id'], term_id, taxonomy)
+             for p in items
+             for field, taxonomy in (('categories', 'category'), ('tags', 'post_tag'))
+             for term_id in p.get(field) or []]
+        )
+        index_posts(conn, items)
+        index_links(conn, items)
+
+    def _upsert_media(self, conn: sqlite3.Connection, items: List[Dict]):
+        """Insert or replace media items."""
+        conn.executemany(
+            'INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(m['id'], m.get('slug'), _rendered(m.get('title')), m.get('source_url'),
+              m.get('mime_type'), m.get('media_type'), m.get('alt_text'), m.get('post'),
+              m.get('modified'), m.get('modified_gmt'), json.dumps(m))
+             for m in items]
+        )
+
+    def get_state(self, collection: str) -> Optional[Dict[str, Any]]:
+        """Sync state of a collection, or None if it was never synced."""
+        row = self._connect().execute(
+            'SELECT * FROM sync_state WHERE collection = ?', (collection,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def _set_state(self, collection: str, cursor: str = None, item_count: int = None,
+                   available: bool = True, conn: sqlite3.Connection = None):
+        """Record a collection's sync cursor and counts."""
+        (conn or self._connect()).execute(
+            'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)',
+            (collection, cursor, int(available), item_count, datetime.now().isoformat())
+        )
+
+    def status(self) -> Dict[str, Any]:
+        """Sync state of every collection."""
+        return {name: self.get_state(name) for name in COLLECTIONS}
+
+    # Reads
+
+    def query(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        """Run a read query against the mirror tables."""
+        return self._connect().execute(sql, tuple(params)).fetchall()
+
+    def get_posts(self, post_type: str = 'post', status: str = None, categories: Iterable[int] = None,
+                  include: Iterable[int] = None, order_by: str = 'date_gmt DESC',
+                  limit: int = None, offset: int = 0) -> List[Dict]:
+        """Posts (or pages) as REST API dicts, newest first by default (optionally one page of them)."""
+        sql = 'SELECT data FROM posts WHERE type = ?'
+        params: List[Any] = [post_type]
+        if status:
+            sql += ' AND status = ?'
+            params.append(status)
+        if include is not None:
+            include = list(include)
+            sql += f" AND id IN ({','.join('?' * len(include)) or 'NULL'})"
+            params.extend(include)
+        if categories is not None:
+            categories = list(categories)
+            sql += (f" AND id IN (SELECT post_id FROM post_terms WHERE term_id IN "
+                    f"({','.join('?' * len(categories)) or 'NULL'}))")
+            params.extend(categories)
+        column, _, direction = order_by.partition(' ')
+        if column not in ORDER_COLUMNS or direction not in ('ASC', 'DESC'):
+            raise ValueError(f"Unsupported order: {order_by}")
+        sql += f' ORDER BY {order_by}, id DESC'
+        return [json.loads(row['data']) for row in self.query(*_limit(sql, params, limit, offset))]
+
+    def get_post(self, post_id: int) -> Optional[Dict]:
+        """A single post or page by ID."""
+        rows = self.query('SELECT data FROM posts WHERE id = ?', (post_id,))
+        return json.loads(rows[0]['data']) if rows else None
+
+    def get_pages(self, **kwargs) -> List[Dict]:
+        """Pages as REST API dicts."""
+        kwargs.setdefault('order_by', 'menu_order ASC')
+        return self.get_posts(post_type='page', **kwargs)
+
+    def get_terms(self, taxonomy: str = 'category') -> List[Dict]:
+        """Terms of a taxonomy ('category' or 'post_tag')."""
+        rows = self.query('SELECT data FROM terms WHERE taxonomy = ? ORDER BY name', (taxonomy,))
+        return [json.loads(row['data']) for row in rows]
+
+    def get_categories(self) -> List[Dict]:
+        """Categories as REST API dicts."""
+        return self.get_terms('category')
+
+    def get_tags(self) -> List[Dict]:
+        """Tags as REST API dicts."""
+        return self.get_terms('post_tag')
+
+    def get_media(self, media_type: str = None, limit: int = None, offset: int = 0) -> List[Dict]:
+        """Media items as REST API dicts, newest first (optionally one page of them)."""
+        if media_type:
+            sql, params = 'SELECT data FROM media WHERE media_type = ? ORDER BY id DESC', [media_type]
+        else:
+            sql, params = 'SELECT data FROM media ORDER BY id DESC', []
+        return [json.loads(row['data']) for row in self.query(*_limit(sql, params, limit, offset))]
+
+    def get_menus(self) -> Optional[List[Dict]]:
+        """Menus, or None when the menus endpoint was not available to mirror."""
+        state = self.get_state('menus')
+        if not state or not state['available']:
+            return None
+        return [json.loads(row['data']) for row in self.query('SELECT data FROM menus ORDER BY id')]
+
+    def get_menu_items(self, menu_id: int = None) -> List[Dict]:
+        """Menu items, optionally for a single menu, in menu order."""
+        if menu_id is None:
+            rows = self.query('SELECT data FROM menu_items ORDER BY menu_id, menu_order')
+        else:
+            rows = self.query('SELECT data FROM menu_items WHERE menu_id = ? ORDER BY menu_order', (menu_id,))
+        return [json.loads(row['data']) for row in rows]
+
+
+def open_site_mirror(base_url: str = None, username: str = None, password: str = None,
+                     db_path: Optional[Path] = None, sync: bool = None,
+                     wp_client: WordPressClient = None) -> SiteMirror:
+    """
+    Open the local site mirror, syncing it first when a client or credentials are given.
+
+    Set WP_MIRROR_OFFLINE=1 (or sync=False) to read the existing mirror
+    without touching the network.
+    """
+    from ..core import config
+    from ..utils import print_warning
+
+    mirror = SiteMirror(db_path)
+    if sync is None:
+        sync = os.getenv('WP_MIRROR_OFFLINE', '').lower() not in ('1', 'true', 'yes')
+    if not sync:
+        return mirror
+
+    if wp_client is None:
+        if not (username and password):
+            print_warning("Mirror sync skipped: no credentials, using local copy")
+            return mirror
+        if base_url:
+            config.set('base_url', base_url.rstrip('/'))
+        wp_client = WordPressClient()
+        if not wp_client.authenticate(username, password):
+            print_warning("Mirror sync skipped: authentication failed, using local copy")
+            return mirror
+
+    result = mirror.sync(wp_client)
+    for name, outcome in result.items():
+        if isinstance(outcome, dict) and 'error' in outcome:
+            print_warning(f"Mirror sync of {name} failed: {outcome['error']}")
+    return mirror
+
+
+def _rendered(field: Any) -> Optional[str]:
+    """Rendered value of a REST field that may be {'rendered': ...} or a plain string."""
+    if isinstance(field, dict):
+        return field.get('rendered')
+    return field
+
+
+def _limit(sql: str, params: List[Any], limit: Optional[int], offset: int) -> Tuple[str, List[Any]]:
+    """Append LIMIT/OFFSET to a read query when a page was requested."""
+    if limit is None:
+        return sql, params
+    return sql + ' LIMIT ? OFFSET ?', [*params, limit, max(0, offset)]
+
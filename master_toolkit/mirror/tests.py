@@ -0,0 +1,230 @@
+"""
+Site Mirror Test Suite
+======================
+Tests for the SQLite site mirror, its search, link graph and URL resolver.
+"""
+
+import unittest
+import tempfile
+from unittest.mock import Mock, patch
+
+# Test imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.core.client import WordPressAPIError
+from master_toolkit.mirror import SiteMirror, MirrorClient, ContentSearch, LinkGraph, UrlResolver
+from master_toolkit.validation.links import LinkValidator
+
+
+class TestSiteMirror(unittest.TestCase):
+    """Test cases for the local SQLite site mirror."""
+    
+    def setUp(self):
+        """Set up a mirror in a temp dir and a fake REST collection source."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mirror = SiteMirror(db_path=Path(self.temp_dir.name) / 'mirror.db')
+        self.remote = {
+            'posts': [self._post(1, '2025-01-01T10:00:00', [3]), self._post(2, '2025-01-02T10:00:00', [4])],
+            'pages': [], 'media': [],
+            'categories': [{'id': 3, 'name': 'Tech', 'slug': 'tech'}, {'id': 4, 'name': 'Finance', 'slug': 'finance'}],
+            'tags': []
+        }
+        self.requests = []
+        
+        def iter_collection(endpoint, **params):
+            self.requests.append((endpoint, params))
+            if endpoint in ('menus', 'menu-items'):
+                raise WordPressAPIError('rest_no_route', 404)
+            items = self.remote[endpoint]
+            if 'modified_after' in params:
+                items = [i for i in items if i['modified'] > params['modified_after']]
+            if params.get('_fields') == 'id':
+                items = [{'id': i['id']} for i in items]
+            return iter(items)
+        
+        self.wp = Mock()
+        self.wp.iter_collection.side_effect = iter_collection
+    
+    def tearDown(self):
+        """Remove the temp mirror."""
+        self.temp_dir.cleanup()
+    
+    def _post(self, post_id, modified, categories):
+        """Minimal REST post payload."""
+        return {'id': post_id, 'slug': f'post-{post_id}', 'status': 'publish', 'type': 'post',
+                'link': f'https://site.test/post-{post_id}/',
+                'title': {'rendered': f'Post {post_id}'}, 'content': {'rendered': '<p>Body</p>'},
+                'date_gmt': modified, 'modified': modified, 'modified_gmt': modified,
+                'categories': categories, 'featured_media': 0}
+    
+    def test_incremental_sync_fetches_changes_and_prunes_deletions(self):
+        """Test that a second sync only asks for newer items and drops deleted ones."""
+        self.mirror.sync(self.wp)
+        self.remote['posts'] = [self._post(2, '2025-02-01T09:00:00', [3])]
+        self.requests.clear()
+        
+        result = self.mirror.sync(self.wp, collections=['posts'])
+        
+        self.assertEqual(self.requests[0][1]['modified_after'], '2025-01-02T10:00:00')
+        self.assertEqual(result['posts'], {'fetched': 1, 'pruned': 1, 'total': 1})
+        self.assertEqual([p['id'] for p in self.mirror.get_posts(categories=[3])], [2])
+        self.assertIsNone(self.mirror.get_post(1))
+        self.assertEqual(self.mirror.get_state('posts')['cursor'], '2025-02-01T09:00:00')
+    
+    def test_mirror_client_serves_reads_and_refuses_writes(self):
+        """Test that MirrorClient answers client reads offline and rejects writes."""
+        self.mirror.sync(self.wp)
+        client = MirrorClient(self.mirror)
+        
+        self.assertEqual([p['id'] for p in client.get_posts(category='Finance')], [2])
+        self.assertEqual([p['id'] for p in client.get_posts(per_page=1, page=2)], [1])
+        self.assertEqual(client.get_posts(per_page=1, page=3), [])
+        self.assertEqual([p['id'] for p in client.get_posts(orderby='modified', order='asc')], [1, 2])
+        self.assertEqual([p['id'] for p in client.get_posts(orderby='title', order='desc')], [2, 1])
+        self.assertTrue(hasattr(client, '_inflight_lock'))
+        self.assertIsNone(self.mirror.get_menus())
+        with self.assertRaises(WordPressAPIError):
+            client.update_post(1, {'title': 'Changed'})
+    
+    def test_search_index_follows_incremental_sync(self):
+        """Test that full-text queries see synced edits and deletions."""
+        self.remote['posts'][0]['content'] = {'rendered': (
+            '<p>Article coming soon.</p><a href="https://site.test/cloud-wars-2025/">More</a>'
+            '<script>track()</script>')}
+        self.mirror.sync(self.wp)
+        search = ContentSearch(self.mirror)
+        
+        self.assertEqual([h['id'] for h in search.find_placeholders()], [1])
+        self.assertEqual([h['id'] for h in search.linking_to('https://site.test/cloud-wars-2025/')], [1])
+        self.assertEqual([h['id'] for h in search.with_inline_scripts()], [1])
+        self.assertEqual(search.mentions('track'), [])
+        
+        self.remote['posts'] = [self._post(2, '2025-02-01T09:00:00', [3])]
+        self.mirror.sync(self.wp, collections=['posts'])
+        
+        self.assertEqual(search.find_placeholders(), [])
+        self.assertEqual([h['id'] for h in search.search('body', limit=5)], [2])
+    
+    def test_link_graph_finds_orphans_chains_and_ranks(self):
+        """Test orphan/dead-end/redirect-chain detection and PageRank over mirrored links."""
+        posts = {i: self._post(i, f'2025-01-0{i}T10:00:00', [3]) for i in range(1, 7)}
+        bodies = {
+            1: '<a href="/post-2/">two</a> <a href="https://www.site.test/post-3">old</a> <a href="https://x.test/">x</a>',
+            2: '<a href="https://site.test/post-1/">one</a>',
+            3: '<script>window.location.href="/post-5/";</script>',
+            5: '<script>window.location.href="/post-4/";</script>',
+            4: '<p>No links</p>',
+            6: '<p>Nobody links here</p>'
+        }
+        for post_id, body in bodies.items():
+            posts[post_id]['content'] = {'rendered': body}
+        self.remote['posts'] = list(posts.values())
+        self.mirror.sync(self.wp)
+        
+        graph = LinkGraph(self.mirror)
+        chains = graph.redirect_chains()
+        rank = graph.pagerank()
+        
+        self.assertEqual([n['post_id'] for n in graph.orphans()], [6])
+        self.assertEqual(sorted(n['post_id'] for n in graph.dead_ends()), [4, 6])
+        self.assertEqual(len(chains), 1)
+        self.assertEqual((chains[0]['hops'], chains[0]['final_url'], chains[0]['linked_from']),
+                         (2, 'site.test/post-4/', [1]))
+        self.assertAlmostEqual(rank.sum(), 1.0)
+        self.assertGreater(rank[graph.index['site.test/post-4/']], rank[graph.index['site.test/post-6/']])
+        self.assertEqual(graph.top_pages(limit=1)[0]['post_id'], 4)
+
+
+class TestUrlResolver(unittest.TestCase):
+    """Test cases for fuzzy broken-URL resolution."""
+    
+    SLUGS = ['product-analytics-in-2025-from-dashboards-to-decisions',
+             'the-future-of-data-privacy-new-laws-and-technologies',
+             'cloud-computing-evolution-trends-and-predictions',
+             'cloud-computing-ai-infrastructure', 'ai-investment-management',
+             'ai-powered-investment-strategies', 'cloud-wars-2025']
+    
+    def setUp(self):
+        """Index a handful of live posts."""
+        posts = [{'id': i, 'slug': slug, 'link': f'https://site.test/{slug}/',
+                  'title': {'rendered': slug.replace('-', ' ').title()}}
+                 for i, slug in enumerate(self.SLUGS)]
+        self.resolver = UrlResolver(posts, terms=[{'link': 'https://site.test/category/tech/'}])
+    
+    def test_renamed_and_misspelled_slugs_resolve(self):
+        """Test that old/typo slugs map to the right post and junk does not."""
+        for old, expected in [('product-analytics-2025', 0), ('data-privacy-future', 1),
+                              ('cloud-computing-evolution', 2), ('ai-investmnt-managment', 4)]:
+            match = self.resolver.resolve(f'https://site.test/{old}/')
+            self.assertEqual(match['id'], expected, old)
+            self.assertLess(match['confidence'], 1.0)
+        
+        self.assertIsNone(self.resolver.resolve('https://site.test/totally-unrelated-thing/'))
+        self.assertEqual(self.resolver.resolve('https://site.test/cloud-wars-2025')['confidence'], 1.0)
+        self.assertTrue(self.resolver.is_live('https://site.test/category/tech/'))
+        self.assertFalse(self.resolver.is_live('https://site.test/data-privacy-future/'))
+    
+    def test_link_validator_rewrites_only_dead_links(self):
+        """Test that LinkValidator fixes dead internal links without touching live ones."""
+        validator = LinkValidator(Mock(), resolver=self.resolver)
+        validator.known_broken_links = {}
+        validator.validate_url = Mock(return_value={'status_code': 404})
+        content = ('<a href="https://site.test/data-privacy-future/">a</a> '
+                   '<a href="https://site.test/cloud-wars-2025/">b</a>')
+        
+        fixed, fixes = validator.fix_broken_links_in_content(content, domain='site.test')
+        
+        self.assertEqual(len(fixes), 1)
+        self.assertIn('href="https://site.test/the-future-of-data-privacy-new-laws-and-technologies/"', fixed)
+        self.assertIn('href="https://site.test/cloud-wars-2025/"', fixed)
+        validator.validate_url.assert_called_once()
+    
+    def test_links_missing_from_mirror_need_a_404(self):
+        """Test that a link newer than the mirror is kept unless the site confirms it is gone."""
+        content = '<a href="https://site.test/cloud-computing-evolution/">a</a>'
+        wp = Mock()
+        wp.get_posts_by_ids.return_value = [{'id': 1, 'title': {'rendered': 'Post'},
+                                             'content': {'rendered': content}}]
+        validator = LinkValidator(wp, resolver=self.resolver)
+        validator.known_broken_links = {}
+        validator.validate_url = Mock(return_value={'status_code': 200})
+        
+        self.assertEqual(validator.fix_broken_links_in_content(content, domain='site.test'), (content, []))
+        with patch('master_toolkit.validation.links.extract_internal_links',
+                   return_value=['https://site.test/cloud-computing-evolution/']):
+            self.assertEqual(validator.verify_fixes([1])['remaining_broken_links'], 0)
+        validator.validate_url.assert_called_once()
+        
+        trusting = LinkValidator(Mock(), resolver=self.resolver, trust_mirror=True)
+        trusting.known_broken_links = {}
+        trusting.validate_url = Mock()
+        fixed, fixes = trusting.fix_broken_links_in_content(content, domain='site.test')
+        self.assertIn('cloud-computing-evolution-trends-and-predictions', fixed)
+        trusting.validate_url.assert_not_called()
+
+    def test_archive_urls_are_never_fuzzy_matched(self):
+        """Test that pagination, author, term and date archives never resolve to a post."""
+        posts = [{'id': 1, 'slug': 'page-speed-optimization-guide',
+                  'link': 'https://site.test/page-speed-optimization-guide/',
+                  'title': {'rendered': 'Page Speed Optimization Guide'}}]
+        resolver = UrlResolver(posts, terms=[{'link': 'https://site.test/category/tech/'}])
+        archives = ['https://site.test/category/tech/page/2/', 'https://site.test/page/3/',
+                    'https://site.test/author/admin/', 'https://site.test/2025/01/',
+                    'https://site.test/tag/speed-optimization/']
+        
+        for url in archives:
+            self.assertEqual(resolver.candidates(url), [], url)
+        self.assertTrue(resolver.is_live('https://site.test/category/tech/page/2/'))
+        self.assertTrue(resolver.is_live('https://site.test/author/admin/'))
+        self.assertFalse(resolver.is_live('https://site.test/category/gone/page/2/'))
+        
+        validator = LinkValidator(Mock(), resolver=resolver)
+        validator.known_broken_links = {}
+        content = ''.join(f'<a href="{url}">x</a>' for url in archives)
+        self.assertEqual(validator.fix_broken_links_in_content(content, domain='site.test'), (content, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+URL Resolver
+============
+Fuzzy mapping of broken internal URLs to live posts and pages.
+
+The resolver indexes every live slug by character trigrams and every
+slug/title by word tokens, both idf-weighted. A broken URL's slug is
+scored against every live slug by summing the postings of its trigrams
+and tokens (one numpy bincount, no per-candidate Python loop), so
+resolving a link takes well under a millisecond and replaces
+hand-maintained old -> new maps.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import numpy as np
+
+from .link_graph import NON_PAGE_PREFIXES, normalize_url
+
+
+# Words that carry no meaning in a slug
+STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'in', 'on', 'to', 'for', 'vs', 'with', 'from',
+             'how', 'what', 'where', 'why', 'is', 'are', 'its', 'new'}
+
+# Share of the score from slug trigrams (typos, partial words) vs whole-word overlap
+TRIGRAM_WEIGHT = 0.5
+
+DEFAULT_MIN_CONFIDENCE = 0.45
+
+TOKEN_SPLIT = re.compile(r'[^a-z0-9]+')
+
+# Listing URLs: they never name a single post, so they are never fuzzy-matched
+PAGINATION = re.compile(r'/page/\d+/?$')
+DATE_ARCHIVE = re.compile(r'^/\d{4}(?:/\d{2}){0,2}/?$')
+TERM_PREFIXES = ('/category/', '/tag/')
+UNINDEXED_ARCHIVE_PREFIXES = ('/author/', '/search/')
+
+
+class UrlResolver:
+    """Trigram/token index over live slugs and titles."""
+
+    def __init__(self, posts: Iterable[Dict], terms: Iterable[Dict] = ()):
+        """
+        Index live posts/pages (REST dicts with id, slug, link and title).
+
+        Terms are not resolution targets, but their archive URLs count as live.
+        """
+        self.docs: List[Dict[str, Any]] = []
+        self.live = set()
+        self._slugs: Dict[str, int] = {}
+        grams: Dict[str, List[int]] = defaultdict(list)
+        tokens: Dict[str, List[int]] = defaultdict(list)
+
+        for post in posts:
+            slug = post.get('slug') or ''
+            if not slug or not post.get('link'):
+                continue
+            doc = len(self.docs)
+            title = _text(post.get('title'))
+            self.docs.append({'id': post['id'], 'slug': slug, 'url': post['link'], 'title': title,
+                              'type': post.get('type')})
+            self.live.add(normalize_url(post['link']))
+            self._slugs.setdefault(slug, doc)
+            for gram in set(trigrams(slug)):
+                grams[gram].append(doc)
+            for token in set(tokenize(f'{slug} {title}')):
+                tokens[token].append(doc)
+
+        for term in terms:
+            if term.get('link'):
+                self.live.add(normalize_url(term['link']))
+
+        # Postings as int32 arrays so a query is a few concatenations and one bincount
+        n = len(self.docs)
+        self._unseen_idf = math.log(1 + max(n, 1))
+        self._grams = {g: np.asarray(d, dtype=np.int32) for g, d in grams.items()}
+        self._tokens = {t: np.asarray(d, dtype=np.int32) for t, d in tokens.items()}
+        self._gram_idf = {g: math.log(1 + n / len(d)) for g, d in grams.items()}
+        self._token_idf = {t: math.log(1 + n / len(d)) for t, d in tokens.items()}
+        norms = np.zeros(n)
+        for gram, docs in self._grams.items():
+            norms[docs] += self._gram_idf[gram] ** 2
+        self._gram_norms = np.sqrt(norms)
+        self._gram_norms[self._gram_norms == 0] = 1.0
+
+    @classmethod
+    def from_mirror(cls, mirror) -> 'UrlResolver':
+        """Index a SiteMirror's published posts and pages."""
+        return cls(mirror.get_posts(status='publish') + mirror.get_pages(status='publish'),
+                   mirror.get_categories() + mirror.get_tags())
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def is_live(self, url: str) -> bool:
+        """Whether an internal URL is a live post/page/archive (or not a page at all)."""
+        parts = urlsplit(url)
+        path = PAGINATION.sub('/', parts.path or '/')
+        if path == '/' or path.startswith(NON_PAGE_PREFIXES):
+            return True
+        # Author, search and date archives are not mirrored, so they cannot be checked offline
+        if path.startswith(UNINDEXED_ARCHIVE_PREFIXES) or DATE_ARCHIVE.match(path):
+            return True
+        return normalize_url(urlunsplit(parts._replace(path=path))) in self.live
+
+    def candidates(self, url: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Best matching live posts for a URL, with confidence scores in [0, 1] (none for archive URLs)."""
+        slug = url_slug(url)
+        if not slug or not self.docs or is_archive_path(urlsplit(url).path):
+            return []
+        if slug in self._slugs:
+            return [dict(self.docs[self._slugs[slug]], confidence=1.0)]
+
+        # idf-weighted cosine between the slug's trigrams and each live slug's
+        gram_dot, query_norm = self._accumulate(set(trigrams(slug)), self._grams, self._gram_idf, square=True)
+        cosine = gram_dot / (math.sqrt(query_norm) * self._gram_norms)
+
+        # Share of the slug's (idf-weighted) words found in each slug/title
+        token_hits, token_total = self._accumulate(set(tokenize(slug)), self._tokens, self._token_idf)
+        coverage = token_hits / token_total if token_total else token_hits
+
+        scores = TRIGRAM_WEIGHT * cosine + (1 - TRIGRAM_WEIGHT) * coverage
+        top = np.argsort(-scores, kind='stable')[:limit]
+        return [dict(self.docs[doc], confidence=round(float(scores[doc]), 3))
+                for doc in top if scores[doc] > 0]
+
+    def _accumulate(self, keys, postings: Dict[str, np.ndarray], idf: Dict[str, float],
+                    square: bool = False):
+        """Per-doc sum of matched key weights, and the query's total weight."""
+        docs, weights, total = [], [], 0.0
+        for key in keys:
+            weight = idf.get(key, self._unseen_idf)
+            if square:
+                weight *= weight
+            total += weight
+            if key in postings:
+                docs.append(postings[key])
+                weights.append(np.full(len(postings[key]), weight))
+        if not docs:
+            return np.zeros(len(self.docs)), total
+        return np.bincount(np.concatenate(docs), weights=np.concatenate(weights),
+                           minlength=len(self.docs)), total
+
+    def resolve(self, url: str, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> Optional[Dict[str, Any]]:
+        """
+        Best live target for a broken URL, or None if nothing is confident enough.
+
+        A near-tie between the top two candidates halves the confidence, since
+        picking either would be a guess.
+        """
+        ranked = self.candidates(url, limit=2)
+        if not ranked:
+            return None
+        best = ranked[0]
+        if len(ranked) > 1 and best['confidence'] < 1.0 and \
+                ranked[1]['confidence'] >= best['confidence'] * 0.95:
+            best = dict(best, confidence=round(best['confidence'] / 2, 3), ambiguous=True)
+        return best if best['confidence'] >= min_confidence else None
+
+    def resolve_all(self, urls: Iterable[str], min_confidence: float = DEFAULT_MIN_CONFIDENCE
+                    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve many URLs; each distinct URL is scored once."""
+        return {url: self.resolve(url, min_confidence) for url in dict.fromkeys(urls)}
+
+
+def is_archive_path(path: str) -> bool:
+    """Whether a URL path is a paginated, term, author, search or date archive rather than a post."""
+    return bool(PAGINATION.search(path) or DATE_ARCHIVE.match(path)
+                or path.startswith(TERM_PREFIXES + UNINDEXED_ARCHIVE_PREFIXES))
+
+
+def url_slug(url: str) -> str:
+    """Last meaningful path segment of a URL (date/page segments skipped)."""
+    segments = [s for s in urlsplit(url).path.split('/') if s]
+    while segments and (segments[-1].isdigit() or segments[-1] == 'amp'):
+        segments.pop()
+    return segments[-1].lower() if segments else ''
+
+
+def trigrams(slug: str) -> List[str]:
+    """Character trigrams of a slug, padded so word starts/ends count."""
+    padded = f'  {slug.lower()} '
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [t for t in TOKEN_SPLIT.split(text.lower()) if t and t not in STOPWORDS]
+
+
+def _text(field: Any) -> str:
+    """Plain text of a rendered REST field."""
+    if isinstance(field, dict):
+        field = field.get('rendered')
+    return re.sub(r'<[^>]+>|&#?\w+;', ' ', field or '').strip()
@@ -10,28 +10,27 @@ Automated optimization utilities for WordPress content including:
 - Advanced features: scheduling, batch processing, monitoring
 """
 
-from .content import ContentOptimizer
-from .images import ImageOptimizer
-from .seo import SEOOptimizer
-from .performance import PerformanceOptimizer
-from .accessibility import AccessibilityOptimizer
-from .advanced import (
-    OptimizationScheduler,
-    BatchOptimizationProcessor, 
-    OptimizationMonitor,
-    AdvancedReporting,
-    AdvancedOptimizationManager
-)
+from .._lazy import lazy_exports
 
-__all__ = [
-    'ContentOptimizer',
-    'ImageOptimizer', 
-    'SEOOptimizer',
-    'PerformanceOptimizer',
-    'AccessibilityOptimizer',
-    'OptimizationScheduler',
-    'BatchOptimizationProcessor',
-    'OptimizationMonitor',
-    'AdvancedReporting',
-    'AdvancedOptimizationManager'
-]
\ No newline at end of file
+# Engines are imported on first access so callers only load the
+# dependencies (bs4, PIL, schedule, ...) of the engines they use.
+_LAZY_IMPORTS = {
+    'ContentOptimizer': '.content',
+    'ImageOptimizer': '.images',
+    'SEOOptimizer': '.seo',
+    'PerformanceOptimizer': '.performance',
+    'AccessibilityOptimizer': '.accessibility',
+    'OptimizationScheduler': '.advanced',
+    'BatchOptimizationProcessor': '.advanced',
+    'OptimizationMonitor': '.advanced',
+    'AdvancedReporting': '.advanced',
+    'AdvancedOptimizationManager': '.advanced',
+    'OptimizationJobQueue': '.job_queue',
+    'QueueWorker': '.job_queue',
+    'CriticalCSSExtractor': '.critical_css',
+    'EngineExecutor': '.engines',
+    'register_engine': '.engines',
+    'register_artifact': '.engines'
+}
+
+lazy_exports(globals(), _LAZY_IMPORTS)
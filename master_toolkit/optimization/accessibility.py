@@ -19,8 +19,9 @@ import requests
 from datetime import datetime
 import colorsys
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, metrics
 from ..utils import print_success, print_error, print_warning
+from ..utils.css_cascade import get_style_index, parse_color, relative_luminance, contrast_ratio, blend
 
 
 class AccessibilityOptimizer:
@@ -64,10 +65,12 @@ class AccessibilityOptimizer:
             'structural_elements': ['nav', 'main', 'header', 'footer', 'aside', 'section']
         }
     
-    def optimize_post_accessibility(self, post_id: int, auto_apply: bool = False) -> Dict[str, Any]:
-        """Comprehensive accessibility optimization for a specific post."""
+    @metrics.timed('engine.accessibility.optimize_post_accessibility')
+    def optimize_post_accessibility(self, post_id: int, auto_apply: bool = False,
+                                    post: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Comprehensive accessibility optimization for a specific post (an already loaded post skips the fetch)."""
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             post_title = post.get('title', {}).get('rendered', 'Untitled')
             content = post.get('content', {}).get('rendered', '')
             post_url = post.get('link', '')
@@ -367,73 +370,70 @@ class AccessibilityOptimizer:
             'wcag_aa_compliance': True,
             'wcag_aaa_compliance': True,
             'improvements': [],
-            'score': 85  # Default score (assuming good contrast without detailed analysis)
+            'score': 100
         }
         
-        # Extract color information from inline styles
-        elements_with_color = soup.find_all(attrs={'style': re.compile(r'color|background')})
+        # Resolve effective colors through theme, embedded and inline CSS
+        style_index = get_style_index(soup, base_url=self.base_url)
+        combinations = {}
         
-        for element in elements_with_color:
-            style = element.get('style', '')
-            colors = self._extract_colors_from_style(style)
+        for record in style_index.text_contrast(soup):
+            if record['background_image']:
+                continue  # Contrast against background images cannot be computed
             
-            if colors['foreground'] and colors['background']:
-                contrast_ratio = self._calculate_contrast_ratio(
-                    colors['foreground'], 
-                    colors['background']
-                )
+            is_large_text = record['is_large_text']
+            aa_threshold = (self.wcag_thresholds['aa_large_contrast'] 
+                          if is_large_text 
+                          else self.wcag_thresholds['aa_normal_contrast'])
+            
+            aaa_threshold = (self.wcag_thresholds['aaa_large_contrast'] 
+                           if is_large_text 
+                           else self.wcag_thresholds['aaa_normal_contrast'])
+            
+            # Identical combinations are reported once with an occurrence count
+            combo_key = (record['foreground'], record['background'], is_large_text)
+            if combo_key in combinations:
+                combinations[combo_key]['occurrences'] += 1
+                color_combo = combinations[combo_key]
+            else:
+                color_combo = combinations[combo_key] = {
+                    'element': record['element'].name,
+                    'foreground': record['foreground'],
+                    'background': record['background'],
+                    'contrast_ratio': record['contrast_ratio'],
+                    'font_size': record['font_size'],
+                    'is_large_text': is_large_text,
+                    'wcag_aa_pass': record['contrast_ratio'] >= aa_threshold,
+                    'wcag_aaa_pass': record['contrast_ratio'] >= aaa_threshold,
+                    'occurrences': 1
+                }
+                
+                analysis['color_combinations'].append(color_combo)
                 
-                if contrast_ratio:
-                    # Estimate font size (simplified)
-                    font_size = self._estimate_font_size(element, style)
-                    is_large_text = font_size >= self.wcag_thresholds['large_text_size']
-                    
-                    aa_threshold = (self.wcag_thresholds['aa_large_contrast'] 
-                                  if is_large_text 
-                                  else self.wcag_thresholds['aa_normal_contrast'])
-                    
-                    aaa_threshold = (self.wcag_thresholds['aaa_large_contrast'] 
-                                   if is_large_text 
-                                   else self.wcag_thresholds['aaa_normal_contrast'])
-                    
-                    color_combo = {
-                        'element': element.name,
-                        'foreground': colors['foreground'],
-                        'background': colors['background'],
-                        'contrast_ratio': contrast_ratio,
-                        'font_size': font_size,
-                        'is_large_text': is_large_text,
-                        'wcag_aa_pass': contrast_ratio >= aa_threshold,
-                        'wcag_aaa_pass': contrast_ratio >= aaa_threshold
-                    }
-                    
-                    analysis['color_combinations'].append(color_combo)
-                    
-                    if not color_combo['wcag_aa_pass']:
-                        analysis['contrast_issues'].append(color_combo)
-                        analysis['wcag_aa_compliance'] = False
-                        
-                        if auto_apply:
-                            # Suggest better colors (simplified)
-                            improved_colors = self._suggest_better_contrast(
-                                colors['foreground'], colors['background'], aa_threshold
-                            )
-                            if improved_colors:
-                                element['data-a11y-suggestion'] = f"Consider using {improved_colors}"
-                    
-                    if not color_combo['wcag_aaa_pass']:
-                        analysis['wcag_aaa_compliance'] = False
+                if not color_combo['wcag_aa_pass']:
+                    analysis['contrast_issues'].append(color_combo)
+                    analysis['wcag_aa_compliance'] = False
+                
+                if not color_combo['wcag_aaa_pass']:
+                    analysis['wcag_aaa_compliance'] = False
+            
+            if auto_apply and not color_combo['wcag_aa_pass']:
+                # Suggest better colors (simplified)
+                improved_colors = self._suggest_better_contrast(
+                    record['foreground'], record['background'], aa_threshold
+                )
+                if improved_colors:
+                    record['element']['data-a11y-suggestion'] = f"Consider using {improved_colors}"
         
         if analysis['contrast_issues']:
             analysis['improvements'].append(f'{len(analysis["contrast_issues"])} color combinations fail WCAG AA contrast requirements')
-            analysis['score'] -= len(analysis['contrast_issues']) * 15
+            analysis['score'] = max(0, analysis['score'] - len(analysis['contrast_issues']) * 15)
         
         if not analysis['wcag_aaa_compliance'] and analysis['wcag_aa_compliance']:
             analysis['improvements'].append('Consider improving contrast for WCAG AAA compliance')
-            analysis['score'] -= 5
+            analysis['score'] = max(0, analysis['score'] - 5)
         
         # General recommendations
-        analysis['improvements'].append('Use color contrast checking tools for comprehensive analysis')
         analysis['improvements'].append('Ensure sufficient contrast for all text elements')
         
         return analysis
@@ -784,96 +784,27 @@ class AccessibilityOptimizer:
         
         return 'Image'
     
-    def _extract_colors_from_style(self, style: str) -> Dict[str, str]:
-        """Extract foreground and background colors from style string."""
-        colors = {'foreground': None, 'background': None}
-        
-        # Extract color values
-        color_match = re.search(r'color:\s*([^;]+)', style)
-        if color_match:
-            colors['foreground'] = color_match.group(1).strip()
-        
-        bg_match = re.search(r'background-color:\s*([^;]+)', style)
-        if bg_match:
-            colors['background'] = bg_match.group(1).strip()
-        
-        return colors
-    
     def _calculate_contrast_ratio(self, color1: str, color2: str) -> Optional[float]:
         """Calculate contrast ratio between two colors."""
-        try:
-            # This is a simplified implementation
-            # In practice, you'd want a more robust color parsing library
-            
-            # Convert colors to RGB (simplified for common formats)
-            rgb1 = self._color_to_rgb(color1)
-            rgb2 = self._color_to_rgb(color2)
-            
-            if rgb1 and rgb2:
-                # Calculate relative luminance
-                lum1 = self._relative_luminance(rgb1)
-                lum2 = self._relative_luminance(rgb2)
-                
-                # Calculate contrast ratio
-                lighter = max(lum1, lum2)
-                darker = min(lum1, lum2)
-                
-                return (lighter + 0.05) / (darker + 0.05)
+        rgba1 = parse_color(color1)
+        rgba2 = parse_color(color2)
         
-        except Exception:
-            pass
+        if rgba1 and rgba2:
+            # Translucent colors are composited over white
+            background = blend(rgba2, (255, 255, 255, 1.0))
+            foreground = blend(rgba1, background)
+            return contrast_ratio(foreground[:3], background[:3])
         
         return None
     
     def _color_to_rgb(self, color: str) -> Optional[Tuple[int, int, int]]:
-        """Convert color string to RGB tuple (simplified)."""
-        color = color.strip().lower()
-        
-        # Handle hex colors
-        if color.startswith('#'):
-            hex_color = color[1:]
-            if len(hex_color) == 3:
-                hex_color = ''.join([c*2 for c in hex_color])
-            if len(hex_color) == 6:
-                try:
-                    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-                except ValueError:
-                    pass
-        
-        # Handle named colors (basic set)
-        named_colors = {
-            'black': (0, 0, 0),
-            'white': (255, 255, 255),
-            'red': (255, 0, 0),
-            'green': (0, 128, 0),
-            'blue': (0, 0, 255)
-        }
-        
-        return named_colors.get(color)
+        """Convert color string to RGB tuple."""
+        rgba = parse_color(color)
+        return rgba[:3] if rgba else None
     
     def _relative_luminance(self, rgb: Tuple[int, int, int]) -> float:
         """Calculate relative luminance of an RGB color."""
-        def normalize_component(c):
-            c = c / 255.0
-            return c / 12.92 if c <= 0.03928 else pow((c + 0.055) / 1.055, 2.4)
-        
-        r, g, b = rgb
-        return 0.2126 * normalize_component(r) + 0.7152 * normalize_component(g) + 0.0722 * normalize_component(b)
-    
-    def _estimate_font_size(self, element: Tag, style: str) -> int:
-        """Estimate font size from element and style (simplified)."""
-        # Look for font-size in style
-        font_size_match = re.search(r'font-size:\s*(\d+)px', style)
-        if font_size_match:
-            return int(font_size_match.group(1))
-        
-        # Default sizes for common elements
-        tag_defaults = {
-            'h1': 32, 'h2': 24, 'h3': 18, 'h4': 16, 'h5': 14, 'h6': 12,
-            'small': 12, 'big': 18
-        }
-        
-        return tag_defaults.get(element.name, 16)  # Default to 16px
+        return relative_luminance(tuple(rgb))
     
     def _suggest_better_contrast(self, fg_color: str, bg_color: str, target_ratio: float) -> Optional[str]:
         """Suggest colors with better contrast (simplified)."""
@@ -14,7 +14,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import sqlite3
 from pathlib import Path
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, ResultSink
 from ..utils import print_success, print_error, print_warning, print_info
 from . import (
     ContentOptimizer,
@@ -23,6 +23,8 @@ from . import (
     PerformanceOptimizer,
     AccessibilityOptimizer
 )
+from .job_queue import OptimizationJobQueue, run_worker_processes, SUMMARY_FIELDS
+from .engines import EngineExecutor
 
 
 class OptimizationScheduler:
@@ -43,6 +45,9 @@ class OptimizationScheduler:
         self.db_path = Path(__file__).parent / 'optimization_tracking.db'
         self._init_database()
         
+        # Durable per-post task queue shared with worker processes
+        self.job_queue = OptimizationJobQueue(self.db_path)
+        
         # Scheduling configuration
         self.scheduled_jobs = {}
         self.is_running = False
@@ -164,21 +169,33 @@ class OptimizationScheduler:
         start_time = time.time()
         
         try:
-            # Get target posts based on criteria
-            posts = self._get_posts_by_criteria(target_criteria)
+            # Resume an interrupted run instead of starting over
+            job_id = self.job_queue.find_unfinished_job(job_name)
             
-            if not posts:
-                print_warning(f"No posts found matching criteria for job {job_name}")
-                return
+            if job_id:
+                print_info(f"Resuming unfinished job {job_id} for '{job_name}'")
+            else:
+                # Get target posts based on criteria
+                posts = self._get_posts_by_criteria(target_criteria)
+                
+                if not posts:
+                    print_warning(f"No posts found matching criteria for job {job_name}")
+                    return
+                
+                job_id = self.job_queue.enqueue_job(
+                    job_name,
+                    post_ids=[p['id'] for p in posts],
+                    engines=engines,
+                    options={'auto_apply': target_criteria.get('auto_apply', False)}
+                )
             
-            # Run batch optimization
-            batch_processor = BatchOptimizationProcessor(self.wp)
-            results = batch_processor.process_posts_batch(
-                post_ids=[p['id'] for p in posts],
-                engines=engines,
-                auto_apply=target_criteria.get('auto_apply', False),
-                max_workers=target_criteria.get('max_workers', 3)
+            # Drain the job's per-post tasks with parallel worker processes
+            run_worker_processes(
+                self.job_queue,
+                num_workers=target_criteria.get('max_workers', 3),
+                job_id=job_id
             )
+            results = self.job_queue.get_job_results(job_id)
             
             execution_time = time.time() - start_time
             
@@ -278,11 +295,25 @@ class BatchOptimizationProcessor:
             'accessibility': AccessibilityOptimizer(self.wp)
         }
     
+    # Per-post fields kept in memory; full engine results only go to the sink
+    SUMMARY_FIELDS = SUMMARY_FIELDS
+    
     def process_posts_batch(self, post_ids: List[int], engines: List[str],
                            auto_apply: bool = False, max_workers: int = 3,
-                           progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
-        """Process multiple posts in parallel with optimized threading."""
+                           progress_callback: Optional[Callable] = None,
+                           sink: ResultSink = None) -> Dict[str, Any]:
+        """
+        Process multiple posts in parallel with optimized threading.
+        
+        Every full per-post result is streamed to the sink (a new temporary
+        .ndjson.gz unless one is passed) as it completes. individual_results
+        keeps only each post's summary fields; read the full results back
+        from results_file with iter_results.
+        """
         start_time = time.time()
+        owns_sink = sink is None
+        if owns_sink:
+            sink = ResultSink(numeric_fields=('overall_score', 'score_improvement', 'total_improvements'))
         
         results = {
             'total_posts': len(post_ids),
@@ -290,63 +321,79 @@ class BatchOptimizationProcessor:
             'successful_optimizations': 0,
             'failed_optimizations': 0,
             'individual_results': {},
+            'results_file': str(sink.path),
             'execution_time': 0,
             'average_score_improvement': 0
         }
+        improvement_total, improvement_count = 0.0, 0
         
         print_info(f"Starting batch optimization of {len(post_ids)} posts")
         print_info(f"Engines: {', '.join(engines)}")
         print_info(f"Max workers: {max_workers}")
         
-        # Process posts in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all optimization tasks
-            future_to_post = {
-                executor.submit(
-                    self._optimize_single_post, 
-                    post_id, engines, auto_apply
-                ): post_id for post_id in post_ids
-            }
+        try:
+            # One engine executor for the batch so run-wide artifacts are fetched once
+            engine_executor = EngineExecutor(self.wp, engines, instances=self.optimizers)
             
-            # Collect results as they complete
-            for future in as_completed(future_to_post):
-                post_id = future_to_post[future]
+            # Process posts in parallel
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Submit all optimization tasks
+                future_to_post = {
+                    executor.submit(
+                        self._optimize_single_post, 
+                        post_id, engines, auto_apply, engine_executor
+                    ): post_id for post_id in post_ids
+                }
                 
-                try:
-                    post_result = future.result()
-                    results['individual_results'][post_id] = post_result
-                    results['processed_posts'] += 1
+                # Collect results as they complete
+                for future in as_completed(future_to_post):
+                    post_id = future_to_post[future]
                     
-                    if post_result['success']:
-                        results['successful_optimizations'] += 1
-                        print_success(f"Post {post_id} optimized successfully")
-                    else:
+                    try:
+                        post_result = future.result()
+                        sink.write(post_result)
+                        results['individual_results'][post_id] = {
+                            key: post_result[key] for key in self.SUMMARY_FIELDS if key in post_result
+                        }
+                        results['processed_posts'] += 1
+                        
+                        if post_result['success']:
+                            results['successful_optimizations'] += 1
+                            if 'score_improvement' in post_result:
+                                improvement_total += post_result['score_improvement']
+                                improvement_count += 1
+                            print_success(f"Post {post_id} optimized successfully")
+                        else:
+                            results['failed_optimizations'] += 1
+                            print_warning(f"Post {post_id} optimization had issues")
+                        
+                        # Update progress
+                        progress = (results['processed_posts'] / results['total_posts']) * 100
+                        if progress_callback:
+                            progress_callback(progress, post_id, post_result)
+                        else:
+                            print_info(f"Progress: {progress:.1f}% ({results['processed_posts']}/{results['total_posts']})")
+                        
+                    except Exception as e:
+                        print_error(f"Post {post_id} optimization failed: {str(e)}")
+                        sink.write({'post_id': post_id, 'success': False, 'error': str(e)})
                         results['failed_optimizations'] += 1
-                        print_warning(f"Post {post_id} optimization had issues")
-                    
-                    # Update progress
-                    progress = (results['processed_posts'] / results['total_posts']) * 100
-                    if progress_callback:
-                        progress_callback(progress, post_id, post_result)
-                    else:
-                        print_info(f"Progress: {progress:.1f}% ({results['processed_posts']}/{results['total_posts']})")
-                    
-                except Exception as e:
-                    print_error(f"Post {post_id} optimization failed: {str(e)}")
-                    results['failed_optimizations'] += 1
-                    results['processed_posts'] += 1
+                        results['processed_posts'] += 1
+        except BaseException:
+            # A run that raised never reports its results_file, so do not leave it behind
+            if owns_sink:
+                sink.close()
+                sink.path.unlink(missing_ok=True)
+            raise
+        finally:
+            if owns_sink:
+                sink.close()
         
         # Calculate final metrics
         results['execution_time'] = time.time() - start_time
         
-        # Calculate average score improvement
-        score_improvements = []
-        for post_result in results['individual_results'].values():
-            if post_result.get('success') and 'score_improvement' in post_result:
-                score_improvements.append(post_result['score_improvement'])
-        
-        if score_improvements:
-            results['average_score_improvement'] = sum(score_improvements) / len(score_improvements)
+        if improvement_count:
+            results['average_score_improvement'] = improvement_total / improvement_count
         
         print_success(f"Batch optimization completed in {results['execution_time']:.2f}s")
         print_info(f"Success rate: {(results['successful_optimizations'] / results['total_posts'] * 100):.1f}%")
@@ -354,8 +401,8 @@ class BatchOptimizationProcessor:
         return results
     
     def _optimize_single_post(self, post_id: int, engines: List[str], 
-                             auto_apply: bool) -> Dict[str, Any]:
-        """Optimize a single post with specified engines."""
+                             auto_apply: bool, executor: EngineExecutor = None) -> Dict[str, Any]:
+        """Optimize a single post with specified engines (sharing a batch's executor if given)."""
         post_result = {
             'post_id': post_id,
             'success': True,
@@ -370,24 +417,17 @@ class BatchOptimizationProcessor:
         final_scores = {}
         
         try:
-            for engine_name in engines:
-                if engine_name not in self.optimizers:
-                    continue
-                
-                optimizer = self.optimizers[engine_name]
-                
-                # Run optimization based on engine type
-                if engine_name == 'content':
-                    result = optimizer.optimize_post_content(post_id, auto_apply=auto_apply)
-                elif engine_name == 'images':
-                    result = optimizer.optimize_post_images(post_id, auto_apply=auto_apply)
-                elif engine_name == 'seo':
-                    result = optimizer.optimize_post_seo(post_id, auto_apply=auto_apply)
-                elif engine_name == 'performance':
-                    result = optimizer.optimize_post_performance(post_id, auto_apply=auto_apply)
-                elif engine_name == 'accessibility':
-                    result = optimizer.optimize_post_accessibility(post_id, auto_apply=auto_apply)
-                
+            executor = executor or EngineExecutor(self.wp, engines, instances=self.optimizers)
+            run = executor.run_post(post_id, auto_apply=auto_apply)
+            
+            failed = {name: result['error'] for name, result in run['engine_results'].items()
+                      if name not in run['engines_run']}
+            if failed:
+                post_result['success'] = False
+                post_result['error'] = '; '.join(f"{name}: {error}" for name, error in failed.items())
+            
+            for engine_name in run['engines_run']:
+                result = run['engine_results'][engine_name]
                 post_result['engine_results'][engine_name] = result
                 post_result['engines_run'].append(engine_name)
                 
@@ -12,6 +12,8 @@ Usage:
     python -m master_toolkit.optimization.cli optimize-accessibility <post_id> [options]
     python -m master_toolkit.optimization.cli optimize-all <post_id> [options]
     python -m master_toolkit.optimization.cli batch-optimize [options]
+    python -m master_toolkit.optimization.cli queue-worker [options]
+    python -m master_toolkit.optimization.cli critical-css [options]
 
 Examples:
     # Optimize single post content
@@ -22,12 +24,17 @@ Examples:
     
     # Batch optimize multiple posts
     python -m master_toolkit.optimization.cli batch-optimize --post-ids 123,124,125 --engines content,seo
+    
+    # Drain the durable optimization queue with 4 worker processes
+    python -m master_toolkit.optimization.cli queue-worker --workers 4
+    
+    # Extract critical CSS for the home/single/page/category templates
+    python -m master_toolkit.optimization.cli critical-css --output-dir critical/
 """
 
 import argparse
 import json
 import sys
-import time
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
@@ -41,8 +48,11 @@ from master_toolkit.optimization import (
     PerformanceOptimizer, 
     AccessibilityOptimizer
 )
-from master_toolkit.core import WordPressClient
-from master_toolkit.utils import print_success, print_error, print_warning, print_info
+from master_toolkit.optimization.job_queue import OptimizationJobQueue, run_worker_processes
+from master_toolkit.optimization.critical_css import CriticalCSSExtractor
+from master_toolkit.optimization.engines import ENGINES, EngineExecutor
+from master_toolkit.core import WordPressClient, ResultSink, iter_results, metrics
+from master_toolkit.utils import print_success, print_error, print_warning, print_info, ResultFormatter
 
 
 class OptimizationCLI:
@@ -59,7 +69,7 @@ class OptimizationCLI:
                 'performance': PerformanceOptimizer(self.wp),
                 'accessibility': AccessibilityOptimizer(self.wp)
             }
-            self.available_engines = list(self.optimizers.keys())
+            self.available_engines = list(ENGINES)
         except Exception as e:
             print_error(f"Failed to initialize optimization engines: {str(e)}")
             sys.exit(1)
@@ -174,59 +184,34 @@ class OptimizationCLI:
             'execution_time': 0
         }
         
-        start_time = time.time()
+        # Run the selected engines concurrently over one set of fetched artifacts
+        executor = self._executor(args.engines)
+        for engine_name in executor.unknown_engines:
+            print_warning(f"Unknown engine: {engine_name}")
         
-        # Run each optimization engine
-        engines_to_run = args.engines.split(',') if args.engines else self.available_engines
+        print_info(f"Running {', '.join(executor.engines)} optimization...")
+        run = executor.run_post(args.post_id, auto_apply=args.auto_apply, target_keywords=keywords)
         
-        for engine_name in engines_to_run:
-            if engine_name not in self.available_engines:
-                print_warning(f"Unknown engine: {engine_name}")
+        for engine_name in executor.engines:
+            result = run['engine_results'][engine_name]
+            all_results[engine_name] = result
+            
+            if 'error' in result:
+                print_error(f"{engine_name.title()} optimization failed: {result.get('error')}")
                 continue
             
-            print_info(f"Running {engine_name} optimization...")
+            optimization_summary['engines_run'].append(engine_name)
             
-            try:
-                if engine_name == 'content':
-                    result = self.optimizers[engine_name].optimize_post_content(
-                        post_id=args.post_id, target_keywords=keywords, auto_apply=args.auto_apply
-                    )
-                elif engine_name == 'images':
-                    result = self.optimizers[engine_name].optimize_post_images(
-                        post_id=args.post_id, auto_apply=args.auto_apply
-                    )
-                elif engine_name == 'seo':
-                    result = self.optimizers[engine_name].optimize_post_seo(
-                        post_id=args.post_id, target_keywords=keywords, auto_apply=args.auto_apply
-                    )
-                elif engine_name == 'performance':
-                    result = self.optimizers[engine_name].optimize_post_performance(
-                        post_id=args.post_id, auto_apply=args.auto_apply
-                    )
-                elif engine_name == 'accessibility':
-                    result = self.optimizers[engine_name].optimize_post_accessibility(
-                        post_id=args.post_id, auto_apply=args.auto_apply
-                    )
-                
-                all_results[engine_name] = result
-                optimization_summary['engines_run'].append(engine_name)
-                
-                # Add to summary
-                if 'score' in result:
-                    optimization_summary['overall_score'] += result['score']
-                
-                # Count improvements
-                improvements_key = self._get_improvements_key(engine_name)
-                if improvements_key in result:
-                    optimization_summary['total_improvements'] += len(result[improvements_key])
-                
-                print_success(f"{engine_name.title()} optimization completed (Score: {result.get('score', 'N/A')})")
-                
-            except Exception as e:
-                print_error(f"{engine_name.title()} optimization failed: {str(e)}")
-                all_results[engine_name] = {'error': str(e)}
+            # Add to summary
+            if 'score' in result:
+                optimization_summary['overall_score'] += result['score']
+            
+            # Count improvements
+            optimization_summary['total_improvements'] += len(executor.improvements(engine_name, result))
+            
+            print_success(f"{engine_name.title()} optimization completed (Score: {result.get('score', 'N/A')})")
         
-        optimization_summary['execution_time'] = time.time() - start_time
+        optimization_summary['execution_time'] = run['execution_time']
         
         # Calculate average score
         if optimization_summary['engines_run']:
@@ -256,72 +241,103 @@ class OptimizationCLI:
                 print_error(f"Failed to fetch posts: {str(e)}")
                 return
         
-        engines_to_run = args.engines.split(',') if args.engines else self.available_engines
+        executor = self._executor(args.engines)
+        for engine_name in executor.unknown_engines:
+            print_warning(f"Unknown engine: {engine_name}")
         keywords = args.keywords.split(',') if args.keywords else None
         
+        # Full per-post results stream to disk; only counters stay in memory
+        sink = ResultSink(args.results_file)
         batch_results = {
             'total_posts': len(post_ids),
             'processed_posts': 0,
             'successful_optimizations': 0,
             'failed_optimizations': 0,
-            'results': {}
+            'results_file': str(sink.path)
         }
         
-        print_info(f"Processing {len(post_ids)} posts with engines: {', '.join(engines_to_run)}")
+        print_info(f"Processing {len(post_ids)} posts with engines: {', '.join(executor.engines)}")
         
         for i, post_id in enumerate(post_ids, 1):
             print_info(f"Processing post {post_id} ({i}/{len(post_ids)})...")
             
-            post_results = {}
-            post_success = True
-            
-            for engine_name in engines_to_run:
-                try:
-                    if engine_name == 'content':
-                        result = self.optimizers[engine_name].optimize_post_content(
-                            post_id=post_id, target_keywords=keywords, auto_apply=args.auto_apply
-                        )
-                    elif engine_name == 'images':
-                        result = self.optimizers[engine_name].optimize_post_images(
-                            post_id=post_id, auto_apply=args.auto_apply
-                        )
-                    elif engine_name == 'seo':
-                        result = self.optimizers[engine_name].optimize_post_seo(
-                            post_id=post_id, target_keywords=keywords, auto_apply=args.auto_apply
-                        )
-                    elif engine_name == 'performance':
-                        result = self.optimizers[engine_name].optimize_post_performance(
-                            post_id=post_id, auto_apply=args.auto_apply
-                        )
-                    elif engine_name == 'accessibility':
-                        result = self.optimizers[engine_name].optimize_post_accessibility(
-                            post_id=post_id, auto_apply=args.auto_apply
-                        )
-                    
-                    post_results[engine_name] = result
-                    
-                except Exception as e:
-                    print_error(f"Engine {engine_name} failed for post {post_id}: {str(e)}")
-                    post_results[engine_name] = {'error': str(e)}
-                    post_success = False
+            run = executor.run_post(post_id, auto_apply=args.auto_apply, target_keywords=keywords)
+            post_results = run['engine_results']
+            failed = [name for name in executor.engines if 'error' in post_results[name]]
+            for engine_name in failed:
+                print_error(f"Engine {engine_name} failed for post {post_id}: {post_results[engine_name]['error']}")
             
-            batch_results['results'][post_id] = post_results
+            record = {'post_id': post_id, 'success': not failed, 'engines_run': run['engines_run'],
+                      'engine_results': post_results}
+            if failed:
+                record['error'] = '; '.join(f"{name}: {post_results[name]['error']}" for name in failed)
+            sink.write(record)
             batch_results['processed_posts'] += 1
             
-            if post_success:
+            if not failed:
                 batch_results['successful_optimizations'] += 1
                 print_success(f"Post {post_id} optimized successfully")
             else:
                 batch_results['failed_optimizations'] += 1
                 print_warning(f"Post {post_id} had optimization issues")
-            
-            # Small delay to avoid overwhelming the server
-            if i < len(post_ids):
-                time.sleep(0.5)
+        
+        sink.close()
         
         # Display batch results
         self._display_batch_results(batch_results, args.report_format)
     
+    def queue_worker(self, args) -> None:
+        """Drain pending tasks from the durable optimization queue."""
+        queue = OptimizationJobQueue(lease_seconds=args.lease_seconds)
+        
+        if args.job_id:
+            print_info(f"Draining job {args.job_id} with {args.workers} workers...")
+        else:
+            print_info(f"Draining optimization queue with {args.workers} workers...")
+        
+        status = run_worker_processes(queue, num_workers=args.workers, job_id=args.job_id)
+        
+        if args.report_format == 'json':
+            print(json.dumps(status, indent=2))
+        elif args.job_id:
+            print_success(
+                f"Job {args.job_id}: {status['done']} done, {status['failed']} failed, "
+                f"{status['pending'] + status['leased']} remaining"
+            )
+        else:
+            print_success("Queue drained")
+    
+    def critical_css(self, args) -> None:
+        """Extract per-template critical CSS from the rendered site."""
+        extractor = CriticalCSSExtractor()
+        if args.template:
+            templates = dict(item.split('=', 1) for item in args.template)
+        else:
+            templates = extractor.sample_templates(self.wp)
+        
+        print_info(f"Extracting critical CSS for {', '.join(templates)}...")
+        results = extractor.extract_site(templates, force=args.force)
+        
+        if args.output_dir:
+            output_dir = Path(args.output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for name, result in results.items():
+                if 'css' in result:
+                    (output_dir / f'{name}.critical.css').write_text(result['css'], encoding='utf-8')
+        
+        if args.report_format == 'json':
+            print(json.dumps({name: {k: v for k, v in result.items() if k != 'css'}
+                              for name, result in results.items()}, indent=2))
+            return
+        
+        for name, result in results.items():
+            if 'error' in result:
+                print_error(f"{name}: {result['error']}")
+                continue
+            source = " (cached)" if result['cached'] else ""
+            print_success(f"{name}: {result['bytes']:,} of {result['source_bytes']:,} bytes critical, "
+                          f"{result['rule_count']} rules{source}")
+    
     def _display_optimization_result(self, title: str, result: Dict[str, Any], 
                                    report_format: str = 'table') -> None:
         """Display optimization results in specified format."""
@@ -412,18 +428,20 @@ class OptimizationCLI:
                        batch_results['processed_posts'] * 100) if batch_results['processed_posts'] > 0 else 0
         print(f"Success Rate: {success_rate:.1f}%")
         
+        if batch_results['failed_optimizations'] and batch_results.get('results_file'):
+            print("\nFailed posts:")
+            for line in ResultFormatter.format_result_stream(iter_results(batch_results['results_file']),
+                                                             failures_only=True):
+                print(f"  {line}")
+        
+        if batch_results.get('results_file'):
+            print(f"\nFull results: {batch_results['results_file']}")
         print('=' * 80)
     
-    def _get_improvements_key(self, engine_name: str) -> str:
-        """Get the improvements key for a specific engine."""
-        improvements_keys = {
-            'content': 'improvements_summary',
-            'images': 'optimization_summary',
-            'seo': 'improvements_summary',
-            'performance': 'recommendations',
-            'accessibility': 'accessibility_summary'
-        }
-        return improvements_keys.get(engine_name, 'improvements')
+    def _executor(self, engines: Optional[str]) -> EngineExecutor:
+        """Engine executor for a comma-separated engine list (default: all registered)."""
+        return EngineExecutor(self.wp, engines.split(',') if engines else self.available_engines,
+                              instances=self.optimizers)
     
     def _get_improvements_key_from_result(self, result: Dict[str, Any]) -> Optional[str]:
         """Get the improvements key from result structure."""
@@ -446,6 +464,11 @@ def create_parser() -> argparse.ArgumentParser:
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     
+    parser.add_argument('--metrics-file', type=str,
+                       help='Write request/engine metrics in OpenMetrics text format')
+    parser.add_argument('--trace-file', type=str,
+                       help='Write a JSON trace of engine and request timings')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Common arguments
@@ -493,11 +516,45 @@ def create_parser() -> argparse.ArgumentParser:
                              help='Maximum number of posts to process')
     batch_parser.add_argument('--engines', type=str,
                              help='Comma-separated list of engines to run')
+    batch_parser.add_argument('--results-file', type=str,
+                             help='Stream per-post results here as NDJSON (.gz compresses; default: temp file)')
     add_common_args(batch_parser)
     
+    # Durable queue workers
+    worker_parser = subparsers.add_parser('queue-worker', help='Drain the durable optimization queue')
+    worker_parser.add_argument('--workers', type=int, default=3,
+                              help='Number of worker processes')
+    worker_parser.add_argument('--job-id', type=int,
+                              help='Only process tasks of this job')
+    worker_parser.add_argument('--lease-seconds', type=int, default=300,
+                              help='Task lease duration before another worker may take over')
+    worker_parser.add_argument('--report-format', choices=['table', 'json'],
+                              default='table', help='Output format')
+    
+    # Critical CSS extraction
+    critical_parser = subparsers.add_parser('critical-css', help='Extract per-template critical CSS')
+    critical_parser.add_argument('--template', action='append', metavar='NAME=URL',
+                                help='Template page to extract (repeatable; default: home, single, page, category)')
+    critical_parser.add_argument('--output-dir', type=str,
+                                help='Write <template>.critical.css files here')
+    critical_parser.add_argument('--force', action='store_true',
+                                help='Re-extract even when template and CSS are unchanged')
+    critical_parser.add_argument('--report-format', choices=['table', 'json'],
+                                default='table', help='Output format')
+    
     return parser
 
 
+def _export_metrics(args) -> None:
+    """Write collected metrics and trace files if requested."""
+    if args.metrics_file:
+        metrics.export_openmetrics(args.metrics_file)
+        print_info(f"Metrics written to {args.metrics_file}")
+    if args.trace_file:
+        metrics.export_trace(args.trace_file)
+        print_info(f"Trace written to {args.trace_file}")
+
+
 def main():
     """Main CLI entry point."""
     parser = create_parser()
@@ -507,6 +564,9 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    if args.metrics_file or args.trace_file:
+        metrics.enable()
+    
     # Initialize CLI
     cli = OptimizationCLI()
     
@@ -518,7 +578,9 @@ def main():
         'optimize-performance': cli.optimize_performance,
         'optimize-accessibility': cli.optimize_accessibility,
         'optimize-all': cli.optimize_all,
-        'batch-optimize': cli.batch_optimize
+        'batch-optimize': cli.batch_optimize,
+        'queue-worker': cli.queue_worker,
+        'critical-css': cli.critical_css
     }
     
     if args.command in command_map:
@@ -530,6 +592,8 @@ def main():
         except Exception as e:
             print_error(f"Command failed: {str(e)}")
             sys.exit(1)
+        finally:
+            _export_metrics(args)
     else:
         print_error(f"Unknown command: {args.command}")
         parser.print_help()
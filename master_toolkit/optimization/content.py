@@ -17,7 +17,7 @@ from collections import Counter
 import statistics
 from bs4 import BeautifulSoup, Tag
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, metrics
 from ..utils import print_success, print_error, print_warning
 
 
@@ -45,11 +45,12 @@ class ContentOptimizer:
             'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
         }
     
+    @metrics.timed('engine.content.optimize_content')
     def optimize_content(self, post_id: int, target_keywords: List[str] = None, 
-                        auto_apply: bool = False) -> Dict[str, Any]:
-        """Comprehensive content optimization for a specific post."""
+                        auto_apply: bool = False, post: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Comprehensive content optimization for a specific post (an already loaded post skips the fetch)."""
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             post_title = post.get('title', {}).get('rendered', 'Untitled')
             content = post.get('content', {}).get('rendered', '')
             excerpt = post.get('excerpt', {}).get('rendered', '')
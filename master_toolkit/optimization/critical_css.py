@@ -0,0 +1,366 @@
+"""
+Critical CSS Extraction
+=======================
+Per-template critical CSS generated from the real rendered pages.
+
+The theme CSS (safe-theme/*.css) plus every stylesheet a rendered page
+links or embeds is matched against the elements in that page's first
+screen of content. Only rules matching one of those elements are kept,
+inside their @media/@supports wrappers, together with the @font-face and
+@keyframes blocks they reference; every stylesheet is then loaded
+deferred. Results are cached by (template hash, CSS hash), so a template
+is re-extracted only when its markup structure or the CSS changes.
+"""
+
+import hashlib
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup, Tag, NavigableString, Comment
+
+from ..core import WordPressClient, config, metrics
+from ..core.storage import SQLiteStore
+from ..utils.css_cascade import (
+    DEFAULT_THEME_DIR, COMMENT_RE, compile_selector, index_key, is_print_only,
+    load_theme_stylesheets, fetch_stylesheet
+)
+
+
+# Visible characters of text treated as the first screen of a page
+DEFAULT_FOLD_TEXT = 1500
+
+# Pseudo-elements and state pseudo-classes never match a static DOM;
+# a rule using them is critical when the element it styles is
+PSEUDO_RE = re.compile(r'::?(?:before|after|first-line|first-letter|placeholder|selection|marker|'
+                       r'hover|focus|focus-within|focus-visible|active|visited|target)\b|::[\w-]+')
+
+SKIP_TEXT_PARENTS = {'script', 'style', 'noscript', 'template', 'head', 'title'}
+
+CRITICAL_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS critical_css (
+        template_hash TEXT NOT NULL,
+        css_hash TEXT NOT NULL,
+        template TEXT,
+        css TEXT,
+        rule_count INTEGER,
+        source_bytes INTEGER,
+        created_at TEXT,
+        PRIMARY KEY (template_hash, css_hash)
+    );
+    CREATE INDEX IF NOT EXISTS idx_critical_css_template ON critical_css (template, created_at);
+'''
+
+
+class CriticalCSSExtractor(SQLiteStore):
+    """Critical CSS per rendered template, cached by template and CSS hash."""
+
+    def __init__(self, db_path: Optional[Path] = None, theme_dir: Path = DEFAULT_THEME_DIR,
+                 fold_text: int = DEFAULT_FOLD_TEXT, timeout: int = 15):
+        """Initialize extractor."""
+        super().__init__(db_path or Path(__file__).parent / 'critical_css.db', CRITICAL_SCHEMA)
+        self.theme_dir = theme_dir
+        self.fold_text = fold_text
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.get('user_agent')})
+
+    # Inputs
+
+    def stylesheets(self, soup: BeautifulSoup, base_url: str = None) -> List[str]:
+        """Theme CSS plus the page's linked (enqueued) and embedded CSS, in cascade order."""
+        sheets = load_theme_stylesheets(self.theme_dir) if self.theme_dir else []
+        for element in soup.find_all(['link', 'style']):
+            if is_print_only(element.get('media', 'all')):
+                continue
+            if element.name == 'style':
+                if element.get('id') != 'critical-css':
+                    sheets.append(element.get_text())
+            elif 'stylesheet' in [r.lower() for r in element.get('rel', [])] and element.get('href'):
+                sheets.append(fetch_stylesheet(urljoin(base_url or '', element['href']), self.timeout))
+
+        # The live theme's style.css is usually the same file as the local copy
+        unique = {}
+        for css in sheets:
+            if css.strip():
+                unique.setdefault(hashlib.sha256(css.encode('utf-8')).hexdigest(), css)
+        return list(unique.values())
+
+    @staticmethod
+    def sample_templates(wp_client: WordPressClient = None) -> Dict[str, str]:
+        """URLs of one rendered page per template: home, single, page and category."""
+        wp = wp_client or WordPressClient()
+        templates = {'home': config.get('base_url').rstrip('/') + '/'}
+        for name, fetch in (('single', lambda: wp.get_posts(per_page=1)),
+                            ('page', lambda: wp.get_pages(per_page=1)),
+                            ('category', lambda: [c for c in wp.get_categories() if c.get('count')])):
+            try:
+                items = fetch()
+            except Exception:
+                continue
+            if items and items[0].get('link'):
+                templates[name] = items[0]['link']
+        return templates
+
+    # Extraction
+
+    def extract(self, template: str, html: str, base_url: str = None,
+                force: bool = False) -> Dict[str, Any]:
+        """
+        Critical CSS of one rendered template page.
+
+        Returns:
+            template, template_hash, css_hash, css, rule_count, bytes,
+            source_bytes and whether the result came from the cache
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        fold = above_the_fold(soup, self.fold_text)
+        sheets = self.stylesheets(soup, base_url)
+        template_hash = structure_hash(fold)
+        css_hash = hashlib.sha256('\0'.join(sheets).encode('utf-8')).hexdigest()
+
+        conn = self._connect()
+        row = None if force else conn.execute(
+            'SELECT * FROM critical_css WHERE template_hash = ? AND css_hash = ?', (template_hash, css_hash)
+        ).fetchone()
+        metrics.record_cache('critical_css', row is not None)
+        if row is not None:
+            return dict(_row_result(row), template=template, cached=True)
+
+        with metrics.span('optimization.critical_css.extract'):
+            css, rule_count = critical_css(sheets, fold)
+        result = {
+            'template_hash': template_hash,
+            'css_hash': css_hash,
+            'css': css,
+            'rule_count': rule_count,
+            'source_bytes': sum(len(s.encode('utf-8')) for s in sheets),
+            'created_at': datetime.now().isoformat()
+        }
+        conn.execute('''
+            INSERT OR REPLACE INTO critical_css
+                (template_hash, css_hash, template, css, rule_count, source_bytes, created_at)
+            VALUES (:template_hash, :css_hash, :template, :css, :rule_count, :source_bytes, :created_at)
+        ''', dict(result, template=template))
+        return dict(result, template=template, bytes=len(css.encode('utf-8')), cached=False)
+
+    def extract_site(self, templates: Dict[str, str] = None, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Fetch and extract every sample template (default: sample_templates())."""
+        templates = templates or self.sample_templates()
+        results = {}
+        for name, url in templates.items():
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                results[name] = {'template': name, 'url': url, 'error': str(e)}
+                continue
+            results[name] = dict(self.extract(name, response.text, base_url=response.url, force=force), url=url)
+        return results
+
+    def latest(self, template: str) -> Optional[Dict[str, Any]]:
+        """Most recently generated critical CSS of a template, if any."""
+        if not self.db_path.exists():
+            return None
+        row = self._connect().execute(
+            'SELECT * FROM critical_css WHERE template = ? ORDER BY created_at DESC LIMIT 1', (template,)
+        ).fetchone()
+        return _row_result(row) if row else None
+
+
+def _row_result(row: sqlite3.Row) -> Dict[str, Any]:
+    """Cache row as an extraction result."""
+    result = dict(row)
+    result['bytes'] = len(result['css'].encode('utf-8'))
+    return result
+
+
+def above_the_fold(soup: BeautifulSoup, text_budget: int = DEFAULT_FOLD_TEXT) -> List[Tag]:
+    """
+    Elements rendered in the first screen of a page: <html>, <body> and every
+    body element in document order until text_budget visible characters.
+    """
+    body = soup.body or soup
+    fold = [el for el in (soup.find('html'), soup.body) if el is not None]
+    seen = 0
+    for node in body.descendants:
+        if isinstance(node, Tag):
+            if node.name not in SKIP_TEXT_PARENTS:
+                fold.append(node)
+        elif isinstance(node, NavigableString) and not isinstance(node, Comment) \
+                and node.parent.name not in SKIP_TEXT_PARENTS:
+            seen += len(node.strip())
+            if seen > text_budget:
+                break
+    return fold
+
+
+def structure_hash(fold: Iterable[Tag]) -> str:
+    """
+    Hash of a template's first-screen markup structure, ignoring its text.
+
+    Each element contributes (parent signature, own signature) with tag, id
+    and classes, so new posts on the same template hash the same while a
+    changed header, wrapper or class does not.
+    """
+    pairs = sorted({(_signature(el.parent) if isinstance(el.parent, Tag) else '', _signature(el))
+                    for el in fold})
+    return hashlib.sha256('\n'.join(f'{p}>{s}' for p, s in pairs).encode('utf-8')).hexdigest()
+
+
+def _signature(el: Tag) -> str:
+    classes = '.'.join(sorted(el.get('class', [])))
+    return f"{el.name}#{el.get('id', '')}.{classes}"
+
+
+def critical_css(stylesheets: List[str], fold: List[Tag]) -> Tuple[str, int]:
+    """Rules of the stylesheets that match a fold element, plus the fonts/animations they use."""
+    matcher = _FoldMatcher(fold)
+    blocks, font_faces, keyframes = [], [], {}
+    for css in stylesheets:
+        blocks.extend(_critical_blocks(COMMENT_RE.sub('', css), matcher, font_faces, keyframes))
+
+    used = ' '.join(blocks).lower()
+    extra = [face for family, face in font_faces if family and family in used]
+    extra += [block for name, block in keyframes.items() if re.search(rf'\b{re.escape(name)}\b', used)]
+    return ''.join(extra + blocks), matcher.rule_count
+
+
+class _FoldMatcher:
+    """Selector matching against the fold elements, indexed like StyleIndex."""
+
+    def __init__(self, fold: List[Tag]):
+        self.fold = fold
+        self.by_key: Dict[Tuple[str, str], List[Tag]] = {}
+        for el in fold:
+            if el.get('id'):
+                self.by_key.setdefault(('id', el['id']), []).append(el)
+            for cls in el.get('class', []):
+                self.by_key.setdefault(('class', cls), []).append(el)
+            self.by_key.setdefault(('tag', el.name), []).append(el)
+        self._cache: Dict[str, bool] = {}
+        self.rule_count = 0
+
+    def matches(self, selector: str) -> bool:
+        if selector not in self._cache:
+            self._cache[selector] = self._match(selector)
+        return self._cache[selector]
+
+    def _match(self, selector: str) -> bool:
+        base = PSEUDO_RE.sub('', selector).strip()
+        if not base or base[-1] in '>+~':
+            base = (base + ' *').strip()
+        compiled = compile_selector(base)
+        if compiled is None:
+            return False
+        key = index_key(base)
+        candidates = self.fold if key == ('*', '*') else self.by_key.get(key, ())
+        return any(compiled.match(el) for el in candidates)
+
+
+def _critical_blocks(css: str, matcher: _FoldMatcher, font_faces: List, keyframes: Dict) -> List[str]:
+    """Critical blocks of one stylesheet level; collects @font-face/@keyframes on the way."""
+    blocks = []
+    for prelude, body in _iter_blocks(css):
+        if prelude.startswith('@'):
+            at_rule = prelude.lower()
+            if at_rule.startswith(('@media', '@supports', '@layer')):
+                if at_rule.startswith('@media') and is_print_only(prelude[len('@media'):]):
+                    continue
+                inner = _critical_blocks(body, matcher, font_faces, keyframes)
+                if inner:
+                    blocks.append(f"{_compact(prelude)}{{{''.join(inner)}}}")
+            elif at_rule.startswith('@font-face'):
+                family = re.search(r'font-family\s*:\s*["\']?([^;"\']+)', body, re.I)
+                font_faces.append((family.group(1).strip().lower() if family else '',
+                                   f'@font-face{{{_compact(body)}}}'))
+            elif re.match(r'@(-\w+-)?keyframes', at_rule):
+                name = prelude.split(None, 1)[-1].strip().lower()
+                keyframes[name] = f'{_compact(prelude)}{{{_compact(body)}}}'
+            continue
+
+        selectors = [s for s in _split_selectors(prelude) if matcher.matches(s)]
+        if selectors and body.strip():
+            matcher.rule_count += 1
+            blocks.append(f"{','.join(selectors)}{{{_compact(body)}}}")
+    return blocks
+
+
+def _iter_blocks(css: str):
+    """Yield (prelude, body) of each top-level block, skipping @import-style statements."""
+    pos, length = 0, len(css)
+    while pos < length:
+        brace = css.find('{', pos)
+        if brace == -1:
+            return
+        depth, end = 1, brace + 1
+        while end < length and depth:
+            if css[end] == '{':
+                depth += 1
+            elif css[end] == '}':
+                depth -= 1
+            end += 1
+        # Drop @import/@charset statements glued to the prelude
+        prelude = css[pos:brace].rsplit(';', 1)[-1].strip()
+        yield prelude, css[brace + 1:end - 1]
+        pos = end
+
+
+def _split_selectors(selector_list: str) -> List[str]:
+    """Split a selector list on top-level commas (not those inside :is()/:not())."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(selector_list):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(selector_list[start:i])
+            start = i + 1
+    parts.append(selector_list[start:])
+    return [' '.join(p.split()) for p in parts if p.strip()]
+
+
+STRING_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+
+
+def _compact(text: str) -> str:
+    """Collapse whitespace inside a prelude or declaration block (quoted strings untouched)."""
+    parts = STRING_RE.split(text.strip())
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s*([{};:,>])\s*', r'\1', re.sub(r'\s+', ' ', parts[i]))
+    return ''.join(parts).rstrip(';')
+
+
+def defer_stylesheets(html: str, css: str) -> str:
+    """
+    Inline critical CSS in <head> and load every stylesheet without blocking
+    render (rel=preload swapped to stylesheet on load, <noscript> fallback).
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    head = soup.head or soup
+    for existing in head.find_all('style', id='critical-css'):
+        existing.decompose()
+
+    for link in soup.find_all('link', rel=lambda r: r and 'stylesheet' in r):
+        if is_print_only(link.get('media', 'all')):
+            continue
+        fallback = soup.new_tag('noscript')
+        fallback.append(soup.new_tag('link', rel='stylesheet', href=link.get('href')))
+        link['rel'] = 'preload'
+        link['as'] = 'style'
+        link['onload'] = "this.onload=null;this.rel='stylesheet'"
+        link.insert_after(fallback)
+
+    style = soup.new_tag('style', id='critical-css')
+    style.string = css
+    charset = head.find('meta', charset=True)
+    if charset:
+        charset.insert_after(style)
+    else:
+        head.insert(0, style)
+    return str(soup)
@@ -0,0 +1,283 @@
+"""
+Optimization Engine Registry
+============================
+Pluggable registry of optimization engines and the artifacts they consume,
+plus a per-post DAG executor.
+
+Each engine declares the artifacts it reads (the REST post, the rendered
+page response, the post's image bytes, the site-wide post list). For every
+post the executor builds a small dependency graph of those artifacts and
+engines. It fetches each artifact exactly once and starts every node as
+soon as its inputs are ready, so independent engines run concurrently and
+adding an engine adds work, not another round of the same fetches.
+
+Artifacts reach engines as keyword arguments of the same name, e.g.
+``optimize_post_performance(post_id, auto_apply=..., post=..., page=...)``.
+"""
+
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Callable, Iterable, Tuple
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from ..core import WordPressClient, config, metrics, page_cache
+
+
+class ArtifactSpec:
+    """How to produce one artifact from the post ID and its dependencies."""
+
+    def __init__(self, name: str, provider: Callable, needs: Iterable[str] = (), shared: bool = False):
+        """
+        Args:
+            name: Artifact name (also the engine keyword argument)
+            provider: provider(wp, post_id, **dependencies) -> value
+            needs: Artifacts the provider itself depends on
+            shared: Same value for every post in one executor run
+                (fetched once per run instead of once per post)
+        """
+        self.name = name
+        self.provider = provider
+        self.needs = tuple(needs)
+        self.shared = shared
+
+
+class EngineSpec:
+    """One registered engine: its class, entry point and inputs."""
+
+    def __init__(self, name: str, engine_class, method: str, needs: Iterable[str] = ('post',),
+                 options: Iterable[str] = (), improvements_key: str = 'improvements'):
+        """
+        Args:
+            name: Engine name used on the command line and in job definitions
+            engine_class: Class (or its name in master_toolkit.optimization)
+                constructed with the WordPress client
+            method: Entry point called as method(post_id, auto_apply=..., ...)
+            needs: Artifacts passed to the entry point as keyword arguments
+            options: Run options the entry point accepts (e.g. target_keywords)
+            improvements_key: Result key listing the engine's improvements
+        """
+        self.name = name
+        self.engine_class = engine_class
+        self.method = method
+        self.needs = tuple(needs)
+        self.options = tuple(options)
+        self.improvements_key = improvements_key
+
+    def create(self, wp_client: WordPressClient):
+        """Instantiate the engine."""
+        engine_class = self.engine_class
+        if isinstance(engine_class, str):
+            engine_class = getattr(importlib.import_module('master_toolkit.optimization'), engine_class)
+        return engine_class(wp_client)
+
+
+ARTIFACTS: Dict[str, ArtifactSpec] = {}
+ENGINES: Dict[str, EngineSpec] = {}
+
+
+def register_artifact(name: str, provider: Callable, needs: Iterable[str] = (), shared: bool = False):
+    """Register (or replace) an artifact provider."""
+    ARTIFACTS[name] = ArtifactSpec(name, provider, needs, shared)
+
+
+def register_engine(name: str, engine_class, method: str, needs: Iterable[str] = ('post',),
+                    options: Iterable[str] = (), improvements_key: str = 'improvements'):
+    """Register (or replace) an optimization engine."""
+    unknown = [artifact for artifact in needs if artifact not in ARTIFACTS]
+    if unknown:
+        raise ValueError(f"Engine {name!r} needs unregistered artifacts: {', '.join(unknown)}")
+    ENGINES[name] = EngineSpec(name, engine_class, method, needs, options, improvements_key)
+
+
+# Built-in artifacts
+
+def _fetch_post(wp, post_id):
+    return wp.get_post(post_id)
+
+
+def _fetch_page(wp, post_id, post):
+    """The rendered page: final URL, status, response headers and HTML (None if unreachable)."""
+    url = post.get('link', '')
+    if not url:
+        return None
+    try:
+        response = page_cache.get(url, timeout=15)
+    except requests.RequestException:
+        return None
+    return {'url': response.url, 'status': response.status_code,
+            'headers': response.headers, 'html': response.text}
+
+
+def _fetch_image_data(wp, post_id, post):
+    """Bytes of every image in the post content, keyed by absolute URL (None if unavailable)."""
+    soup = BeautifulSoup(post.get('content', {}).get('rendered', ''), 'html.parser')
+    image_data = {}
+    for img in soup.find_all('img'):
+        src = img.get('src', '')
+        if not src:
+            continue
+        url = urljoin(config.get('base_url'), src) if src.startswith('/') else src
+        if url in image_data:
+            continue
+        try:
+            response = requests.get(url, timeout=15)
+            image_data[url] = response.content if response.status_code == 200 else None
+        except requests.RequestException:
+            image_data[url] = None
+    return image_data
+
+
+def _fetch_site_posts(wp, post_id):
+    return wp.get_posts(per_page=50)
+
+
+register_artifact('post', _fetch_post)
+register_artifact('page', _fetch_page, needs=('post',))
+register_artifact('image_data', _fetch_image_data, needs=('post',))
+register_artifact('site_posts', _fetch_site_posts, shared=True)
+
+
+# Built-in engines
+
+register_engine('content', 'ContentOptimizer', 'optimize_content',
+                options=('target_keywords',), improvements_key='improvements_summary')
+register_engine('images', 'ImageOptimizer', 'optimize_post_images', needs=('post', 'image_data'),
+                improvements_key='optimization_summary')
+register_engine('seo', 'SEOOptimizer', 'optimize_post_seo', needs=('post', 'site_posts'),
+                options=('target_keywords',), improvements_key='improvements_summary')
+register_engine('performance', 'PerformanceOptimizer', 'optimize_post_performance',
+                needs=('post', 'page'), improvements_key='recommendations')
+register_engine('accessibility', 'AccessibilityOptimizer', 'optimize_post_accessibility',
+                improvements_key='accessibility_summary')
+
+
+class EngineExecutor:
+    """Runs registered engines over posts, one artifact/engine DAG per post."""
+
+    def __init__(self, wp_client: WordPressClient = None, engines: Iterable[str] = None,
+                 max_workers: int = 4, instances: Dict[str, Any] = None):
+        """
+        Args:
+            wp_client: Shared WordPress client
+            engines: Engine names to run (default: every registered engine)
+            max_workers: Concurrent artifact fetches/engine runs per post
+            instances: Already constructed engines to reuse, by name
+        """
+        self.wp = wp_client or WordPressClient()
+        names = list(engines) if engines else list(ENGINES)
+        self.unknown_engines = [name for name in names if name not in ENGINES]
+        self.engines = [name for name in names if name in ENGINES]
+        self.max_workers = max_workers
+        self._instances: Dict[str, Any] = dict(instances or {})
+        self._shared: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def engine(self, name: str):
+        """The engine instance (created once per executor)."""
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = ENGINES[name].create(self.wp)
+            return self._instances[name]
+
+    def plan(self) -> List[Tuple[str, str, Tuple[str, ...]]]:
+        """(kind, name, needs) nodes reachable from the selected engines, dependencies first."""
+        ordered, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            if name not in ARTIFACTS:
+                raise ValueError(f"Unregistered artifact: {name}")
+            for dependency in ARTIFACTS[name].needs:
+                visit(dependency)
+            ordered.append(('artifact', name, ARTIFACTS[name].needs))
+
+        for engine_name in self.engines:
+            for artifact in ENGINES[engine_name].needs:
+                visit(artifact)
+        return ordered + [('engine', name, ENGINES[name].needs) for name in self.engines]
+
+    def run_post(self, post_id: int, auto_apply: bool = False, **options) -> Dict[str, Any]:
+        """
+        Run the selected engines on one post.
+
+        Returns:
+            engine_results (name -> result or {'error'}), artifact_errors,
+            engines_run and execution_time
+        """
+        start = time.perf_counter()
+        pending = {(kind, name): [('artifact', dep) for dep in needs] for kind, name, needs in self.plan()}
+        values: Dict[Tuple[str, str], Any] = {}
+        failed: Dict[Tuple[str, str], str] = {}
+        running = {}
+
+        def run_node(kind, name):
+            if kind == 'artifact':
+                dependencies = {dep: values[('artifact', dep)] for dep in ARTIFACTS[name].needs}
+                return self._artifact(name, post_id, dependencies)
+            spec = ENGINES[name]
+            kwargs = {artifact: values[('artifact', artifact)] for artifact in spec.needs}
+            kwargs.update({key: options[key] for key in spec.options if options.get(key) is not None})
+            with metrics.span(f'engine.{name}'):
+                return getattr(self.engine(name), spec.method)(post_id, auto_apply=auto_apply, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for node, needs in list(pending.items()):
+                    blocked = [dep for dep in needs if dep in failed]
+                    if blocked:
+                        failed[node] = f"{blocked[0][1]} unavailable: {failed[blocked[0]]}"
+                        del pending[node]
+                    elif all(dep in values for dep in needs):
+                        running[pool.submit(run_node, *node)] = node
+                        del pending[node]
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        values[node] = future.result()
+                    except Exception as e:
+                        failed[node] = str(e)
+
+        engine_results = {
+            name: values.get(('engine', name), {'error': failed.get(('engine', name), 'not run')})
+            for name in self.engines
+        }
+        return {
+            'post_id': post_id,
+            'engine_results': engine_results,
+            'engines_run': [name for name in self.engines if ('engine', name) in values],
+            'artifact_errors': {name: error for (kind, name), error in failed.items() if kind == 'artifact'},
+            'execution_time': time.perf_counter() - start
+        }
+
+    def _artifact(self, name: str, post_id: int, dependencies: Dict[str, Any]):
+        """Produce one artifact; shared artifacts are fetched once per executor."""
+        spec = ARTIFACTS[name]
+        if spec.shared:
+            with self._lock:
+                cached = name in self._shared
+            metrics.record_cache(f'artifact.{name}', cached)
+            if cached:
+                return self._shared[name]
+        with metrics.span(f'artifact.{name}'):
+            value = spec.provider(self.wp, post_id, **dependencies)
+        if spec.shared:
+            with self._lock:
+                value = self._shared.setdefault(name, value)
+        return value
+
+    @staticmethod
+    def improvements(engine_name: str, result: Dict[str, Any]) -> List[Any]:
+        """The improvements an engine reported in its result."""
+        spec = ENGINES.get(engine_name)
+        improvements = result.get(spec.improvements_key if spec else 'improvements', [])
+        return improvements if isinstance(improvements, list) else []
@@ -20,7 +20,7 @@ import base64
 from PIL import Image
 from bs4 import BeautifulSoup, Tag
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, metrics
 from ..utils import print_success, print_error, print_warning
 
 
@@ -46,10 +46,17 @@ class ImageOptimizer:
         self.input_formats = ['JPEG', 'PNG', 'BMP', 'TIFF']
         self.output_formats = ['JPEG', 'WebP', 'AVIF']
     
-    def optimize_post_images(self, post_id: int, auto_apply: bool = False) -> Dict[str, Any]:
-        """Comprehensive image optimization for a specific post."""
+    @metrics.timed('engine.images.optimize_post_images')
+    def optimize_post_images(self, post_id: int, auto_apply: bool = False, post: Dict[str, Any] = None,
+                             image_data: Dict[str, Optional[bytes]] = None) -> Dict[str, Any]:
+        """
+        Comprehensive image optimization for a specific post.
+
+        An already loaded post skips the fetch; image_data (absolute URL ->
+        bytes, None if unavailable) replaces the per-image downloads.
+        """
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             post_title = post.get('title', {}).get('rendered', 'Untitled')
             content = post.get('content', {}).get('rendered', '')
             
@@ -98,7 +105,7 @@ class ImageOptimizer:
                     continue
                 
                 # Optimize individual image
-                img_optimization = self._optimize_individual_image(img, soup, auto_apply)
+                img_optimization = self._optimize_individual_image(img, soup, auto_apply, image_data)
                 
                 # Update totals
                 if img_optimization.get('compressed'):
@@ -154,7 +161,8 @@ class ImageOptimizer:
             }
     
     def _optimize_individual_image(self, img_tag: Tag, soup: BeautifulSoup, 
-                                 auto_apply: bool = False) -> Dict[str, Any]:
+                                 auto_apply: bool = False,
+                                 image_data: Dict[str, Optional[bytes]] = None) -> Dict[str, Any]:
         """Optimize an individual image element."""
         optimization = {
             'src': img_tag.get('src', ''),
@@ -182,12 +190,16 @@ class ImageOptimizer:
                 full_url = img_src
             
             # Download and analyze image
-            response = requests.get(full_url, timeout=15)
-            if response.status_code == 200:
-                optimization['original_size'] = len(response.content)
+            if image_data is not None and full_url in image_data:
+                data = image_data[full_url]
+            else:
+                response = requests.get(full_url, timeout=15)
+                data = response.content if response.status_code == 200 else None
+            if data is not None:
+                optimization['original_size'] = len(data)
                 
                 # Optimize image
-                optimized_data = self._compress_image(response.content)
+                optimized_data = self._compress_image(data)
                 if optimized_data:
                     optimization['optimized_size'] = len(optimized_data)
                     optimization['savings_bytes'] = optimization['original_size'] - optimization['optimized_size']
@@ -195,12 +207,12 @@ class ImageOptimizer:
                     optimization['compressed'] = True
                 
                 # Check for format conversion opportunities
-                if self._should_convert_format(response.content):
+                if self._should_convert_format(data):
                     optimization['format_converted'] = True
                 
                 # Generate responsive images
                 if auto_apply and self._should_generate_responsive(optimization['original_size']):
-                    self._add_responsive_attributes(img_tag, full_url)
+                    self._add_responsive_attributes(img_tag, full_url, data)
                     optimization['responsive_generated'] = True
                 
                 # Improve alt text
@@ -279,15 +291,17 @@ class ImageOptimizer:
         # Generate responsive images for files larger than 200KB
         return file_size > 200000
     
-    def _add_responsive_attributes(self, img_tag: Tag, img_url: str) -> None:
+    def _add_responsive_attributes(self, img_tag: Tag, img_url: str, data: bytes = None) -> None:
         """Add responsive image attributes (srcset and sizes)."""
         try:
-            # Download original image
-            response = requests.get(img_url, timeout=10)
-            if response.status_code != 200:
-                return
+            # Download original image unless already in hand
+            if data is None:
+                response = requests.get(img_url, timeout=10)
+                if response.status_code != 200:
+                    return
+                data = response.content
             
-            image = Image.open(io.BytesIO(response.content))
+            image = Image.open(io.BytesIO(data))
             original_width = image.width
             
             # Generate srcset for different breakpoints
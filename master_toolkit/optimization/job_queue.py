@@ -0,0 +1,492 @@
+"""
+Durable Optimization Job Queue
+==============================
+SQLite-backed job queue for scheduled optimization runs. Each job fans out
+into one task per post; workers lease tasks, heartbeat while they run and
+record the result per post, so an interrupted run resumes from the last
+completed post instead of starting over.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from ..core import WordPressClient, ResultSink, auth
+from ..core.storage import connect
+from ..utils import print_success, print_error, print_warning, print_info
+
+
+# Per-post fields kept in result summaries; full results only go to a ResultSink
+SUMMARY_FIELDS = ('post_id', 'success', 'error', 'engines_run', 'overall_score',
+                  'score_improvement', 'total_improvements')
+
+
+class OptimizationJobQueue:
+    """Persistent job/task queue with leases, heartbeats and retry counts."""
+
+    # Task states
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, db_path: Optional[Path] = None, lease_seconds: int = 300,
+                 max_attempts: int = 3):
+        """Initialize job queue."""
+        self.db_path = Path(db_path) if db_path else Path(__file__).parent / 'optimization_tracking.db'
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection suitable for concurrent worker processes."""
+        return connect(self.db_path)
+
+    def _init_database(self):
+        """Create queue tables if they do not exist."""
+        conn = self._connect()
+
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS optimization_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_name TEXT,
+                engines TEXT,
+                options TEXT,
+                created_at REAL,
+                finished_at REAL
+            )
+        ''')
+
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS optimization_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER REFERENCES optimization_jobs(id),
+                post_id INTEGER,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER,
+                lease_owner TEXT,
+                lease_expires REAL,
+                heartbeat_at REAL,
+                updated_at REAL,
+                result_data TEXT,
+                error TEXT,
+                UNIQUE (job_id, post_id)
+            )
+        ''')
+
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_optimization_tasks_status
+            ON optimization_tasks (status, lease_expires)
+        ''')
+
+        conn.close()
+
+    def enqueue_job(self, job_name: str, post_ids: List[int], engines: List[str],
+                    options: Dict[str, Any] = None) -> int:
+        """Create a job and fan it out into one pending task per post."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            cursor = conn.execute('''
+                INSERT INTO optimization_jobs (job_name, engines, options, created_at)
+                VALUES (?, ?, ?, ?)
+            ''', (job_name, ','.join(engines), json.dumps(options or {}), now))
+            job_id = cursor.lastrowid
+
+            conn.executemany('''
+                INSERT OR IGNORE INTO optimization_tasks
+                (job_id, post_id, status, max_attempts, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(job_id, post_id, self.PENDING, self.max_attempts, now)
+                  for post_id in dict.fromkeys(post_ids)])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        return job_id
+
+    def find_unfinished_job(self, job_name: str) -> Optional[int]:
+        """Return the most recent job with this name that still has open tasks."""
+        conn = self._connect()
+        try:
+            row = conn.execute('''
+                SELECT j.id FROM optimization_jobs j
+                WHERE j.job_name = ? AND j.finished_at IS NULL
+                AND EXISTS (
+                    SELECT 1 FROM optimization_tasks t
+                    WHERE t.job_id = j.id AND t.status IN (?, ?)
+                )
+                ORDER BY j.id DESC LIMIT 1
+            ''', (job_name, self.PENDING, self.LEASED)).fetchone()
+            return row['id'] if row else None
+        finally:
+            conn.close()
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get job definition."""
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM optimization_jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        return {
+            'job_id': row['id'],
+            'job_name': row['job_name'],
+            'engines': [e for e in row['engines'].split(',') if e],
+            'options': json.loads(row['options'] or '{}'),
+            'created_at': row['created_at'],
+            'finished_at': row['finished_at']
+        }
+
+    def lease_task(self, worker_id: str, job_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically lease the next runnable task.
+        Pending tasks and tasks whose lease expired (crashed worker) are eligible.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+
+            query = '''
+                SELECT t.id, t.job_id, t.post_id, t.attempts, t.max_attempts
+                FROM optimization_tasks t
+                WHERE (t.status = ? OR (t.status = ? AND t.lease_expires < ?))
+            '''
+            params = [self.PENDING, self.LEASED, now]
+            if job_id is not None:
+                query += ' AND t.job_id = ?'
+                params.append(job_id)
+            query += ' ORDER BY t.job_id, t.id LIMIT 1'
+
+            while True:
+                row = conn.execute(query, params).fetchone()
+                if not row or row['attempts'] < row['max_attempts']:
+                    break
+
+                # An expired lease counts as a failed attempt
+                conn.execute('''
+                    UPDATE optimization_tasks
+                    SET status = ?, lease_owner = NULL, lease_expires = NULL,
+                        updated_at = ?, error = COALESCE(error, 'Lease expired too many times')
+                    WHERE id = ?
+                ''', (self.FAILED, now, row['id']))
+
+            if not row:
+                conn.execute('COMMIT')
+                return None
+
+            conn.execute('''
+                UPDATE optimization_tasks
+                SET status = ?, attempts = attempts + 1, lease_owner = ?,
+                    lease_expires = ?, heartbeat_at = ?, updated_at = ?
+                WHERE id = ?
+            ''', (self.LEASED, worker_id, now + self.lease_seconds, now, now, row['id']))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        return {
+            'task_id': row['id'],
+            'job_id': row['job_id'],
+            'post_id': row['post_id'],
+            'attempt': row['attempts'] + 1,
+            'max_attempts': row['max_attempts']
+        }
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend a lease. Returns False if the lease was lost to another worker."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                UPDATE optimization_tasks
+                SET lease_expires = ?, heartbeat_at = ?
+                WHERE id = ? AND status = ? AND lease_owner = ?
+            ''', (now + self.lease_seconds, now, task_id, self.LEASED, worker_id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete_task(self, task_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a leased task as done and store its result."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                UPDATE optimization_tasks
+                SET status = ?, lease_owner = NULL, lease_expires = NULL,
+                    updated_at = ?, result_data = ?, error = NULL
+                WHERE id = ? AND status = ? AND lease_owner = ?
+            ''', (self.DONE, now, json.dumps(result, default=str), task_id, self.LEASED, worker_id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def fail_task(self, task_id: int, worker_id: str, error: str) -> str:
+        """
+        Record a failed attempt. The task goes back to pending until it runs
+        out of attempts, then it is marked failed. Returns the new status.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('''
+                SELECT attempts, max_attempts FROM optimization_tasks
+                WHERE id = ? AND status = ? AND lease_owner = ?
+            ''', (task_id, self.LEASED, worker_id)).fetchone()
+
+            if not row:
+                conn.execute('COMMIT')
+                return self.LEASED
+
+            status = self.FAILED if row['attempts'] >= row['max_attempts'] else self.PENDING
+            conn.execute('''
+                UPDATE optimization_tasks
+                SET status = ?, lease_owner = NULL, lease_expires = NULL,
+                    updated_at = ?, error = ?
+                WHERE id = ?
+            ''', (status, now, error, task_id))
+            conn.execute('COMMIT')
+            return status
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def finish_job_if_complete(self, job_id: int) -> bool:
+        """Stamp finished_at once no tasks of the job are open."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                UPDATE optimization_jobs SET finished_at = ?
+                WHERE id = ? AND finished_at IS NULL AND NOT EXISTS (
+                    SELECT 1 FROM optimization_tasks
+                    WHERE job_id = ? AND status IN (?, ?)
+                )
+            ''', (time.time(), job_id, job_id, self.PENDING, self.LEASED))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def get_job_status(self, job_id: int) -> Dict[str, Any]:
+        """Get task counts per status for a job."""
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT status, COUNT(*) AS count FROM optimization_tasks
+                WHERE job_id = ? GROUP BY status
+            ''', (job_id,)).fetchall()
+        finally:
+            conn.close()
+
+        counts = {self.PENDING: 0, self.LEASED: 0, self.DONE: 0, self.FAILED: 0}
+        for row in rows:
+            counts[row['status']] = row['count']
+
+        total = sum(counts.values())
+        return {
+            'job_id': job_id,
+            'total_tasks': total,
+            **counts,
+            'is_complete': total > 0 and counts[self.PENDING] == 0 and counts[self.LEASED] == 0
+        }
+
+    def get_job_results(self, job_id: int, sink: ResultSink = None) -> Dict[str, Any]:
+        """
+        Build a batch-style result summary from completed tasks.
+
+        Task rows are streamed from the database and individual_results keeps
+        only each post's SUMMARY_FIELDS. Pass a sink to also stream every full
+        result into it; its path is returned as results_file.
+        """
+        results = {
+            'total_posts': 0,
+            'processed_posts': 0,
+            'successful_optimizations': 0,
+            'failed_optimizations': 0,
+            'individual_results': {},
+            'average_score_improvement': 0
+        }
+        if sink is not None:
+            results['results_file'] = str(sink.path)
+
+        improvement_total, improvement_count = 0.0, 0
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT post_id, status, result_data, error FROM optimization_tasks
+                WHERE job_id = ? ORDER BY id
+            ''', (job_id,))
+            for row in rows:
+                results['total_posts'] += 1
+                if row['status'] == self.DONE:
+                    post_result = json.loads(row['result_data'] or '{}')
+                elif row['status'] == self.FAILED:
+                    post_result = {'post_id': row['post_id'], 'success': False, 'error': row['error']}
+                else:
+                    continue
+
+                if sink is not None:
+                    sink.write(post_result)
+                results['individual_results'][row['post_id']] = {
+                    key: post_result[key] for key in SUMMARY_FIELDS if key in post_result
+                }
+                results['processed_posts'] += 1
+                if post_result.get('success'):
+                    results['successful_optimizations'] += 1
+                    if 'score_improvement' in post_result:
+                        improvement_total += post_result['score_improvement']
+                        improvement_count += 1
+                else:
+                    results['failed_optimizations'] += 1
+        finally:
+            conn.close()
+
+        if improvement_count:
+            results['average_score_improvement'] = improvement_total / improvement_count
+
+        return results
+
+
+class QueueWorker:
+    """Drains tasks from an OptimizationJobQueue, one post at a time."""
+
+    def __init__(self, queue: OptimizationJobQueue, wp_client: WordPressClient = None,
+                 worker_id: str = None):
+        """Initialize queue worker."""
+        # Imported lazily: advanced.py imports this module
+        from .advanced import BatchOptimizationProcessor
+
+        self.queue = queue
+        self.wp = wp_client or WordPressClient()
+        self.processor = BatchOptimizationProcessor(self.wp)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def run(self, job_id: Optional[int] = None, idle_exit: bool = True,
+            poll_interval: float = 5.0) -> int:
+        """
+        Process tasks until the queue is empty (or forever when idle_exit is False).
+        Returns the number of tasks handled by this worker.
+        """
+        handled = 0
+
+        while True:
+            task = self.queue.lease_task(self.worker_id, job_id)
+
+            if not task:
+                if idle_exit:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            self._run_task(task)
+            handled += 1
+
+        return handled
+
+    def _run_task(self, task: Dict[str, Any]):
+        """Run a single leased task with a background heartbeat."""
+        job = self.queue.get_job(task['job_id'])
+        if not job:
+            self.queue.fail_task(task['task_id'], self.worker_id, 'Job definition missing')
+            return
+
+        stop_heartbeat = threading.Event()
+        heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(task['task_id'], stop_heartbeat),
+            daemon=True
+        )
+        heartbeat_thread.start()
+
+        try:
+            post_result = self.processor._optimize_single_post(
+                task['post_id'], job['engines'], job['options'].get('auto_apply', False)
+            )
+        except Exception as e:
+            post_result = {'post_id': task['post_id'], 'success': False, 'error': str(e)}
+        finally:
+            stop_heartbeat.set()
+            heartbeat_thread.join()
+
+        if post_result.get('success'):
+            self.queue.complete_task(task['task_id'], self.worker_id, post_result)
+            print_success(f"Post {task['post_id']} optimized (job {task['job_id']})")
+        else:
+            status = self.queue.fail_task(
+                task['task_id'], self.worker_id, post_result.get('error', 'Optimization failed')
+            )
+            if status == OptimizationJobQueue.FAILED:
+                print_error(f"Post {task['post_id']} failed after {task['attempt']} attempts")
+            else:
+                print_warning(f"Post {task['post_id']} failed (attempt {task['attempt']}), will retry")
+
+        self.queue.finish_job_if_complete(task['job_id'])
+
+    def _heartbeat_loop(self, task_id: int, stop: threading.Event):
+        """Keep the lease alive while the task runs."""
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not stop.wait(interval):
+            if not self.queue.heartbeat(task_id, self.worker_id):
+                print_warning(f"Lost lease on task {task_id}")
+                return
+
+
+def _worker_process_main(db_path: str, job_id: Optional[int], lease_seconds: int,
+                         max_attempts: int, credentials: Optional[tuple]):
+    """Entry point for a worker process."""
+    wp = WordPressClient()
+    if credentials:
+        wp.authenticate(*credentials)
+
+    queue = OptimizationJobQueue(db_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    QueueWorker(queue, wp).run(job_id=job_id)
+
+
+def run_worker_processes(queue: OptimizationJobQueue, num_workers: int = 3,
+                         job_id: Optional[int] = None) -> Dict[str, Any]:
+    """Drain the queue with several worker processes and wait for them to finish."""
+    credentials = (auth.username, auth.password) if auth.is_authenticated() else None
+
+    print_info(f"Starting {num_workers} queue workers")
+
+    processes = []
+    for _ in range(num_workers):
+        process = multiprocessing.Process(
+            target=_worker_process_main,
+            args=(str(queue.db_path), job_id, queue.lease_seconds,
+                  queue.max_attempts, credentials)
+        )
+        process.start()
+        processes.append(process)
+
+    for process in processes:
+        process.join()
+
+    if job_id is not None:
+        queue.finish_job_if_complete(job_id)
+        return queue.get_job_status(job_id)
+
+    return {'workers': num_workers, 'finished_at': datetime.now().isoformat()}
@@ -0,0 +1,353 @@
+"""
+CSS/JS Minification
+===================
+Single-pass tokenizing minifiers for inline CSS and JavaScript with
+byte-accurate size accounting.
+
+Each minifier walks the source once, copying string literals, url()
+values, template literals and regex literals verbatim and dropping
+comments and whitespace only where no token boundary depends on them.
+Results are cached by the sha256 of the input, so the same inline asset
+repeated across posts is minified and compressed once per process.
+"""
+
+import gzip
+import hashlib
+from typing import Dict, Any, Optional
+
+from ..core import metrics
+from ..core.storage import LRUCache
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+# CSS at-rules whose blocks hold rules rather than declarations
+CSS_RULE_BLOCKS = ('@media', '@supports', '@layer', '@container', '@document')
+
+# Whitespace next to these is never significant in CSS
+CSS_PUNCTUATION = set('{};,>')
+
+# A '/' after one of these punctuators (or keywords) starts a regex literal;
+# '++'/'--' are tokens of their own and leave the previous state unchanged
+JS_REGEX_PREFIX = set('(,=:[!&|?{};~+-*%<>^')
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'case', 'do', 'else', 'in', 'of', 'new',
+                     'delete', 'void', 'throw', 'yield', 'await'}
+
+# Newlines may end a statement (ASI) between these token edges
+JS_STATEMENT_END = set(')]}\'"`+-')
+JS_STATEMENT_START = set('{[(\'"`+-/!~')
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char in '_$\\' or ord(char) > 127
+
+
+# CSS
+
+def minify_css(css: str) -> str:
+    """Minify CSS in one pass; strings, url() values and /*! comments are kept verbatim."""
+    out = []
+    i, n = 0, len(css)
+    blocks = []            # 'rules' or 'decls' per open brace
+    parens = 0
+    prelude_start = 0      # output index where the current prelude began
+    pending_space = False
+
+    def in_decls():
+        return bool(blocks) and blocks[-1] == 'decls'
+
+    while i < n:
+        char = css[i]
+
+        if char in ' \t\r\n\f':
+            pending_space = True
+            i += 1
+            continue
+
+        if char == '/' and css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            if css.startswith('/*!', i):
+                out.append(css[i:end])
+            else:
+                pending_space = True
+            i = end
+            continue
+
+        if pending_space and out:
+            prev = out[-1][-1]
+            droppable = CSS_PUNCTUATION | ({':'} if in_decls() else set()) | \
+                ({'+', '~'} if not in_decls() and not parens else set())
+            if prev not in droppable and char not in droppable and char not in ')!' and prev != '(':
+                out.append(' ')
+        pending_space = False
+
+        if char in '"\'':
+            end = _string_end(css, i)
+            out.append(css[i:end])
+            i = end
+            continue
+
+        if (char in 'uU' and css[i:i + 4].lower() == 'url(' and
+                (not out or not _is_word(out[-1][-1]))):
+            end = css.find(')', i)
+            end = n if end == -1 else end + 1
+            out.append(f'url({css[i + 4:end - 1].strip()})')
+            i = end
+            continue
+
+        if char == '(':
+            parens += 1
+        elif char == ')':
+            parens = max(parens - 1, 0)
+        elif char == '{':
+            prelude = ''.join(out[prelude_start:]).strip().lower()
+            blocks.append('rules' if prelude.startswith(CSS_RULE_BLOCKS) else 'decls')
+        elif char == '}':
+            if out and out[-1] == ';':
+                out.pop()
+            if blocks:
+                blocks.pop()
+        elif char == ';' and out and out[-1] in (';', '{'):
+            i += 1
+            continue
+
+        out.append(char)
+        if char in '{};':
+            prelude_start = len(out)
+        i += 1
+
+    return ''.join(out).strip()
+
+
+def _string_end(text: str, start: int) -> int:
+    """Index just past the string literal opening at start (quote char at start)."""
+    quote = text[start]
+    i = start + 1
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == quote or (text[i] == '\n' and quote != '`'):
+            return i + 1
+        i += 1
+    return len(text)
+
+
+# JavaScript
+
+def minify_js(js: str) -> str:
+    """
+    Minify JavaScript in one pass.
+
+    Strings, template literals (with nested ${} expressions) and regex
+    literals are copied verbatim. Whitespace is kept only between word
+    characters, between '+ +'/'- -', after a number followed by '.'
+    ("1 .toString()"), where dropping it would form an HTML comment token
+    ("< !--", "-- >"), and as a newline where removing it could change
+    automatic semicolon insertion.
+    """
+    out = []
+    i, n = 0, len(js)
+    templates = []         # brace depth at each open ${ of a template literal
+    depth = 0
+    last_word = ''         # last identifier/keyword emitted
+    regex_ok = True        # whether a '/' here would start a regex literal (not divide)
+    gap = ''               # '' | ' ' | '\n' whitespace seen since the last token
+
+    while i < n:
+        char = js[i]
+
+        if char in ' \t\r\f\v\u00a0\ufeff':
+            gap = gap or ' '
+            i += 1
+            continue
+        if char in '\n\u2028\u2029':
+            gap = '\n'
+            i += 1
+            continue
+
+        if char == '/' and js.startswith('//', i):
+            end = js.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if char == '/' and js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            comment = js[i:end]
+            if comment.startswith('/*!'):
+                out.append(comment)
+            elif '\n' in comment:
+                gap = '\n'
+            else:
+                gap = gap or ' '
+            i = end
+            continue
+
+        prev = out[-1][-1] if out else ''
+        if gap and prev:
+            if gap == '\n' and (prev in JS_STATEMENT_END or _is_word(prev)) and \
+                    (char in JS_STATEMENT_START or _is_word(char)):
+                out.append('\n')
+            elif _is_word(prev) and _is_word(char) or (prev == char and char in '+-') or \
+                    (prev == '/' and char == '/') or \
+                    (char == '.' and last_word[:1].isdigit() and out[-1] == last_word) or \
+                    (prev == '<' and js.startswith('!--', i)) or \
+                    (char == '>' and ''.join(out[-2:]).endswith('--')):
+                out.append(' ')
+        if out and out[-1] == '\n':
+            regex_ok = True
+        gap = ''
+
+        if char in '"\'':
+            end = _string_end(js, i)
+            out.append(js[i:end])
+            i, last_word, regex_ok = end, '', False
+            continue
+
+        if char == '`' or (char == '}' and templates and templates[-1] == depth):
+            if char == '}':
+                templates.pop()
+            end = _template_end(js, i + 1)
+            out.append(js[i:end])
+            if js.startswith('${', end - 2):
+                templates.append(depth)
+                regex_ok = True
+            else:
+                regex_ok = False
+            i, last_word = end, ''
+            continue
+
+        if char == '/' and regex_ok:
+            end = _regex_end(js, i)
+            out.append(js[i:end])
+            i, last_word, regex_ok = end, '', False
+            continue
+
+        if _is_word(char):
+            start = i
+            while i < n and _is_word(js[i]):
+                i += 1
+            # Number literals with exponents/decimals stay one token
+            while i < n and js[i] == '.' and start < i and js[start].isdigit():
+                i += 1
+                while i < n and _is_word(js[i]):
+                    i += 1
+            last_word = js[start:i]
+            out.append(last_word)
+            regex_ok = last_word in JS_REGEX_KEYWORDS
+            continue
+
+        # Postfix x++ ends an operand (a '/' after it divides), prefix ++x does not
+        if char in '+-' and js.startswith(char * 2, i):
+            out.append(char * 2)
+            last_word = ''
+            i += 2
+            continue
+
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        out.append(char)
+        last_word = ''
+        regex_ok = char in JS_REGEX_PREFIX
+        i += 1
+
+    return ''.join(out).strip()
+
+
+def _template_end(js: str, i: int) -> int:
+    """Index past the template literal chunk starting at i (its closing ` or ${)."""
+    while i < len(js):
+        if js[i] == '\\':
+            i += 2
+            continue
+        if js[i] == '`':
+            return i + 1
+        if js.startswith('${', i):
+            return i + 2
+        i += 1
+    return len(js)
+
+
+def _regex_end(js: str, start: int) -> int:
+    """Index past the regex literal (including flags) opening at start."""
+    i, in_class = start + 1, False
+    while i < len(js) and js[i] != '\n':
+        if js[i] == '\\':
+            i += 2
+            continue
+        if js[i] == '[':
+            in_class = True
+        elif js[i] == ']':
+            in_class = False
+        elif js[i] == '/' and not in_class:
+            i += 1
+            while i < len(js) and _is_word(js[i]):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+# Size accounting
+
+def compressed_sizes(content) -> Dict[str, Optional[int]]:
+    """Raw, gzip (level 9) and brotli (quality 11, None if unavailable) sizes in bytes."""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    return {
+        'bytes': len(data),
+        'gzip': len(gzip.compress(data, compresslevel=9, mtime=0)),
+        'brotli': len(brotli.compress(data, quality=11)) if HAS_BROTLI else None
+    }
+
+
+class Minifier:
+    """Hash-keyed LRU cache of minification results with size accounting."""
+
+    MINIFIERS = {'css': minify_css, 'js': minify_js}
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._cache = LRUCache(max_entries)
+
+    def minify(self, kind: str, source: str) -> Dict[str, Any]:
+        """
+        Minify a 'css' or 'js' source.
+
+        Returns:
+            minified text plus original/minified byte, gzip and brotli sizes
+            and the byte savings of each
+        """
+        key = hashlib.sha256(f'{kind}\0{source}'.encode('utf-8')).hexdigest()
+        result = self._cache.get(key)
+        metrics.record_cache(f'minify.{kind}', result is not None)
+        if result is not None:
+            return result
+
+        with metrics.span(f'optimization.minify.{kind}'):
+            minified = self.MINIFIERS[kind](source)
+        before, after = compressed_sizes(source), compressed_sizes(minified)
+        result = {
+            'minified': minified,
+            'original_size': before['bytes'],
+            'minified_size': after['bytes'],
+            'savings': before['bytes'] - after['bytes'],
+            'original_gzip': before['gzip'],
+            'minified_gzip': after['gzip'],
+            'gzip_savings': before['gzip'] - after['gzip'],
+            'original_brotli': before['brotli'],
+            'minified_brotli': after['brotli'],
+            'brotli_savings': before['brotli'] - after['brotli'] if HAS_BROTLI else None
+        }
+        self._cache.put(key, result)
+        return result
+
+
+# Shared across optimizers so repeated inline assets are processed once per process
+minifier = Minifier()
@@ -16,19 +16,21 @@ import base64
 from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup, Tag
-import requests
 from datetime import datetime, timedelta
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, PageCache, page_cache, metrics
 from ..utils import print_success, print_error, print_warning
+from .minify import minifier, compressed_sizes
 
 
 class PerformanceOptimizer:
     """Advanced performance optimization utilities for WordPress sites."""
     
-    def __init__(self, wp_client: WordPressClient = None):
+    def __init__(self, wp_client: WordPressClient = None, critical_css=None, pages: PageCache = None):
         """Initialize performance optimizer."""
         self.wp = wp_client or WordPressClient()
+        self.pages = pages or page_cache
+        self._critical_css = critical_css
         self.base_url = "https://spherevista360.com"
         
         # Performance thresholds (Core Web Vitals)
@@ -39,28 +41,26 @@ class PerformanceOptimizer:
             'fcp': 1.8,      # First Contentful Paint (seconds)
             'ttfb': 600      # Time to First Byte (milliseconds)
         }
-        
-        # CSS/JS optimization patterns
-        self.css_minify_patterns = [
-            (r'/\*.*?\*/', ''),          # Remove comments
-            (r'\s+', ' '),               # Collapse whitespace
-            (r';\s*}', '}'),             # Remove unnecessary semicolons
-            (r'\s*{\s*', '{'),           # Remove spaces around braces
-            (r';\s*', ';'),              # Remove spaces after semicolons
-            (r':\s*', ':'),              # Remove spaces after colons
-        ]
-        
-        self.js_minify_patterns = [
-            (r'//.*?$', '', re.MULTILINE),   # Remove single-line comments
-            (r'/\*.*?\*/', '', re.DOTALL),   # Remove multi-line comments
-            (r'\s+', ' '),                   # Collapse whitespace
-            (r'\s*([{}();,:])\s*', r'\1'),   # Remove spaces around operators
-        ]
     
-    def optimize_post_performance(self, post_id: int, auto_apply: bool = False) -> Dict[str, Any]:
-        """Comprehensive performance optimization for a specific post."""
+    @property
+    def critical_css(self):
+        """Critical CSS extractor whose cache holds the per-template results."""
+        if self._critical_css is None:
+            from .critical_css import CriticalCSSExtractor
+            self._critical_css = CriticalCSSExtractor()
+        return self._critical_css
+    
+    @metrics.timed('engine.performance.optimize_post_performance')
+    def optimize_post_performance(self, post_id: int, auto_apply: bool = False,
+                                  post: Dict[str, Any] = None, page: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Comprehensive performance optimization for a specific post.
+
+        An already loaded post skips the fetch; an already fetched page
+        response supplies the caching headers instead of a HEAD request.
+        """
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             post_title = post.get('title', {}).get('rendered', 'Untitled')
             content = post.get('content', {}).get('rendered', '')
             post_url = post.get('link', '')
@@ -104,7 +104,7 @@ class PerformanceOptimizer:
                 soup, auto_apply
             )
             result['performance_optimization']['caching_optimization'] = self._optimize_caching(
-                post_url, auto_apply
+                post_url, auto_apply, headers=page['headers'] if page else None
             )
             result['performance_optimization']['core_web_vitals'] = self._optimize_core_web_vitals(
                 soup, post_url, auto_apply
@@ -184,24 +184,23 @@ class PerformanceOptimizer:
             analysis['improvements'].append(f'Consider combining CSS files - found {len(css_links)} external stylesheets')
             analysis['score'] -= 10
         
-        # Minify inline CSS
+        # Minify inline CSS (sizes in bytes, raw and gzipped)
         for style_tag in inline_styles:
             if style_tag.string:
-                original_css = style_tag.string
-                minified_css = self._minify_css(original_css)
+                minified = minifier.minify('css', style_tag.string)
                 
                 if auto_apply:
-                    style_tag.string = minified_css
+                    style_tag.string = minified['minified']
                 
-                analysis['css_optimization']['minified_css'].append({
-                    'original_size': len(original_css),
-                    'minified_size': len(minified_css),
-                    'savings': len(original_css) - len(minified_css)
-                })
+                analysis['css_optimization']['total_css_size'] += minified['original_size']
+                analysis['css_optimization']['minified_css'].append(
+                    {k: v for k, v in minified.items() if k != 'minified'}
+                )
         
         if analysis['css_optimization']['minified_css']:
-            total_savings = sum(item['savings'] for item in analysis['css_optimization']['minified_css'])
-            analysis['improvements'].append(f'Minified inline CSS - saved {total_savings} characters')
+            analysis['improvements'].append(
+                f"Minified inline CSS - {self._savings_summary(analysis['css_optimization']['minified_css'])}"
+            )
             analysis['score'] += 10
         
         # Analyze JavaScript resources
@@ -226,24 +225,25 @@ class PerformanceOptimizer:
             analysis['improvements'].append(f'Add async/defer to {len(non_async_scripts)} JavaScript files for better loading')
             analysis['score'] -= 10
         
-        # Minify inline JavaScript
+        # Minify inline JavaScript (JSON-LD and other data blocks are not scripts)
         for script_tag in inline_scripts:
-            if script_tag.string and script_tag.string.strip():
-                original_js = script_tag.string
-                minified_js = self._minify_js(original_js)
+            script_type = script_tag.get('type', 'text/javascript').lower()
+            if script_tag.string and script_tag.string.strip() and \
+                    ('javascript' in script_type or script_type == 'module'):
+                minified = minifier.minify('js', script_tag.string)
                 
                 if auto_apply:
-                    script_tag.string = minified_js
+                    script_tag.string = minified['minified']
                 
-                analysis['js_optimization']['minified_js'].append({
-                    'original_size': len(original_js),
-                    'minified_size': len(minified_js),
-                    'savings': len(original_js) - len(minified_js)
-                })
+                analysis['js_optimization']['total_js_size'] += minified['original_size']
+                analysis['js_optimization']['minified_js'].append(
+                    {k: v for k, v in minified.items() if k != 'minified'}
+                )
         
         if analysis['js_optimization']['minified_js']:
-            total_savings = sum(item['savings'] for item in analysis['js_optimization']['minified_js'])
-            analysis['improvements'].append(f'Minified inline JavaScript - saved {total_savings} characters')
+            analysis['improvements'].append(
+                f"Minified inline JavaScript - {self._savings_summary(analysis['js_optimization']['minified_js'])}"
+            )
             analysis['score'] += 10
         
         # Analyze images for optimization
@@ -327,14 +327,25 @@ class PerformanceOptimizer:
         style_tags = soup.find_all('style')
         link_tags = soup.find_all('link', rel='stylesheet')
         
+        generated = self.critical_css.latest('single')
+        
         analysis['critical_css'] = {
             'inline_styles': len(style_tags),
             'external_stylesheets': len(link_tags),
-            'critical_css_detected': bool(style_tags)
+            'critical_css_detected': bool(style_tags),
+            'template_critical_css': {
+                'bytes': generated['bytes'],
+                'source_bytes': generated['source_bytes'],
+                'rule_count': generated['rule_count'],
+                'generated_at': generated['created_at']
+            } if generated else None
         }
         
-        if link_tags and not style_tags:
-            analysis['improvements'].append('Consider inlining critical CSS for faster rendering')
+        if generated:
+            analysis['score'] += 10
+        elif link_tags and not style_tags:
+            analysis['improvements'].append('Generate critical CSS for the single template '
+                                            '(optimization cli critical-css) and defer stylesheets')
             analysis['score'] -= 15
         elif style_tags:
             analysis['score'] += 10
@@ -372,7 +383,8 @@ class PerformanceOptimizer:
         
         return analysis
     
-    def _optimize_caching(self, post_url: str, auto_apply: bool = False) -> Dict[str, Any]:
+    def _optimize_caching(self, post_url: str, auto_apply: bool = False,
+                          headers: Dict[str, str] = None) -> Dict[str, Any]:
         """Analyze and recommend caching optimizations."""
         analysis = {
             'browser_caching': {},
@@ -384,8 +396,8 @@ class PerformanceOptimizer:
         
         try:
             # Check current caching headers
-            response = requests.head(post_url, timeout=10)
-            headers = response.headers
+            if headers is None:
+                headers = self.pages.get(post_url, timeout=10).headers
             
             # Analyze browser caching
             cache_control = headers.get('Cache-Control', '')
@@ -601,26 +613,27 @@ class PerformanceOptimizer:
             'score': 70  # Default score
         }
         
-        # Estimate content sizes
-        html_content = str(soup)
-        content_size = len(html_content.encode('utf-8'))
+        # Measure content sizes
+        sizes = compressed_sizes(str(soup))
+        content_size = sizes['bytes']
         
         analysis['content_optimization'] = {
             'html_size': content_size,
-            'estimated_compressed_size': int(content_size * 0.3),  # ~70% compression
-            'compression_ratio': 0.7
+            'gzip_size': sizes['gzip'],
+            'brotli_size': sizes['brotli'],
+            'compression_ratio': round(1 - sizes['gzip'] / content_size, 3) if content_size else 0
         }
         
         # Compression recommendations
         analysis['gzip_compression'] = {
             'recommended': True,
-            'estimated_savings': int(content_size * 0.6),  # 60% savings typical
+            'estimated_savings': content_size - sizes['gzip'],
             'mime_types': ['text/html', 'text/css', 'text/javascript', 'application/javascript']
         }
         
         analysis['brotli_compression'] = {
             'recommended': True,
-            'estimated_savings': int(content_size * 0.65),  # 65% savings typical
+            'estimated_savings': content_size - sizes['brotli'] if sizes['brotli'] is not None else None,
             'browser_support': 'Modern browsers'
         }
         
@@ -680,27 +693,17 @@ class PerformanceOptimizer:
     
     def _minify_css(self, css_content: str) -> str:
         """Minify CSS content."""
-        minified = css_content
-        
-        for pattern, replacement, *flags in self.css_minify_patterns:
-            if flags:
-                minified = re.sub(pattern, replacement, minified, flags=flags[0])
-            else:
-                minified = re.sub(pattern, replacement, minified)
-        
-        return minified.strip()
+        return minifier.minify('css', css_content)['minified']
     
     def _minify_js(self, js_content: str) -> str:
-        """Minify JavaScript content (basic implementation)."""
-        minified = js_content
-        
-        for pattern, replacement, *flags in self.js_minify_patterns:
-            if flags:
-                minified = re.sub(pattern, replacement, minified, flags=flags[0])
-            else:
-                minified = re.sub(pattern, replacement, minified)
-        
-        return minified.strip()
+        """Minify JavaScript content."""
+        return minifier.minify('js', js_content)['minified']
+    
+    def _savings_summary(self, items: List[Dict[str, Any]]) -> str:
+        """Total byte savings of minified blocks, raw and gzipped."""
+        saved = sum(item['savings'] for item in items)
+        gzip_saved = sum(item['gzip_savings'] for item in items)
+        return f'saved {saved} bytes ({gzip_saved} bytes gzipped)'
     
     def _extract_max_age(self, cache_control: str) -> Optional[int]:
         """Extract max-age value from Cache-Control header."""
@@ -17,7 +17,7 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup, Tag
 from datetime import datetime
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, metrics
 from ..utils import print_success, print_error, print_warning
 
 
@@ -59,11 +59,18 @@ class SEOOptimizer:
             }
         }
     
+    @metrics.timed('engine.seo.optimize_post_seo')
     def optimize_post_seo(self, post_id: int, target_keywords: List[str] = None, 
-                         auto_apply: bool = False) -> Dict[str, Any]:
-        """Comprehensive SEO optimization for a specific post."""
+                         auto_apply: bool = False, post: Dict[str, Any] = None,
+                         site_posts: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Comprehensive SEO optimization for a specific post.
+
+        An already loaded post skips the fetch; site_posts (the candidates
+        for internal links) is fetched here only when not supplied.
+        """
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             post_title = post.get('title', {}).get('rendered', 'Untitled')
             content = post.get('content', {}).get('rendered', '')
             excerpt = post.get('excerpt', {}).get('rendered', '')
@@ -108,7 +115,7 @@ class SEOOptimizer:
                 post, target_keywords
             )
             result['seo_optimization']['internal_linking'] = self._optimize_internal_linking(
-                soup, post_id, auto_apply
+                soup, post_id, auto_apply, site_posts=site_posts
             )
             result['seo_optimization']['content_seo'] = self._optimize_content_seo(
                 soup, target_keywords, auto_apply
@@ -297,7 +304,8 @@ class SEOOptimizer:
         return analysis
     
     def _optimize_internal_linking(self, soup: BeautifulSoup, post_id: int, 
-                                  auto_apply: bool = False) -> Dict[str, Any]:
+                                  auto_apply: bool = False,
+                                  site_posts: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Optimize internal linking structure."""
         analysis = {
             'current_internal_links': 0,
@@ -317,7 +325,7 @@ class SEOOptimizer:
         
         # Get related posts for internal linking
         try:
-            all_posts = self.wp.get_posts(per_page=50)
+            all_posts = site_posts if site_posts is not None else self.wp.get_posts(per_page=50)
             related_posts = []
             
             for other_post in all_posts:
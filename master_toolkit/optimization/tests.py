@@ -8,6 +8,8 @@ import unittest
 import json
 import tempfile
 import os
+import time
+import threading
 from unittest.mock import Mock, patch, MagicMock
 from bs4 import BeautifulSoup
 
@@ -21,8 +23,14 @@ from master_toolkit.optimization import (
     ImageOptimizer, 
     SEOOptimizer,
     PerformanceOptimizer,
-    AccessibilityOptimizer
+    AccessibilityOptimizer,
+    OptimizationJobQueue
 )
+from master_toolkit.optimization.critical_css import CriticalCSSExtractor, defer_stylesheets
+from master_toolkit.optimization.minify import Minifier, minify_css, minify_js
+from master_toolkit.optimization.engines import ENGINES, ARTIFACTS, EngineExecutor, register_artifact, register_engine
+from master_toolkit.core.client import WordPressAPIError
+from master_toolkit.core.result_sink import ResultSink
 
 
 class TestContentOptimizer(unittest.TestCase):
@@ -258,8 +266,7 @@ class TestPerformanceOptimizer(unittest.TestCase):
         self.assertIn('js_optimization', analysis)
         self.assertIn('image_optimization', analysis)
     
-    @patch('requests.head')
-    def test_caching_analysis(self, mock_head):
+    def test_caching_analysis(self):
         """Test caching analysis."""
         # Mock response headers
         mock_response = Mock()
@@ -267,10 +274,12 @@ class TestPerformanceOptimizer(unittest.TestCase):
             'Cache-Control': 'public, max-age=3600',
             'ETag': '"abc123"'
         }
-        mock_head.return_value = mock_response
+        self.optimizer.pages = Mock()
+        self.optimizer.pages.get.return_value = mock_response
         
         analysis = self.optimizer._optimize_caching('https://example.com', auto_apply=False)
         
+        self.optimizer.pages.get.assert_called_once_with('https://example.com', timeout=10)
         self.assertIn('browser_caching', analysis)
         self.assertIn('cdn_usage', analysis)
 
@@ -335,6 +344,21 @@ class TestAccessibilityOptimizer(unittest.TestCase):
         self.assertIn('contrast_issues', analysis)
         self.assertIn('wcag_aa_compliance', analysis)
     
+    def test_color_contrast_uses_stylesheet_cascade(self):
+        """Test that contrast analysis resolves colors from embedded CSS."""
+        soup = BeautifulSoup(
+            '<style>.muted { color: #bbb; } .panel { background: #fff; }</style>'
+            '<div class="panel"><p class="muted">Faint</p><p class="muted">Also faint</p></div>',
+            'html.parser'
+        )
+        
+        analysis = self.optimizer._analyze_color_contrast(soup, auto_apply=False)
+        
+        self.assertFalse(analysis['wcag_aa_compliance'])
+        issue = analysis['contrast_issues'][0]
+        self.assertEqual((issue['foreground'], issue['background']), ('#bbbbbb', '#ffffff'))
+        self.assertEqual(issue['occurrences'], 2)
+    
     def test_wcag_compliance_check(self):
         """Test WCAG compliance checking."""
         soup = BeautifulSoup(self.mock_post['content']['rendered'], 'html.parser')
@@ -457,6 +481,260 @@ class OptimizationEngineIntegrationTest(unittest.TestCase):
         self.assertLessEqual(avg_score, 100)
 
 
+class TestOptimizationJobQueue(unittest.TestCase):
+    """Test cases for the durable optimization job queue."""
+    
+    def setUp(self):
+        """Set up a queue on a temporary database."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue = OptimizationJobQueue(
+            Path(self.temp_dir.name) / 'queue.db', lease_seconds=60, max_attempts=2
+        )
+    
+    def tearDown(self):
+        """Remove temporary database."""
+        self.temp_dir.cleanup()
+    
+    def test_job_fans_out_into_tasks(self):
+        """Test that a job creates one task per unique post."""
+        job_id = self.queue.enqueue_job('nightly', [1, 2, 2, 3], ['seo'])
+        
+        status = self.queue.get_job_status(job_id)
+        self.assertEqual(status['total_tasks'], 3)
+        self.assertEqual(status['pending'], 3)
+    
+    def test_resume_after_interruption(self):
+        """Test that completed posts are not re-run after a crash."""
+        job_id = self.queue.enqueue_job('nightly', [1, 2, 3], ['seo'])
+        
+        task = self.queue.lease_task('worker-a')
+        self.queue.complete_task(task['task_id'], 'worker-a', {'success': True})
+        self.queue.lease_task('worker-a')  # worker crashes holding this lease
+        
+        self.assertEqual(self.queue.find_unfinished_job('nightly'), job_id)
+        
+        # Post 1 is done and post 2 is leased by the crashed worker, so another
+        # worker can lease only the untouched post 3 until that lease expires
+        next_task = self.queue.lease_task('worker-b')
+        self.assertEqual(next_task['post_id'], 3)
+        
+        with patch('master_toolkit.optimization.job_queue.time.time',
+                   return_value=time.time() + 120):
+            recovered = self.queue.lease_task('worker-b')
+        
+        self.assertEqual(recovered['post_id'], 2)
+        self.assertEqual(recovered['attempt'], 2)
+    
+    def test_retry_until_max_attempts(self):
+        """Test that failed tasks are retried then marked failed."""
+        job_id = self.queue.enqueue_job('nightly', [7], ['seo'])
+        
+        task = self.queue.lease_task('worker-a')
+        self.assertEqual(self.queue.fail_task(task['task_id'], 'worker-a', 'boom'), 'pending')
+        
+        task = self.queue.lease_task('worker-a')
+        self.assertEqual(self.queue.fail_task(task['task_id'], 'worker-a', 'boom'), 'failed')
+        
+        self.assertIsNone(self.queue.lease_task('worker-a'))
+        self.assertTrue(self.queue.finish_job_if_complete(job_id))
+        
+        results = self.queue.get_job_results(job_id)
+        self.assertEqual(results['failed_optimizations'], 1)
+    
+    def test_job_results_keep_only_summary_fields(self):
+        """Test that full task results go to the sink while individual_results stays compact."""
+        job_id = self.queue.enqueue_job('nightly', [1, 2], ['seo'])
+        
+        task = self.queue.lease_task('worker-a')
+        self.queue.complete_task(task['task_id'], 'worker-a', {
+            'post_id': 1, 'success': True, 'score_improvement': 4,
+            'engine_results': {'seo': {'optimized_content': '<p>' + 'x' * 1000 + '</p>'}}
+        })
+        task = self.queue.lease_task('worker-a')
+        self.queue.complete_task(task['task_id'], 'worker-a', {'post_id': 2, 'success': False, 'error': 'boom'})
+        
+        sink = ResultSink(Path(self.temp_dir.name) / 'results.ndjson.gz')
+        results = self.queue.get_job_results(job_id, sink=sink)
+        
+        self.assertEqual(results['individual_results'][1], {'post_id': 1, 'success': True, 'score_improvement': 4})
+        self.assertEqual(results['failed_optimizations'], 1)
+        self.assertEqual(results['average_score_improvement'], 4)
+        self.assertEqual([record['post_id'] for record in sink.read()], [1, 2])
+        self.assertEqual(results['results_file'], str(sink.path))
+    
+    def test_heartbeat_requires_lease_owner(self):
+        """Test that only the lease owner can extend a lease."""
+        self.queue.enqueue_job('nightly', [1], ['seo'])
+        task = self.queue.lease_task('worker-a')
+        
+        self.assertTrue(self.queue.heartbeat(task['task_id'], 'worker-a'))
+        self.assertFalse(self.queue.heartbeat(task['task_id'], 'worker-b'))
+
+
+class TestCriticalCSS(unittest.TestCase):
+    """Test cases for per-template critical CSS extraction."""
+    
+    CSS = ('body{margin:0} .site-header{background:#2c3e50;font-family:Inter} .site-footer{padding:2rem} '
+           '@media (max-width:600px){.site-title{font-size:1rem} .sidebar{display:none}} '
+           '@media print{.site-header{display:none}} .site-title a:hover{color:red} '
+           '@font-face{font-family:"Inter";src:url(inter.woff2)} @font-face{font-family:Unused;src:url(u.woff2)}')
+    
+    def setUp(self):
+        """Set up an extractor without theme CSS in a temp dir."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.extractor = CriticalCSSExtractor(db_path=Path(self.temp_dir.name) / 'critical.db', theme_dir=None,
+                                              fold_text=200)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _page(self, css, text='Hello world. ' * 50):
+        return (f'<html><head><meta charset="utf-8"><style>{css}</style></head><body>'
+                f'<header class="site-header"><h1 class="site-title"><a href="/">Site</a></h1></header>'
+                f'<main><p>{text}</p></main><aside class="sidebar">x</aside>'
+                f'<footer class="site-footer">f</footer></body></html>')
+    
+    def test_keeps_only_first_screen_rules(self):
+        """Test that rules for below-the-fold or absent elements are dropped."""
+        result = self.extractor.extract('single', self._page(self.CSS))
+        css = result['css']
+        
+        for kept in ('body{margin:0}', '.site-header{background:#2c3e50', '@media (max-width:600px){.site-title',
+                     '.site-title a:hover{color:red}', '@font-face{font-family:"Inter"'):
+            self.assertIn(kept, css)
+        for dropped in ('.site-footer', '.sidebar', 'print', 'Unused'):
+            self.assertNotIn(dropped, css)
+        self.assertFalse(result['cached'])
+        self.assertLess(result['bytes'], result['source_bytes'])
+    
+    def test_keeps_media_lists_that_apply_on_screen(self):
+        """Test that '@media screen, print' and '@media not print' blocks are not treated as print-only."""
+        css = '@media screen, print{.site-title{color:red}} @media not print{.site-header{color:blue}}'
+        result = self.extractor.extract('single', self._page(css))
+        
+        self.assertIn('@media screen,print{.site-title{color:red}}', result['css'].replace(', ', ','))
+        self.assertIn('.site-header{color:blue}', result['css'])
+    
+    def test_cache_follows_template_and_css_hashes(self):
+        """Test that new text reuses the cached result while CSS or markup changes do not."""
+        self.extractor.extract('single', self._page(self.CSS))
+        
+        self.assertTrue(self.extractor.extract('single', self._page(self.CSS, text='Other post. ' * 50))['cached'])
+        self.assertFalse(self.extractor.extract('single', self._page(self.CSS + ' p{color:#111}'))['cached'])
+        self.assertFalse(self.extractor.extract(
+            'single', self._page(self.CSS).replace('<main>', '<main class="narrow">'))['cached'])
+        self.assertEqual(self.extractor.latest('single')['css'].count('p{color:#111}'), 0)
+    
+    def test_defer_stylesheets(self):
+        """Test that critical CSS is inlined and linked stylesheets load without blocking."""
+        html = '<html><head><meta charset="utf-8"><link rel="stylesheet" href="/style.css"></head><body></body></html>'
+        soup = BeautifulSoup(defer_stylesheets(html, 'body{margin:0}'), 'html.parser')
+        
+        self.assertEqual(soup.find('style', id='critical-css').string, 'body{margin:0}')
+        link = soup.find('link', href='/style.css')
+        self.assertEqual(link['rel'], ['preload'])
+        self.assertEqual(link['as'], 'style')
+        self.assertEqual(soup.noscript.link['rel'], ['stylesheet'])
+
+
+class TestMinify(unittest.TestCase):
+    """Test cases for the tokenizing CSS/JS minifiers."""
+    
+    def test_css_keeps_strings_and_significant_spaces(self):
+        """Test that CSS strings, url() values, calc() and descendant pseudo-classes survive."""
+        css = ('@media screen and (max-width: 600px) { .a > .b , .c :hover { width : calc(100% - 2px) ; } }\n'
+               '.x::after { content: "a  /* not a comment */  b" ; background: url( "a b.png" ) !important; }')
+        
+        self.assertEqual(minify_css(css),
+                         '@media screen and (max-width: 600px){.a>.b,.c :hover{width:calc(100% - 2px)}}'
+                         '.x::after{content:"a  /* not a comment */  b";background:url("a b.png")!important}')
+    
+    def test_js_keeps_literals_and_statement_breaks(self):
+        """Test that JS strings, regex and template literals are untouched and ASI still holds."""
+        js = ("var s = 'a // b', re = /[/]+\\//g, d = a / b / c; // comment\n"
+              "let t = `x ${ {k: 1}.k } // y`;\n"
+              "a = b\n++c\nx = y + +z\n")
+        
+        self.assertEqual(minify_js(js),
+                         "var s='a // b',re=/[/]+\\//g,d=a/b/c;let t=`x ${{k:1}.k} // y`;a=b\n++c\nx=y+ +z")
+    
+    def test_js_keeps_spaces_that_separate_tokens(self):
+        """Test that number member access and HTML comment-like operators keep their space."""
+        self.assertEqual(minify_js('x = 1 .toString();'), 'x=1 .toString();')
+        self.assertEqual(minify_js('y = 1.5 + a . b;'), 'y=1.5+a.b;')
+        self.assertEqual(minify_js('if (a < !--b) c();'), 'if(a< !--b)c();')
+        self.assertEqual(minify_js('while (i-- > 0) f();'), 'while(i-- >0)f();')
+    
+    def test_js_slash_after_postfix_operator_divides(self):
+        """Test that '/' after x++/x-- is division while after ++x/--x operands it may start a regex."""
+        self.assertEqual(minify_js('var r = x-- / y, t = "a // b";'), 'var r=x--/y,t="a // b";')
+        self.assertEqual(minify_js('f(--i - /x/.source.length);'), 'f(--i-/x/.source.length);')
+        self.assertEqual(minify_js('x = y - --z + w++ + +v;'), 'x=y- --z+w++ + +v;')
+    
+    def test_results_are_cached_with_byte_sizes(self):
+        """Test that repeated sources hit the cache and sizes are bytes, not characters."""
+        minifier = Minifier()
+        source = 'body  {  content: "é" ;  }'
+        
+        first = minifier.minify('css', source)
+        self.assertIs(minifier.minify('css', source), first)
+        self.assertEqual(first['original_size'], len(source.encode('utf-8')))
+        self.assertEqual(first['savings'], first['original_size'] - len(first['minified'].encode('utf-8')))
+        self.assertGreater(first['original_gzip'], 0)
+
+
+class TestEngineExecutor(unittest.TestCase):
+    """Test cases for the engine registry and per-post DAG executor."""
+    
+    def setUp(self):
+        """Register two probe engines that must run at the same time."""
+        barrier = threading.Barrier(2, timeout=5)
+        
+        class ProbeEngine:
+            def __init__(self, wp):
+                self.wp = wp
+            
+            def run(self, post_id, auto_apply=False, post=None, **kwargs):
+                barrier.wait()
+                return {'post_id': post_id, 'title': post['title'], 'score': 80, **kwargs}
+        
+        def broken(wp, post_id, post):
+            raise WordPressAPIError('page down', 503)
+        
+        register_artifact('probe_page', broken, needs=('post',))
+        register_engine('probe_a', ProbeEngine, 'run', options=('target_keywords',))
+        register_engine('probe_b', ProbeEngine, 'run')
+        register_engine('probe_c', ProbeEngine, 'run', needs=('post', 'probe_page'))
+        
+        self.wp = Mock()
+        self.wp.get_post.return_value = {'id': 5, 'title': 'Probe'}
+    
+    def tearDown(self):
+        for name in ('probe_a', 'probe_b', 'probe_c'):
+            ENGINES.pop(name, None)
+        ARTIFACTS.pop('probe_page', None)
+    
+    def test_independent_engines_share_one_fetch_and_run_concurrently(self):
+        """Test that the post is fetched once and both engines pass the shared barrier."""
+        executor = EngineExecutor(self.wp, ['probe_a', 'probe_b', 'nope'])
+        run = executor.run_post(5, target_keywords=['x'])
+        
+        self.assertEqual(executor.unknown_engines, ['nope'])
+        self.assertEqual(run['engines_run'], ['probe_a', 'probe_b'])
+        self.assertEqual(run['engine_results']['probe_a']['target_keywords'], ['x'])
+        self.assertNotIn('target_keywords', run['engine_results']['probe_b'])
+        self.wp.get_post.assert_called_once_with(5)
+    
+    def test_failed_artifact_only_blocks_its_dependents(self):
+        """Test that an engine whose artifact failed reports it while others still run."""
+        executor = EngineExecutor(self.wp, ['probe_a', 'probe_b', 'probe_c'])
+        run = executor.run_post(5)
+        
+        self.assertEqual(run['engines_run'], ['probe_a', 'probe_b'])
+        self.assertIn('page down', run['engine_results']['probe_c']['error'])
+        self.assertEqual(run['artifact_errors'], {'probe_page': 'page down'})
+
+
 def create_test_suite():
     """Create comprehensive test suite."""
     suite = unittest.TestSuite()
@@ -468,7 +746,11 @@ def create_test_suite():
         TestSEOOptimizer,
         TestPerformanceOptimizer,
         TestAccessibilityOptimizer,
-        OptimizationEngineIntegrationTest
+        OptimizationEngineIntegrationTest,
+        TestOptimizationJobQueue,
+        TestCriticalCSS,
+        TestMinify,
+        TestEngineExecutor
     ]
     
     for test_class in test_classes:
@@ -5,7 +5,6 @@ Add a sliding image gallery showing all categories
 """
 
 import requests
-import time
 
 WORDPRESS_URL = 'https://spherevista360.com'
 USERNAME = 'JK'
@@ -25,17 +24,20 @@ CATEGORY_IMAGES = {
     177: {'name': 'Top Stories', 'media_id': 2747, 'slug': 'top-stories'},
 }
 
-def get_media_url(media_id):
-    """Get full URL of media file"""
-    response = requests.get(
-        f'{WORDPRESS_URL}/wp-json/wp/v2/media/{media_id}',
-        auth=(USERNAME, PASSWORD)
-    )
-    
-    if response.ok:
-        media = response.json()
-        return media.get('source_url', '')
-    return ''
+def get_media_urls(media_ids):
+    """Get full URLs of media files, 100 IDs per request"""
+    media_ids = list(media_ids)
+    urls = {}
+    for start in range(0, len(media_ids), 100):
+        chunk = media_ids[start:start + 100]
+        response = requests.get(
+            f'{WORDPRESS_URL}/wp-json/wp/v2/media',
+            params={'include': ','.join(map(str, chunk)), 'per_page': len(chunk)},
+            auth=(USERNAME, PASSWORD)
+        )
+        if response.ok:
+            urls.update((media['id'], media.get('source_url', '')) for media in response.json())
+    return urls
 
 def create_carousel_html():
     """Generate HTML/CSS/JS for category carousel"""
@@ -48,9 +50,10 @@ def create_carousel_html():
     # Get all media URLs
     print("📥 Fetching image URLs...")
     category_data = []
+    media_urls = get_media_urls(cat_info['media_id'] for cat_info in CATEGORY_IMAGES.values())
     
     for cat_id, cat_info in CATEGORY_IMAGES.items():
-        media_url = get_media_url(cat_info['media_id'])
+        media_url = media_urls.get(cat_info['media_id'], '')
         if media_url:
             category_data.append({
                 'name': cat_info['name'],
@@ -59,7 +62,6 @@ def create_carousel_html():
                 'link': f"{WORDPRESS_URL}/category/{cat_info['slug']}/"
             })
             print(f"   ✅ {cat_info['name']}: {media_url[:60]}...")
-        time.sleep(0.3)
     
     print()
     print("=" * 80)
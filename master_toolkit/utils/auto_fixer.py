@@ -8,7 +8,7 @@ import json
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, AuditStore
 from ..utils import print_success, print_error, print_warning
 from ..validation.images import ImageValidator
 from ..validation.seo import SEOValidator
@@ -18,9 +18,15 @@ from ..validation.content_quality import ContentQualityEnhancer
 class AutoFixer:
     """Unified auto-fixer for website issues."""
     
-    def __init__(self, wp_client: WordPressClient = None):
-        """Initialize auto-fixer with all validation tools."""
+    def __init__(self, wp_client: WordPressClient = None, audit_store: AuditStore = None):
+        """
+        Initialize auto-fixer with all validation tools.
+        
+        Every analysis is recorded in the audit store (default: the shared
+        core store) and diffed against each post's previous analysis.
+        """
         self.wp = wp_client
+        self.audit_store = audit_store or AuditStore()
         self.image_validator = ImageValidator(wp_client)
         self.seo_validator = SEOValidator(wp_client)
         self.content_enhancer = ContentQualityEnhancer(wp_client)
@@ -171,6 +177,11 @@ class AutoFixer:
                 if p.get('severity') in ['critical', 'high']
             ]
             
+            # Persist the run and compare with each post's previous analysis
+            analysis_results['run_id'] = self._record_analysis(analysis_results)
+            analysis_results['changes'] = self.audit_store.diff('auto_fixer', analysis_results['run_id'])
+            analysis_results['regressed_posts'] = analysis_results['changes']['regressed_subjects']
+            
             return analysis_results
             
         except Exception as e:
@@ -179,8 +190,26 @@ class AutoFixer:
                 'error': str(e)
             }
 
-    def fix_all_issues(self, post_ids: List[int] = None, per_page: int = 10, dry_run: bool = False, priority_only: bool = False) -> Dict[str, Any]:
-        """Automatically fix all identified issues."""
+    def _record_analysis(self, analysis_results: Dict[str, Any]) -> int:
+        """Store an analysis run keyed by (post ID, issue type)."""
+        analyzed = [p for p in analysis_results['posts_analyzed'] if 'error' not in p]
+        return self.audit_store.record_run(
+            'auto_fixer',
+            {p['post_id']: p['overall_score'] for p in analyzed},
+            [{'subject': p['post_id'], 'check': issue, 'severity': p['severity']}
+             for p in analyzed for issue in p['issues']],
+            meta={'total_posts': analysis_results['total_posts']},
+            started_at=analysis_results['timestamp']
+        )
+
+    def fix_all_issues(self, post_ids: List[int] = None, per_page: int = 10, dry_run: bool = False,
+                       priority_only: bool = False, regressions_only: bool = False) -> Dict[str, Any]:
+        """
+        Automatically fix all identified issues.
+        
+        With regressions_only, only posts that gained an issue or lost score
+        since their previous analysis are fixed.
+        """
         try:
             # First analyze issues
             analysis = self.analyze_all_issues(post_ids, per_page)
@@ -193,12 +222,18 @@ class AutoFixer:
                 posts_to_fix = analysis['high_priority_posts']
             else:
                 posts_to_fix = [p['post_id'] for p in analysis['posts_analyzed'] if p.get('issue_count', 0) > 0]
+            if regressions_only:
+                regressed = set(analysis['regressed_posts'])
+                posts_to_fix = [pid for pid in posts_to_fix if pid in regressed]
             
             fix_results = {
                 'analysis_summary': {
                     'total_posts_analyzed': analysis['total_posts'],
                     'total_issues_found': analysis['total_issues'],
-                    'posts_with_issues': analysis['posts_with_issues']
+                    'posts_with_issues': analysis['posts_with_issues'],
+                    'run_id': analysis['run_id'],
+                    'new_issues': len(analysis['changes']['new_issues']),
+                    'resolved_issues': len(analysis['changes']['resolved_issues'])
                 },
                 'fix_summary': {
                     'posts_to_fix': len(posts_to_fix),
@@ -21,64 +21,57 @@ from master_toolkit.utils import print_success, print_error, print_warning, prin
 class RedirectConverter:
     """Convert redirect posts to full content articles."""
     
-    def __init__(self):
-        """Initialize the converter."""
-        self.wp = None
+    def __init__(self, wp_client: WordPressClient = None, username: str = None, password: str = None):
+        """
+        Initialize the converter.
+
+        Args:
+            wp_client: Authenticated WordPress client (default: one is created in setup_client)
+            username: WordPress username for setup_client
+            password: WordPress application password for setup_client
+        """
+        self.wp = wp_client
+        self.username = username
+        self.password = password
         self.redirect_posts = []
         
     def setup_client(self):
-        """Setup WordPress client."""
+        """Setup an authenticated WordPress client (prompts when no credentials were given)."""
         print_info("🔧 Setting up WordPress client...")
         
-        try:
-            # Use direct requests instead of WordPressClient for now
-            import requests
-            
-            # Test connection to the site
-            test_url = "https://spherevista360.com/wp-json/wp/v2/posts?per_page=1"
-            response = requests.get(test_url, timeout=10)
-            
-            if response.status_code == 200:
-                print_success("✅ WordPress site accessible")
-                return True
-            else:
-                print_error(f"❌ WordPress site returned status: {response.status_code}")
-                return False
-                
-        except Exception as e:
-            print_error(f"❌ WordPress connection failed: {str(e)}")
+        if self.wp is not None:
+            return True
+        
+        client = WordPressClient()
+        if not client.authenticate(self.username, self.password):
+            print_error("❌ WordPress authentication failed")
             return False
+        
+        self.wp = client
+        print_success("✅ WordPress client authenticated")
+        return True
     
     def find_redirect_posts(self):
-        """Find all redirect posts."""
+        """Find all redirect posts (None if the posts could not be loaded)."""
         print_info("\n🔍 Finding redirect posts...")
         
         try:
-            import requests
-            
-            # Get all posts using direct API calls
-            all_posts = []
-            page = 1
+            from master_toolkit.mirror import SiteMirror, ContentSearch
             
-            while True:
-                url = f"https://spherevista360.com/wp-json/wp/v2/posts?per_page=50&page={page}"
-                response = requests.get(url, timeout=10)
-                
-                if response.status_code != 200:
-                    break
-                    
-                posts = response.json()
-                if not posts:
-                    break
-                    
-                all_posts.extend(posts)
-                page += 1
-                
-                if page > 10:  # Safety limit
-                    break
+            # Read posts from the local mirror; the sync only fetches posts changed since last run
+            mirror = SiteMirror()
+            result = mirror.sync(self.wp, collections=['posts'])
+            if 'error' in result['posts']:
+                print_error(f"❌ Mirror sync of posts failed: {result['posts']['error']}")
+                return None
+            all_posts = mirror.get_posts()
             
             print_info(f"📊 Retrieved {len(all_posts)} total posts")
             
+            # Placeholder text is looked up in the full-text index (stripped text, not markup)
+            placeholder_ids = {hit['id'] for hit in
+                               ContentSearch(mirror).find_placeholders(('coming soon', 'placeholder'))}
+            
             # Find redirect posts by title or content
             redirect_posts = []
             
@@ -91,8 +84,7 @@ class RedirectConverter:
                     title.lower().startswith('redirect:') or
                     'redirect' in title.lower() or
                     len(content.strip()) < 200 or  # Very short content
-                    'coming soon' in content.lower() or
-                    'placeholder' in content.lower() or
+                    post['id'] in placeholder_ids or
                     'tech innovation 2025' in title.lower() or
                     'on device' in title.lower() or
                     'data privacy' in title.lower() or
@@ -115,7 +107,7 @@ class RedirectConverter:
             
         except Exception as e:
             print_error(f"❌ Failed to find redirect posts: {str(e)}")
-            return []
+            return None
     
     def generate_content_for_post(self, post):
         """Generate full content for a redirect post."""
@@ -1228,6 +1220,8 @@ def main():
     
     # Find redirect posts
     redirect_posts = converter.find_redirect_posts()
+    if redirect_posts is None:
+        return False
     
     if not redirect_posts:
         print_success("🎉 No redirect posts found! All posts have full content.")
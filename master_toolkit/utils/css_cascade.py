@@ -0,0 +1,624 @@
+"""
+CSS Cascade Resolver
+===================
+Parses stylesheets once into a selector index and resolves the effective
+foreground/background colour and font size of text nodes, so contrast checks
+see theme and linked CSS rather than inline styles only.
+
+Colour parsing, luminance and contrast ratios are memoized.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+import soupsieve
+from bs4 import BeautifulSoup, Tag, NavigableString, Comment
+
+from ..core.storage import LRUCache
+
+
+RGBA = Tuple[int, int, int, float]
+
+DEFAULT_THEME_DIR = Path(__file__).resolve().parent.parent.parent / 'safe-theme'
+
+# Browser defaults used when no rule applies
+DEFAULT_COLOR: RGBA = (0, 0, 0, 1.0)
+DEFAULT_BACKGROUND: RGBA = (255, 255, 255, 1.0)
+ROOT_FONT_SIZE = 16.0
+
+# User-agent font sizes (em) and bold elements
+UA_FONT_SIZES = {'h1': 2.0, 'h2': 1.5, 'h3': 1.17, 'h4': 1.0, 'h5': 0.83, 'h6': 0.67,
+                 'small': 0.833, 'big': 1.2, 'sub': 0.833, 'sup': 0.833}
+UA_BOLD = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'b', 'strong', 'th'}
+
+FONT_SIZE_KEYWORDS = {'xx-small': 9, 'x-small': 10, 'small': 13, 'medium': 16,
+                      'large': 18, 'x-large': 24, 'xx-large': 32, 'xxx-large': 48}
+
+SKIP_TEXT_PARENTS = {'script', 'style', 'head', 'title', 'noscript', 'template', 'meta', 'link'}
+
+TRACKED_PROPERTIES = {'color', 'background-color', 'background', 'font-size', 'font-weight'}
+
+NAMED_COLORS = {
+    'aliceblue': 'f0f8ff', 'antiquewhite': 'faebd7', 'aqua': '00ffff', 'aquamarine': '7fffd4',
+    'azure': 'f0ffff', 'beige': 'f5f5dc', 'bisque': 'ffe4c4', 'black': '000000',
+    'blanchedalmond': 'ffebcd', 'blue': '0000ff', 'blueviolet': '8a2be2', 'brown': 'a52a2a',
+    'burlywood': 'deb887', 'cadetblue': '5f9ea0', 'chartreuse': '7fff00', 'chocolate': 'd2691e',
+    'coral': 'ff7f50', 'cornflowerblue': '6495ed', 'cornsilk': 'fff8dc', 'crimson': 'dc143c',
+    'cyan': '00ffff', 'darkblue': '00008b', 'darkcyan': '008b8b', 'darkgoldenrod': 'b8860b',
+    'darkgray': 'a9a9a9', 'darkgreen': '006400', 'darkgrey': 'a9a9a9', 'darkkhaki': 'bdb76b',
+    'darkmagenta': '8b008b', 'darkolivegreen': '556b2f', 'darkorange': 'ff8c00',
+    'darkorchid': '9932cc', 'darkred': '8b0000', 'darksalmon': 'e9967a', 'darkseagreen': '8fbc8f',
+    'darkslateblue': '483d8b', 'darkslategray': '2f4f4f', 'darkslategrey': '2f4f4f',
+    'darkturquoise': '00ced1', 'darkviolet': '9400d3', 'deeppink': 'ff1493',
+    'deepskyblue': '00bfff', 'dimgray': '696969', 'dimgrey': '696969', 'dodgerblue': '1e90ff',
+    'firebrick': 'b22222', 'floralwhite': 'fffaf0', 'forestgreen': '228b22', 'fuchsia': 'ff00ff',
+    'gainsboro': 'dcdcdc', 'ghostwhite': 'f8f8ff', 'gold': 'ffd700', 'goldenrod': 'daa520',
+    'gray': '808080', 'green': '008000', 'greenyellow': 'adff2f', 'grey': '808080',
+    'honeydew': 'f0fff0', 'hotpink': 'ff69b4', 'indianred': 'cd5c5c', 'indigo': '4b0082',
+    'ivory': 'fffff0', 'khaki': 'f0e68c', 'lavender': 'e6e6fa', 'lavenderblush': 'fff0f5',
+    'lawngreen': '7cfc00', 'lemonchiffon': 'fffacd', 'lightblue': 'add8e6', 'lightcoral': 'f08080',
+    'lightcyan': 'e0ffff', 'lightgoldenrodyellow': 'fafad2', 'lightgray': 'd3d3d3',
+    'lightgreen': '90ee90', 'lightgrey': 'd3d3d3', 'lightpink': 'ffb6c1', 'lightsalmon': 'ffa07a',
+    'lightseagreen': '20b2aa', 'lightskyblue': '87cefa', 'lightslategray': '778899',
+    'lightslategrey': '778899', 'lightsteelblue': 'b0c4de', 'lightyellow': 'ffffe0',
+    'lime': '00ff00', 'limegreen': '32cd32', 'linen': 'faf0e6', 'magenta': 'ff00ff',
+    'maroon': '800000', 'mediumaquamarine': '66cdaa', 'mediumblue': '0000cd',
+    'mediumorchid': 'ba55d3', 'mediumpurple': '9370db', 'mediumseagreen': '3cb371',
+    'mediumslateblue': '7b68ee', 'mediumspringgreen': '00fa9a', 'mediumturquoise': '48d1cc',
+    'mediumvioletred': 'c71585', 'midnightblue': '191970', 'mintcream': 'f5fffa',
+    'mistyrose': 'ffe4e1', 'moccasin': 'ffe4b5', 'navajowhite': 'ffdead', 'navy': '000080',
+    'oldlace': 'fdf5e6', 'olive': '808000', 'olivedrab': '6b8e23', 'orange': 'ffa500',
+    'orangered': 'ff4500', 'orchid': 'da70d6', 'palegoldenrod': 'eee8aa', 'palegreen': '98fb98',
+    'paleturquoise': 'afeeee', 'palevioletred': 'db7093', 'papayawhip': 'ffefd5',
+    'peachpuff': 'ffdab9', 'peru': 'cd853f', 'pink': 'ffc0cb', 'plum': 'dda0dd',
+    'powderblue': 'b0e0e6', 'purple': '800080', 'rebeccapurple': '663399', 'red': 'ff0000',
+    'rosybrown': 'bc8f8f', 'royalblue': '4169e1', 'saddlebrown': '8b4513', 'salmon': 'fa8072',
+    'sandybrown': 'f4a460', 'seagreen': '2e8b57', 'seashell': 'fff5ee', 'sienna': 'a0522d',
+    'silver': 'c0c0c0', 'skyblue': '87ceeb', 'slateblue': '6a5acd', 'slategray': '708090',
+    'slategrey': '708090', 'snow': 'fffafa', 'springgreen': '00ff7f', 'steelblue': '4682b4',
+    'tan': 'd2b48c', 'teal': '008080', 'thistle': 'd8bfd8', 'tomato': 'ff6347',
+    'turquoise': '40e0d0', 'violet': 'ee82ee', 'wheat': 'f5deb3', 'white': 'ffffff',
+    'whitesmoke': 'f5f5f5', 'yellow': 'ffff00', 'yellowgreen': '9acd32'
+}
+
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_FUNC_COLOR_RE = re.compile(r'^(rgba?|hsla?)\((.*)\)$')
+_LENGTH_RE = re.compile(r'^(-?[\d.]+)(px|pt|em|rem|%)?$')
+_BG_TOKEN_RE = re.compile(r'(?:rgba?|hsla?)\([^)]*\)|#[0-9a-fA-F]{3,8}\b|[a-zA-Z]+')
+_ID_RE = re.compile(r'#[\w-]+')
+_CLASS_LIKE_RE = re.compile(r'\.[\w-]+|\[[^\]]*\]|(?<!:):(?!not\()[\w-]+')
+_TYPE_RE = re.compile(r'(?:^|[\s>+~(])([a-zA-Z][\w-]*)')
+
+
+# Colour math (memoized)
+
+@lru_cache(maxsize=4096)
+def parse_color(value: str) -> Optional[RGBA]:
+    """Parse a CSS colour into (r, g, b, alpha). Returns None if unsupported."""
+    if not value:
+        return None
+    value = value.strip().lower()
+
+    if value == 'transparent':
+        return (0, 0, 0, 0.0)
+
+    if value.startswith('#'):
+        hex_color = value[1:]
+        if len(hex_color) in (3, 4):
+            hex_color = ''.join(c * 2 for c in hex_color)
+        if len(hex_color) in (6, 8):
+            try:
+                alpha = int(hex_color[6:8], 16) / 255 if len(hex_color) == 8 else 1.0
+                return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16), alpha)
+            except ValueError:
+                return None
+        return None
+
+    if value in NAMED_COLORS:
+        return parse_color('#' + NAMED_COLORS[value])
+
+    match = _FUNC_COLOR_RE.match(value)
+    if not match:
+        return None
+
+    func, args = match.groups()
+    parts = [p for p in re.split(r'[\s,/]+', args.strip()) if p]
+    if len(parts) < 3:
+        return None
+
+    try:
+        alpha = _parse_alpha(parts[3]) if len(parts) > 3 else 1.0
+        if func.startswith('rgb'):
+            rgb = tuple(_parse_channel(p) for p in parts[:3])
+        else:
+            rgb = _hsl_to_rgb(float(parts[0].replace('deg', '')),
+                              float(parts[1].rstrip('%')) / 100,
+                              float(parts[2].rstrip('%')) / 100)
+    except ValueError:
+        return None
+
+    return (rgb[0], rgb[1], rgb[2], alpha)
+
+
+def _parse_channel(part: str) -> int:
+    """Parse an rgb() channel (number or percentage)."""
+    if part.endswith('%'):
+        return max(0, min(255, round(float(part[:-1]) * 2.55)))
+    return max(0, min(255, round(float(part))))
+
+
+def _parse_alpha(part: str) -> float:
+    """Parse an alpha value (number or percentage)."""
+    if part.endswith('%'):
+        return max(0.0, min(1.0, float(part[:-1]) / 100))
+    return max(0.0, min(1.0, float(part)))
+
+
+def _hsl_to_rgb(h: float, s: float, l: float) -> Tuple[int, int, int]:
+    """Convert HSL to RGB per CSS Color 3."""
+    h = (h % 360) / 360
+    q = l * (1 + s) if l < 0.5 else l + s - l * s
+    p = 2 * l - q
+
+    def hue(t):
+        t %= 1
+        if t < 1 / 6:
+            return p + (q - p) * 6 * t
+        if t < 1 / 2:
+            return q
+        if t < 2 / 3:
+            return p + (q - p) * (2 / 3 - t) * 6
+        return p
+
+    return tuple(round(hue(t) * 255) for t in (h + 1 / 3, h, h - 1 / 3))
+
+
+@lru_cache(maxsize=4096)
+def relative_luminance(rgb: Tuple[int, int, int]) -> float:
+    """WCAG relative luminance of an sRGB colour."""
+    def channel(c):
+        c = c / 255.0
+        return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+    r, g, b = rgb[:3]
+    return 0.2126 * channel(r) + 0.7152 * channel(g) + 0.0722 * channel(b)
+
+
+@lru_cache(maxsize=8192)
+def contrast_ratio(fg: Tuple[int, int, int], bg: Tuple[int, int, int]) -> float:
+    """WCAG contrast ratio between two opaque colours."""
+    lum1 = relative_luminance(fg[:3])
+    lum2 = relative_luminance(bg[:3])
+    lighter, darker = max(lum1, lum2), min(lum1, lum2)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def blend(top: RGBA, bottom: RGBA) -> RGBA:
+    """Composite a possibly translucent colour over an opaque one."""
+    alpha = top[3]
+    if alpha >= 1.0:
+        return top
+    return (round(top[0] * alpha + bottom[0] * (1 - alpha)),
+            round(top[1] * alpha + bottom[1] * (1 - alpha)),
+            round(top[2] * alpha + bottom[2] * (1 - alpha)),
+            1.0)
+
+
+def to_hex(color: RGBA) -> str:
+    """Format a colour as #rrggbb."""
+    return '#{:02x}{:02x}{:02x}'.format(*color[:3])
+
+
+def is_large_text(font_size_px: float, bold: bool) -> bool:
+    """WCAG large text: at least 18pt, or 14pt bold."""
+    return font_size_px >= 24 or (bold and font_size_px >= 18.66)
+
+
+# Stylesheet parsing
+
+def _specificity(selector: str) -> Tuple[int, int, int]:
+    """Approximate (ids, classes/attributes/pseudo-classes, types) specificity."""
+    stripped = re.sub(r'\[[^\]]*\]', '[]', selector)
+    ids = len(_ID_RE.findall(stripped))
+    classes = len(_CLASS_LIKE_RE.findall(stripped))
+    types = len([t for t in _TYPE_RE.findall(re.sub(r'[#.:][\w-]+', '', stripped)) if t != 'not'])
+    return (ids, classes, types)
+
+
+def index_key(selector: str) -> Tuple[str, str]:
+    """Index key from the rightmost compound selector."""
+    compound = re.split(r'[\s>+~]+', selector.strip())[-1]
+    compound = re.sub(r'\[[^\]]*\]|\([^)]*\)', '', compound)
+    id_match = re.search(r'#([\w-]+)', compound)
+    if id_match:
+        return ('id', id_match.group(1))
+    class_match = re.search(r'\.([\w-]+)', compound)
+    if class_match:
+        return ('class', class_match.group(1))
+    tag_match = re.match(r'([a-zA-Z][\w-]*)', compound)
+    if tag_match:
+        return ('tag', tag_match.group(1).lower())
+    return ('*', '*')
+
+
+def is_print_only(media: str) -> bool:
+    """
+    Whether a media query list (a media attribute or @media condition)
+    applies only to print. The list is print-only when every query in it is
+    a non-negated 'print' query; 'screen, print' and 'not print' apply on
+    screen.
+    """
+    queries = [query.strip().lower() for query in media.split(',')]
+    queries = [query for query in queries if query] or ['all']
+    for query in queries:
+        words = query.split()
+        if words[0] == 'only':
+            words = words[1:]
+        if not words or words[0] != 'print':
+            return False
+    return True
+
+
+def _parse_declarations(block: str) -> List[Tuple[str, str, bool]]:
+    """Parse 'prop: value' pairs keeping only tracked properties."""
+    declarations = []
+    for part in block.split(';'):
+        if ':' not in part:
+            continue
+        prop, value = part.split(':', 1)
+        prop = prop.strip().lower()
+        if prop not in TRACKED_PROPERTIES:
+            continue
+        value = value.strip()
+        important = False
+        if value.lower().endswith('!important'):
+            value = value[:-len('!important')].strip()
+            important = True
+        if value:
+            declarations.append((prop, value, important))
+    return declarations
+
+
+def _iter_rules(css: str):
+    """Yield (selector_text, declaration_block) from CSS, flattening @media blocks."""
+    css = COMMENT_RE.sub('', css)
+    pos = 0
+    length = len(css)
+
+    while pos < length:
+        brace = css.find('{', pos)
+        if brace == -1:
+            return
+        prelude = css[pos:brace].strip()
+
+        # Find the matching closing brace
+        depth = 1
+        end = brace + 1
+        while end < length and depth:
+            if css[end] == '{':
+                depth += 1
+            elif css[end] == '}':
+                depth -= 1
+            end += 1
+        body = css[brace + 1:end - 1]
+        pos = end
+
+        if prelude.startswith('@'):
+            # Screen rules inside @media/@supports still apply; skip print-only and non-style at-rules
+            at_rule = prelude.lower()
+            if at_rule.startswith('@media'):
+                if not is_print_only(prelude[len('@media'):]):
+                    yield from _iter_rules(body)
+            elif at_rule.startswith(('@supports', '@layer')):
+                yield from _iter_rules(body)
+            continue
+
+        # Drop any stray at-statements (@import ...;) glued to the prelude
+        prelude = prelude.rsplit(';', 1)[-1].strip()
+        if prelude:
+            yield prelude, body
+
+
+@lru_cache(maxsize=256)
+def parse_stylesheet(css: str) -> Tuple[Tuple[str, Tuple[int, int, int], Tuple], ...]:
+    """Parse CSS into (selector, specificity, declarations) rules. Cached by text."""
+    rules = []
+    for selector_text, body in _iter_rules(css):
+        declarations = tuple(_parse_declarations(body))
+        if not declarations:
+            continue
+        for selector in selector_text.split(','):
+            selector = selector.strip()
+            if selector and '::' not in selector:
+                rules.append((selector, _specificity(selector), declarations))
+    return tuple(rules)
+
+
+@lru_cache(maxsize=4096)
+def compile_selector(selector: str):
+    """Compile a selector with soupsieve; None if unsupported."""
+    try:
+        return soupsieve.compile(selector)
+    except Exception:
+        return None
+
+
+class StyleIndex:
+    """Selector index over one or more stylesheets."""
+
+    def __init__(self, stylesheets: List[str]):
+        """Build the index from raw CSS texts (in cascade order)."""
+        self.index: Dict[Tuple[str, str], List[Tuple]] = {}
+        self.rule_count = 0
+        order = 0
+
+        for css in stylesheets:
+            for selector, specificity, declarations in parse_stylesheet(css):
+                compiled = compile_selector(selector)
+                if compiled is None:
+                    continue
+                self.index.setdefault(index_key(selector), []).append(
+                    (compiled, specificity, order, declarations)
+                )
+                order += 1
+                self.rule_count += 1
+
+    def candidate_rules(self, element: Tag) -> List[Tuple]:
+        """Rules whose rightmost compound could match the element."""
+        candidates = list(self.index.get(('*', '*'), ()))
+        candidates.extend(self.index.get(('tag', element.name), ()))
+        element_id = element.get('id')
+        if element_id:
+            candidates.extend(self.index.get(('id', element_id), ()))
+        for class_name in element.get('class', ()):
+            candidates.extend(self.index.get(('class', class_name), ()))
+        return candidates
+
+    def declared_values(self, element: Tag) -> Dict[str, str]:
+        """Winning declared value per tracked property, including inline style."""
+        winners: Dict[str, Tuple[Tuple, str]] = {}
+
+        for compiled, specificity, order, declarations in self.candidate_rules(element):
+            if not compiled.match(element):
+                continue
+            for prop, value, important in declarations:
+                rank = (important, 0, specificity, order)
+                if prop not in winners or rank > winners[prop][0]:
+                    winners[prop] = (rank, value)
+
+        inline = element.get('style')
+        if inline:
+            for order, (prop, value, important) in enumerate(_parse_declarations(inline)):
+                rank = (important, 1, (0, 0, 0), order)
+                if prop not in winners or rank > winners[prop][0]:
+                    winners[prop] = (rank, value)
+
+        values = {prop: value for prop, (_, value) in winners.items()}
+
+        # The background shorthand only sets the colour if it wins over background-color
+        if 'background' in winners:
+            if 'background-color' not in winners or winners['background'][0] > winners['background-color'][0]:
+                values['background-color'] = values.pop('background')
+                values['_background_shorthand'] = '1'
+            else:
+                values.pop('background')
+
+        return values
+
+    def text_contrast(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """Resolve effective colours and font size for every element holding text."""
+        return _DocumentStyles(self).text_contrast(soup)
+
+
+class _DocumentStyles:
+    """Per-document computed style memo."""
+
+    def __init__(self, index: StyleIndex):
+        self.index = index
+        self._computed: Dict[int, Dict[str, Any]] = {}
+
+    def computed(self, element: Optional[Tag]) -> Dict[str, Any]:
+        """Computed colour, background, font size and weight for an element."""
+        if element is None or not isinstance(element, Tag) or element.name == '[document]':
+            return {
+                'color': DEFAULT_COLOR,
+                'background': DEFAULT_BACKGROUND,
+                'background_image': False,
+                'font_size': ROOT_FONT_SIZE,
+                'bold': False
+            }
+
+        key = id(element)
+        cached = self._computed.get(key)
+        if cached is not None:
+            return cached
+
+        parent = self.computed(element.parent)
+        declared = self.index.declared_values(element)
+
+        # Font size (inherited, relative to parent)
+        font_size = parent['font_size']
+        if 'font-size' in declared:
+            font_size = _resolve_font_size(declared['font-size'], parent['font_size'])
+        elif element.name in UA_FONT_SIZES:
+            font_size = parent['font_size'] * UA_FONT_SIZES[element.name]
+
+        # Font weight (inherited)
+        bold = parent['bold'] or element.name in UA_BOLD
+        weight = declared.get('font-weight', '').lower()
+        if weight:
+            if weight in ('bold', 'bolder') or (weight.isdigit() and int(weight) >= 700):
+                bold = True
+            elif weight in ('normal', 'lighter') or weight.isdigit():
+                bold = False
+
+        # Background (not inherited; composite over ancestors)
+        background = parent['background']
+        background_image = parent['background_image']
+        bg_value = declared.get('background-color')
+        if bg_value:
+            if declared.get('_background_shorthand'):
+                own_bg, has_image = _background_from_shorthand(bg_value)
+            else:
+                own_bg, has_image = parse_color(bg_value), False
+            if has_image:
+                background_image = True
+            if own_bg is not None:
+                background = blend(own_bg, parent['background'])
+                if own_bg[3] >= 1.0:
+                    background_image = has_image
+
+        # Foreground (inherited)
+        color = parent['color']
+        color_value = declared.get('color', '').lower()
+        if color_value and color_value not in ('inherit', 'currentcolor'):
+            parsed = parse_color(color_value)
+            if parsed is not None:
+                color = parsed
+
+        computed = {
+            'color': color,
+            'background': background,
+            'background_image': background_image,
+            'font_size': font_size,
+            'bold': bold
+        }
+        self._computed[key] = computed
+        return computed
+
+    def text_contrast(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """Contrast record for every element with direct text."""
+        records = []
+
+        for element in soup.find_all(True):
+            if element.name in SKIP_TEXT_PARENTS:
+                continue
+            if not any(isinstance(child, NavigableString) and not isinstance(child, Comment)
+                       and child.strip() for child in element.children):
+                continue
+
+            style = self.computed(element)
+            foreground = blend(style['color'], style['background'])
+            ratio = contrast_ratio(foreground[:3], style['background'][:3])
+
+            records.append({
+                'element': element,
+                'foreground': to_hex(foreground),
+                'background': to_hex(style['background']),
+                'contrast_ratio': round(ratio, 2),
+                'font_size': round(style['font_size'], 1),
+                'bold': style['bold'],
+                'is_large_text': is_large_text(style['font_size'], style['bold']),
+                'background_image': style['background_image']
+            })
+
+        return records
+
+
+def _resolve_font_size(value: str, parent_size: float) -> float:
+    """Resolve a font-size value to px."""
+    value = value.strip().lower()
+    if value in FONT_SIZE_KEYWORDS:
+        return float(FONT_SIZE_KEYWORDS[value])
+    if value == 'smaller':
+        return parent_size / 1.2
+    if value == 'larger':
+        return parent_size * 1.2
+
+    match = _LENGTH_RE.match(value)
+    if not match:
+        return parent_size
+
+    number, unit = float(match.group(1)), match.group(2) or 'px'
+    if unit == 'px':
+        return number
+    if unit == 'pt':
+        return number * 4 / 3
+    if unit == 'em':
+        return number * parent_size
+    if unit == 'rem':
+        return number * ROOT_FONT_SIZE
+    return number * parent_size / 100
+
+
+def _background_from_shorthand(value: str) -> Tuple[Optional[RGBA], bool]:
+    """Extract the colour from a background shorthand and whether it has an image."""
+    has_image = 'url(' in value or 'gradient(' in value
+    without_urls = re.sub(r'url\([^)]*\)', ' ', value)
+    for token in _BG_TOKEN_RE.findall(without_urls):
+        color = parse_color(token)
+        if color is not None:
+            return color, has_image
+    return None, has_image
+
+
+# Stylesheet loading (cached per process)
+
+_STYLESHEET_CACHE: Dict[str, str] = {}
+_INDEX_CACHE = LRUCache(64)
+
+
+def load_theme_stylesheets(theme_dir: Path = DEFAULT_THEME_DIR) -> List[str]:
+    """Read all CSS files of a theme directory (style.css first)."""
+    theme_dir = Path(theme_dir)
+    if not theme_dir.is_dir():
+        return []
+
+    files = sorted(theme_dir.glob('*.css'), key=lambda p: (p.name != 'style.css', p.name))
+    sheets = []
+    for path in files:
+        key = str(path.resolve())
+        if key not in _STYLESHEET_CACHE:
+            _STYLESHEET_CACHE[key] = path.read_text(encoding='utf-8', errors='replace')
+        sheets.append(_STYLESHEET_CACHE[key])
+    return sheets
+
+
+def fetch_stylesheet(url: str, timeout: int = 10) -> str:
+    """Fetch a linked stylesheet once per process; empty string on failure."""
+    if url not in _STYLESHEET_CACHE:
+        try:
+            response = requests.get(url, timeout=timeout)
+            _STYLESHEET_CACHE[url] = response.text if response.status_code == 200 else ''
+        except requests.RequestException:
+            _STYLESHEET_CACHE[url] = ''
+    return _STYLESHEET_CACHE[url]
+
+
+def document_stylesheets(soup: BeautifulSoup, base_url: str = None,
+                         fetch_linked: bool = True) -> List[str]:
+    """Linked and embedded stylesheets of a document in cascade order."""
+    sheets = []
+    for element in soup.find_all(['link', 'style']):
+        if element.name == 'style':
+            if not is_print_only(element.get('media', 'all')):
+                sheets.append(element.get_text())
+        elif fetch_linked and 'stylesheet' in [r.lower() for r in element.get('rel', [])]:
+            href = element.get('href')
+            if href and not is_print_only(element.get('media', 'all')):
+                sheets.append(fetch_stylesheet(urljoin(base_url or '', href)))
+    return sheets
+
+
+def get_style_index(soup: BeautifulSoup = None, base_url: str = None,
+                    theme_dir: Path = DEFAULT_THEME_DIR, fetch_linked: bool = True) -> StyleIndex:
+    """
+    Style index for theme CSS plus a document's own stylesheets.
+    Indexes are cached by the hash of their combined CSS, so pages sharing
+    the same stylesheets reuse one index.
+    """
+    sheets = load_theme_stylesheets(theme_dir) if theme_dir else []
+    if soup is not None:
+        sheets.extend(document_stylesheets(soup, base_url, fetch_linked))
+
+    digest = hashlib.sha256('\0'.join(sheets).encode('utf-8')).hexdigest()
+    index = _INDEX_CACHE.get(digest)
+    if index is None:
+        index = StyleIndex(sheets)
+        _INDEX_CACHE.put(digest, index)
+    return index
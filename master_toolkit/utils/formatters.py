@@ -4,7 +4,7 @@ Output Formatters
 Formatting utilities for consistent output display.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional
 from datetime import datetime
 
 
@@ -97,6 +97,30 @@ class ResultFormatter:
         
         return "\n".join(output)
     
+    @staticmethod
+    def format_result_stream(records: Iterable[Dict[str, Any]],
+                             failures_only: bool = False) -> Iterator[str]:
+        """
+        Yield one line per streamed per-post result.
+        Records are consumed lazily (e.g. from iter_results), so whole runs never load at once.
+        """
+        for record in records:
+            succeeded = record.get('success', 'error' not in record)
+            if failures_only and succeeded:
+                continue
+            line = f"{'✅' if succeeded else '❌'} [{record.get('post_id', '?')}]"
+            if 'overall_score' in record:
+                line += f" score {record['overall_score']:.1f}"
+            if record.get('score_improvement'):
+                line += f" ({record['score_improvement']:+.1f})"
+            if record.get('total_improvements'):
+                line += f", {record['total_improvements']} improvements"
+            if record.get('engines_run'):
+                line += f" [{', '.join(record['engines_run'])}]"
+            if not succeeded and record.get('error'):
+                line += f" - {record['error']}"
+            yield line
+    
     @staticmethod
     def format_progress(current: int, total: int, item_name: str = "item") -> str:
         """Format progress indicator."""
@@ -0,0 +1,112 @@
+"""
+Utilities Test Suite
+====================
+Tests for the bulk URL rewriter and the stylesheet cascade.
+"""
+
+import unittest
+import json
+from unittest.mock import Mock
+
+# Test imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.utils.url_rewriter import UrlRewriter, BulkUrlRewrite
+from master_toolkit.utils.css_cascade import is_print_only, parse_stylesheet
+
+
+class TestUrlRewriter(unittest.TestCase):
+    """Test cases for the bulk URL rewriter."""
+    
+    def setUp(self):
+        self.rewriter = UrlRewriter(site_url='https://example.com')
+        self.rewriter.add('https://example.com/old-post/', 'https://example.com/mid-post/')
+        self.rewriter.add('https://example.com/mid-post/', 'https://example.com/new-post/')
+        self.rewriter.add_prefix('/2019/', 'https://example.com/archive/2019/')
+        self.rewriter.add_domain('cdn.old.net', 'cdn.example.com')
+    
+    def test_rules_and_chains_rewrite_in_one_pass(self):
+        """Test exact (chained), prefix, domain, root-relative and srcset rewriting."""
+        html = ('<a href="https://www.example.com/old-post/?ref=x">a</a>'
+                '<a href="/2019/05/post/">b</a><a href="https://example.com/2019x/">c</a>'
+                '<img src="http://cdn.old.net/a.jpg" srcset="http://cdn.old.net/a.jpg 1x, /b.jpg 2x">'
+                '<p>https://example.com/old-post/ in text</p>')
+        
+        new_html, changes = self.rewriter.rewrite_html(html)
+        
+        self.assertIn('href="https://example.com/new-post/?ref=x"', new_html)
+        self.assertIn('href="/archive/2019/05/post/"', new_html)
+        self.assertIn('href="https://example.com/2019x/"', new_html)
+        self.assertIn('src="http://cdn.example.com/a.jpg"', new_html)
+        self.assertIn('srcset="http://cdn.example.com/a.jpg 1x, /b.jpg 2x"', new_html)
+        self.assertIn('<p>https://example.com/old-post/ in text</p>', new_html)
+        self.assertEqual(len(changes), 4)
+    
+    def test_each_rule_applies_once_per_chain(self):
+        """Test that a prefix rule targeting its own subtree does not compound."""
+        rewriter = UrlRewriter(site_url='https://example.com')
+        rewriter.add_prefix('/blog/', '/blog/en/')
+        rewriter.add('https://example.com/a/', 'https://example.com/b/')
+        rewriter.add('https://example.com/b/', 'https://example.com/a/')
+        
+        self.assertEqual(rewriter.rewrite_url('/blog/post/'), '/blog/en/post/')
+        self.assertEqual(rewriter.rewrite_url('https://example.com/blog/'), '/blog/en/')
+        self.assertEqual(rewriter.rewrite_url('https://example.com/a/'), 'https://example.com/b/')
+    
+    def test_bulk_plan_diffs_and_apply_reports_conflicts(self):
+        """Test that the plan only lists changed items and stale items are not overwritten."""
+        items = {
+            'posts': [
+                {'id': 1, 'title': {'raw': 'One'}, 'modified_gmt': 't1',
+                 'content': {'raw': '<a href="/old-post/">x</a>'}},
+                {'id': 2, 'title': {'raw': 'Two'}, 'modified_gmt': 't1',
+                 'content': {'raw': '<a href="/other/">y</a>'}},
+            ],
+            'pages': [
+                {'id': 3, 'title': {'raw': 'Three'}, 'modified_gmt': 't1',
+                 'content': {'raw': '<img src="http://cdn.old.net/p.png">'}},
+            ]
+        }
+        wp = Mock()
+        wp.iter_collection.side_effect = lambda collection, **kwargs: iter(items[collection])
+        
+        def request(method, endpoint, **kwargs):
+            modified = 't2' if endpoint == 'pages/3' else 't1'
+            return Mock(status_code=200, json=Mock(return_value={'id': 1, 'modified_gmt': modified}))
+        wp._make_request.side_effect = request
+        
+        bulk = BulkUrlRewrite(wp, self.rewriter)
+        plan = bulk.plan()
+        
+        self.assertEqual(plan['scanned'], {'posts': 2, 'pages': 1})
+        self.assertEqual([item['id'] for item in plan['items']], [1, 3])
+        self.assertIn('+<a href="/new-post/">x</a>', plan['items'][0]['diff'])
+        
+        results = bulk.apply(plan, max_workers=2)
+        
+        self.assertEqual([item['id'] for item in results['updated']], [1])
+        self.assertEqual([item['id'] for item in results['conflicts']], [3])
+        writes = [c for c in wp._make_request.call_args_list if c.args[0] == 'POST']
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(writes[0].kwargs['data'], {'content': '<a href="/new-post/">x</a>'})
+
+
+
+class TestCssCascade(unittest.TestCase):
+    """Test cases for stylesheet parsing in the contrast cascade."""
+    
+    def test_only_print_only_media_is_skipped(self):
+        """Test that a media list is skipped only when every query in it is print."""
+        for media in ('print', 'only print', 'print and (orientation: landscape)', 'print, print'):
+            self.assertTrue(is_print_only(media), media)
+        for media in ('', 'all', 'screen, print', 'not print', '(max-width: 600px)'):
+            self.assertFalse(is_print_only(media), media)
+        
+        css = ('@media screen, print{.a{color:red}} @media not print{.b{color:red}} '
+               '@media print{.c{color:red}} @supports (display:grid){.d{color:red}}')
+        self.assertEqual([rule[0] for rule in parse_stylesheet(css)], ['.a', '.b', '.d'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,10 +5,17 @@ Each post gets a different image from its category pool
 """
 
 import os
+import sys
 import requests
 from dotenv import load_dotenv
-import time
 import random
+from pathlib import Path
+
+# Add the project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from master_toolkit.core import WordPressClient, MediaIndex, MediaIngestPipeline, config
 
 # Load environment variables
 load_dotenv()
@@ -222,12 +229,22 @@ def update_all_featured_images():
     print(f"📊 Found {len(all_posts)} posts to update")
     print()
     
-    updated_count = 0
-    failed_count = 0
+    # Connect the pipeline's client to the same site
+    config.set('base_url', WORDPRESS_URL)
+    wp = WordPressClient()
+    if not wp.authenticate(USERNAME, PASSWORD):
+        print("❌ Authentication failed")
+        return
+    
+    # Byte-identical images already in the media library are reused, not re-uploaded
+    media_index = MediaIndex(wp_client=wp)
+    media_index.sync()
+    
     categories_used = {}
     image_ids_used = []
+    items = []
     
-    for idx, post in enumerate(all_posts, 1):
+    for post in all_posts:
         post_id = post['id']
         title = post['title']['rendered']
         content = post['content']['rendered']
@@ -240,61 +257,37 @@ def update_all_featured_images():
         categories_used[category] = categories_used.get(category, 0) + 1
         image_ids_used.append(image_id)
         
-        print(f"[{idx}/{len(all_posts)}] 📝 {title[:45]}...")
-        print(f"      🎯 Category: {category}")
-        print(f"      🖼️  Image ID: {image_id} (unique)")
-        
-        try:
-            # Download image
-            img_response = requests.get(image_url, timeout=15)
-            if not img_response.ok:
-                print(f"      ❌ Failed to download")
-                failed_count += 1
-                print()
-                continue
-            
-            # Generate unique filename
-            filename = f"{category}-{post_id}-{image_id}.jpg"
-            
-            # Upload to WordPress
-            files = {
-                'file': (filename, img_response.content, 'image/jpeg')
-            }
-            
-            upload_response = requests.post(
-                f'{WORDPRESS_URL}/wp-json/wp/v2/media',
-                auth=(USERNAME, PASSWORD),
-                files=files
-            )
-            
-            if not upload_response.ok:
-                print(f"      ❌ Failed to upload")
-                failed_count += 1
-                print()
-                continue
-            
-            media_id = upload_response.json()['id']
-            
-            # Set as featured image
-            update_response = requests.post(
-                f'{WORDPRESS_URL}/wp-json/wp/v2/posts/{post_id}',
-                json={'featured_media': media_id},
-                auth=(USERNAME, PASSWORD)
-            )
-            
-            if update_response.ok:
-                print(f"      ✅ Updated with unique image")
-                updated_count += 1
-            else:
-                print(f"      ❌ Failed to set featured")
-                failed_count += 1
-                
-        except Exception as e:
-            print(f"      ❌ Error: {str(e)[:50]}")
-            failed_count += 1
-        
+        items.append({
+            'post_id': post_id,
+            'image_url': image_url,
+            'filename': f"{category}-{post_id}-{image_id}.jpg",
+            'title': title,
+            'category': category,
+            'image_id': image_id
+        })
+    
+    details = {item['post_id']: item for item in items}
+    completed = 0
+    
+    def report(result):
+        """Print each post as it finishes the pipeline."""
+        nonlocal completed
+        completed += 1
+        item = details[result['post_id']]
+        print(f"[{completed}/{len(items)}] 📝 {item['title'][:45]}...")
+        print(f"      🎯 Category: {item['category']}")
+        print(f"      🖼️  Image ID: {item['image_id']} (unique)")
+        if result['success']:
+            reused = " (reused existing media)" if result['reused'] else ""
+            print(f"      ✅ Updated with unique image{reused}")
+        else:
+            print(f"      ❌ Failed to {result['failed_stage']}: {str(result['error'])[:50]}")
         print()
-        time.sleep(0.5)
+    
+    # Downloads, uploads and featured-image updates overlap across posts
+    summary = MediaIngestPipeline(wp, on_result=report, media_index=media_index).run(items)
+    updated_count = summary['succeeded']
+    failed_count = summary['failed']
     
     print("=" * 80)
     print("📊 SUMMARY")
@@ -302,6 +295,7 @@ def update_all_featured_images():
     print(f"✅ Successfully updated: {updated_count}")
     print(f"❌ Failed: {failed_count}")
     print(f"📝 Total posts: {len(all_posts)}")
+    print(f"⏱️  Duration: {summary['duration_seconds']}s")
     print()
     
     print("📁 CATEGORIES USED:")
@@ -0,0 +1,323 @@
+"""
+Bulk URL Rewriter
+=================
+Compiles old -> new URL mappings into one matcher and rewrites href/src
+(and srcset) attributes across posts and pages.
+
+Three kinds of rule are supported:
+    exact   https://site/old-slug/        -> https://site/new-slug/
+    prefix  https://site/2019/            -> https://site/archive/2019/
+    domain  old.example.com               -> new.example.com
+
+Exact rules are a dict keyed by normalized URL (host without www, path
+without trailing slash). Prefix rules are a dict keyed by host + leading
+path segments, probed from the longest prefix down. Domain rules are a dict
+keyed by host. Matching one URL therefore costs a handful of hash lookups
+however many thousands of rules are loaded. A document is rewritten in a
+single regex pass over its attributes. Chains (a -> b, b -> c) are followed
+to their end, applying each rule at most once, so loops stop and a prefix
+rule whose target lies under its own source does not compound.
+
+BulkUrlRewrite applies a rewriter to the whole site. It reads each
+collection in one edit-context pass, builds a dry-run diff, and writes the
+changed items through a bounded pool, one EditSession per item so that
+concurrent edits are never overwritten.
+"""
+
+import csv
+import difflib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..core import WordPressClient, WordPressAPIError, EditSession, config, metrics
+
+
+# href="..." / src='...' / srcset="a.jpg 1x, b.jpg 2x"
+ATTR_RE = re.compile(r'''(\b(?:href|src|srcset)\s*=\s*)(["'])(.*?)\2''', re.IGNORECASE | re.DOTALL)
+
+MAX_CHAIN = 10
+
+
+def _split(url: str, site_host: str = '') -> Optional[Tuple[str, str, str, str]]:
+    """(scheme, host, path, suffix) of an absolute or root-relative URL; None for others."""
+    url = url.strip()
+    if url.startswith('//'):
+        url = 'https:' + url
+    if url.startswith('/'):
+        if not site_host:
+            return None
+        parts = urlsplit('https://' + site_host + url)
+        scheme = ''
+    else:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            return None
+        scheme = parts.scheme
+    suffix = (f'?{parts.query}' if parts.query else '') + (f'#{parts.fragment}' if parts.fragment else '')
+    return scheme, parts.netloc.lower(), parts.path, suffix
+
+
+def _host_key(host: str) -> str:
+    return host[4:] if host.startswith('www.') else host
+
+
+def _path_key(path: str) -> str:
+    return path.rstrip('/') or '/'
+
+
+class UrlRewriter:
+    """Exact, prefix and domain URL rules compiled into hash lookups."""
+
+    def __init__(self, site_url: str = None):
+        """
+        Args:
+            site_url: Site base URL; root-relative links are matched as if on
+                this host and rewritten back to root-relative form
+                (default: configured base_url)
+        """
+        self.site_host = _host_key(urlsplit(site_url or config.get('base_url')).netloc.lower())
+        self.exact: Dict[str, str] = {}
+        self.prefixes: Dict[str, str] = {}
+        self.domains: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.exact) + len(self.prefixes) + len(self.domains)
+
+    # Rules
+
+    def _key(self, url: str) -> Optional[str]:
+        parts = _split(url, self.site_host)
+        if parts is None:
+            return None
+        return _host_key(parts[1]) + _path_key(parts[2])
+
+    def add(self, old: str, new: str):
+        """Map one URL (query and fragment of the link are kept) to another."""
+        key = self._key(old)
+        if key is None:
+            raise ValueError(f"Not an absolute or root-relative URL: {old}")
+        self.exact[key] = new
+
+    def add_prefix(self, old_prefix: str, new_prefix: str):
+        """Map every URL under a path prefix, keeping the remainder of the path."""
+        key = self._key(old_prefix)
+        if key is None:
+            raise ValueError(f"Not an absolute or root-relative URL: {old_prefix}")
+        self.prefixes[key] = new_prefix.rstrip('/')
+
+    def add_domain(self, old_host: str, new_host: str):
+        """Move every URL on one host to another (scheme and path kept)."""
+        self.domains[_host_key(old_host.lower())] = new_host.lower()
+
+    def update(self, mapping: Dict[str, Any]):
+        """Add exact rules from {old: new} or {old: {'url': new}} (resolver output); None values are skipped."""
+        for old, new in mapping.items():
+            if isinstance(new, dict):
+                new = new.get('url')
+            if new:
+                self.add(old, new)
+
+    def load(self, path) -> int:
+        """Load exact rules from a JSON object or a two-column old,new CSV; returns the rule count."""
+        path = Path(path)
+        before = len(self.exact)
+        if path.suffix.lower() == '.json':
+            with open(path) as f:
+                self.update(json.load(f))
+        else:
+            with open(path, newline='') as f:
+                self.update({row[0].strip(): row[1].strip() for row in csv.reader(f)
+                             if len(row) >= 2 and not row[0].startswith('#') and row[0].strip() != 'old'})
+        return len(self.exact) - before
+
+    def load_htaccess(self, path) -> int:
+        """
+        Load "Redirect [301] /old/ https://site/new/" lines.
+
+        Apache's Redirect is a prefix match, so each rule is loaded as a
+        prefix rule (which also covers the exact URL).
+        """
+        count = 0
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if not parts or parts[0] not in ('Redirect', 'RedirectPermanent'):
+                    continue
+                source, target = parts[-2], parts[-1]
+                if source.startswith('/') and (target.startswith('/') or '://' in target):
+                    self.add_prefix(source, target)
+                    count += 1
+        return count
+
+    # Matching
+
+    def _lookup(self, url: str) -> Optional[Tuple[str, Tuple[str, str]]]:
+        """One rule application as (target, rule key), or None if no rule matches."""
+        parts = _split(url, self.site_host)
+        if parts is None:
+            return None
+        scheme, host, path, suffix = parts
+        host_key = _host_key(host)
+
+        key = host_key + _path_key(path)
+        target = self.exact.get(key)
+        if target is not None:
+            return (target + suffix if suffix and not urlsplit(target).query else target), ('exact', key)
+
+        if self.prefixes:
+            segments = _path_key(path).split('/')
+            for end in range(len(segments), 0, -1):
+                prefix = '/'.join(segments[:end]) or '/'
+                target = self.prefixes.get(host_key + prefix)
+                if target is not None:
+                    return target + path[len(prefix.rstrip('/')):] + suffix, ('prefix', host_key + prefix)
+
+        new_host = self.domains.get(host_key)
+        if new_host is not None:
+            return f"{scheme or 'https'}://{new_host}{path}{suffix}", ('domain', host_key)
+        return None
+
+    def rewrite_url(self, url: str) -> Optional[str]:
+        """Final target of a URL after following rule chains, or None if unchanged."""
+        current, seen, applied = url, {url}, set()
+        for _ in range(MAX_CHAIN):
+            match = self._lookup(current)
+            if match is None:
+                break
+            target, rule = match
+            if target == current or target in seen or rule in applied:
+                break
+            seen.add(target)
+            applied.add(rule)
+            current = target
+        if current == url:
+            return None
+        return self._localize(url, current)
+
+    def _localize(self, original: str, target: str) -> str:
+        """Keep root-relative links root-relative when the target is on the site."""
+        if not original.strip().startswith('/') or original.strip().startswith('//'):
+            return target
+        parts = urlsplit(target)
+        if parts.netloc and _host_key(parts.netloc.lower()) == self.site_host:
+            return parts.path + (f'?{parts.query}' if parts.query else '') + \
+                (f'#{parts.fragment}' if parts.fragment else '')
+        return target
+
+    def rewrite_html(self, html: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Rewrite href/src/srcset URLs in one pass.
+
+        Returns:
+            (new_html, [(old_url, new_url), ...] in document order)
+        """
+        changes = []
+
+        def replace_attr(match):
+            name, quote, value = match.groups()
+            if name.rstrip(' =\t\n').lower() == 'srcset':
+                candidates = []
+                for candidate in value.split(','):
+                    pieces = candidate.strip().split(None, 1)
+                    if pieces:
+                        new = self.rewrite_url(pieces[0])
+                        if new is not None:
+                            changes.append((pieces[0], new))
+                            pieces[0] = new
+                    candidates.append(' '.join(pieces))
+                new_value = ', '.join(candidates)
+            else:
+                new = self.rewrite_url(value)
+                if new is None:
+                    return match.group(0)
+                changes.append((value, new))
+                new_value = new
+            return f'{name}{quote}{new_value}{quote}'
+
+        if not len(self):
+            return html, changes
+        return ATTR_RE.sub(replace_attr, html), changes
+
+
+class BulkUrlRewrite:
+    """Site-wide rewrite of post and page content through one UrlRewriter."""
+
+    COLLECTIONS = ('posts', 'pages')
+
+    def __init__(self, wp_client: WordPressClient, rewriter: UrlRewriter,
+                 statuses: Iterable[str] = ('publish', 'future', 'draft', 'pending', 'private')):
+        self.wp = wp_client
+        self.rewriter = rewriter
+        self.statuses = tuple(statuses)
+
+    def plan(self, collections: Iterable[str] = COLLECTIONS) -> Dict[str, Any]:
+        """
+        Dry run: one edit-context listing per collection, every item rewritten in memory.
+
+        Returns:
+            scanned counts per collection and the changed items, each with
+            its new content, URL changes and unified diff
+        """
+        plan = {'scanned': {}, 'items': [], 'url_changes': 0}
+        with metrics.span('url_rewrite.plan'):
+            for collection in collections:
+                scanned = 0
+                for item in self.wp.iter_collection(collection, context='edit', status=','.join(self.statuses)):
+                    scanned += 1
+                    content = item.get('content', {})
+                    raw = content.get('raw', content.get('rendered', '')) if isinstance(content, dict) else content
+                    new_content, changes = self.rewriter.rewrite_html(raw or '')
+                    if not changes or new_content == raw:
+                        continue
+                    plan['items'].append({
+                        'type': collection,
+                        'id': item['id'],
+                        'title': (item.get('title') or {}).get('raw') or (item.get('title') or {}).get('rendered', ''),
+                        'post': item,
+                        'content': new_content,
+                        'changes': changes,
+                        'diff': _diff(raw, new_content, f"{collection}/{item['id']}")
+                    })
+                    plan['url_changes'] += len(changes)
+                plan['scanned'][collection] = scanned
+        return plan
+
+    def apply(self, plan: Dict[str, Any], max_workers: int = 4) -> Dict[str, Any]:
+        """
+        Write every planned item, at most max_workers at a time.
+
+        Items edited on the site since the plan was made are reported as
+        conflicts and left alone.
+        """
+        results = {'updated': [], 'conflicts': [], 'failed': []}
+
+        def write(item):
+            session = EditSession(self.wp, item['id'], post_type=item['type'], post=item['post'])
+            session.content = item['content']
+            return session.commit()
+
+        with metrics.span('url_rewrite.apply'), ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(write, item): item for item in plan['items']}
+            for future in as_completed(futures):
+                item = futures[future]
+                ref = {'type': item['type'], 'id': item['id'], 'title': item['title']}
+                try:
+                    future.result()
+                    results['updated'].append(ref)
+                except WordPressAPIError as e:
+                    key = 'conflicts' if e.status_code == 409 else 'failed'
+                    results[key].append(dict(ref, error=str(e)))
+                except Exception as e:
+                    results['failed'].append(dict(ref, error=str(e)))
+        return results
+
+
+def _diff(before: str, after: str, label: str) -> str:
+    """Unified diff of two contents, split at tags so one-line HTML still diffs readably."""
+    def split(text):
+        return re.sub(r'>(?=<)', '>\n', text).splitlines(keepends=True)
+    return ''.join(difflib.unified_diff(split(before), split(after), f'a/{label}', f'b/{label}', n=1))
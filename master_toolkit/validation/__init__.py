@@ -4,24 +4,21 @@ Validation Module
 Comprehensive validation utilities for WordPress content.
 """
 
-from .links import LinkValidator
-from .images import ImageValidator
-from .seo import SEOValidator
-from .comprehensive import ComprehensiveValidator
-from .technical import TechnicalValidator
-from .performance import PerformanceValidator
-from .accessibility import AccessibilityValidator
-from .security import SecurityValidator
-from .mobile import MobileValidator
+from .._lazy import lazy_exports
 
-__all__ = [
-    'LinkValidator',
-    'ImageValidator', 
-    'SEOValidator',
-    'ComprehensiveValidator',
-    'TechnicalValidator',
-    'PerformanceValidator',
-    'AccessibilityValidator',
-    'SecurityValidator',
-    'MobileValidator'
-]
\ No newline at end of file
+# Validators are imported on first access so callers only load the
+# dependencies (bs4, PIL, ...) of the validators they use.
+_LAZY_IMPORTS = {
+    'LinkValidator': '.links',
+    'ImageValidator': '.images',
+    'SEOValidator': '.seo',
+    'ComprehensiveValidator': '.comprehensive',
+    'TechnicalValidator': '.technical',
+    'PerformanceValidator': '.performance',
+    'AccessibilityValidator': '.accessibility',
+    'SecurityValidator': '.security',
+    'MobileValidator': '.mobile',
+    'NearDuplicateImageFinder': '.image_similarity'
+}
+
+lazy_exports(globals(), _LAZY_IMPORTS)
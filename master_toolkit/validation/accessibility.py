@@ -10,23 +10,24 @@ Comprehensive accessibility validation for WordPress sites including:
 - Screen reader compatibility
 """
 
-import requests
 import re
 from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup, Tag
 import colorsys
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, PageCache, page_cache, metrics
 from ..utils import print_success, print_error, print_warning
+from ..utils.css_cascade import get_style_index
 
 
 class AccessibilityValidator:
     """Accessibility validation utilities for WordPress sites."""
     
-    def __init__(self, wp_client: WordPressClient = None):
+    def __init__(self, wp_client: WordPressClient = None, pages: PageCache = None):
         """Initialize accessibility validator."""
         self.wp = wp_client or WordPressClient()
+        self.pages = pages or page_cache
         self.base_url = "https://spherevista360.com"
         
         # WCAG 2.1 compliance levels
@@ -36,6 +37,7 @@ class AccessibilityValidator:
             'AAA': {'contrast_ratio': 7.0, 'large_text_ratio': 4.5}
         }
         
+    @metrics.timed('validator.accessibility.validate_accessibility')
     def validate_accessibility(self, post_id: int, wcag_level: str = 'AA') -> Dict[str, Any]:
         """Comprehensive accessibility validation for a specific post."""
         try:
@@ -68,7 +70,7 @@ class AccessibilityValidator:
             
             # Get full page content for comprehensive analysis
             try:
-                response = requests.get(post_url, timeout=15)
+                response = self.pages.get(post_url, timeout=15)
                 if response.status_code == 200:
                     full_content = response.text
                     soup = BeautifulSoup(full_content, 'html.parser')
@@ -422,38 +424,49 @@ class AccessibilityValidator:
         return analysis
     
     def _validate_color_contrast(self, soup: BeautifulSoup, wcag_level: str) -> Dict[str, Any]:
-        """Validate color contrast ratios (basic implementation)."""
+        """Validate color contrast ratios using the resolved CSS cascade."""
         analysis = {
             'contrast_issues': 0,
             'elements_checked': 0,
             'low_contrast_elements': [],
             'issues': [],
-            'score': 85  # Default good score - full contrast checking requires advanced tools
+            'score': 100
         }
         
-        # This is a simplified implementation
-        # Full color contrast validation requires:
-        # 1. Computed CSS styles
-        # 2. Background color detection (including images)
-        # 3. Color ratio calculations
-        
-        # Check for obvious contrast issues in inline styles
-        elements_with_style = soup.find_all(attrs={'style': True})
-        
-        for elem in elements_with_style:
-            style = elem.get('style', '')
-            if 'color:' in style and 'background' in style:
-                analysis['elements_checked'] += 1
-                # This would require CSS parsing and color contrast calculation
-                # For now, we'll flag potential issues
-                if 'white' in style and 'yellow' in style:
-                    analysis['contrast_issues'] += 1
-                    analysis['issues'].append('Potential low contrast: white text on yellow background')
-        
-        # Check for common problematic color combinations in classes
-        problematic_classes = soup.find_all(class_=re.compile(r'light.*text|yellow.*bg|gray.*light'))
-        if problematic_classes:
-            analysis['issues'].append(f'Found {len(problematic_classes)} elements with potentially low contrast classes')
+        thresholds = self.wcag_levels.get(wcag_level, self.wcag_levels['AA'])
+        style_index = get_style_index(soup, base_url=self.base_url)
+        failing_combinations = {}
+        
+        for record in style_index.text_contrast(soup):
+            if record['background_image']:
+                continue  # Text over images needs visual inspection
+            
+            analysis['elements_checked'] += 1
+            required = thresholds['large_text_ratio'] if record['is_large_text'] else thresholds['contrast_ratio']
+            
+            if record['contrast_ratio'] < required:
+                analysis['contrast_issues'] += 1
+                combo_key = (record['foreground'], record['background'], record['is_large_text'])
+                if combo_key not in failing_combinations:
+                    failing_combinations[combo_key] = {
+                        'element': record['element'].name,
+                        'foreground': record['foreground'],
+                        'background': record['background'],
+                        'contrast_ratio': record['contrast_ratio'],
+                        'required_ratio': required,
+                        'occurrences': 0
+                    }
+                failing_combinations[combo_key]['occurrences'] += 1
+        
+        analysis['low_contrast_elements'] = list(failing_combinations.values())
+        
+        for combo in analysis['low_contrast_elements']:
+            analysis['issues'].append(
+                f"Low contrast {combo['contrast_ratio']}:1 (needs {combo['required_ratio']}:1): "
+                f"{combo['foreground']} on {combo['background']} in {combo['occurrences']} <{combo['element']}> element(s)"
+            )
+        
+        analysis['score'] = max(0, 100 - len(failing_combinations) * 15)
         
         return analysis
     
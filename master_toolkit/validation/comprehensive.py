@@ -5,7 +5,7 @@ Unified validation system combining SEO, links, images, and content quality.
 """
 
 from typing import Dict, List, Any, Optional
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, EditSession, ResultSink, metrics
 from ..utils import print_header, print_section, print_success, print_error, ResultFormatter
 from .links import LinkValidator
 from .images import ImageValidator
@@ -22,18 +22,19 @@ class ComprehensiveValidator:
         self.image_validator = ImageValidator(self.wp)
         self.seo_validator = SEOValidator(self.wp)
     
-    def validate_post_comprehensive(self, post_id: int) -> Dict[str, Any]:
-        """Run comprehensive validation on a single post."""
+    @metrics.timed('validator.comprehensive.validate_post_comprehensive')
+    def validate_post_comprehensive(self, post_id: int, post: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run comprehensive validation on a single post (fetched once, shared by every validator)."""
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             post_title = post['title']['rendered']
             
             print_section(f"Validating Post {post_id}: {post_title}")
             
             # Run all validations
-            seo_result = self.seo_validator.validate_post(post_id)
-            link_result = self.link_validator.validate_post_links(post_id)
-            image_result = self.image_validator.validate_post_images(post_id)
+            seo_result = self.seo_validator.validate_post(post_id, post=post)
+            link_result = self.link_validator.validate_post_links(post_id, post=post)
+            image_result = self.image_validator.validate_post_images(post_id, post=post)
             
             # Calculate overall scores
             seo_score = seo_result.get('score', 0) if 'error' not in seo_result else 0
@@ -79,12 +80,22 @@ class ComprehensiveValidator:
                 'error': str(e)
             }
     
-    def validate_multiple_posts(self, post_ids: List[int] = None, per_page: int = 10) -> Dict[str, Any]:
-        """Run comprehensive validation on multiple posts."""
+    def validate_multiple_posts(self, post_ids: List[int] = None, per_page: int = 10,
+                                sink: ResultSink = None) -> Dict[str, Any]:
+        """
+        Run comprehensive validation on multiple posts.
+
+        With a sink, each post's validation is streamed to it instead of
+        being collected in validation_results.
+        """
         print_header("Comprehensive Post Validation")
         
         if post_ids:
-            posts_to_validate = [{'id': pid} for pid in post_ids]
+            try:
+                loaded = {post['id']: post for post in self.wp.get_posts_by_ids(post_ids, status='any')}
+            except WordPressAPIError:
+                loaded = {}
+            posts_to_validate = [loaded.get(pid, {'id': pid}) for pid in post_ids]
         else:
             try:
                 posts_to_validate = self.wp.get_posts(per_page=per_page)
@@ -98,12 +109,14 @@ class ComprehensiveValidator:
             'posts_needing_attention': 0,
             'validation_results': []
         }
+        if sink is not None:
+            results['results_file'] = str(sink.path)
         
         total_score = 0
         
         for post in posts_to_validate:
             post_id = post['id']
-            validation = self.validate_post_comprehensive(post_id)
+            validation = self.validate_post_comprehensive(post_id, post=post if 'content' in post else None)
             
             if 'error' not in validation:
                 results['validated_posts'] += 1
@@ -112,11 +125,16 @@ class ComprehensiveValidator:
                 if validation['summary']['needs_attention']:
                     results['posts_needing_attention'] += 1
                 
-                results['validation_results'].append(validation)
+                if sink is not None:
+                    sink.write(validation)
+                else:
+                    results['validation_results'].append(validation)
                 
                 # Progress indicator
                 print(f"✅ Post {post_id}: {validation['overall_score']:.1f}% overall")
             else:
+                if sink is not None:
+                    sink.write(validation)
                 print_error(f"Failed to validate post {post_id}: {validation['error']}")
         
         if results['validated_posts'] > 0:
@@ -160,21 +178,33 @@ class ComprehensiveValidator:
             }
             
             try:
+                # Load once; every fixer edits the same copy, written back once
+                session = EditSession(self.wp, post_id)
+                
                 # Fix SEO issues
-                seo_result = self.seo_validator.optimize_post_seo(post_id, dry_run)
+                seo_result = self.seo_validator.optimize_post_seo(post_id, dry_run, session=session)
                 if seo_result.get('optimizations'):
                     post_fixes['seo_fixes'] = seo_result['optimizations']
                 
                 # Fix broken links
-                link_result = self.link_validator.fix_post_links(post_id, dry_run)
+                link_result = self.link_validator.fix_post_links(post_id, dry_run, session=session)
                 if link_result.get('fixes_applied'):
                     post_fixes['link_fixes'] = link_result['fixes_applied']
                 
                 # Fix image issues
-                image_result = self.image_validator.optimize_post_images(post_id, dry_run=dry_run)
+                image_result = self.image_validator.optimize_post_images(post_id, dry_run=dry_run,
+                                                                         session=session)
                 if image_result.get('fixes_applied'):
                     post_fixes['image_fixes'] = image_result['fixes_applied']
                 
+                for fixer_result in (seo_result, link_result, image_result):
+                    if 'error' in fixer_result:
+                        raise WordPressAPIError(fixer_result['error'])
+                
+                post_fixes['updated_fields'] = sorted(session.changes)
+                if not dry_run:
+                    session.commit()
+                
                 # Count total fixes
                 total_post_fixes = (
                     len(post_fixes['seo_fixes']) +
@@ -7,10 +7,16 @@ Validates ALL requirements including content quality and word count
 import os
 import re
 import requests
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from requests.auth import HTTPBasicAuth
 from bs4 import BeautifulSoup
 
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.mirror import open_site_mirror
+
 load_dotenv()
 
 WORDPRESS_URL = os.getenv('WORDPRESS_BASE_URL')
@@ -19,7 +25,8 @@ PASSWORD = os.getenv('WORDPRESS_PASSWORD')
 
 class ComprehensiveValidator:
     def __init__(self):
-        self.auth = HTTPBasicAuth(USERNAME, PASSWORD)
+        # Every check reads the same local mirror instead of refetching posts
+        self.mirror = open_site_mirror(WORDPRESS_URL, USERNAME, PASSWORD)
         self.issues = []
         self.warnings = []
         self.success = []
@@ -39,14 +46,7 @@ class ComprehensiveValidator:
         print("\n📝 Validating Post Content Length (500-700 words)...")
         print("-" * 60)
         
-        url = f"{WORDPRESS_URL}/wp-json/wp/v2/posts?per_page=100"
-        response = requests.get(url, auth=self.auth)
-        
-        if response.status_code != 200:
-            self.issues.append("Failed to fetch posts for content validation")
-            return False
-        
-        posts = response.json()
+        posts = self.mirror.get_posts()
         short_posts = []
         long_posts = []
         good_posts = []
@@ -85,7 +85,6 @@ class ComprehensiveValidator:
         print("\n📚 Validating Published Content Matches Source...")
         print("-" * 60)
         
-        from pathlib import Path
         content_dir = Path('/home/kddevops/projects/spherevista360/published_content')
         
         if not content_dir.exists():
@@ -97,9 +96,7 @@ class ComprehensiveValidator:
         print(f"   📁 Source files in published_content: {len(md_files)}")
         
         # Get posts from WordPress
-        url = f"{WORDPRESS_URL}/wp-json/wp/v2/posts?per_page=100"
-        response = requests.get(url, auth=self.auth)
-        wp_posts = len(response.json()) if response.status_code == 200 else 0
+        wp_posts = len(self.mirror.get_posts())
         
         print(f"   📰 Posts on WordPress: {wp_posts}")
         
@@ -116,14 +113,7 @@ class ComprehensiveValidator:
         print("\n🖼️  Validating Featured Images...")
         print("-" * 60)
         
-        url = f"{WORDPRESS_URL}/wp-json/wp/v2/posts?per_page=100"
-        response = requests.get(url, auth=self.auth)
-        
-        if response.status_code != 200:
-            self.issues.append("Failed to fetch posts for image validation")
-            return False
-        
-        posts = response.json()
+        posts = self.mirror.get_posts()
         without_images = [p for p in posts if p.get('featured_media', 0) == 0]
         
         print(f"   Total posts: {len(posts)}")
@@ -144,13 +134,7 @@ class ComprehensiveValidator:
         print("\n📂 Validating Post Categories...")
         print("-" * 60)
         
-        url = f"{WORDPRESS_URL}/wp-json/wp/v2/posts?per_page=100"
-        response = requests.get(url, auth=self.auth)
-        
-        if response.status_code != 200:
-            return False
-        
-        posts = response.json()
+        posts = self.mirror.get_posts()
         uncategorized = [p for p in posts if not p.get('categories') or p['categories'] == [1]]
         
         print(f"   ✅ Categorized posts: {len(posts) - len(uncategorized)}")
@@ -288,11 +272,9 @@ class ComprehensiveValidator:
         print("\n🧭 Validating Navigation Menus...")
         print("-" * 60)
         
-        url = f"{WORDPRESS_URL}/wp-json/wp/v2/menus"
-        response = requests.get(url, auth=self.auth)
+        menus = self.mirror.get_menus()
         
-        if response.status_code == 200:
-            menus = response.json()
+        if menus is not None:
             print(f"   ✅ Total menus: {len(menus)}")
             for menu in menus[:5]:
                 print(f"      • {menu.get('name', 'Unknown')}")
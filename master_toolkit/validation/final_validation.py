@@ -5,11 +5,17 @@ Final Comprehensive Validation - 300-500 Word Target
 
 import os
 import re
+import sys
 import requests
+from pathlib import Path
 from dotenv import load_dotenv
-from requests.auth import HTTPBasicAuth
 from bs4 import BeautifulSoup
 
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.mirror import open_site_mirror
+
 load_dotenv()
 
 WORDPRESS_URL = os.getenv('WORDPRESS_BASE_URL')
@@ -31,19 +37,19 @@ def main():
     print(f"🌐 Site: {WORDPRESS_URL}")
     print(f"📅 Date: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
-    auth = HTTPBasicAuth(USERNAME, PASSWORD)
+    # Posts, pages and menus are read from the local mirror (synced incrementally)
+    mirror = open_site_mirror(WORDPRESS_URL, USERNAME, PASSWORD)
     results = {'pass': [], 'warning': [], 'fail': []}
     
     # 1. Validate published_content match
     print("=" * 70)
     print("1️⃣  PUBLISHED CONTENT VERIFICATION")
     print("=" * 70)
-    from pathlib import Path
     content_dir = Path('/home/kddevops/projects/spherevista360/published_content')
     md_files = list(content_dir.rglob('*.md')) if content_dir.exists() else []
     
-    response = requests.get(f"{WORDPRESS_URL}/wp-json/wp/v2/posts?per_page=100", auth=auth)
-    wp_posts = len(response.json()) if response.status_code == 200 else 0
+    posts = mirror.get_posts()
+    wp_posts = len(posts)
     
     print(f"   📁 Source files: {len(md_files)}")
     print(f"   📰 WordPress posts: {wp_posts}")
@@ -59,7 +65,6 @@ def main():
     print("2️⃣  WORD COUNT VALIDATION (300-500 words per post)")
     print("=" * 70)
     
-    posts = response.json()
     word_counts = {'optimal': [], 'short': [], 'long': []}
     
     for post in posts:
@@ -124,9 +129,8 @@ def main():
     print("=" * 70)
     print("5️⃣  PAGES & PROPER CONTENT")
     print("=" * 70)
-    page_response = requests.get(f"{WORDPRESS_URL}/wp-json/wp/v2/pages?per_page=100", auth=auth)
-    if page_response.status_code == 200:
-        pages = page_response.json()
+    pages = mirror.get_pages()
+    if pages:
         print(f"   ✅ Total pages: {len(pages)}")
         essential_pages = ['Home', 'About', 'Contact', 'Blog', 'Services']
         for page_name in essential_pages:
@@ -230,9 +234,8 @@ def main():
     print("=" * 70)
     print("9️⃣  NAVIGATION MENUS")
     print("=" * 70)
-    menu_response = requests.get(f"{WORDPRESS_URL}/wp-json/wp/v2/menus", auth=auth)
-    if menu_response.status_code == 200:
-        menus = menu_response.json()
+    menus = mirror.get_menus()
+    if menus is not None:
         print(f"   ✅ Total menus configured: {len(menus)}")
         for menu in menus[:3]:
             print(f"      • {menu.get('name', 'Unknown')}")
@@ -0,0 +1,450 @@
+"""
+Perceptual Image Similarity
+===========================
+Near-duplicate detection for the media library and featured images.
+
+Images are reduced to 64-bit perceptual hashes (dHash and a DCT-based pHash)
+from downscaled, uncropped renditions, so the same photo at a different size
+or compression level lands within a small Hamming distance. Hashes are computed
+in a process pool and cached in SQLite so repeat scans only hash new or
+changed media. Library-wide clustering compares all pairs with vectorized
+popcounts; single-image lookups use a BK-tree.
+"""
+
+import io
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+import numpy as np
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+from ..core import WordPressClient, config, metrics
+from ..core.storage import SQLiteStore, chunked, placeholders
+
+
+HASH_SIZE = 8
+PHASH_SAMPLE = 32
+
+# Default Hamming radius (of 64 bits) for "same image"
+DEFAULT_MAX_DISTANCE = 10
+
+# Pairwise distance matrix cells computed per block (~32 MB of uint64)
+PAIRWISE_BLOCK_CELLS = 4_000_000
+
+# Below this many images, hashing inline beats process pool startup
+PROCESS_POOL_MIN_ITEMS = 32
+
+# Renditions to hash, smallest first. 'thumbnail' is hard-cropped to a square,
+# which moves the hash far from the uncropped image, so it is never used.
+RENDITION_SIZES = ('medium', 'medium_large', 'large')
+
+# Part of every cached hash version; bump when the hashed rendition changes
+RENDITION_VERSION = 'uncropped'
+
+HASH_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS image_hashes (
+        cache_key TEXT PRIMARY KEY,
+        version TEXT,
+        dhash TEXT NOT NULL,
+        phash TEXT NOT NULL,
+        computed_at TEXT
+    );
+'''
+
+
+# Hashing
+
+def _load_grayscale(data: bytes, sample: int) -> Image.Image:
+    """Decode image bytes straight to a small grayscale image."""
+    image = Image.open(io.BytesIO(data))
+    # JPEG draft mode decodes at 1/2..1/8 scale inside libjpeg, skipping most of the work
+    image.draft('L', (sample * 2, sample * 2))
+    return image.convert('L')
+
+
+def dhash(image: Image.Image, size: int = HASH_SIZE) -> int:
+    """Difference hash: sign of horizontal gradients on a (size+1) x size thumbnail."""
+    pixels = np.asarray(image.resize((size + 1, size), Image.LANCZOS), dtype=np.int16)
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis matrix."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+def phash(image: Image.Image, size: int = HASH_SIZE, sample: int = PHASH_SAMPLE) -> int:
+    """DCT hash: low-frequency coefficients of a sample x sample thumbnail vs their median."""
+    pixels = np.asarray(image.resize((sample, sample), Image.LANCZOS), dtype=np.float64)
+    basis = _dct_matrix(sample)
+    low = (basis @ pixels @ basis.T)[:size, :size]
+    # The DC term only encodes overall brightness, so it is left out of the median
+    median = np.median(low.flatten()[1:])
+    return _bits_to_int(low > median)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """Pack a boolean array into an int, most significant bit first."""
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), 'big')
+
+
+def compute_hashes(data: bytes) -> Tuple[int, int]:
+    """(dhash, phash) of encoded image bytes. Runs in worker processes."""
+    image = _load_grayscale(data, PHASH_SAMPLE)
+    return dhash(image), phash(image)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits."""
+    return (a ^ b).bit_count()
+
+
+# Index
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes under Hamming distance."""
+
+    def __init__(self):
+        """Initialize empty tree."""
+        self.root: Optional[List] = None
+        self.size = 0
+
+    def add(self, value: int, key: Any):
+        """Insert a hash with an associated key; identical hashes share a node."""
+        self.size += 1
+        if self.root is None:
+            self.root = [value, [key], {}]
+            return
+
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(key)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [key], {}]
+                return
+            node = child
+
+    def query(self, value: int, radius: int) -> List[Tuple[int, Any]]:
+        """All (distance, key) pairs within radius of value."""
+        if self.root is None:
+            return []
+
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_value, keys, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                matches.extend((distance, key) for key in keys)
+            # Triangle inequality: only subtrees at |d - radius|..d + radius can match
+            low, high = distance - radius, distance + radius
+            stack.extend(child for edge, child in children.items() if low <= edge <= high)
+        return matches
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class ImageHashCache(SQLiteStore):
+    """Persistent cache of perceptual hashes keyed by source and version."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """Initialize hash cache."""
+        super().__init__(db_path or Path(__file__).parent / 'image_hashes.db', HASH_SCHEMA)
+        self._connect()
+
+    def get_many(self, entries: Dict[str, str]) -> Dict[str, Tuple[int, int]]:
+        """Cached hashes for {cache_key: version} whose stored version still matches."""
+        hits = {}
+        conn = self._connect()
+        for chunk in chunked(entries):
+            rows = conn.execute('SELECT cache_key, version, dhash, phash FROM image_hashes '
+                                f'WHERE cache_key IN ({placeholders(chunk)})', chunk)
+            for key, version, d, p in rows:
+                if entries[key] == version:
+                    hits[key] = (int(d, 16), int(p, 16))
+        return hits
+
+    def put_many(self, rows: Iterable[Tuple[str, str, int, int]]):
+        """Store (cache_key, version, dhash, phash) rows."""
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Hex text: 64-bit unsigned hashes do not fit SQLite's signed INTEGER
+            conn.executemany(
+                'INSERT OR REPLACE INTO image_hashes VALUES (?, ?, ?, ?, ?)',
+                [(key, version, f'{d:016x}', f'{p:016x}', now) for key, version, d, p in rows]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+class NearDuplicateImageFinder:
+    """Find visually identical images across the media library."""
+
+    def __init__(self, wp_client: WordPressClient = None, cache: ImageHashCache = None,
+                 download_workers: int = 16, hash_workers: int = None):
+        """Initialize near-duplicate finder."""
+        self.wp = wp_client or WordPressClient()
+        self.cache = cache or ImageHashCache()
+        self.download_workers = download_workers
+        self.hash_workers = hash_workers
+        self._tree: Optional[BKTree] = None
+        self._tree_hashes: Dict[int, Tuple[int, int]] = {}
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.get('user_agent')})
+        adapter = HTTPAdapter(pool_maxsize=download_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @metrics.timed('validator.image_similarity.find_near_duplicates')
+    def find_near_duplicates(self, max_distance: int = DEFAULT_MAX_DISTANCE,
+                             include_posts: bool = True) -> Dict[str, Any]:
+        """
+        Cluster media whose pHash and dHash are both within max_distance.
+
+        Returns:
+            Clusters of media IDs (with the posts featuring each) plus hashing stats
+        """
+        media = self._list_media()
+        hashes, stats = self.hash_media(media)
+        clusters = cluster_hashes(hashes, max_distance)
+
+        featured_by = self._featured_media_map() if include_posts else {}
+        by_id = {item['id']: item for item in media}
+        report_clusters = []
+        for cluster in clusters:
+            report_clusters.append({
+                'media_ids': cluster['keys'],
+                'max_distance': cluster['max_distance'],
+                'media': [
+                    {
+                        'media_id': media_id,
+                        'source_url': by_id[media_id].get('source_url'),
+                        'featured_in_posts': featured_by.get(media_id, [])
+                    }
+                    for media_id in cluster['keys']
+                ]
+            })
+
+        return {
+            'media_scanned': len(media),
+            'hashed': stats['hashed'],
+            'cache_hits': stats['cache_hits'],
+            'errors': stats['errors'],
+            'max_distance': max_distance,
+            'clusters': report_clusters,
+            'near_duplicate_media': sum(len(c['media_ids']) for c in report_clusters)
+        }
+
+    def find_similar(self, image, max_distance: int = DEFAULT_MAX_DISTANCE,
+                     refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Media items that look like an image, closest first.
+        Useful before uploading a candidate image; the library's BK-tree is
+        built once per finder and reused across calls.
+
+        Args:
+            image: URL of an uncropped image, or a media item (hashed at
+                the same rendition as the library)
+        """
+        if self._tree is None or refresh:
+            self._tree_hashes, _ = self.hash_media(self._list_media())
+            self._tree = BKTree()
+            for media_id, (_, p) in self._tree_hashes.items():
+                self._tree.add(p, media_id)
+
+        image_url = _rendition_url(image) if isinstance(image, dict) else image
+        d, p = compute_hashes(self._fetch(image_url))
+        matches = [
+            {'media_id': media_id, 'distance': distance}
+            for distance, media_id in self._tree.query(p, max_distance)
+            if hamming(d, self._tree_hashes[media_id][0]) <= max_distance
+        ]
+        return sorted(matches, key=lambda m: (m['distance'], m['media_id']))
+
+    def hash_media(self, media: List[Dict]) -> Tuple[Dict[int, Tuple[int, int]], Dict[str, Any]]:
+        """Perceptual hashes for media items, from cache where the item is unchanged."""
+        images = {item['id']: item for item in media if item.get('media_type', 'image') == 'image'}
+        versions = {f"media:{media_id}": f"{RENDITION_VERSION}:{item.get('modified_gmt', '')}"
+                    for media_id, item in images.items()}
+        cached = self.cache.get_many(versions)
+        for _ in cached:
+            metrics.record_cache('image_hashes', True)
+
+        hashes = {int(key.split(':', 1)[1]): value for key, value in cached.items()}
+        pending = {media_id: _rendition_url(item) for media_id, item in images.items()
+                   if f"media:{media_id}" not in cached}
+        for _ in pending:
+            metrics.record_cache('image_hashes', False)
+
+        computed, errors = self.hash_urls(pending)
+        hashes.update(computed)
+        self.cache.put_many(
+            (f"media:{media_id}", versions[f"media:{media_id}"], d, p)
+            for media_id, (d, p) in computed.items()
+        )
+
+        return hashes, {'hashed': len(computed), 'cache_hits': len(cached), 'errors': errors}
+
+    def hash_urls(self, urls: Dict[Any, str]) -> Tuple[Dict[Any, Tuple[int, int]], List[Dict]]:
+        """
+        Download images on a thread pool and hash them on a process pool.
+        Decoding and DCTs are CPU-bound, so they run outside the GIL.
+        """
+        if not urls:
+            return {}, []
+
+        results, errors = {}, []
+        with ThreadPoolExecutor(max_workers=self.download_workers) as io_pool:
+            downloads = {io_pool.submit(self._fetch, url): key for key, url in urls.items()}
+
+            if len(urls) < PROCESS_POOL_MIN_ITEMS:
+                # Not worth starting worker processes for a handful of images
+                for future in as_completed(downloads):
+                    key = downloads[future]
+                    try:
+                        results[key] = compute_hashes(future.result())
+                    except Exception as e:
+                        errors.append({'key': key, 'url': urls[key], 'error': str(e)})
+                return results, errors
+
+            # forkserver: download threads are already running, and forking a
+            # threaded process can deadlock the children
+            with ProcessPoolExecutor(max_workers=self.hash_workers, mp_context=_process_context()) as cpu_pool:
+                hashing = {}
+                for future in as_completed(downloads):
+                    key = downloads[future]
+                    try:
+                        hashing[cpu_pool.submit(compute_hashes, future.result())] = key
+                    except Exception as e:
+                        errors.append({'key': key, 'url': urls[key], 'error': str(e)})
+
+                for future in as_completed(hashing):
+                    key = hashing[future]
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        errors.append({'key': key, 'url': urls[key], 'error': f'Undecodable image: {e}'})
+
+        return results, errors
+
+    def _fetch(self, url: str) -> bytes:
+        """Download image bytes."""
+        response = self.session.get(url, timeout=config.get('timeout'))
+        response.raise_for_status()
+        return response.content
+
+    def _list_media(self) -> List[Dict]:
+        """All image media library items."""
+        return list(self.wp.iter_collection('media', media_type='image'))
+
+    def _featured_media_map(self) -> Dict[int, List[int]]:
+        """media_id -> IDs of posts using it as featured image."""
+        featured = {}
+        for post in self.wp.iter_collection('posts', status='publish', _fields='id,featured_media'):
+            if post.get('featured_media'):
+                featured.setdefault(post['featured_media'], []).append(post['id'])
+        return featured
+
+
+def cluster_hashes(hashes: Dict[Any, Tuple[int, int]],
+                   max_distance: int = DEFAULT_MAX_DISTANCE) -> List[Dict[str, Any]]:
+    """
+    Group keys whose pHash and dHash are both within max_distance.
+
+    All pairs are compared with vectorized XOR/popcount in row blocks; dHash
+    confirms pHash matches, which filters the occasional pHash collision
+    between unrelated images.
+    """
+    keys = list(hashes)
+    if len(keys) < 2:
+        return []
+
+    dhashes = np.array([hashes[k][0] for k in keys], dtype=np.uint64)
+    phashes = np.array([hashes[k][1] for k in keys], dtype=np.uint64)
+    n = len(keys)
+    parent = list(range(n))
+    max_seen = [0] * n
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    block = max(1, PAIRWISE_BLOCK_CELLS // n)
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        p_dist = _popcount(phashes[start:stop, None] ^ phashes[None, :])
+        d_dist = _popcount(dhashes[start:stop, None] ^ dhashes[None, :])
+        match = (p_dist <= max_distance) & (d_dist <= max_distance)
+        # Upper triangle only: each pair once, no self-matches
+        match &= np.arange(n)[None, :] > np.arange(start, stop)[:, None]
+        for row, col in zip(*np.nonzero(match)):
+            i = start + int(row)
+            distance = int(p_dist[row, col])
+            max_seen[i] = max(max_seen[i], distance)
+            root_a, root_b = find(i), find(int(col))
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) > 1:
+            clusters.append({
+                'keys': sorted(keys[i] for i in members),
+                'max_distance': max(max_seen[i] for i in members)
+            })
+    clusters.sort(key=lambda c: len(c['keys']), reverse=True)
+    return clusters
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Per-element set bit count of a uint64 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    as_bytes = values.view(np.uint8).reshape(values.shape + (8,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1)
+
+
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _process_context():
+    """Start method for hashing workers."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
+
+
+def _rendition_url(item: Dict) -> str:
+    """Smallest uncropped rendition of a media item, falling back to the original."""
+    sizes = item.get('media_details', {}).get('sizes', {})
+    for name in RENDITION_SIZES:
+        if name in sizes and sizes[name].get('source_url'):
+            return sizes[name]['source_url']
+    return item.get('source_url')
@@ -9,16 +9,17 @@ import re
 from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, EditSession, MediaIndex, MediaIngestPipeline, metrics
 from ..utils import print_success, print_error, print_warning
 
 
 class ImageValidator:
     """Image validation and optimization utilities."""
     
-    def __init__(self, wp_client: WordPressClient = None):
+    def __init__(self, wp_client: WordPressClient = None, media_index: MediaIndex = None):
         """Initialize image validator."""
         self.wp = wp_client or WordPressClient()
+        self.media_index = media_index
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (WordPress-Toolkit/1.0)'
@@ -131,10 +132,11 @@ class ImageValidator:
         
         return results
     
-    def validate_post_images(self, post_id: int) -> Dict[str, Any]:
-        """Validate all images in a specific post."""
+    @metrics.timed('validator.images.validate_post_images')
+    def validate_post_images(self, post_id: int, post: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Validate all images in a specific post (an already loaded post skips the fetch)."""
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             content = post['content']['rendered']
             
             results = self.validate_images_in_content(content)
@@ -258,22 +260,36 @@ class ImageValidator:
         
         return fixed_content, fixes_applied
     
-    def optimize_post_images(self, post_id: int, category: str = 'default', dry_run: bool = False) -> Dict[str, Any]:
-        """Comprehensive image optimization for a post."""
+    @metrics.timed('validator.images.optimize_post_images')
+    def optimize_post_images(self, post_id: int, category: str = 'default', dry_run: bool = False,
+                             session: EditSession = None) -> Dict[str, Any]:
+        """
+        Comprehensive image optimization for a post.
+
+        With an EditSession the post is not re-fetched and the fixed content
+        (including any earlier fixer's edits) is staged on it for the caller
+        to commit instead of being written here.
+        """
         try:
-            # Get current validation
-            validation = self.validate_post_images(post_id)
-            
-            if 'error' in validation:
-                return validation
-            
-            # Get post content for fixing
-            post = self.wp.get_post(post_id, context='edit')
-            
-            if 'raw' in post.get('content', {}):
-                current_content = post['content']['raw']
+            if session is not None:
+                validation = self.validate_images_in_content(session.rendered('content'))
+                validation['post_id'] = post_id
+                validation['post_title'] = session.rendered('title')
+                current_content = session.content
             else:
-                current_content = post['content']['rendered']
+                # Get current validation
+                validation = self.validate_post_images(post_id)
+                
+                if 'error' in validation:
+                    return validation
+                
+                # Get post content for fixing
+                post = self.wp.get_post(post_id, context='edit')
+                
+                if 'raw' in post.get('content', {}):
+                    current_content = post['content']['raw']
+                else:
+                    current_content = post['content']['rendered']
             
             all_fixes = []
             fixed_content = current_content
@@ -299,6 +315,12 @@ class ImageValidator:
                 result['message'] = 'No image optimizations needed'
                 return result
             
+            if session is not None:
+                session.content = fixed_content
+                session.fixes.setdefault('images', []).extend(all_fixes)
+                result['message'] = f'Staged {len(all_fixes)} image optimizations'
+                return result
+            
             if dry_run:
                 result['message'] = f'Would apply {len(all_fixes)} image optimizations'
                 return result
@@ -319,6 +341,7 @@ class ImageValidator:
                 'error': str(e)
             }
 
+    @metrics.timed('validator.images.check_featured_image')
     def check_featured_image(self, post_id: int) -> Dict[str, Any]:
         """Check if post has a featured image."""
         try:
@@ -396,52 +419,29 @@ class ImageValidator:
                 result['message'] = f'Would set featured image from: {image_url}'
                 return result
             
-            # Upload image to WordPress media library
-            try:
-                # Download image
-                response = requests.get(image_url, timeout=30)
-                response.raise_for_status()
-                
-                # Extract filename
-                import os
-                from urllib.parse import urlparse
-                parsed_url = urlparse(image_url)
-                filename = os.path.basename(parsed_url.path) or f'featured_image_{post_id}.jpg'
-                
-                # Upload to WordPress
-                media_response = self.wp.upload_media(
-                    file_content=response.content,
-                    filename=filename,
-                    alt_text=first_image.get('alt', ''),
-                    caption=f'Featured image for post {post_id}'
-                )
-                
-                media_id = media_response['id']
-                
-                # Set as featured image
-                self.wp.update_post(post_id, {'featured_media': media_id})
-                
-                result.update({
-                    'success': True,
-                    'media_id': media_id,
-                    'message': f'Successfully set featured image from content'
-                })
-                
-                return result
-                
-            except requests.RequestException as e:
-                result.update({
-                    'success': False,
-                    'error': f'Failed to download image: {str(e)}'
-                })
-                return result
-            except Exception as e:
+            # Upload image to WordPress media library (reusing identical media)
+            ingest = MediaIngestPipeline(self.wp, media_index=self.media_index).ingest_one(
+                post_id,
+                image_url,
+                alt_text=first_image.get('alt', ''),
+                caption=f'Featured image for post {post_id}'
+            )
+            
+            if not ingest['success']:
                 result.update({
                     'success': False,
-                    'error': f'Failed to upload image: {str(e)}'
+                    'error': f'Failed to {ingest["failed_stage"]} image: {ingest["error"]}'
                 })
                 return result
             
+            result.update({
+                'success': True,
+                'media_id': ingest['media_id'],
+                'message': f'Successfully set featured image from content'
+            })
+            
+            return result
+            
         except Exception as e:
             return {
                 'post_id': post_id,
@@ -470,43 +470,29 @@ class ImageValidator:
                 result['message'] = f'Would download and set featured image: {image_url}'
                 return result
             
-            # Download image
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Extract filename
-            import os
-            from urllib.parse import urlparse
-            parsed_url = urlparse(image_url)
-            filename = os.path.basename(parsed_url.path) or f'featured_image_{post_id}.jpg'
-            
-            # Upload to WordPress
-            media_response = self.wp.upload_media(
-                file_content=response.content,
-                filename=filename,
+            # Download, upload and attach with per-stage retries
+            ingest = MediaIngestPipeline(self.wp, media_index=self.media_index).ingest_one(
+                post_id,
+                image_url,
                 alt_text=f'Featured image for {post.get("title", {}).get("rendered", "post")}',
                 caption=f'Featured image for post {post_id}'
             )
             
-            media_id = media_response['id']
-            
-            # Set as featured image
-            self.wp.update_post(post_id, {'featured_media': media_id})
+            if not ingest['success']:
+                result.update({
+                    'success': False,
+                    'error': f'Failed to {ingest["failed_stage"]} image: {ingest["error"]}'
+                })
+                return result
             
             result.update({
                 'success': True,
-                'media_id': media_id,
+                'media_id': ingest['media_id'],
                 'message': 'Successfully downloaded and set featured image'
             })
             
             return result
             
-        except requests.RequestException as e:
-            return {
-                'post_id': post_id,
-                'success': False,
-                'error': f'Failed to download image: {str(e)}'
-            }
         except Exception as e:
             return {
                 'post_id': post_id,
@@ -514,6 +500,26 @@ class ImageValidator:
                 'error': str(e)
             }
 
+    def bulk_download_and_set_featured_images(self, image_urls: Dict[int, str], dry_run: bool = False,
+                                              **pipeline_options) -> Dict[str, Any]:
+        """
+        Download external images and set them as featured images for many posts.
+        Downloads, uploads and attachments run concurrently through the media ingest pipeline.
+        """
+        if dry_run:
+            return {
+                'total_posts': len(image_urls),
+                'message': f'Dry run: Would set featured images for {len(image_urls)} posts'
+            }
+        
+        pipeline = MediaIngestPipeline(self.wp, media_index=self.media_index, **pipeline_options)
+        summary = pipeline.run(
+            {'post_id': post_id, 'image_url': url, 'caption': f'Featured image for post {post_id}'}
+            for post_id, url in image_urls.items()
+        )
+        summary['message'] = f'Set featured images for {summary["succeeded"]} of {summary["total"]} posts'
+        return summary
+
     def bulk_fix_featured_images(self, post_ids: List[int] = None, per_page: int = 10, dry_run: bool = False) -> Dict[str, Any]:
         """Bulk fix missing featured images for multiple posts."""
         try:
@@ -10,16 +10,38 @@ from typing import Dict, List, Tuple, Optional, Any
 from urllib.parse import urljoin, urlparse
 import time
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, EditSession, metrics
 from ..utils import print_success, print_error, print_warning, extract_internal_links, clean_url
+from ..utils.url_rewriter import UrlRewriter
+
+
+# Status codes that confirm a link is broken rather than temporarily unreachable
+GONE_STATUSES = (404, 410)
 
 
 class LinkValidator:
     """Link validation and fixing utilities."""
     
-    def __init__(self, wp_client: WordPressClient = None):
-        """Initialize link validator."""
+    def __init__(self, wp_client: WordPressClient = None, resolver=None,
+                 min_confidence: float = None, mirror=None, trust_mirror: bool = False):
+        """
+        Initialize link validator.
+        
+        Broken internal links without a known mapping are resolved to live
+        posts by a fuzzy UrlResolver built from the site mirror (or the one
+        passed in); min_confidence sets how sure it must be to rewrite a link.
+        The mirror is read as it is; sync it beforehand (mirror sync) or pass
+        a synced SiteMirror. A link missing from the mirror only counts as
+        broken once it answers 404/410, unless trust_mirror is set.
+        """
         self.wp = wp_client or WordPressClient()
+        self._resolver = resolver
+        self._mirror = mirror
+        self.trust_mirror = trust_mirror
+        self._gone: Dict[str, bool] = {}
+        self._rewriter = None
+        self._rewriter_source = None
+        self.min_confidence = min_confidence
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (WordPress-Toolkit/1.0)'
@@ -39,6 +61,37 @@ class LinkValidator:
                 'https://spherevista360.com/cloud-computing-evolution-trends-and-predictions/'
         }
     
+    def _site_mirror(self):
+        """Site mirror passed in, or the local copy opened without syncing."""
+        if self._mirror is None:
+            from ..mirror import open_site_mirror
+            self._mirror = open_site_mirror(sync=False)
+        return self._mirror
+    
+    @property
+    def resolver(self):
+        """Fuzzy URL resolver over live slugs and titles (built on first use)."""
+        if self._resolver is None:
+            from ..mirror.url_resolver import UrlResolver
+            self._resolver = UrlResolver.from_mirror(self._site_mirror())
+        return self._resolver
+    
+    def url_rewriter(self, domain: str) -> UrlRewriter:
+        """Known mappings compiled into one matcher (rebuilt when they change)."""
+        source = (domain, dict(self.known_broken_links))
+        if self._rewriter is None or self._rewriter_source != source:
+            rewriter = UrlRewriter(site_url=f'https://{domain}')
+            rewriter.update(self.known_broken_links)
+            self._rewriter, self._rewriter_source = rewriter, source
+        return self._rewriter
+    
+    def resolve_url(self, url: str) -> Optional[Dict[str, Any]]:
+        """Best live target for a broken internal URL, with a confidence score."""
+        if url in self.known_broken_links:
+            return {'url': self.known_broken_links[url], 'confidence': 1.0, 'known': True}
+        options = {} if self.min_confidence is None else {'min_confidence': self.min_confidence}
+        return self.resolver.resolve(url, **options)
+    
     def validate_url(self, url: str, timeout: int = 10) -> Dict[str, Any]:
         """Validate a single URL."""
         try:
@@ -62,6 +115,22 @@ class LinkValidator:
                 'redirected': False
             }
     
+    def is_broken(self, url: str) -> bool:
+        """
+        Whether an internal URL is confirmed broken.
+        
+        URLs the mirror lists as live are not checked. Any other URL must
+        answer 404/410 (checked once per validator), since it may just be
+        newer than the last sync; with trust_mirror, absence is enough.
+        """
+        if self.resolver.is_live(url):
+            return False
+        if self.trust_mirror:
+            return True
+        if url not in self._gone:
+            self._gone[url] = self.validate_url(url).get('status_code') in GONE_STATUSES
+        return self._gone[url]
+    
     def validate_links_in_content(self, content: str, domain: str = "spherevista360.com") -> Dict[str, Any]:
         """Validate all links in content."""
         internal_links = extract_internal_links(content, domain)
@@ -85,10 +154,11 @@ class LinkValidator:
         
         return results
     
-    def validate_post_links(self, post_id: int) -> Dict[str, Any]:
-        """Validate all links in a specific post."""
+    @metrics.timed('validator.links.validate_post_links')
+    def validate_post_links(self, post_id: int, post: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Validate all links in a specific post (an already loaded post skips the fetch)."""
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             content = post['content']['rendered']
             
             results = self.validate_links_in_content(content)
@@ -103,21 +173,46 @@ class LinkValidator:
                 'post_id': post_id
             }
     
-    def fix_broken_links_in_content(self, content: str) -> Tuple[str, List[str]]:
-        """Fix broken links in content using known mappings."""
-        fixed_content = content
-        fixes_applied = []
+    def fix_broken_links_in_content(self, content: str, domain: str = "spherevista360.com") -> Tuple[str, List[str]]:
+        """Fix broken links in content using known mappings, then the fuzzy resolver."""
+        fixed_content, changes = self.url_rewriter(domain).rewrite_html(content)
+        fixes_applied = [f"{old} → {new}" for old, new in dict.fromkeys(changes)]
         
-        for broken_url, correct_url in self.known_broken_links.items():
-            if broken_url in content:
-                fixed_content = fixed_content.replace(broken_url, correct_url)
-                fixes_applied.append(f"{broken_url} → {correct_url}")
+        # Only links confirmed broken are handed to the fuzzy resolver
+        for link in dict.fromkeys(extract_internal_links(fixed_content, domain)):
+            url = clean_url(link)
+            if not self.is_broken(url):
+                continue
+            match = self.resolve_url(url)
+            if match is None:
+                continue
+            fixed_content = re.sub(re.escape(link) + r'(?=["\'\s<)]|$)', lambda _: match['url'], fixed_content)
+            fixes_applied.append(f"{link} → {match['url']} (confidence {match['confidence']:.2f})")
         
         return fixed_content, fixes_applied
     
-    def fix_post_links(self, post_id: int, dry_run: bool = False) -> Dict[str, Any]:
-        """Fix broken links in a specific post."""
+    @metrics.timed('validator.links.fix_post_links')
+    def fix_post_links(self, post_id: int, dry_run: bool = False,
+                       session: EditSession = None) -> Dict[str, Any]:
+        """
+        Fix broken links in a specific post.
+
+        With an EditSession the fixed content is staged on it for the caller
+        to commit instead of being written here.
+        """
         try:
+            if session is not None:
+                fixes_applied = session.apply('links', 'content', self.fix_broken_links_in_content)
+                return {
+                    'post_id': post_id,
+                    'post_title': session.rendered('title'),
+                    'content_source': session.content_source,
+                    'fixes_applied': fixes_applied,
+                    'changes_made': len(fixes_applied) > 0,
+                    'message': (f'Staged {len(fixes_applied)} link fixes' if fixes_applied
+                                else 'No broken links found to fix')
+                }
+            
             # Get post content
             post = self.wp.get_post(post_id, context='edit')
             
@@ -192,7 +287,11 @@ class LinkValidator:
                         results['broken_links_by_post'].append({
                             'post_id': post_id,
                             'title': validation_result.get('post_title', 'Unknown'),
-                            'broken_links': validation_result['broken_links']
+                            'broken_links': validation_result['broken_links'],
+                            'suggested_fixes': {
+                                link: self.resolve_url(clean_url(link))
+                                for link in validation_result['broken_links']
+                            }
                         })
                 
                 page += 1
@@ -203,11 +302,18 @@ class LinkValidator:
         
         return results
     
+    def posts_with_unresolved_links(self) -> List[int]:
+        """IDs of posts linking to internal URLs that are not live, from the link graph."""
+        from ..mirror import LinkGraph
+        graph = LinkGraph(self._site_mirror())
+        return sorted({pid for node in graph.unresolved_links() for pid in node['linked_from']}
+                      | {pid for chain in graph.redirect_chains() if chain['final_url'] is None
+                         for pid in chain['linked_from']})
+    
     def fix_all_broken_links(self, post_ids: List[int] = None, dry_run: bool = False) -> Dict[str, Any]:
-        """Fix broken links in multiple posts."""
+        """Fix broken links in multiple posts (default: every post with unresolved links)."""
         if post_ids is None:
-            # Get posts with known broken links
-            post_ids = [1833, 1832, 1831, 1838, 1829, 1828]  # Known problematic posts
+            post_ids = self.posts_with_unresolved_links()
         
         results = {
             'total_posts': len(post_ids),
@@ -246,7 +352,7 @@ class LinkValidator:
     def verify_fixes(self, post_ids: List[int] = None) -> Dict[str, Any]:
         """Verify that broken links have been fixed."""
         if post_ids is None:
-            post_ids = [1833, 1832, 1831, 1838, 1829, 1828]
+            post_ids = self.posts_with_unresolved_links()
         
         results = {
             'posts_checked': 0,
@@ -255,16 +361,21 @@ class LinkValidator:
             'verification_results': []
         }
         
+        try:
+            loaded = {post['id']: post for post in self.wp.get_posts_by_ids(post_ids, status='any')}
+        except WordPressAPIError as e:
+            print_warning(f"Batch fetch failed, loading posts one by one: {e}")
+            loaded = {}
+        
         for post_id in post_ids:
             try:
-                post = self.wp.get_post(post_id)
+                post = loaded.get(post_id) or self.wp.get_post(post_id)
                 content = post['content']['rendered']
                 
-                # Check for known broken URLs
-                broken_found = []
-                for broken_url in self.known_broken_links.keys():
-                    if broken_url in content:
-                        broken_found.append(broken_url)
+                # Check for known broken URLs and links confirmed broken
+                broken_found = [url for url in self.known_broken_links if url in content]
+                broken_found += [link for link in dict.fromkeys(extract_internal_links(content))
+                                 if link not in broken_found and self.is_broken(clean_url(link))]
                 
                 results['posts_checked'] += 1
                 
@@ -9,21 +9,21 @@ Comprehensive mobile responsiveness validation for WordPress sites including:
 - Mobile layout validation
 """
 
-import requests
 from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 import re
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, PageCache, page_cache, metrics
 from ..utils import print_success, print_error, print_warning
 
 
 class MobileValidator:
     """Mobile responsiveness validation utilities for WordPress sites."""
     
-    def __init__(self, wp_client: WordPressClient = None):
+    def __init__(self, wp_client: WordPressClient = None, pages: PageCache = None):
         """Initialize mobile validator."""
         self.wp = wp_client or WordPressClient()
+        self.pages = pages or page_cache
         self.base_url = "https://spherevista360.com"
         
         # Mobile-friendly criteria
@@ -31,6 +31,7 @@ class MobileValidator:
         self.min_touch_target = 44  # pixels (Apple HIG & Material Design)
         self.max_content_width = 100  # viewport width percentage
     
+    @metrics.timed('validator.mobile.validate_mobile_responsiveness')
     def validate_mobile_responsiveness(self, post_id: int) -> Dict[str, Any]:
         """Comprehensive mobile responsiveness validation for a specific post."""
         try:
@@ -60,7 +61,7 @@ class MobileValidator:
                 headers = {
                     'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1'
                 }
-                response = requests.get(post_url, timeout=15, headers=headers)
+                response = self.pages.get(post_url, headers=headers, timeout=15)
                 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -10,7 +10,6 @@ Comprehensive performance validation for WordPress sites including:
 """
 
 import requests
-import time
 from typing import Dict, List, Any, Optional
 from urllib.parse import urljoin, urlparse
 import json
@@ -18,18 +17,20 @@ from bs4 import BeautifulSoup
 from PIL import Image
 import io
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, PageCache, page_cache, metrics
 from ..utils import print_success, print_error, print_warning
 
 
 class PerformanceValidator:
     """Performance validation utilities for WordPress sites."""
     
-    def __init__(self, wp_client: WordPressClient = None):
+    def __init__(self, wp_client: WordPressClient = None, pages: PageCache = None):
         """Initialize performance validator."""
         self.wp = wp_client or WordPressClient()
+        self.pages = pages or page_cache
         self.base_url = "https://spherevista360.com"
         
+    @metrics.timed('validator.performance.validate_page_speed')
     def validate_page_speed(self, post_id: int) -> Dict[str, Any]:
         """Analyze page speed and loading performance for a specific post."""
         try:
@@ -65,13 +66,12 @@ class PerformanceValidator:
                 'score': 0
             }
             
-            # Measure page load time
-            start_time = time.time()
+            # Measure page load time with a full download, never a cached copy or a 304
             try:
-                response = requests.get(post_url, timeout=30, headers={
+                response = self.pages.get(post_url, timeout=30, refresh=True, headers={
                     'User-Agent': 'Mozilla/5.0 (compatible; PerformanceValidator/1.0)'
                 })
-                load_time = time.time() - start_time
+                load_time = response.elapsed
                 result['performance']['load_time'] = round(load_time, 2)
                 
                 if response.status_code == 200:
@@ -339,6 +339,7 @@ class PerformanceValidator:
         result['recommendations'] = recommendations
         return result
     
+    @metrics.timed('validator.performance.validate_image_optimization')
     def validate_image_optimization(self, post_id: int) -> Dict[str, Any]:
         """Detailed image optimization analysis for a specific post."""
         try:
@@ -12,22 +12,41 @@ Comprehensive security validation for WordPress sites including:
 import requests
 import ssl
 import socket
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Any, Iterable, Optional
 from urllib.parse import urlparse, urljoin
 import re
 from datetime import datetime
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, metrics
 from ..utils import print_success, print_error, print_warning
 
 
 class SecurityValidator:
     """Security validation utilities for WordPress sites."""
     
-    def __init__(self, wp_client: WordPressClient = None):
+    def __init__(self, wp_client: WordPressClient = None, base_url: str = None,
+                 max_workers: int = 8):
         """Initialize security validator."""
         self.wp = wp_client or WordPressClient()
-        self.base_url = "https://spherevista360.com"
+        self.base_url = base_url or "https://spherevista360.com"
+        self.max_workers = max_workers
+        
+        # Pooled session shared by all probes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Files that must not be publicly readable
+        self.sensitive_files = [
+            '/wp-config.php',
+            '/wp-config.php.bak',
+            '/wp-admin/install.php',
+            '/readme.html',
+            '/license.txt'
+        ]
         
         # Security headers to check
         self.security_headers = {
@@ -57,6 +76,7 @@ class SecurityValidator:
             }
         }
     
+    @metrics.timed('validator.security.validate_site_security')
     def validate_site_security(self) -> Dict[str, Any]:
         """Comprehensive security validation for the entire site."""
         try:
@@ -74,20 +94,23 @@ class SecurityValidator:
                 'score': 0
             }
             
+            # Fetch the homepage once and run all other probes concurrently
+            probe = self._run_probes()
+            
             # Validate HTTPS implementation
-            result['security']['https'] = self._validate_https()
+            result['security']['https'] = self._validate_https(probe)
             
             # Validate security headers
-            result['security']['headers'] = self._validate_security_headers()
+            result['security']['headers'] = self._validate_security_headers(probe)
             
             # Validate SSL certificate
-            result['security']['ssl_certificate'] = self._validate_ssl_certificate()
+            result['security']['ssl_certificate'] = self._validate_ssl_certificate(probe)
             
             # Validate WordPress-specific security
-            result['security']['wordpress_security'] = self._validate_wordpress_security()
+            result['security']['wordpress_security'] = self._validate_wordpress_security(probe)
             
             # Validate content security
-            result['security']['content_security'] = self._validate_content_security()
+            result['security']['content_security'] = self._validate_content_security(probe)
             
             # Calculate overall score
             scores = [section['score'] for section in result['security'].values()]
@@ -126,7 +149,73 @@ class SecurityValidator:
                 'error': f'Error validating site security: {str(e)}'
             }
     
-    def _validate_https(self) -> Dict[str, Any]:
+    def validate_sites_security(self, site_urls: List[str], max_sites: int = 4) -> Dict[str, Dict[str, Any]]:
+        """Validate several sites in parallel, each with its own pooled session."""
+        def validate_site(site_url):
+            validator = SecurityValidator(self.wp, base_url=site_url, max_workers=self.max_workers)
+            try:
+                return validator.validate_site_security()
+            finally:
+                validator.session.close()
+        
+        with ThreadPoolExecutor(max_workers=max_sites) as executor:
+            results = executor.map(validate_site, site_urls)
+            return dict(zip(site_urls, results))
+    
+    def _run_probes(self, names: Iterable[str] = None) -> Dict[str, Any]:
+        """
+        Run the named network probes (default: every probe the sections need), concurrently, once.
+        Each entry holds a response (or certificate) or the exception raised.
+        """
+        http_url = self.base_url.replace('https://', 'http://')
+        
+        plan = {
+            'homepage': lambda: self.session.get(self.base_url, timeout=10, allow_redirects=True),
+            'http_redirect': lambda: self.session.get(http_url, timeout=10, allow_redirects=True, stream=True),
+            'wp_content': lambda: self.session.get(urljoin(self.base_url, '/wp-content/'), timeout=5),
+            'certificate': self._fetch_certificate
+        }
+        for file_path in self.sensitive_files:
+            plan[f'file:{file_path}'] = (
+                lambda url=urljoin(self.base_url, file_path): self._probe_status(url)
+            )
+        if names is not None:
+            plan = {name: plan[name] for name in dict.fromkeys(names)}
+        
+        def run(task):
+            try:
+                return task()
+            except Exception as e:
+                return e
+        
+        if len(plan) == 1:
+            probe = {name: run(task) for name, task in plan.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(plan))) as executor:
+                futures = {name: executor.submit(run, task) for name, task in plan.items()}
+                probe = {name: future.result() for name, future in futures.items()}
+        
+        # Only the final URL of the redirect probe is needed
+        if isinstance(probe.get('http_redirect'), requests.Response):
+            probe['http_redirect'].close()
+        
+        return probe
+    
+    def _probe_status(self, url: str) -> int:
+        """Status code of a URL without downloading the body."""
+        with self.session.get(url, timeout=5, stream=True) as response:
+            return response.status_code
+    
+    def _fetch_certificate(self) -> Dict[str, Any]:
+        """Fetch the site's TLS certificate."""
+        hostname = urlparse(self.base_url).hostname
+        context = ssl.create_default_context()
+        
+        with socket.create_connection((hostname, 443), timeout=10) as sock:
+            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                return ssock.getpeercert()
+    
+    def _validate_https(self, probe: Dict[str, Any] = None) -> Dict[str, Any]:
         """Validate HTTPS implementation and redirects."""
         analysis = {
             'https_enabled': False,
@@ -136,9 +225,13 @@ class SecurityValidator:
             'score': 0
         }
         
+        probe = probe or self._run_probes(['homepage', 'http_redirect'])
+        
         try:
             # Test HTTPS access
-            https_response = requests.get(self.base_url, timeout=10, allow_redirects=True)
+            https_response = probe['homepage']
+            if isinstance(https_response, Exception):
+                raise https_response
             if https_response.status_code == 200:
                 analysis['https_enabled'] = True
                 analysis['score'] += 40
@@ -150,16 +243,15 @@ class SecurityValidator:
                     analysis['issues'].append('Site does not enforce HTTPS')
             
             # Test HTTP to HTTPS redirect
-            http_url = self.base_url.replace('https://', 'http://')
-            try:
-                http_response = requests.get(http_url, timeout=10, allow_redirects=True)
+            http_response = probe['http_redirect']
+            if isinstance(http_response, Exception):
+                analysis['issues'].append('Unable to test HTTP redirect')
+            else:
                 if http_response.url.startswith('https://'):
                     analysis['http_redirects'] = True
                     analysis['score'] += 20
                 else:
                     analysis['issues'].append('HTTP does not redirect to HTTPS')
-            except Exception:
-                analysis['issues'].append('Unable to test HTTP redirect')
             
             # Check for mixed content (basic check)
             if analysis['https_enabled']:
@@ -183,7 +275,7 @@ class SecurityValidator:
         
         return analysis
     
-    def _validate_security_headers(self) -> Dict[str, Any]:
+    def _validate_security_headers(self, probe: Dict[str, Any] = None) -> Dict[str, Any]:
         """Validate security headers implementation."""
         analysis = {
             'headers_present': {},
@@ -193,8 +285,12 @@ class SecurityValidator:
             'score': 0
         }
         
+        probe = probe or self._run_probes(['homepage'])
+        
         try:
-            response = requests.get(self.base_url, timeout=10)
+            response = probe['homepage']
+            if isinstance(response, Exception):
+                raise response
             headers = {k.lower(): v for k, v in response.headers.items()}
             
             total_required = sum(1 for h in self.security_headers.values() if h['required'])
@@ -253,7 +349,7 @@ class SecurityValidator:
             if '1' not in header_value:
                 analysis['issues'].append('XSS Protection is disabled')
     
-    def _validate_ssl_certificate(self) -> Dict[str, Any]:
+    def _validate_ssl_certificate(self, probe: Dict[str, Any] = None) -> Dict[str, Any]:
         """Validate SSL certificate configuration."""
         analysis = {
             'certificate_valid': False,
@@ -264,42 +360,42 @@ class SecurityValidator:
             'score': 0
         }
         
+        probe = probe or self._run_probes(['certificate'])
+        
         try:
-            hostname = urlparse(self.base_url).netloc
-            context = ssl.create_default_context()
+            cert = probe['certificate']
+            if isinstance(cert, Exception):
+                raise cert
             
-            with socket.create_connection((hostname, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    analysis['certificate_valid'] = True
-                    analysis['score'] += 50
-                    
-                    # Check certificate expiry
-                    expiry_date = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
-                    analysis['certificate_expiry'] = expiry_date.isoformat()
-                    
-                    days_until_expiry = (expiry_date - datetime.now()).days
-                    analysis['days_until_expiry'] = days_until_expiry
-                    
-                    if days_until_expiry < 30:
-                        analysis['issues'].append(f'Certificate expires in {days_until_expiry} days')
-                        analysis['score'] -= 20
-                    elif days_until_expiry < 90:
-                        analysis['issues'].append(f'Certificate expires in {days_until_expiry} days - consider renewal')
-                        analysis['score'] -= 10
-                    else:
-                        analysis['score'] += 30
-                    
-                    # Get certificate issuer
-                    issuer = cert.get('issuer', [])
-                    for item in issuer:
-                        if item[0][0] == 'organizationName':
-                            analysis['certificate_issuer'] = item[0][1]
-                            break
-                    
-                    analysis['score'] += 20  # Valid certificate bonus
-                    
+            if cert:
+                analysis['certificate_valid'] = True
+                analysis['score'] += 50
+                
+                # Check certificate expiry
+                expiry_date = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
+                analysis['certificate_expiry'] = expiry_date.isoformat()
+                
+                days_until_expiry = (expiry_date - datetime.now()).days
+                analysis['days_until_expiry'] = days_until_expiry
+                
+                if days_until_expiry < 30:
+                    analysis['issues'].append(f'Certificate expires in {days_until_expiry} days')
+                    analysis['score'] -= 20
+                elif days_until_expiry < 90:
+                    analysis['issues'].append(f'Certificate expires in {days_until_expiry} days - consider renewal')
+                    analysis['score'] -= 10
+                else:
+                    analysis['score'] += 30
+                
+                # Get certificate issuer
+                issuer = cert.get('issuer', [])
+                for item in issuer:
+                    if item[0][0] == 'organizationName':
+                        analysis['certificate_issuer'] = item[0][1]
+                        break
+                
+                analysis['score'] += 20  # Valid certificate bonus
+                
         except ssl.SSLError as e:
             analysis['issues'].append(f'SSL certificate error: {str(e)}')
         except Exception as e:
@@ -307,7 +403,7 @@ class SecurityValidator:
         
         return analysis
     
-    def _validate_wordpress_security(self) -> Dict[str, Any]:
+    def _validate_wordpress_security(self, probe: Dict[str, Any] = None) -> Dict[str, Any]:
         """Validate WordPress-specific security configurations."""
         analysis = {
             'version_disclosure': False,
@@ -319,9 +415,14 @@ class SecurityValidator:
             'score': 100
         }
         
+        probe = probe or self._run_probes(['homepage', 'wp_content',
+                                           *(f'file:{path}' for path in self.sensitive_files)])
+        
         try:
             # Check for WordPress version disclosure
-            response = requests.get(self.base_url, timeout=10)
+            response = probe['homepage']
+            if isinstance(response, Exception):
+                raise response
             content = response.text.lower()
             
             if 'wp-content' in content or 'wordpress' in content:
@@ -332,33 +433,19 @@ class SecurityValidator:
                     analysis['score'] -= 15
             
             # Check for sensitive file exposure
-            sensitive_files = [
-                '/wp-config.php',
-                '/wp-config.php.bak',
-                '/wp-admin/install.php',
-                '/readme.html',
-                '/license.txt'
-            ]
-            
-            for file_path in sensitive_files:
-                try:
-                    file_response = requests.get(urljoin(self.base_url, file_path), timeout=5)
-                    if file_response.status_code == 200:
-                        analysis['sensitive_files_exposed'].append(file_path)
-                        analysis['issues'].append(f'Sensitive file exposed: {file_path}')
-                        analysis['score'] -= 10
-                except Exception:
-                    continue
+            for file_path in self.sensitive_files:
+                if probe.get(f'file:{file_path}') == 200:
+                    analysis['sensitive_files_exposed'].append(file_path)
+                    analysis['issues'].append(f'Sensitive file exposed: {file_path}')
+                    analysis['score'] -= 10
             
             # Check directory listing
-            try:
-                wp_content_response = requests.get(urljoin(self.base_url, '/wp-content/'), timeout=5)
+            wp_content_response = probe['wp_content']
+            if not isinstance(wp_content_response, Exception):
                 if 'index of' in wp_content_response.text.lower():
                     analysis['directory_listing'] = True
                     analysis['issues'].append('Directory listing enabled for wp-content')
                     analysis['score'] -= 10
-            except Exception:
-                pass
             
             # Check for common admin usernames
             try:
@@ -373,7 +460,7 @@ class SecurityValidator:
         
         return analysis
     
-    def _validate_content_security(self) -> Dict[str, Any]:
+    def _validate_content_security(self, probe: Dict[str, Any] = None) -> Dict[str, Any]:
         """Validate content security policies and inline content."""
         analysis = {
             'csp_header': False,
@@ -385,8 +472,12 @@ class SecurityValidator:
             'score': 80  # Default good score
         }
         
+        probe = probe or self._run_probes(['homepage'])
+        
         try:
-            response = requests.get(self.base_url, timeout=10)
+            response = probe['homepage']
+            if isinstance(response, Exception):
+                raise response
             
             # Check for CSP header
             csp_header = response.headers.get('content-security-policy', '')
@@ -9,7 +9,7 @@ from typing import Dict, List, Any, Optional
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, EditSession, metrics
 from ..utils import print_success, print_error, print_warning
 
 
@@ -167,10 +167,11 @@ class SEOValidator:
             'recommendations': recommendations
         }
     
-    def validate_post(self, post_id: int) -> Dict[str, Any]:
-        """Comprehensive SEO validation for a post."""
+    @metrics.timed('validator.seo.validate_post')
+    def validate_post(self, post_id: int, post: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Comprehensive SEO validation for a post (an already loaded post skips the fetch)."""
         try:
-            post = self.wp.get_post(post_id)
+            post = post or self.wp.get_post(post_id)
             
             title = post['title']['rendered']
             content = post['content']['rendered']
@@ -220,10 +221,17 @@ class SEOValidator:
                 'error': str(e)
             }
     
-    def optimize_post_seo(self, post_id: int, dry_run: bool = False) -> Dict[str, Any]:
-        """Optimize post SEO by fixing common issues."""
+    @metrics.timed('validator.seo.optimize_post_seo')
+    def optimize_post_seo(self, post_id: int, dry_run: bool = False,
+                          session: EditSession = None) -> Dict[str, Any]:
+        """
+        Optimize post SEO by fixing common issues.
+
+        With an EditSession the changes are staged on it for the caller to
+        commit instead of being written here.
+        """
         try:
-            validation = self.validate_post(post_id)
+            validation = self.validate_post(post_id, post=session.post if session else None)
             
             if 'error' in validation:
                 return validation
@@ -256,6 +264,13 @@ class SEOValidator:
                 result['message'] = 'No optimizations needed'
                 return result
             
+            if session is not None:
+                for field, value in updates.items():
+                    session.set(field, value)
+                session.fixes.setdefault('seo', []).extend(optimizations)
+                result['message'] = f'Staged {len(optimizations)} optimizations'
+                return result
+            
             if dry_run:
                 result['message'] = f'Would apply {len(optimizations)} optimizations'
                 return result
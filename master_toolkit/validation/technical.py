@@ -11,7 +11,7 @@ from urllib.parse import urljoin, urlparse
 import hashlib
 from difflib import SequenceMatcher
 
-from ..core import WordPressClient, WordPressAPIError
+from ..core import WordPressClient, WordPressAPIError, metrics
 from ..utils import print_success, print_error, print_warning
 
 
@@ -23,6 +23,7 @@ class TechnicalValidator:
         self.wp = wp_client or WordPressClient()
         self.base_url = "https://spherevista360.com"
     
+    @metrics.timed('validator.technical.validate_sitemap_inclusion')
     def validate_sitemap_inclusion(self, post_id: int) -> Dict[str, Any]:
         """Check if a post is included in the XML sitemap."""
         try:
@@ -144,6 +145,7 @@ class TechnicalValidator:
         except Exception:
             return False
     
+    @metrics.timed('validator.technical.validate_robots_txt')
     def validate_robots_txt(self) -> Dict[str, Any]:
         """Validate robots.txt file."""
         try:
@@ -217,6 +219,7 @@ class TechnicalValidator:
                 'error': f'Error validating robots.txt: {str(e)}'
             }
     
+    @metrics.timed('validator.technical.check_duplicate_content')
     def check_duplicate_content(self, post_id: int, similarity_threshold: float = 0.8) -> Dict[str, Any]:
         """Check for duplicate content across the site."""
         try:
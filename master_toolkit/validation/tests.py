@@ -0,0 +1,148 @@
+"""
+Validation Module Test Suite
+============================
+Tests for the validators, the security probes and the near-duplicate image finder.
+"""
+
+import unittest
+import tempfile
+from unittest.mock import Mock, MagicMock, patch
+
+# Test imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.validation.security import SecurityValidator
+from master_toolkit.validation.image_similarity import (
+    BKTree, ImageHashCache, NearDuplicateImageFinder, compute_hashes, cluster_hashes
+)
+
+
+class TestImageSimilarity(unittest.TestCase):
+    """Test cases for perceptual hashing and near-duplicate clustering."""
+    
+    def _jpeg(self, seed, size=(800, 480), quality=85):
+        """Encode a smooth random test image."""
+        import io
+        import numpy as np
+        from PIL import Image
+        pixels = (np.random.default_rng(seed).random((12, 20, 3)) * 255).astype('uint8')
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).resize(size, Image.BICUBIC).save(buffer, 'JPEG', quality=quality)
+        return buffer.getvalue()
+    
+    def test_resized_copies_cluster_together(self):
+        """Test that rescaled/recompressed copies cluster and unrelated images do not."""
+        hashes = {
+            'a': compute_hashes(self._jpeg(1)),
+            'a_small': compute_hashes(self._jpeg(1, (300, 180), quality=40)),
+            'b': compute_hashes(self._jpeg(2))
+        }
+        
+        clusters = cluster_hashes(hashes, max_distance=10)
+        
+        self.assertEqual([c['keys'] for c in clusters], [['a', 'a_small']])
+    
+    def test_bk_tree_radius_query(self):
+        """Test that BK-tree queries return exactly the hashes within the radius."""
+        tree = BKTree()
+        for key, value in enumerate([0b0000, 0b0001, 0b0011, 0b1111, 0b0001]):
+            tree.add(value, key)
+        
+        matches = sorted(tree.query(0b0000, 1))
+        
+        self.assertEqual(matches, [(0, 0), (1, 1), (1, 4)])
+        self.assertEqual(len(tree), 5)
+    
+    def test_finder_lists_media_and_posts_through_iter_collection(self):
+        """Test that the whole library and every featured image are listed via iter_collection."""
+        collections = {
+            'media': [{'id': 1, 'source_url': 'https://img.test/1.jpg'},
+                      {'id': 2, 'source_url': 'https://img.test/2.jpg'}],
+            'posts': [{'id': 10, 'featured_media': 2}, {'id': 11, 'featured_media': 0}]
+        }
+        wp = Mock()
+        wp.iter_collection.side_effect = lambda endpoint, **params: iter(collections[endpoint])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            finder = NearDuplicateImageFinder(wp, cache=ImageHashCache(Path(tmp) / 'hashes.db'))
+            hashes = {1: (0b1010, 0b1100), 2: (0b1010, 0b1101)}
+            with patch.object(finder, 'hash_media', return_value=(hashes, {'hashed': 2, 'cache_hits': 0,
+                                                                           'errors': []})):
+                report = finder.find_near_duplicates(max_distance=2)
+        
+        self.assertEqual(report['media_scanned'], 2)
+        self.assertEqual([m['featured_in_posts'] for m in report['clusters'][0]['media']], [[], [10]])
+        wp.get_media.assert_not_called()
+        wp.get_posts.assert_not_called()
+    
+    def test_library_is_hashed_from_uncropped_renditions(self):
+        """Test that a media item matches its original, which a square thumbnail would not."""
+        import io
+        from PIL import Image
+        original = self._jpeg(3, size=(1200, 800))
+        medium = io.BytesIO()
+        Image.open(io.BytesIO(original)).resize((300, 200)).save(medium, 'JPEG')
+        item = {'id': 5, 'source_url': 'https://img.test/5.jpg', 'media_details': {'sizes': {
+            'thumbnail': {'source_url': 'https://img.test/5-150x150.jpg'},
+            'medium': {'source_url': 'https://img.test/5-300x200.jpg'}}}}
+        files = {'https://img.test/5-300x200.jpg': medium.getvalue(), 'https://img.test/new.jpg': original}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            finder = NearDuplicateImageFinder(Mock(), cache=ImageHashCache(Path(tmp) / 'hashes.db'))
+            with patch.object(finder, '_list_media', return_value=[item]), \
+                    patch.object(finder, '_fetch', side_effect=files.__getitem__):
+                matches = finder.find_similar('https://img.test/new.jpg')
+        
+        self.assertEqual([m['media_id'] for m in matches], [5])
+
+
+class TestSecurityValidator(unittest.TestCase):
+    """Test cases for the shared security probes."""
+    
+    def setUp(self):
+        """Set up a validator whose session and certificate fetch are mocked."""
+        self.validator = SecurityValidator(Mock(), base_url='https://site.test')
+        homepage = MagicMock(status_code=200, url='https://site.test/', text='<html><p>Hi</p></html>',
+                             headers={'X-Content-Type-Options': 'nosniff'})
+        homepage.__enter__.return_value = homepage
+        self.validator.session = MagicMock()
+        self.validator.session.get.return_value = homepage
+        self.certificate = patch.object(self.validator, '_fetch_certificate',
+                                        return_value={'notAfter': 'Jan 01 00:00:00 2099 GMT', 'issuer': []})
+        self.fetch_certificate = self.certificate.start()
+    
+    def tearDown(self):
+        self.certificate.stop()
+    
+    def _requested(self):
+        return [call.args[0] for call in self.validator.session.get.call_args_list]
+    
+    def test_full_validation_runs_each_probe_once(self):
+        """Test that all sections share one homepage fetch and one certificate fetch."""
+        result = self.validator.validate_site_security()
+        
+        requested = self._requested()
+        self.assertEqual(requested.count('https://site.test'), 1)
+        self.assertEqual(len(requested), 3 + len(self.validator.sensitive_files))
+        self.assertEqual(self.fetch_certificate.call_count, 1)
+        self.assertTrue(result['security']['ssl_certificate']['certificate_valid'])
+    
+    def test_sections_run_only_their_own_probes(self):
+        """Test that a section called on its own does not run the whole probe plan."""
+        headers = self.validator._validate_security_headers()
+        self.assertEqual(self._requested(), ['https://site.test'])
+        self.assertTrue(headers['headers_present']['x-content-type-options'])
+        
+        self.validator.session.get.reset_mock()
+        self.assertTrue(self.validator._validate_ssl_certificate()['certificate_valid'])
+        self.assertEqual(self._requested(), [])
+        
+        self.validator._validate_https()
+        self.assertCountEqual(self._requested(), ['https://site.test', 'http://site.test'])
+        self.assertEqual(self.fetch_certificate.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,11 +7,17 @@ Checks ALL requirements comprehensively
 import os
 import re
 import requests
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from requests.auth import HTTPBasicAuth
 from bs4 import BeautifulSoup
 from collections import defaultdict
 
+# Add the project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from master_toolkit.mirror import open_site_mirror
+
 load_dotenv()
 
 WORDPRESS_URL = os.getenv('WORDPRESS_BASE_URL')
@@ -34,17 +40,11 @@ def main():
     print(f"📅 Date: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 80)
     
-    auth = HTTPBasicAuth(USERNAME, PASSWORD)
-    
-    # Fetch all data
-    posts_response = requests.get(f"{WORDPRESS_URL}/wp-json/wp/v2/posts?per_page=100", auth=auth)
-    posts = posts_response.json()
-    
-    categories_response = requests.get(f"{WORDPRESS_URL}/wp-json/wp/v2/categories?per_page=100", auth=auth)
-    categories = categories_response.json()
-    
-    pages_response = requests.get(f"{WORDPRESS_URL}/wp-json/wp/v2/pages?per_page=100", auth=auth)
-    pages = pages_response.json()
+    # Fetch all data (from the local mirror, synced incrementally)
+    mirror = open_site_mirror(WORDPRESS_URL, USERNAME, PASSWORD)
+    posts = mirror.get_posts()
+    categories = mirror.get_categories()
+    pages = mirror.get_pages()
     
     results = {'✅ PASSED': [], '⚠️  WARNINGS': [], '❌ FAILED': []}
     